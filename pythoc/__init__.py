@@ -46,14 +46,22 @@ from .utils.build_utils import (
     export_c_headers,
 )
 from .cimport import cimport, cimport_header, cimport_source
+from .buffers import pointer_view
 from .config import config
 from .forward_ref import mark_type_defined, register_forward_ref_callback
 
-# Import libc module for convenient access
-from . import libc
-from . import std
-from . import meta
+# Fork the build worker processes while the importing thread is most likely
+# still the only one (see pythoc.build.scheduler.start_process_pool).
+if config.build_executor == 'process':
+    from .build.scheduler import start_process_pool as _start_process_pool
+    _start_process_pool()
+
+# libc and meta are imported on first access (see __getattr__): the C library
+# headers alone register a few hundred externs and structs.  (std is loaded
+# by the builtin entities anyway.)
+_LAZY_SUBMODULES = ('libc', 'meta')
 import builtins as _py
+import importlib as _importlib
 
 # Version information
 __version__ = "0.5.0"
@@ -106,6 +114,7 @@ __all__ = [
     'compare_performance',
     'disassemble_to_native',
     'create_build_info',
+    'pointer_view',
     'get_compiler',
     'clear_registry',
     'nullptr',
@@ -164,6 +173,16 @@ for _w in _py.range(1, 65):
                 __all__.append(_n)
 
 
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return _importlib.import_module('.' + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 def info():
     """Print information about the PythoC compiler"""
     build_info = create_build_info()
@@ -0,0 +1,39 @@
+"""
+Command line entry point: ``python -m pythoc <command>``.
+
+Commands:
+    freeze APP [-o DIR]   Build APP and write a bundle loadable without
+                          pythoc or llvmlite (see pythoc.build.freeze)
+"""
+
+import argparse
+import sys
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m pythoc')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    freeze_parser = commands.add_parser(
+        'freeze', help='Compile and link a program into a prebuilt bundle',
+    )
+    freeze_parser.add_argument('app', help='Program defining the @compile functions')
+    freeze_parser.add_argument(
+        '-o', '--output', default=None,
+        help='Bundle directory (default: <app>_frozen)',
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == 'freeze':
+        from .build.freeze import FreezeError, freeze
+        try:
+            out_dir = freeze(args.app, args.output)
+        except FreezeError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        print(out_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Awaitable calls of @compile functions for asyncio programs.
+
+``await fn.async_call(*args)`` runs ``fn(*args)`` on a pythoc worker thread
+and resumes the awaiting coroutine with its result, so a long native call
+does not block the event loop.  The native code runs with the GIL released
+(see ``@compile(nogil=True)``), so the loop keeps serving other tasks while
+kernels run, on as many cores as there are workers.  The worker hands the
+result back through the loop's thread-safe wakeup (its self-pipe), which
+completes the awaited future on the loop thread.
+
+The call cannot be interrupted: cancelling the awaiting task drops the
+result, but a call that already started runs to completion.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .config import config
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_async_executor() -> ThreadPoolExecutor:
+    """
+    Return the worker pool running ``fn.async_call()`` calls.
+
+    Created on first use with ``config.async_workers`` threads.
+    """
+    global _executor
+    executor = _executor
+    if executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = config.async_workers or os.cpu_count() or 1
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='pythoc-async')
+            executor = _executor
+    return executor
+
+
+def async_call(wrapper, *args, **kwargs) -> asyncio.Future:
+    """
+    Start a call of a @compile function on a worker thread.
+
+    The call is submitted right away; awaiting the result is optional.
+
+    Args:
+        wrapper: @compile function
+        *args, **kwargs: Arguments, as for calling *wrapper* directly;
+            buffer arguments are in use by the worker until the call
+            completes
+
+    Returns:
+        asyncio.Future of the call's result, bound to the running loop
+
+    Raises:
+        RuntimeError: no event loop is running in this thread
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(wrapper, *args, **kwargs)
+    return loop.run_in_executor(get_async_executor(), call)
+
+
+def shutdown_async_executor(wait: bool = True):
+    """Stop the worker pool; the next ``fn.async_call()`` starts a new one."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Zero-copy access to Python buffers from native code, and back.
+
+Any object exporting the buffer protocol (``bytes``, ``bytearray``,
+``array.array``, ``memoryview``, ctypes arrays, NumPy arrays, ...) can be
+handed to native code by address.  :func:`acquire_buffer` asks the exporter
+for a C-contiguous view with ``PyObject_GetBuffer``, so read-only buffers
+work too and nothing is copied.  The view pins the exporter's memory until
+it is released.  :func:`pointer_view` goes the other way and wraps native
+memory in a ``memoryview``.
+"""
+
+import ctypes
+import struct
+from typing import Any, Optional, Tuple
+
+
+class _PyBuffer(ctypes.Structure):
+    """CPython's ``Py_buffer``."""
+    _fields_ = [
+        ('buf', ctypes.c_void_p),
+        ('obj', ctypes.py_object),
+        ('len', ctypes.c_ssize_t),
+        ('itemsize', ctypes.c_ssize_t),
+        ('readonly', ctypes.c_int),
+        ('ndim', ctypes.c_int),
+        ('format', ctypes.c_char_p),
+        ('shape', ctypes.POINTER(ctypes.c_ssize_t)),
+        ('strides', ctypes.POINTER(ctypes.c_ssize_t)),
+        ('suboffsets', ctypes.POINTER(ctypes.c_ssize_t)),
+        ('internal', ctypes.c_void_p),
+    ]
+
+
+_PyBUF_WRITABLE = 0x0001
+_PyBUF_FORMAT = 0x0004
+_PyBUF_C_CONTIGUOUS = 0x0038
+_PyBUF_WRITE = 0x0200
+
+_get_buffer = ctypes.pythonapi.PyObject_GetBuffer
+_get_buffer.argtypes = [ctypes.py_object, ctypes.POINTER(_PyBuffer), ctypes.c_int]
+_get_buffer.restype = ctypes.c_int
+_release_buffer = ctypes.pythonapi.PyBuffer_Release
+_release_buffer.argtypes = [ctypes.POINTER(_PyBuffer)]
+_release_buffer.restype = None
+_memory_view = ctypes.pythonapi.PyMemoryView_FromMemory
+_memory_view.argtypes = [ctypes.c_void_p, ctypes.c_ssize_t, ctypes.c_int]
+_memory_view.restype = ctypes.py_object
+
+# struct format character -> element kind.
+_FORMAT_KINDS = {}
+_FORMAT_KINDS.update(dict.fromkeys('bhilqn', 'int'))
+_FORMAT_KINDS.update(dict.fromkeys('BHILQN', 'uint'))
+_FORMAT_KINDS.update(dict.fromkeys('efd', 'float'))
+_FORMAT_KINDS['?'] = 'bool'
+
+_NATIVE_ORDER = '<' if struct.pack('=H', 1) == struct.pack('<H', 1) else '>'
+
+
+def is_buffer(obj) -> bool:
+    """Return True if *obj* exports the buffer protocol."""
+    try:
+        memoryview(obj)
+    except TypeError:
+        return False
+    return True
+
+
+class BufferView:
+    """A C-contiguous view of an exporter's memory, pinned until released.
+
+    Attributes:
+        address: Address of the first element
+        format: struct format string of the elements
+        itemsize: Size of one element in bytes
+        shape: Shape of the buffer (``()`` for a scalar view)
+        count: Number of elements
+        readonly: Whether the exporter forbids writes
+    """
+
+    def __init__(self, obj, writable: bool = False):
+        self._held = False
+        self._view = _PyBuffer()
+        flags = _PyBUF_C_CONTIGUOUS | _PyBUF_FORMAT
+        if writable:
+            flags |= _PyBUF_WRITABLE
+        try:
+            _get_buffer(obj, ctypes.byref(self._view), flags)
+        except BufferError as e:
+            raise TypeError(
+                f"{type(obj).__name__} cannot be passed to native code: {e}"
+            ) from None
+        except TypeError:
+            raise TypeError(
+                f"expected an object supporting the buffer protocol, "
+                f"got {type(obj).__name__}"
+            ) from None
+        self._held = True
+        view = self._view
+        self.address = view.buf or 0
+        self.itemsize = view.itemsize
+        self.format = view.format.decode('ascii') if view.format else 'B'
+        self.shape = tuple(view.shape[i] for i in range(view.ndim))
+        self.count = view.len // view.itemsize if view.itemsize else 0
+        self.readonly = bool(view.readonly)
+
+    def matches(self, ctype) -> bool:
+        """Return True if the elements have the layout of ctypes type *ctype*."""
+        return element_kind(self.format) == ctype_kind(ctype) and (
+            self.itemsize == ctypes.sizeof(ctype))
+
+    def release(self):
+        """Unpin the exporter's memory; the address is invalid afterwards."""
+        if self._held:
+            self._held = False
+            _release_buffer(ctypes.byref(self._view))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def __del__(self):
+        self.release()
+
+
+def acquire_buffer(obj, writable: bool = False) -> BufferView:
+    """
+    Pin a buffer exporter's memory for native code.
+
+    Args:
+        obj: Object exporting the buffer protocol
+        writable: Fail unless native code may write to the buffer
+
+    Returns:
+        BufferView, to be released once native code is done with it
+
+    Raises:
+        TypeError: *obj* is not a buffer, is not C-contiguous, or is
+            read-only although *writable* was requested
+    """
+    return BufferView(obj, writable=writable)
+
+
+def element_kind(fmt: str) -> Optional[str]:
+    """
+    Classify a single-element struct format string.
+
+    Returns:
+        'int', 'uint', 'float' or 'bool', or None for anything else
+        (structs, non-native byte order, multi-character formats)
+    """
+    order = fmt[:1]
+    if order in ('@', '=', '<', '>', '!'):
+        if order in ('<', '>', '!') and (order == '<') != (_NATIVE_ORDER == '<'):
+            return None
+        fmt = fmt[1:]
+    if len(fmt) != 1:
+        return None
+    return _FORMAT_KINDS.get(fmt)
+
+
+def ctype_kind(ctype) -> Optional[str]:
+    """Return the element kind of a scalar ctypes type, as :func:`element_kind`."""
+    code = getattr(ctype, '_type_', None)
+    return _FORMAT_KINDS.get(code) if isinstance(code, str) else None
+
+
+def scalar_ctype(pc_type):
+    """
+    Return the ctypes type of a scalar pythoc type as a buffer element.
+
+    Returns:
+        ctypes type, or None for non-scalars and for f16/bf16/f128, which
+        have no ctypes type of their own size
+    """
+    if pc_type is None or not (getattr(pc_type, '_is_integer', False)
+                               or getattr(pc_type, '_is_float', False)
+                               or getattr(pc_type, '_is_bool', False)):
+        return None
+    ctype = pc_type.get_ctypes_type()
+    return ctype if ctypes.sizeof(ctype) == pc_type.get_size_bytes() else None
+
+
+def pointer_view(pointer, count: int, element_type=None) -> memoryview:
+    """
+    Expose native memory as a writable ``memoryview`` without copying.
+
+    The view does not keep the memory alive: it is only valid while the
+    native side does.
+
+    Args:
+        pointer: ``ptr[T]`` value returned by a @compile function, or an
+            integer address
+        count: Number of elements
+        element_type: pythoc element type; defaults to the pointer's ``T``
+
+    Returns:
+        memoryview of *count* elements, formatted as ``T`` for scalar
+        element types and as bytes otherwise
+    """
+    if element_type is None:
+        element_type = getattr(getattr(pointer, '_pc_type', None), 'pointee_type', None)
+    address = int(pointer) if pointer is not None else 0
+    ctype = scalar_ctype(element_type)
+    if ctype is not None:
+        itemsize = ctypes.sizeof(ctype)
+    elif hasattr(element_type, 'get_size_bytes'):
+        itemsize = element_type.get_size_bytes() or 1
+    else:
+        itemsize = 1
+    if count < 0:
+        raise ValueError(f"pointer_view() count must not be negative, got {count}")
+    if not address and count:
+        raise ValueError("pointer_view() of a null pointer")
+    if not count:
+        view = memoryview(b'')
+    else:
+        view = _memory_view(address, count * itemsize, _PyBUF_WRITE)
+    return view.cast(ctype._type_) if ctype is not None else view
+
+
+def new_buffer(ctype, shape: Tuple[int, ...], like: Any = None):
+    """
+    Allocate a zeroed buffer of *ctype* elements.
+
+    Args:
+        ctype: Scalar ctypes element type
+        shape: Shape of the result
+        like: If a NumPy array, the result is a NumPy array too
+
+    Returns:
+        NumPy array, or a ``memoryview`` over a fresh ``bytearray``
+    """
+    if type(like).__module__ == 'numpy':
+        import numpy
+        return numpy.zeros(shape, dtype=ctype)
+    count = 1
+    for dim in shape:
+        count *= dim
+    view = memoryview(bytearray(count * ctypes.sizeof(ctype)))
+    # memoryview cannot take a shape with a zero in it.
+    return view.cast(ctype._type_, shape) if count else view.cast(ctype._type_)
@@ -11,6 +11,11 @@ from .deps import (
     DependencyTracker,
     get_dependency_tracker,
 )
+from .deps_index import DepsIndex
+from .shared_cache import (
+    SharedObjectCache,
+    get_shared_object_cache,
+)
 from .scheduler import (
     BuildScheduler,
     BuildSchedulerError,
@@ -34,6 +39,10 @@ __all__ = [
     'GroupDeps',
     'DependencyTracker',
     'get_dependency_tracker',
+    'DepsIndex',
+    # Shared object cache
+    'SharedObjectCache',
+    'get_shared_object_cache',
     'BuildScheduler',
     'BuildSchedulerError',
     'BuildTask',
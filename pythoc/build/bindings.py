@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Binding snapshots: warm imports without parsing function sources.
+
+Registering an ``@compile`` function reads its source
+(``inspect.getsource``), parses it, resolves its annotations and builds the
+wrapper's ``FunctionBindingState`` -- even when the group object on disk is
+fresh and nothing will be lowered.  A new process importing a large module
+paid that cost for every function on every start.
+
+Whenever a plain group (module-level functions, no scope or suffix) is
+compiled or found in the cache, the signature of each of its functions is
+saved with the group's deps record (``GroupDeps.bindings``): parameter
+names, the pythoc type of each annotated parameter and of the return value
+as a small JSON descriptor, the varargs flags and the function attributes.
+Descriptors cover builtin types, ``ptr[T]``, ``array[T, N...]`` and types
+reachable by module and qualified name (e.g. ``@compile`` structs);
+functions using any other type are left out.
+
+While the content key recorded with the object still matches the group's
+current inputs, a later process binds those functions from the snapshot:
+their types are rebuilt from the descriptors and checked against the
+recorded type ids, and the source is only read and parsed if the group
+actually has to be recompiled.
+"""
+
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..builtin_entities import array, ptr
+from ..logger import logger
+from ..registry import get_unified_registry
+from ..type_id import get_type_id
+
+
+BINDINGS_VERSION = 1
+
+
+def encode_type(pc_type) -> Any:
+    """
+    Return a JSON descriptor of a pythoc type, or None if it has none.
+
+    Args:
+        pc_type: Resolved parameter or return type
+
+    Returns:
+        str for builtin types, list for ``ptr``/``array``/named types
+    """
+    if not isinstance(pc_type, type):
+        return None
+    if issubclass(pc_type, ptr) and pc_type.pointee_type is not None:
+        pointee = encode_type(pc_type.pointee_type)
+        return None if pointee is None else ['ptr', pointee]
+    if issubclass(pc_type, array) and pc_type.element_type is not None:
+        element = encode_type(pc_type.element_type)
+        if element is None or not pc_type.dimensions:
+            return None
+        return ['array', element, list(pc_type.dimensions)]
+    get_name = getattr(pc_type, 'get_name', None)
+    if get_name is not None:
+        try:
+            name = get_name()
+        except Exception:
+            name = None
+        if (isinstance(name, str)
+                and get_unified_registry().get_builtin_entity(name) is pc_type):
+            return name
+    module = getattr(pc_type, '__module__', None)
+    qualname = getattr(pc_type, '__qualname__', None)
+    if module and qualname and _resolve_named(module, qualname) is pc_type:
+        return ['ref', module, qualname]
+    return None
+
+
+def _resolve_named(module: str, qualname: str):
+    if '<' in qualname:
+        return None
+    value = sys.modules.get(module)
+    for part in qualname.split('.'):
+        value = getattr(value, part, None)
+        if value is None:
+            return None
+    return value
+
+
+# Descriptor JSON -> (decoded type, [(named type descriptor, object)]).
+# Specializing ptr/array is costly, so each descriptor is rebuilt once per
+# process; named types are re-resolved on every hit in case the defining
+# module was reloaded.
+_decoded_types: Dict[str, Tuple[Any, List[Tuple[Any, Any]]]] = {}
+
+
+def _named_refs(desc, out):
+    if isinstance(desc, list) and desc:
+        if desc[0] == 'ref':
+            out.append(desc)
+        else:
+            for item in desc[1:]:
+                _named_refs(item, out)
+    return out
+
+
+def decode_type(desc) -> Any:
+    """Rebuild a pythoc type from its descriptor; None if it is unavailable."""
+    key = json.dumps(desc)
+    cached = _decoded_types.get(key)
+    if cached is not None:
+        pc_type, refs = cached
+        if all(_resolve_named(ref[1], ref[2]) is obj for ref, obj in refs):
+            return pc_type
+    pc_type = _decode_type(desc)
+    if pc_type is not None:
+        refs = [
+            (ref, _resolve_named(ref[1], ref[2])) for ref in _named_refs(desc, [])
+        ]
+        _decoded_types[key] = (pc_type, refs)
+    return pc_type
+
+
+def _decode_type(desc) -> Any:
+    if isinstance(desc, str):
+        return get_unified_registry().get_builtin_entity(desc)
+    if not isinstance(desc, list) or not desc:
+        return None
+    kind = desc[0]
+    if kind == 'ptr' and len(desc) == 2:
+        pointee = _decode_type(desc[1])
+        return None if pointee is None else ptr[pointee]
+    if kind == 'array' and len(desc) == 3:
+        element = _decode_type(desc[1])
+        return None if element is None else array[(element,) + tuple(desc[2])]
+    if kind == 'ref' and len(desc) == 3:
+        return _resolve_named(desc[1], desc[2])
+    return None
+
+
+def _signature_id(param_names: List[str], param_types: Dict[str, Any], return_type) -> str:
+    parts = [
+        get_type_id(param_types[name]) if name in param_types else '-'
+        for name in param_names
+    ]
+    return ','.join(parts) + '->' + get_type_id(return_type)
+
+
+def _snapshot_entry(wrapper) -> Optional[Tuple[str, Dict[str, Any]]]:
+    binding = getattr(wrapper, '_binding', None)
+    func_info = getattr(wrapper, '_func_info', None)
+    func = getattr(wrapper, '__wrapped__', None)
+    if binding is None or func_info is None or func is None:
+        return None
+    if (binding.is_template or binding.compile_suffix or binding.effect_suffix
+            or binding.mangled_name or func_info.parametric_param_names
+            or binding.effect_override_names):
+        return None
+    name = binding.original_name
+    if (getattr(func, '__name__', None) != name
+            or '<' in getattr(func, '__qualname__', '<')
+            or hasattr(func, '__pc_source__')):
+        return None
+
+    types = {}
+    for param, pc_type in func_info.param_type_hints.items():
+        desc = encode_type(pc_type)
+        if desc is None:
+            return None
+        types[param] = desc
+    returns = encode_type(func_info.return_type_hint)
+    if returns is None:
+        return None
+    try:
+        type_id = _signature_id(
+            func_info.param_names, func_info.param_type_hints,
+            func_info.return_type_hint,
+        )
+    except Exception:
+        return None
+    return name, {
+        'version': BINDINGS_VERSION,
+        'params': list(func_info.param_names),
+        'types': types,
+        'return': returns,
+        'type_id': type_id,
+        'attrs': sorted(func_info.fn_attrs),
+        'llvm_varargs': bool(func_info.has_llvm_varargs),
+        'varargs': bool(func_info.has_varargs),
+        'kwargs': bool(func_info.has_kwargs),
+    }
+
+
+def snapshot_group_bindings(group_key, wrappers: Iterable) -> Dict[str, Dict[str, Any]]:
+    """
+    Collect the binding snapshot of a group from its registered wrappers.
+
+    Args:
+        group_key: Group key tuple; only plain groups have snapshots
+        wrappers: The group's ``@compile`` wrappers
+
+    Returns:
+        dict: function name -> snapshot entry (names registered with
+        differing signatures are left out)
+    """
+    if any(tuple(group_key)[1:]):
+        return {}
+    entries = {}
+    conflicts = set()
+    for wrapper in wrappers:
+        binding = getattr(wrapper, '_binding', None)
+        if binding is None or tuple(binding.group_key) != tuple(group_key):
+            continue
+        snapshot = _snapshot_entry(wrapper)
+        if snapshot is None:
+            conflicts.add(getattr(binding, 'original_name', None))
+            continue
+        name, entry = snapshot
+        if entries.setdefault(name, entry) != entry:
+            conflicts.add(name)
+    for name in conflicts:
+        entries.pop(name, None)
+    return entries
+
+
+def decode_binding(entry: Dict[str, Any], fn_attrs) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild the signature of one snapshot entry.
+
+    Args:
+        entry: Snapshot entry written by :func:`snapshot_group_bindings`
+        fn_attrs: Function attributes requested by the decorator
+
+    Returns:
+        dict with ``param_names``, ``param_type_hints``, ``return_type_hint``
+        and the varargs flags, or None when the entry no longer applies
+    """
+    if entry.get('version') != BINDINGS_VERSION:
+        return None
+    if entry.get('attrs') != sorted(fn_attrs or ()):
+        return None
+    param_names = list(entry.get('params', []))
+    param_types = {}
+    for param, desc in entry.get('types', {}).items():
+        pc_type = decode_type(desc)
+        if pc_type is None:
+            return None
+        param_types[param] = pc_type
+    return_type = decode_type(entry.get('return'))
+    if return_type is None:
+        return None
+    try:
+        type_id = _signature_id(param_names, param_types, return_type)
+    except Exception:
+        return None
+    if type_id != entry.get('type_id'):
+        logger.debug(
+            f"Binding snapshot type mismatch: {type_id} != {entry.get('type_id')}"
+        )
+        return None
+    return {
+        'param_names': param_names,
+        'param_type_hints': param_types,
+        'return_type_hint': return_type,
+        'has_llvm_varargs': bool(entry.get('llvm_varargs')),
+        'has_varargs': bool(entry.get('varargs')),
+        'has_kwargs': bool(entry.get('kwargs')),
+    }
@@ -7,25 +7,112 @@ Implements the layered invalidation model:
 
 Each layer updates ONLY when its input (previous layer) changes.
 .ll is just an intermediate artifact, not a cache layer.
+
+The object layer is content-addressed: a group's `.o` is reused when the
+content key persisted in its deps record matches the key recomputed from the
+current inputs (normalized source ASTs, group key, type-layout sources and
+codegen knobs).  File mtimes are deliberately not part of the key, so
+``git checkout``, ``touch`` or a restored CI workspace do not force rebuilds.
 """
 
+import ast
+import hashlib
 import os
-from typing import List
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Process-wide memo of normalized source digests, keyed by
+# (path, mtime_ns, size, positions).  The stat triple is only used to decide
+# whether the file must be re-read; the digest itself depends on content alone.
+_source_digests: Dict[Tuple[str, int, int, bool], str] = {}
+_source_digests_lock = threading.Lock()
+
+
+def source_digest(path: str, positions: Optional[bool] = None) -> Optional[str]:
+    """Return a digest of the normalized content of *path*.
+
+    Python sources are hashed via ``ast.dump`` of the parsed module, so edits
+    that only touch comments or formatting keep the same digest.  With
+    *positions* (default: ``config.debug_info``) line and column numbers are
+    hashed too, since debug info records them in the object.  Other files
+    (or sources that fail to parse) are hashed byte-for-byte.
+
+    Returns None when the file does not exist.
+    """
+    if positions is None:
+        from ..config import config
+        positions = bool(config.debug_info)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    memo_key = (path, st.st_mtime_ns, st.st_size, positions)
+    with _source_digests_lock:
+        cached = _source_digests.get(memo_key)
+    if cached is not None:
+        return cached
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    normalized = data
+    if path.endswith('.py'):
+        try:
+            normalized = ast.dump(
+                ast.parse(data), include_attributes=positions).encode('utf-8')
+        except (SyntaxError, ValueError):
+            normalized = data
+
+    digest = hashlib.sha256(normalized).hexdigest()
+    with _source_digests_lock:
+        _source_digests[memo_key] = digest
+    return digest
+
+
+def codegen_knobs() -> List[Tuple[str, str]]:
+    """Return the configuration values that change emitted object code."""
+    import llvmlite
+    from llvmlite import binding
+    from ..config import config
+    from ..compiler import target_machine_options
+    from .deps import DEPS_VERSION
+
+    # "native" is resolved, so hosts with different CPUs sharing a cache
+    # directory never exchange objects.
+    target = target_machine_options()
+    return [
+        ('deps_version', str(DEPS_VERSION)),
+        ('llvmlite', llvmlite.__version__),
+        ('triple', binding.get_default_triple()),
+        ('target_cpu', target['cpu']),
+        ('target_features', target['features']),
+        ('opt_level', str(int(config.opt_level))),
+        ('vectorize', str(bool(config.vectorize))),
+        ('lto', str(bool(config.lto))),
+        ('pgo_generate', str(bool(config.pgo_generate))),
+        ('pgo_use', (source_digest(config.pgo_use) or '') if config.pgo_use else ''),
+        ('debug_info', str(bool(config.debug_info))),
+    ]
 
 
 class BuildCache:
     """
-    Manages build cache and timestamp checking for incremental compilation.
+    Manages build cache checks for incremental compilation.
     
     Layered invalidation rules:
-    - .o recompiled when: source file changes
+    - .o recompiled when: its content key changes
     - .so re-linked when: any dependent .o changes
     - dlopen reloaded when: .so changes
     """
     
     @staticmethod
     def check_obj_uptodate(obj_file: str, source_file: str) -> bool:
-        """Check if `.o` file is up-to-date."""
+        """Check if `.o` file is newer than *source_file* (mtime based)."""
         if not os.path.exists(source_file):
             return False
         if not os.path.exists(obj_file):
@@ -34,6 +121,74 @@ class BuildCache:
         obj_mtime = os.path.getmtime(obj_file)
         return obj_mtime >= source_mtime
 
+    @staticmethod
+    def compute_content_key(
+        group_key: Sequence,
+        source_file: str,
+        embed_files: Iterable[str] = (),
+    ) -> Optional[str]:
+        """
+        Compute the content key of a group object.
+
+        Args:
+            group_key: Group key tuple (file, scope, compile_suffix, effect_suffix)
+            source_file: Source file the group is compiled from
+            embed_files: Sources whose code or type layouts are embedded by
+                value into the object (``source_embed`` dependencies)
+
+        Returns:
+            Hex digest, or None when a required source file is missing.
+        """
+        src_digest = source_digest(source_file)
+        if src_digest is None:
+            return None
+
+        hasher = hashlib.sha256()
+
+        def feed(*parts):
+            for part in parts:
+                hasher.update(str(part).encode('utf-8'))
+                hasher.update(b'\0')
+
+        # The object location is already derived from the source path, so only
+        # the file name enters the key.  DWARF records absolute paths though,
+        # so debug builds stay tied to their checkout.
+        from ..config import config
+        file_part = source_file if config.debug_info else os.path.basename(source_file)
+        feed('group', file_part, *tuple(group_key)[1:])
+        feed('source', src_digest)
+
+        # Embed sources are identified by content only (sorted digests), so the
+        # key does not depend on where a checkout or site-packages lives.
+        embed_digests = []
+        for embed_file in set(embed_files):
+            if embed_file == source_file:
+                continue
+            embed_digest = source_digest(embed_file)
+            if embed_digest is None:
+                return None
+            embed_digests.append(embed_digest)
+        for embed_digest in sorted(embed_digests):
+            feed('embed', embed_digest)
+
+        for name, value in codegen_knobs():
+            feed(name, value)
+
+        return hasher.hexdigest()[:32]
+
+    @staticmethod
+    def check_obj_content_uptodate(
+        obj_file: str,
+        content_key: Optional[str],
+        cached_content_key: Optional[str],
+    ) -> bool:
+        """Check if `.o` exists and was built from the same content key."""
+        if not content_key or not cached_content_key:
+            return False
+        if not os.path.exists(obj_file):
+            return False
+        return content_key == cached_content_key
+
     
     @staticmethod
     def check_so_needs_relink(so_file: str, obj_files: List[str]) -> bool:
@@ -86,12 +241,15 @@ class BuildCache:
     @staticmethod
     def invalidate_obj(obj_file: str):
         """
-        Invalidate .o and related files.
+        Invalidate .o and related files, including its persisted deps.
         
         Args:
             obj_file: Path to .o file
         """
         if obj_file:
+            from .deps import get_dependency_tracker
             ir_file = obj_file.replace('.o', '.ll')
-            deps_file = obj_file.replace('.o', '.deps')
-            BuildCache._delete_files(obj_file, ir_file, deps_file)
+            bc_file = obj_file.replace('.o', '.bc')
+            prof_file = obj_file.replace('.o', '.prof.json')
+            BuildCache._delete_files(obj_file, ir_file, bc_file, prof_file)
+            get_dependency_tracker().discard_deps(obj_file)
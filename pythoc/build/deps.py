@@ -25,9 +25,10 @@ import threading
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple, Any
 from ..logger import logger
+from .deps_index import DepsIndex
 
 # Version for .deps file format
-DEPS_VERSION = 11  # Increment when scheduler/cache/effect planning semantics change
+DEPS_VERSION = 12  # Increment when scheduler/cache/effect planning semantics change
 
 
 def _type_source_file(pc_type: Any) -> Optional[str]:
@@ -133,7 +134,8 @@ class GroupDependency:
       bakes in the layout/size of structs it allocates). Such a caller MUST be
       recompiled when the target's source file changes, otherwise the caller
       keeps a stale, wrong-sized frame -> silent memory corruption. The cache
-      therefore mtime-invalidates the caller against these targets' sources.
+      therefore folds these targets' source contents into the caller's
+      content key.
     """
     target_group: GroupKey              # The group we depend on
     dependency_type: str = "function_call"  # See class docstring for values
@@ -202,6 +204,20 @@ class GroupDeps:
     # flag must invalidate the cached object.
     debug_info: bool = False
 
+    # Content key of the inputs this object was built from (see
+    # BuildCache.compute_content_key).  The object is reused only while the
+    # key recomputed from the current inputs still matches.
+    content_key: Optional[str] = None
+
+    # Normalized AST digest of every function materialized into the object,
+    # keyed by symbol name.
+    function_hashes: Dict[str, str] = field(default_factory=dict)
+
+    # Signatures of the group's module-level functions, keyed by name, so a
+    # later process can bind their wrappers without parsing the source (see
+    # build.bindings).
+    bindings: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dict for JSON serialization with compressed group keys."""
         # Collect all unique group keys
@@ -238,6 +254,15 @@ class GroupDeps:
         if self.debug_info:
             result['debug_info'] = True
 
+        if self.content_key:
+            result['content_key'] = self.content_key
+
+        if self.function_hashes:
+            result['function_hashes'] = dict(sorted(self.function_hashes.items()))
+
+        if self.bindings:
+            result['bindings'] = dict(sorted(self.bindings.items()))
+
         # Add group keys table if we have any
         if unique_group_keys:
             result['group_keys'] = unique_group_keys
@@ -277,6 +302,9 @@ class GroupDeps:
         compiled_symbols = d.get('compiled_symbols', [])
         ast_content_hash = d.get('ast_content_hash')
         debug_info = d.get('debug_info', False)
+        content_key = d.get('content_key')
+        function_hashes = d.get('function_hashes', {})
+        bindings = d.get('bindings', {})
 
         return cls(
             version=d.get('version', DEPS_VERSION),
@@ -288,6 +316,9 @@ class GroupDeps:
             compiled_symbols=compiled_symbols,
             ast_content_hash=ast_content_hash,
             debug_info=debug_info,
+            content_key=content_key,
+            function_hashes=function_hashes,
+            bindings=bindings,
         )
 
     
@@ -314,6 +345,25 @@ class GroupDeps:
         """Get all group keys this group depends on."""
         return {dep.target_group.to_tuple() for dep in self.group_dependencies}
 
+    def get_source_embed_files(self) -> List[str]:
+        """Get source files whose code or layouts are embedded by value."""
+        files = []
+        for dep in self.group_dependencies:
+            if dep.dependency_type != "source_embed":
+                continue
+            target_file = dep.target_group.file
+            if target_file and target_file not in files:
+                files.append(target_file)
+        return files
+
+
+def _decode_deps(text: str) -> Optional[GroupDeps]:
+    """Parse a persisted deps record; None for another format version."""
+    data = json.loads(text)
+    if data.get('version') != DEPS_VERSION:
+        return None
+    return GroupDeps.from_dict(data)
+
 
 class DependencyTracker:
     """
@@ -330,6 +380,9 @@ class DependencyTracker:
         # Loaded deps from files: group_key -> GroupDeps
         self._loaded_deps: Dict[Tuple, GroupDeps] = {}
 
+        # Persisted deps indexes: build directory -> DepsIndex
+        self._indexes: Dict[str, DepsIndex] = {}
+
         # Build tasks can record/load deps concurrently when object workers > 1.
         self._lock = threading.RLock()
 
@@ -363,12 +416,12 @@ class DependencyTracker:
         layout (size, field offsets) into its own object code -- e.g. via
         sizeof(T), an array[T, N] local, a by-value T field/parameter, or a
         stack slot of type T. The incremental cache only tracks each group's
-        own source mtime, so a layout change in the *defining* module would
+        own source, so a layout change in the *defining* module would
         otherwise be served from this group's stale .o whose baked-in frame
         size no longer matches, causing silent memory corruption.
 
         Recording a source_embed edge to the defining file forces a rebuild of
-        this group whenever that file changes. Plain function references stay
+        this group whenever that file's content changes. Plain function references stay
         link-time (function_ref) and are intentionally not covered here.
         """
         if not isinstance(globals_dict, dict) or not group_key:
@@ -415,34 +468,84 @@ class DependencyTracker:
                 group_deps.add_link_object(obj)
 
     def get_deps_file_path(self, obj_file: str) -> str:
-        """Get .deps file path corresponding to an .o file."""
+        """Get the legacy per-object .deps file path of an .o file."""
         return obj_file.replace('.o', '.deps')
-    
+
+    def _index_for(self, obj_file: str) -> DepsIndex:
+        """Get the dependency index of the directory holding *obj_file*."""
+        directory = os.path.dirname(os.path.abspath(obj_file))
+        with self._lock:
+            index = self._indexes.get(directory)
+            if index is None:
+                index = DepsIndex(directory, _decode_deps)
+                self._indexes[directory] = index
+            return index
+
+    def _store_deps(self, deps: GroupDeps, obj_file: str):
+        """Write *deps* into the index and drop any legacy .deps file."""
+        self._index_for(obj_file).put(
+            os.path.basename(obj_file), json.dumps(deps.to_dict()),
+        )
+        legacy_file = self.get_deps_file_path(obj_file)
+        if os.path.exists(legacy_file):
+            try:
+                os.remove(legacy_file)
+            except OSError:
+                pass
+
     def save_deps(self, group_key: Tuple, obj_file: str):
         """
-        Save dependency info to .deps file.
+        Save dependency info to the build directory's deps index.
         
         Args:
             group_key: Group key
-            obj_file: Path to .o file (deps file will be derived from this)
+            obj_file: Path to .o file the record belongs to
         """
         with self._lock:
             if group_key not in self._group_deps:
                 return
             
             deps = self._group_deps[group_key]
-            deps_file = self.get_deps_file_path(obj_file)
-            
             try:
-                with open(deps_file, 'w') as f:
-                    json.dump(deps.to_dict(), f, indent=2)
-                logger.debug(f"Saved group-level deps to {deps_file}")
+                self._store_deps(deps, obj_file)
+                logger.debug(f"Saved group-level deps for {obj_file}")
             except Exception as e:
-                logger.debug(f"Failed to save deps to {deps_file}: {e}")
+                logger.debug(f"Failed to save deps for {obj_file}: {e}")
     
+    def write_deps(self, deps: GroupDeps, obj_file: str):
+        """
+        Write an existing GroupDeps record as the deps of an .o file.
+
+        Used when an object is restored from the shared cache rather than
+        compiled in this process.
+
+        Args:
+            deps: Dependency record to persist
+            obj_file: Path to .o file the record belongs to
+        """
+        self._store_deps(deps, obj_file)
+        logger.debug(f"Wrote restored deps for {obj_file}")
+
+    def discard_deps(self, obj_file: str):
+        """Drop the persisted deps of an .o file (index record and legacy file)."""
+        try:
+            self._index_for(obj_file).delete(os.path.basename(obj_file))
+        except Exception as e:
+            logger.debug(f"Failed to drop deps for {obj_file}: {e}")
+        legacy_file = self.get_deps_file_path(obj_file)
+        if os.path.exists(legacy_file):
+            try:
+                os.remove(legacy_file)
+            except OSError:
+                pass
+
     def load_deps(self, obj_file: str) -> Optional[GroupDeps]:
         """
-        Load dependency info from .deps file.
+        Load the persisted dependency info of an .o file.
+
+        Records come from the directory's deps index (served from memory
+        until another process updates it); objects built before the index
+        existed fall back to their legacy .deps file.
         
         Args:
             obj_file: Path to .o file
@@ -450,6 +553,20 @@ class DependencyTracker:
         Returns:
             GroupDeps or None if not found/invalid
         """
+        deps = self._index_for(obj_file).get(os.path.basename(obj_file))
+        if deps is None:
+            deps = self._load_legacy_deps(obj_file)
+        if deps is None:
+            return None
+
+        # Cache loaded deps
+        with self._lock:
+            if deps.group_key:
+                self._loaded_deps[deps.group_key.to_tuple()] = deps
+        return deps
+
+    def _load_legacy_deps(self, obj_file: str) -> Optional[GroupDeps]:
+        """Load dependency info from a per-object .deps JSON file."""
         deps_file = self.get_deps_file_path(obj_file)
         
         if not os.path.exists(deps_file):
@@ -457,22 +574,10 @@ class DependencyTracker:
         
         try:
             with open(deps_file, 'r') as f:
-                data = json.load(f)
-
-            if data.get('version') != DEPS_VERSION:
-                logger.debug(
-                    f"Ignoring stale deps format in {deps_file}: "
-                    f"version={data.get('version')} expected={DEPS_VERSION}"
-                )
+                deps = _decode_deps(f.read())
+            if deps is None:
+                logger.debug(f"Ignoring stale deps format in {deps_file}")
                 return None
-            
-            deps = GroupDeps.from_dict(data)
-            
-            # Cache loaded deps
-            with self._lock:
-                if deps.group_key:
-                    self._loaded_deps[deps.group_key.to_tuple()] = deps
-            
             logger.debug(f"Loaded group-level deps from {deps_file}")
             return deps
         except Exception as e:
@@ -569,6 +674,11 @@ class DependencyTracker:
         """Clear all in-memory state."""
         self._group_deps.clear()
         self._loaded_deps.clear()
+        with self._lock:
+            indexes = list(self._indexes.values())
+            self._indexes.clear()
+        for index in indexes:
+            index.close()
 
 
 
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Per-directory dependency index for pythoc.
+
+Every group object used to carry its dependency record in a JSON sidecar
+(``foo.o`` -> ``foo.deps``).  Cache checks, dependency restoration and
+library loading re-read those sidecars on every flush and load, so with
+thousands of groups startup was dominated by small-file I/O and JSON
+parsing.
+
+The records of all objects in one build directory now live in a single
+SQLite database (``deps.sqlite``) keyed by object file name.  Each row
+carries a sequence number that grows with every write, and deletions are
+kept as tombstone rows, so a process only has to fetch rows newer than the
+last one it saw.  Other writers are detected through SQLite's
+``PRAGMA data_version``; as long as nobody else wrote to the index, lookups
+are served from memory without touching the disk beyond one ``stat``.
+Records are decoded on first use only.
+
+Writers serialize on SQLite's database lock, so concurrent builds in
+separate processes may update the same index safely.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from ..logger import logger
+
+
+INDEX_FILENAME = 'deps.sqlite'
+
+# Bump when the table layout changes; older indexes are rebuilt empty.
+INDEX_SCHEMA_VERSION = 1
+
+# Seconds a writer waits for another process to release the database lock.
+_LOCK_TIMEOUT = 60.0
+
+
+def index_file_for(obj_file: str) -> str:
+    """Return the dependency index path covering an object file."""
+    return os.path.join(os.path.dirname(os.path.abspath(obj_file)), INDEX_FILENAME)
+
+
+class DepsIndex:
+    """
+    Dependency records of the objects in one build directory.
+
+    Records are opaque text (the JSON of a ``GroupDeps``); *decode* turns one
+    into the value returned by :meth:`get` and may return None for records
+    that should be ignored (e.g. a stale format version).
+    """
+
+    def __init__(self, directory: str, decode: Callable[[str], Any]):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, INDEX_FILENAME)
+        self._decode = decode
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._conn_ino = None
+        self._data_version: Optional[int] = None
+        self._seq = 0
+        # name -> [text, decoded value, decoded?]
+        self._records: Dict[str, List[Any]] = {}
+
+    # -- connection management --------------------------------------------
+
+    def _file_identity(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _reset(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+        self._conn_pid = None
+        self._conn_ino = None
+        self._data_version = None
+        self._seq = 0
+        self._records = {}
+
+    def _connection(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Return a connection to the index, reopening it when needed.
+
+        The connection is dropped when the database file was deleted or
+        replaced (e.g. ``build/`` was wiped) and after ``fork``.
+        """
+        identity = self._file_identity()
+        if self._conn is not None and (
+            self._conn_pid != os.getpid() or identity != self._conn_ino
+        ):
+            self._reset()
+        if self._conn is not None:
+            return self._conn
+        if identity is None and not create:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, timeout=_LOCK_TIMEOUT, isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            self._ensure_schema(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        self._conn_ino = self._file_identity()
+        return conn
+
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection):
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version == INDEX_SCHEMA_VERSION:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != INDEX_SCHEMA_VERSION:
+                conn.execute('DROP TABLE IF EXISTS deps')
+                conn.execute(
+                    'CREATE TABLE deps ('
+                    'name TEXT PRIMARY KEY, seq INTEGER NOT NULL, data TEXT)'
+                )
+                conn.execute('CREATE INDEX deps_seq ON deps (seq)')
+                conn.execute(f'PRAGMA user_version = {INDEX_SCHEMA_VERSION}')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    # -- reading ----------------------------------------------------------
+
+    def _catch_up(self, conn: sqlite3.Connection):
+        """Apply rows written by other connections since the last read."""
+        rows = conn.execute(
+            'SELECT name, seq, data FROM deps WHERE seq > ? ORDER BY seq',
+            (self._seq,),
+        ).fetchall()
+        for name, seq, data in rows:
+            if data is None:
+                self._records.pop(name, None)
+            else:
+                self._records[name] = [data, None, False]
+            self._seq = max(self._seq, seq)
+        self._data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def _refresh(self) -> bool:
+        conn = self._connection(create=False)
+        if conn is None:
+            self._records = {}
+            return False
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version != self._data_version:
+            self._catch_up(conn)
+        return True
+
+    def get(self, name: str) -> Any:
+        """
+        Return the decoded record of object *name*.
+
+        Args:
+            name: Object file name (no directory)
+
+        Returns:
+            Decoded record, or None when the index has no usable record
+        """
+        with self._lock:
+            try:
+                if not self._refresh():
+                    return None
+            except sqlite3.Error as e:
+                logger.debug(f"Failed to read deps index {self.path}: {e}")
+                self._reset()
+                return None
+            entry = self._records.get(name)
+            if entry is None:
+                return None
+            if not entry[2]:
+                try:
+                    entry[1] = self._decode(entry[0])
+                except Exception as e:
+                    logger.debug(f"Ignoring invalid deps record {name} in {self.path}: {e}")
+                    entry[1] = None
+                entry[2] = True
+            return entry[1]
+
+    def names(self) -> List[str]:
+        """Return the object names that currently have a record."""
+        with self._lock:
+            try:
+                self._refresh()
+            except sqlite3.Error:
+                self._reset()
+            return sorted(self._records)
+
+    # -- writing ----------------------------------------------------------
+
+    def _write(self, name: str, data: Optional[str]):
+        with self._lock:
+            conn = self._connection(create=data is not None)
+            if conn is None:
+                return
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._catch_up(conn)
+                seq = self._seq + 1
+                conn.execute(
+                    'INSERT OR REPLACE INTO deps (name, seq, data) VALUES (?, ?, ?)',
+                    (name, seq, data),
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self._seq = seq
+            if data is None:
+                self._records.pop(name, None)
+            else:
+                self._records[name] = [data, None, False]
+
+    def put(self, name: str, data: str):
+        """
+        Store the record of object *name*.
+
+        Args:
+            name: Object file name (no directory)
+            data: Encoded record
+        """
+        self._write(name, data)
+
+    def delete(self, name: str):
+        """Drop the record of object *name* (no-op without an index)."""
+        with self._lock:
+            if name not in self._records:
+                try:
+                    self._refresh()
+                except sqlite3.Error:
+                    return
+                if name not in self._records:
+                    return
+            self._write(name, None)
+
+    def close(self):
+        """Close the connection and forget cached records."""
+        with self._lock:
+            self._reset()
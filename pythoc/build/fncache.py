@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Per-function reuse of optimized IR within a group.
+
+A group object is rebuilt as a whole whenever its content key changes, so
+editing one function used to re-optimize every function of the module.
+With ``config.function_cache`` (``PC_FUNCTION_CACHE``) enabled, each
+rebuild also keeps the optimized module as bitcode next to the object
+(``foo.o`` -> ``foo.fn.bc``) together with a per-function key
+(``foo.fn.json``).
+
+A function's key digests the unoptimized IR of everything it can reach:
+its own body, the bodies of the group functions it references
+(transitively, so inlining into it is covered), the declarations of
+functions from other groups (their signatures), the global variables it
+uses and the layouts of the named struct types involved, plus the codegen
+knobs.  On the next rebuild, exported functions whose key is unchanged are
+*reused*: they are only declared in the module handed to the optimizer
+(or kept ``available_externally`` when a recompiled function calls them,
+so it may still inline them), and their cached optimized bodies are linked
+back in before the object is emitted.  Only changed functions and the
+functions that reach them are re-optimized.
+
+Functions that reach a mutable internal global are never reused: linking
+the cached body would give it its own copy of that global.  The cache is
+off for O0 (nothing to save), debug-info builds and instrumented PGO
+builds.
+"""
+
+import collections
+import copy
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, Optional, Set
+
+from ..logger import logger
+
+
+FNCACHE_VERSION = 1
+
+_GLOBAL_REF_RE = re.compile(r'@"(?:[^"\\]|\\.)*"')
+_TYPE_REF_RE = re.compile(r'%"(?:[^"\\]|\\.)*"')
+
+
+def fncache_files_for(obj_file: str):
+    """Return the (bitcode, manifest) sidecar paths of a group object."""
+    base = os.path.splitext(obj_file)[0]
+    return base + '.fn.bc', base + '.fn.json'
+
+
+def function_cache_enabled() -> bool:
+    """Whether rebuilt groups keep and reuse per-function optimized IR."""
+    from ..config import config
+    return (
+        bool(config.function_cache)
+        and int(config.opt_level) >= 1
+        and not config.debug_info
+        and not config.pgo_generate
+    )
+
+
+class FunctionReusePlan:
+    """Keys of one group module and the functions reusable from the cache."""
+
+    def __init__(self, keys: Dict[str, str], reusable: Set[str], ir_text: str,
+                 bitcode: Optional[bytes]):
+        # Exported function name -> key over the current unoptimized IR.
+        self.keys = keys
+        # Functions whose cached optimized body is linked in.
+        self.reusable = reusable
+        # Module text to optimize (reused functions only declared).
+        self.ir_text = ir_text
+        # Cached optimized module, when anything is reused.
+        self.bitcode = bitcode
+
+
+def _context_digest(module, inline_threshold) -> str:
+    from llvmlite import binding
+    from .cache import codegen_knobs
+
+    hasher = hashlib.sha256()
+    hasher.update(f'fncache:{FNCACHE_VERSION}\0'.encode('utf-8'))
+    hasher.update(repr(binding.llvm_version_info).encode('utf-8'))
+    hasher.update(f'\0{module.triple}\0{module.data_layout}\0'.encode('utf-8'))
+    hasher.update(repr(inline_threshold).encode('utf-8'))
+    for name, value in codegen_knobs():
+        hasher.update(f'\0{name}={value}'.encode('utf-8'))
+    for name, node in module.namedmetadata.items():
+        operands = ', '.join(op.get_reference() for op in node.operands)
+        hasher.update(f'\0!{name} = !{{ {operands} }}'.encode('utf-8'))
+    for node in module.metadata:
+        hasher.update(b'\0' + str(node).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _is_mutable_local(value) -> bool:
+    from llvmlite import ir
+    return (
+        isinstance(value, ir.GlobalVariable)
+        and value.linkage in ('internal', 'private')
+        and not value.global_constant
+    )
+
+
+def _global_texts(module) -> Dict[str, str]:
+    return {value.name: str(value) for value in module.globals.values()}
+
+
+def compute_function_keys(module, inline_threshold=None, texts=None) -> Dict[str, str]:
+    """
+    Key every exported function defined in an unoptimized ``ir.Module``.
+
+    Functions reaching a mutable internal global get no key.
+
+    Args:
+        module: Unoptimized module
+        inline_threshold: Inline threshold the module is optimized with
+        texts: Printed global values of *module*, when already at hand
+
+    Returns:
+        dict: function name -> key
+    """
+    from llvmlite import ir
+
+    if texts is None:
+        texts = _global_texts(module)
+    by_ref = {value.get_reference(): value for value in module.globals.values()}
+    types = {
+        str(ty): ty.get_declaration()
+        for ty in module.get_identified_types().values()
+    }
+    refs = {}
+    for value in module.globals.values():
+        text = texts[value.name]
+        refs[value.name] = {
+            by_ref[ref].name for ref in _GLOBAL_REF_RE.findall(text)
+            if ref in by_ref and by_ref[ref] is not value
+        }
+
+    type_refs = {ref: set(_TYPE_REF_RE.findall(decl)) for ref, decl in types.items()}
+    digests = {}
+
+    def node_digest(name):
+        digest = digests.get(name)
+        if digest is None:
+            text = texts[name]
+            seen_types = set()
+            stack = [ref for ref in _TYPE_REF_RE.findall(text) if ref in types]
+            while stack:
+                ref = stack.pop()
+                if ref in seen_types:
+                    continue
+                seen_types.add(ref)
+                stack.extend(r for r in type_refs[ref] if r in types)
+            hasher = hashlib.sha256(text.encode('utf-8'))
+            for ref in sorted(seen_types):
+                hasher.update(b'\0' + types[ref].encode('utf-8'))
+            digest = digests[name] = hasher.hexdigest()
+        return digest
+
+    context = _context_digest(module, inline_threshold)
+    keys = {}
+    for value in module.globals.values():
+        if not isinstance(value, ir.Function) or value.is_declaration:
+            continue
+        if value.linkage not in ('', 'external'):
+            continue
+        closure = set()
+        stack = [value.name]
+        while stack:
+            name = stack.pop()
+            if name in closure:
+                continue
+            closure.add(name)
+            stack.extend(refs[name])
+        if any(_is_mutable_local(module.globals[name]) for name in closure):
+            continue
+        hasher = hashlib.sha256(context.encode('utf-8'))
+        for name in sorted(closure):
+            hasher.update(f'\0{name}\0{node_digest(name)}'.encode('utf-8'))
+        keys[value.name] = hasher.hexdigest()[:32]
+    return keys
+
+
+def _load_cache(obj_file: str):
+    bc_file, manifest_file = fncache_files_for(obj_file)
+    try:
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != FNCACHE_VERSION:
+            return None, None
+        with open(bc_file, 'rb') as f:
+            bitcode = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if hashlib.sha256(bitcode).hexdigest() != manifest.get('bitcode'):
+        return None, None
+    return manifest.get('functions', {}), bitcode
+
+
+def _module_text(module, reusable: Set[str], inline_into: Set[str]) -> str:
+    """Print *module* with reused functions declared or available_externally.
+
+    The printed module is a shallow copy of *module* whose globals map has
+    the reused functions replaced by stubs; *module* itself is unchanged.
+    """
+    if not reusable:
+        return str(module)
+    stubbed = copy.copy(module)
+    stubbed.globals = collections.OrderedDict()
+    for name, value in module.globals.items():
+        if name in reusable:
+            value = copy.copy(value)
+            if name in inline_into:
+                value.linkage = 'available_externally'
+            else:
+                value.blocks = []
+                value.metadata = {}
+        stubbed.globals[name] = value
+    return str(stubbed)
+
+
+def plan_function_reuse(module, obj_file: str, inline_threshold=None) -> FunctionReusePlan:
+    """
+    Decide which functions of a group module can reuse cached optimized IR.
+
+    Args:
+        module: Unoptimized ``ir.Module`` of the group
+        obj_file: Group object whose sidecars hold the cache
+        inline_threshold: Inline threshold the module is optimized with
+
+    Returns:
+        FunctionReusePlan (nothing reusable when the cache is cold)
+    """
+    texts = _global_texts(module)
+    keys = compute_function_keys(module, inline_threshold, texts)
+    cached, bitcode = _load_cache(obj_file)
+    reusable = {
+        name for name, key in keys.items()
+        if cached is not None and cached.get(name) == key
+    }
+    if not reusable:
+        return FunctionReusePlan(
+            keys, set(), _module_text(module, set(), set()), None,
+        )
+
+    # Reused functions referenced by recompiled ones stay inlinable.
+    reusable_refs = {
+        module.globals[name].get_reference(): name for name in reusable
+    }
+    inline_into = set()
+    for value in module.globals.values():
+        if value.name in reusable or not getattr(value, 'blocks', None):
+            continue
+        for ref in _GLOBAL_REF_RE.findall(texts[value.name]):
+            if ref in reusable_refs:
+                inline_into.add(reusable_refs[ref])
+    logger.debug(
+        f"Reusing {len(reusable)}/{len(keys)} optimized functions for {obj_file}"
+    )
+    return FunctionReusePlan(
+        keys, reusable, _module_text(module, reusable, inline_into), bitcode,
+    )
+
+
+def link_reused_functions(llvm_module, bitcode: bytes, reusable: Iterable[str]):
+    """
+    Link the cached optimized bodies of *reusable* into *llvm_module*.
+
+    Every other exported definition of the cached module is demoted to
+    ``available_externally`` (the fresh definitions win), and whatever the
+    reused functions do not reference is dropped before linking.
+    """
+    from llvmlite import binding
+    from ..compiler import LLVMCompiler
+
+    reusable = set(reusable)
+    cached = binding.parse_bitcode(bitcode)
+    for value in list(cached.functions) + list(cached.global_variables):
+        if value.is_declaration or value.name in reusable:
+            continue
+        if value.linkage.name in ('internal', 'private'):
+            continue
+        value.linkage = 'available_externally'
+    LLVMCompiler.drop_unreferenced_globals(cached)
+    llvm_module.link_in(cached)
+    llvm_module.verify()
+
+
+def store_function_cache(obj_file: str, keys: Dict[str, str], bitcode: bytes):
+    """Write the optimized module's bitcode and the keys of its functions.
+
+    Every keyed function is an external definition, which optimization
+    keeps, so all of *keys* are recorded.
+    """
+    from .output_manager import _atomic_replace
+
+    bc_file, manifest_file = fncache_files_for(obj_file)
+    manifest = {
+        'version': FNCACHE_VERSION,
+        'bitcode': hashlib.sha256(bitcode).hexdigest(),
+        'functions': dict(sorted(keys.items())),
+    }
+    tmp_suffix = '.tmp.' + str(os.getpid())
+    # Bitcode first, manifest last: the manifest names the bitcode digest.
+    with open(bc_file + tmp_suffix, 'wb') as f:
+        f.write(bitcode)
+    _atomic_replace(bc_file + tmp_suffix, bc_file)
+    with open(manifest_file + tmp_suffix, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    _atomic_replace(manifest_file + tmp_suffix, manifest_file)
+
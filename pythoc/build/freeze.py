@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Ahead-of-time freezing of a pythoc program.
+
+``python -m pythoc freeze app.py`` runs the registration phase of
+``app.py`` (its module body, with ``__name__`` set so that a
+``if __name__ == "__main__":`` block is skipped), flushes every group,
+links the shared libraries and writes a self-contained bundle directory::
+
+    app_frozen/
+        __init__.py      copy of pythoc.build.frozen_runtime
+        manifest.json    libraries in load order, functions and signatures
+        lib/...          the group shared libraries (build/ layout)
+
+A deployed service imports the bundle and calls the functions through
+ctypes directly: no llvmlite, no source parsing and no compilation.  The
+manifest records, per ``@compile`` function, the library and symbol it lives
+in and its ctypes signature, derived from the pythoc types exactly as
+:class:`MultiSOExecutor` does.  Templates are not frozen (they have no
+symbol until instantiated); functions whose ctypes signature cannot be
+described are skipped with a warning.
+
+Group libraries reference each other through symbols resolved when they are
+loaded ``RTLD_GLOBAL`` in dependency order, which is how the bundle loader
+loads them too.  Libraries named by ``@extern(lib=...)``/``cimport`` are
+recorded and loaded by name (``ctypes.util.find_library``) on the target.
+"""
+
+import ctypes
+import json
+import os
+import platform
+import runpy
+import shutil
+import sys
+from typing import Any, Dict, List, Optional
+
+from ..logger import logger
+from .frozen_runtime import FORMAT_VERSION, MANIFEST_FILE
+
+
+class FreezeError(Exception):
+    """Raised when a program cannot be frozen."""
+
+
+_BUILD_ROOT = 'build'
+_LIB_DIR = 'lib'
+
+
+def encode_ctype(ctype, _active=None) -> Any:
+    """
+    Describe a ctypes type for the bundle manifest.
+
+    Args:
+        ctype: ctypes type (or None for void / dropped parameters)
+
+    Returns:
+        JSON-serializable descriptor read by ``frozen_runtime.decode_ctype``
+
+    Raises:
+        FreezeError: for types the manifest cannot describe
+    """
+    if ctype is None:
+        return None
+    if not isinstance(ctype, type):
+        raise FreezeError(f"Not a ctypes type: {ctype!r}")
+    if issubclass(ctype, ctypes._SimpleCData):
+        if getattr(ctypes, ctype.__name__, None) is not ctype:
+            raise FreezeError(f"Unsupported ctypes type {ctype.__name__}")
+        return ctype.__name__
+    active = _active if _active is not None else set()
+    if ctype in active:
+        raise FreezeError(f"Recursive ctypes type {ctype.__name__}")
+    active.add(ctype)
+    try:
+        if issubclass(ctype, ctypes.Array):
+            return {'array': encode_ctype(ctype._type_, active), 'length': ctype._length_}
+        if issubclass(ctype, ctypes._Pointer):
+            return {'pointer': encode_ctype(ctype._type_, active)}
+        if issubclass(ctype, ctypes._CFuncPtr):
+            return {
+                'cfunc': encode_ctype(ctype._restype_, active),
+                'args': [encode_ctype(arg, active) for arg in ctype._argtypes_],
+            }
+        if issubclass(ctype, (ctypes.Structure, ctypes.Union)):
+            fields = []
+            for field in ctype._fields_:
+                if len(field) != 2:
+                    raise FreezeError(f"Bit fields of {ctype.__name__} are not supported")
+                fields.append([field[0], encode_ctype(field[1], active)])
+            kind = 'struct' if issubclass(ctype, ctypes.Structure) else 'union'
+            desc = {kind: fields, 'name': ctype.__name__}
+            if getattr(ctype, '_pack_', 0):
+                desc['pack'] = ctype._pack_
+            return desc
+    finally:
+        active.discard(ctype)
+    raise FreezeError(f"Unsupported ctypes type {ctype.__name__}")
+
+
+def _library_id(so_file: str) -> str:
+    """Bundle-relative path of a group library (``build/a/b.so`` -> ``lib/a/b.so``)."""
+    rel = os.path.relpath(so_file, _BUILD_ROOT)
+    if rel.startswith(os.pardir):
+        rel = os.path.basename(so_file)
+    return '/'.join([_LIB_DIR] + rel.split(os.sep))
+
+
+def _function_key(library: str, symbol: str) -> str:
+    stem = os.path.splitext(library[len(_LIB_DIR) + 1:])[0]
+    return f"{stem}:{symbol}"
+
+
+def _run_registration(app_file: str):
+    """Execute the module body of *app_file* like ``python app.py`` would,
+    except for its ``__main__`` block."""
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+    sys.argv = [app_file]
+    sys.path.insert(0, os.path.dirname(app_file))
+    try:
+        runpy.run_path(app_file, run_name='__pythoc_freeze__')
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+
+
+def _frozen_wrappers():
+    """Yield (group, wrapper) for every non-template @compile function."""
+    from .output_manager import get_output_manager
+
+    for group in list(get_output_manager().get_all_groups().values()):
+        if group.get('jit'):
+            continue  # @jit code has no library to ship.
+        for wrapper in group.get('all_wrappers') or group.get('wrappers') or []:
+            state = getattr(wrapper, '_state', None)
+            if state is None or state.is_template or not state.so_file:
+                continue
+            if getattr(wrapper, '_func_info', None) is None:
+                continue
+            yield group, wrapper
+
+
+def build_manifest(app_file: str) -> Dict[str, Any]:
+    """
+    Link every group of the current process and describe the bundle.
+
+    The groups must already be flushed.
+
+    Args:
+        app_file: Frozen program, recorded in the manifest
+
+    Returns:
+        dict: manifest (library paths are bundle-relative; ``sources`` maps
+        them back to the build tree)
+    """
+    from ..native_executor import get_multi_so_executor
+    from ..utils.link_utils import get_shared_lib_extension
+    from .deps import get_dependency_tracker
+
+    executor = get_multi_so_executor()
+    tracker = get_dependency_tracker()
+
+    load_order: List[str] = []
+    linked = set()
+    functions: Dict[str, Dict[str, Any]] = {}
+    for group, wrapper in _frozen_wrappers():
+        so_file = group['so_file']
+        if so_file not in linked:
+            linked.add(so_file)
+            dependencies, _relinked = executor.link_shared_library(
+                group['source_file'], so_file,
+            )
+            for lib in executor.library_load_order(so_file, dependencies):
+                if lib not in load_order and os.path.exists(lib):
+                    load_order.append(lib)
+
+        state = wrapper._state
+        symbol = state.actual_func_name or state.original_name
+        signature = executor.get_native_signature(wrapper)
+        if signature is None:
+            logger.warning(f"freeze: skipping {symbol}: no signature")
+            continue
+        restype, argtypes, _ = signature
+        try:
+            entry = {
+                'name': state.original_name,
+                'library': _library_id(so_file),
+                'symbol': symbol,
+                'restype': encode_ctype(restype),
+                'argtypes': [encode_ctype(ctype) for ctype in argtypes],
+            }
+        except FreezeError as e:
+            logger.warning(f"freeze: skipping {symbol}: {e}")
+            continue
+        functions[_function_key(entry['library'], symbol)] = entry
+
+    link_libraries: List[str] = []
+    lib_ext = get_shared_lib_extension()
+    for so_file in load_order:
+        deps = tracker.load_deps(so_file.replace(lib_ext, '.o'))
+        for lib in (deps.link_libraries if deps else ()):
+            if lib not in link_libraries:
+                link_libraries.append(lib)
+
+    names: Dict[str, List[str]] = {}
+    for key, entry in sorted(functions.items()):
+        names.setdefault(entry['name'], []).append(key)
+
+    return {
+        'version': FORMAT_VERSION,
+        'app': os.path.basename(app_file),
+        'platform': {'system': sys.platform, 'machine': platform.machine()},
+        'libraries': [_library_id(so_file) for so_file in load_order],
+        'sources': {_library_id(so_file): so_file for so_file in load_order},
+        'link_libraries': link_libraries,
+        'functions': functions,
+        'names': names,
+    }
+
+
+def write_bundle(manifest: Dict[str, Any], out_dir: str):
+    """Copy the libraries and the loader into *out_dir* and write the manifest."""
+    from . import frozen_runtime
+
+    if os.path.isdir(out_dir) and os.listdir(out_dir):
+        if not os.path.exists(os.path.join(out_dir, MANIFEST_FILE)):
+            raise FreezeError(f"{out_dir} exists and is not a frozen bundle")
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    sources = manifest.pop('sources')
+    for library in manifest['libraries']:
+        dest = os.path.join(out_dir, *library.split('/'))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copy2(sources[library], dest)
+    shutil.copyfile(frozen_runtime.__file__, os.path.join(out_dir, '__init__.py'))
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def freeze(app_file: str, out_dir: Optional[str] = None) -> str:
+    """
+    Freeze a pythoc program into a bundle directory.
+
+    Args:
+        app_file: Program whose module body registers the functions
+        out_dir: Bundle directory; defaults to ``<app>_frozen`` in the
+            current directory, importable as a package of that name
+
+    Returns:
+        str: the bundle directory
+    """
+    from .output_manager import flush_all_pending_outputs
+
+    app_file = os.path.abspath(app_file)
+    if not os.path.isfile(app_file):
+        raise FreezeError(f"No such file: {app_file}")
+    if out_dir is None:
+        out_dir = os.path.splitext(os.path.basename(app_file))[0] + '_frozen'
+
+    _run_registration(app_file)
+    flush_all_pending_outputs()
+    manifest = build_manifest(app_file)
+    if not manifest['functions']:
+        raise FreezeError(f"{app_file} defines no @compile functions to freeze")
+    write_bundle(manifest, out_dir)
+    logger.debug(
+        f"Froze {len(manifest['functions'])} functions in "
+        f"{len(manifest['libraries'])} libraries into {out_dir}"
+    )
+    return out_dir
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Loader for frozen pythoc bundles.
+
+``python -m pythoc freeze app.py`` (see :mod:`pythoc.build.freeze`) writes a
+directory holding the app's shared libraries, a ``manifest.json`` and a copy
+of this file as ``__init__.py``.  Importing that directory as a package
+loads the libraries with ``ctypes`` and exposes the compiled functions as
+attributes::
+
+    import app_frozen
+    app_frozen.add(1, 2)
+
+This module only uses the standard library: a deployed bundle needs neither
+pythoc nor llvmlite.  Arguments are passed straight to ctypes and results
+are returned as ctypes produces them (Python numbers for scalars, ctypes
+instances for structs and arrays).
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import platform
+import sys
+import threading
+
+
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 1
+
+
+class FrozenBundleError(Exception):
+    """Raised when a frozen bundle cannot be loaded or has no such function."""
+
+
+# Descriptor JSON -> ctypes type, so that every function taking or returning
+# the same struct shares one ctypes class.
+_decoded_ctypes = {}
+
+
+def decode_ctype(desc):
+    """
+    Rebuild a ctypes type from its manifest descriptor.
+
+    Args:
+        desc: None, the name of a ``ctypes`` simple type, or a dict with one
+            of the keys ``pointer``, ``array``, ``struct``, ``union``,
+            ``cfunc``
+
+    Returns:
+        ctypes type, or None for ``void`` / dropped parameters
+    """
+    if desc is None:
+        return None
+    if isinstance(desc, str):
+        ctype = getattr(ctypes, desc, None)
+        if ctype is None:
+            raise FrozenBundleError(f"Unknown ctypes type {desc!r}")
+        return ctype
+    key = json.dumps(desc, sort_keys=True)
+    ctype = _decoded_ctypes.get(key)
+    if ctype is None:
+        ctype = _decoded_ctypes[key] = _decode_compound(desc)
+    return ctype
+
+
+def _decode_compound(desc):
+    if 'pointer' in desc:
+        return ctypes.POINTER(decode_ctype(desc['pointer']))
+    if 'array' in desc:
+        return decode_ctype(desc['array']) * desc['length']
+    if 'cfunc' in desc:
+        restype = decode_ctype(desc['cfunc'])
+        return ctypes.CFUNCTYPE(restype, *[decode_ctype(a) for a in desc['args']])
+    kind = 'struct' if 'struct' in desc else 'union'
+    base = ctypes.Structure if kind == 'struct' else ctypes.Union
+    namespace = {
+        '_fields_': [(name, decode_ctype(field)) for name, field in desc[kind]],
+    }
+    if desc.get('pack'):
+        namespace['_pack_'] = desc['pack']
+    return type(desc.get('name') or 'FrozenStruct', (base,), namespace)
+
+
+def _load_mode():
+    if hasattr(os, 'RTLD_LAZY') and hasattr(os, 'RTLD_GLOBAL'):
+        return os.RTLD_LAZY | os.RTLD_GLOBAL
+    return getattr(ctypes, 'RTLD_GLOBAL', 0)
+
+
+class FrozenBundle:
+    """The shared libraries and function table of one frozen bundle."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        manifest_file = os.path.join(self.path, MANIFEST_FILE)
+        try:
+            with open(manifest_file, 'r') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise FrozenBundleError(f"Cannot read {manifest_file}: {e}")
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise FrozenBundleError(
+                f"{manifest_file} has format version {self.manifest.get('version')}, "
+                f"expected {FORMAT_VERSION}"
+            )
+        target = self.manifest.get('platform', {})
+        if (target.get('system') != sys.platform
+                or target.get('machine') != platform.machine()):
+            raise FrozenBundleError(
+                f"Bundle was frozen for {target.get('system')}/{target.get('machine')}, "
+                f"this is {sys.platform}/{platform.machine()}"
+            )
+
+        self._lock = threading.Lock()
+        self._functions = {}
+        self._libs = {}
+        self._dll_dir_handles = []
+        self._load_libraries()
+
+    def _load_libraries(self):
+        mode = _load_mode()
+        for name in self.manifest.get('link_libraries', []):
+            found = ctypes.util.find_library(name)
+            if found is None:
+                continue  # Already part of the process (libc, libm, ...).
+            ctypes.CDLL(found, mode=mode)
+
+        libs = [os.path.join(self.path, rel) for rel in self.manifest['libraries']]
+        if sys.platform == 'win32' and hasattr(os, 'add_dll_directory'):
+            for lib_dir in sorted({os.path.dirname(lib) for lib in libs}):
+                self._dll_dir_handles.append(os.add_dll_directory(lib_dir))
+
+        # Dependencies come first; a library whose peers close a cycle may
+        # only load once they are all in, hence the retry pass.
+        failed = []
+        for rel, lib in zip(self.manifest['libraries'], libs):
+            try:
+                self._libs[rel] = ctypes.CDLL(lib, mode=mode)
+            except OSError:
+                failed.append((rel, lib))
+        for rel, lib in failed:
+            try:
+                self._libs[rel] = ctypes.CDLL(lib, mode=mode)
+            except OSError as e:
+                raise FrozenBundleError(f"Cannot load {lib}: {e}")
+
+    def names(self):
+        """Return the keys of every function in the bundle."""
+        return sorted(self.manifest['functions'])
+
+    def _resolve_key(self, name):
+        functions = self.manifest['functions']
+        if name in functions:
+            return name
+        matches = self.manifest.get('names', {}).get(name)
+        if not matches:
+            raise FrozenBundleError(f"No function {name!r} in bundle {self.path}")
+        if len(matches) > 1:
+            raise FrozenBundleError(
+                f"Function name {name!r} is ambiguous, use one of: {', '.join(matches)}"
+            )
+        return matches[0]
+
+    def function(self, name):
+        """
+        Return a Python callable for a frozen function.
+
+        Args:
+            name: Function name, or ``"<library>:<symbol>"`` when the name
+                is defined by several groups
+
+        Returns:
+            callable taking the function's parameters in order
+        """
+        with self._lock:
+            fn = self._functions.get(name)
+            if fn is None:
+                fn = self._bind(self._resolve_key(name))
+                self._functions[name] = fn
+            return fn
+
+    __getitem__ = function
+
+    def _bind(self, key):
+        entry = self.manifest['functions'][key]
+        native = getattr(self._libs[entry['library']], entry['symbol'])
+        argtypes = [decode_ctype(desc) for desc in entry['argtypes']]
+        # Zero-size parameters (linear tokens, ...) have no native slot.
+        keep = [i for i, ctype in enumerate(argtypes) if ctype is not None]
+        native.argtypes = [argtypes[i] for i in keep]
+        native.restype = decode_ctype(entry['restype'])
+        if len(keep) == len(argtypes):
+            return native
+
+        def call(*args):
+            return native(*[args[i] for i in keep if i < len(args)])
+        call.__name__ = entry['symbol']
+        return call
+
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+
+def load(path=None):
+    """
+    Load a frozen bundle.
+
+    Args:
+        path: Bundle directory; defaults to the directory of this file
+
+    Returns:
+        FrozenBundle
+    """
+    global _bundle
+    if path is not None:
+        return FrozenBundle(path)
+    with _bundle_lock:
+        if _bundle is None:
+            _bundle = FrozenBundle(os.path.dirname(os.path.abspath(__file__)))
+        return _bundle
+
+
+def __getattr__(name):
+    # Only a copy inside a bundle directory has a manifest next to it.
+    here = os.path.dirname(os.path.abspath(__file__))
+    if name.startswith('__') or not os.path.exists(os.path.join(here, MANIFEST_FILE)):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        return load().function(name)
+    except FrozenBundleError as e:
+        raise AttributeError(str(e)) from None
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Cross-group link-time optimization for pythoc.
+
+With ``config.lto`` (``PC_LTO``) enabled, every group also writes its
+optimized module as LLVM bitcode next to the object (``foo.o`` ->
+``foo.bc``).  When an executable or shared library is linked, the bitcode
+of the selected objects is merged into one module, symbols that are not
+exported are internalized, and the whole program is optimized and emitted
+as a single object.  That lets the inliner and global DCE work across group
+boundaries, which per-group objects cannot offer.
+
+Objects without bitcode (cimport objects, groups compiled before LTO was
+enabled) are linked natively next to the LTO object.  Because such objects
+may reference any pythoc symbol, internalization is only applied when every
+input carries bitcode.
+"""
+
+import json
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from ..logger import logger
+
+
+def bitcode_file_for(obj_file: str) -> str:
+    """Return the bitcode sidecar path of a group object."""
+    return os.path.splitext(obj_file)[0] + '.bc'
+
+
+def _split_bitcode_inputs(obj_files: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Split objects into (bitcode files, native-only objects).
+
+    A sidecar older than its object is stale (the object was rebuilt without
+    LTO) and is ignored.
+    """
+    bitcode_files = []
+    native_objs = []
+    for obj_file in obj_files:
+        bc_file = bitcode_file_for(obj_file)
+        try:
+            fresh = os.path.getmtime(bc_file) >= os.path.getmtime(obj_file)
+        except OSError:
+            fresh = False
+        if fresh:
+            bitcode_files.append(bc_file)
+        else:
+            native_objs.append(obj_file)
+    return bitcode_files, native_objs
+
+
+def _lto_object_uptodate(lto_obj: str, manifest: dict) -> bool:
+    """Check an LTO object was built from the same inputs and is newer."""
+    try:
+        with open(lto_obj + '.json', 'r') as f:
+            if json.load(f) != manifest:
+                return False
+        lto_mtime = os.path.getmtime(lto_obj)
+        return all(os.path.getmtime(p) <= lto_mtime for p in manifest['inputs'])
+    except (OSError, ValueError):
+        return False
+
+
+def link_bitcode_module(bitcode_files: List[str]):
+    """Parse and link bitcode files into one binding ModuleRef."""
+    from llvmlite import binding
+
+    merged = None
+    for bc_file in bitcode_files:
+        with open(bc_file, 'rb') as f:
+            module = binding.parse_bitcode(f.read())
+        if merged is None:
+            merged = module
+        else:
+            merged.link_in(module)
+    return merged
+
+
+def internalize(llvm_module, preserve_symbols: Iterable[str]) -> int:
+    """
+    Give every definition outside *preserve_symbols* internal linkage.
+
+    Returns:
+        int: Number of internalized definitions
+    """
+    preserve = set(preserve_symbols)
+    count = 0
+    for value in list(llvm_module.functions) + list(llvm_module.global_variables):
+        if value.is_declaration or value.name in preserve:
+            continue
+        if value.name.startswith('llvm.'):
+            continue
+        if value.linkage.name in ('internal', 'private'):
+            continue
+        value.linkage = 'internal'
+        count += 1
+    return count
+
+
+def lto_link_objects(
+    obj_files: List[str],
+    output_obj: str,
+    preserve_symbols: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """
+    Replace the bitcode-carrying objects of a link with one LTO object.
+
+    Args:
+        obj_files: Objects selected for the link
+        output_obj: Path of the merged, whole-program optimized object
+        preserve_symbols: Symbols the linked artifact exports; all other
+            definitions are internalized when every input has bitcode.
+            None keeps the original linkage.
+
+    Returns:
+        List[str]: Objects to hand to the linker instead of *obj_files*
+    """
+    from ..compiler import LLVMCompiler, target_machine_options
+    from ..config import config
+    from .output_manager import _atomic_replace
+
+    bitcode_files, native_objs = _split_bitcode_inputs(obj_files)
+    if not bitcode_files:
+        return list(obj_files)
+
+    opt_level = max(int(config.opt_level), 2)
+    preserve = None
+    if preserve_symbols is not None and not native_objs:
+        preserve = sorted(set(preserve_symbols))
+    manifest = {
+        'inputs': bitcode_files,
+        'preserve': preserve,
+        'opt_level': opt_level,
+        'target': target_machine_options(),
+        'vectorize': bool(config.vectorize),
+    }
+    if _lto_object_uptodate(output_obj, manifest):
+        logger.debug(f"LTO object is up to date: {output_obj}")
+        return [output_obj] + native_objs
+
+    llvm_module = link_bitcode_module(bitcode_files)
+    if preserve is not None:
+        internalize(llvm_module, preserve)
+    llvm_module.verify()
+    LLVMCompiler.optimize_whole_program(llvm_module, opt_level)
+    obj_bytes = LLVMCompiler.emit_object(llvm_module)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_obj)), exist_ok=True)
+    tmp_suffix = '.tmp.' + str(os.getpid())
+    with open(output_obj + tmp_suffix, 'wb') as f:
+        f.write(obj_bytes)
+    _atomic_replace(output_obj + tmp_suffix, output_obj)
+    with open(output_obj + '.json' + tmp_suffix, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    _atomic_replace(output_obj + '.json' + tmp_suffix, output_obj + '.json')
+
+    logger.debug(
+        f"LTO merged {len(bitcode_files)} module(s) into {output_obj}"
+        f" ({len(native_objs)} native object(s) linked as-is)"
+    )
+    return [output_obj] + native_objs
@@ -1,9 +1,11 @@
 import os
 import sys
 import atexit
+import hashlib
 import threading
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Any, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from ..utils.link_utils import file_lock
 from .deps import get_dependency_tracker, GroupKey
 
@@ -27,6 +29,21 @@ def _atomic_replace(src: str, dst: str):
     os.replace(src, dst)
 
 
+def _object_build_workers(executor: str) -> int:
+    """Number of object build workers for a flush.
+
+    ``PC_OBJECT_BUILD_WORKERS`` when set; otherwise one per CPU for the
+    process executor, whose workers exist to spread the back end over
+    cores, and 1 for threads.
+    """
+    workers = os.environ.get('PC_OBJECT_BUILD_WORKERS')
+    if workers:
+        return int(workers)
+    if executor == 'process':
+        return os.cpu_count() or 1
+    return 1
+
+
 @dataclass
 class _CompileIteration:
     """One scheduler-visible slice of group compilation work."""
@@ -41,6 +58,7 @@ class _CompileResult:
 
     compiled_count: int = 0
     compiled_symbols: Set[str] = field(default_factory=set)
+    function_hashes: Dict[str, str] = field(default_factory=dict)
 
 
 @dataclass
@@ -110,6 +128,14 @@ class OutputManager:
         # Effect specialization graph — replaces BFS-based planning deps.
         from ..effect_graph import EffectGraph
         self._effect_graph = EffectGraph()
+
+        # Set when an object was published to the shared cache during the
+        # current flush; eviction runs once the scheduler is done.
+        self._shared_cache_published = False
+
+        # Validated binding snapshots: group_key -> GroupDeps (or None when
+        # the group's object is stale or has no snapshot).
+        self._binding_snapshots = {}
     
     def _next_group_object_task_id(self, group_key):
         """Return a unique scheduler task id for one group-object attempt."""
@@ -160,7 +186,7 @@ class OutputManager:
         )
 
     def get_or_create_group(self, group_key, compiler, ir_file, obj_file, so_file, 
-                           source_file):
+                           source_file, jit=False):
         """
         Get existing group or create a new one.
         
@@ -171,9 +197,12 @@ class OutputManager:
             obj_file: Path to output .o file
             so_file: Path to output .so file
             source_file: Original source file path
+            jit: Build the group into the in-process JIT; its paths are
+                then never written
         
         Returns:
             dict: Group info with keys: compiler, wrappers, ir_file, obj_file, so_file, source_file
+            (and ``jit`` for JIT groups)
         """
         with self._state_lock:
             # Reject if group already flushed — groups are immutable after flush.
@@ -192,6 +221,8 @@ class OutputManager:
                     'obj_file': obj_file,
                     'so_file': so_file,
                 }
+                if jit:
+                    group['jit'] = True
                 self._pending_groups[group_key] = group
                 self._all_groups[group_key] = group
             
@@ -293,6 +324,16 @@ class OutputManager:
             for _, func_info in pending
         }
 
+    def _get_pending_function_hashes(self, group_key):
+        """Return normalized AST digests of the currently pending defs."""
+        with self._state_lock:
+            pending = list(self._pending_compilations.get(group_key, []))
+        return {
+            func_info.mangled_name or func_info.name: func_info.ast_hash
+            for _, func_info in pending
+            if getattr(func_info, 'ast_hash', None)
+        }
+
     def _get_cached_compiled_symbols(self, group_key, group):
         """Load the compiled symbol set for a group's current object file."""
         compiled_symbols = group.get('compiled_symbols')
@@ -353,23 +394,6 @@ class OutputManager:
                         )
                         return False
 
-        # Changing debug_info settings must invalidate cached objects, otherwise
-        # a previously-built object without DWARF would be reused after enabling
-        # PC_DEBUG_INFO (and vice versa).
-        obj_file = group.get('obj_file')
-        if obj_file:
-            from .deps import get_dependency_tracker
-            from ..config import config
-            dep_tracker = get_dependency_tracker()
-            cached_deps = dep_tracker.load_deps(obj_file)
-            if cached_deps and cached_deps.debug_info != bool(config.debug_info):
-                from ..logger import logger
-                logger.debug(
-                    f"Cache miss for {group_key}: debug_info changed "
-                    f"({cached_deps.debug_info} -> {config.debug_info})"
-                )
-                return False
-
         if not self._cached_dependency_outputs_exist(group):
             return False
 
@@ -393,7 +417,7 @@ class OutputManager:
         cwd = os.getcwd()
 
         for group_dep in deps.group_dependencies:
-            # source_embed deps are validated by mtime, not output existence
+            # source_embed deps are validated by content key, not output existence
             # (an inlined-only module may emit no object of its own).
             if getattr(group_dep, 'dependency_type', None) == "source_embed":
                 continue
@@ -537,14 +561,15 @@ class OutputManager:
         for callback, _func_info in cached:
             callback(scratch)
 
-        if not scratch.verify_module():
+        llvm_module = scratch.parse_module()
+        if llvm_module is None:
             raise RuntimeError(
                 f"in-memory IR materialisation failed verification "
                 f"for group {group_key!r}"
             )
 
         from ..config import config
-        scratch.optimize_module(optimization_level=int(config.opt_level))
+        scratch.optimize_module(int(config.opt_level), llvm_module)
         return scratch.get_ir()
 
     def _drain_next_compile_iteration(self, group_key, compiled_funcs) -> _CompileIteration:
@@ -680,6 +705,10 @@ class OutputManager:
             _it_count = len(iteration.items)
             result.compiled_count += _it_count
             result.compiled_symbols |= iteration.symbols
+            for _callback, func_info in iteration.items:
+                ast_hash = getattr(func_info, 'ast_hash', None)
+                if ast_hash:
+                    result.function_hashes[func_info.mangled_name or func_info.name] = ast_hash
 
             self._prepare_compile_iteration(compiler, iteration)
             self._compile_iteration_bodies(compiler, iteration)
@@ -703,50 +732,157 @@ class OutputManager:
     
     def _group_object_cache_hit(self, group_key, group) -> bool:
         """Return whether the current object artifact covers pending work."""
+        return (
+            not group.get('jit')
+            and bool(group.get('source_file'))
+            and self._cached_content_key_matches(group_key, group)
+            and self._cached_object_covers_pending_symbols(group_key, group)
+        )
+
+    def _locked_group_object_cache_hit(self, group_key, group) -> bool:
+        """Cache check run under the group's file lock.
+
+        On a local miss the object is looked up in the shared cache
+        (``config.cache_dir``).  A restored object must still pass the
+        regular local check; otherwise it is removed again so that no later
+        check can mistake it for a local build.
+        """
+        if self._group_object_cache_hit(group_key, group):
+            return True
+        if group.get('jit') or not self._restore_shared_object(group_key, group):
+            return False
+        if self._group_object_cache_hit(group_key, group):
+            return True
         from .cache import BuildCache
+        BuildCache.invalidate_obj(group['obj_file'])
+        return False
+
+    def _restore_shared_object(self, group_key, group) -> bool:
+        """Copy a matching shared-cache entry into the local build tree."""
+        from .shared_cache import get_shared_object_cache
+        from ..logger import logger
 
+        cache = get_shared_object_cache()
         source_file = group.get('source_file')
+        obj_file = group.get('obj_file')
+        if cache is None or not source_file or not obj_file:
+            return False
+
+        hit = cache.lookup(group_key, source_file)
+        if hit is None:
+            return False
+        shared_obj, deps = hit
+
+        import shutil
+        tmp_obj = obj_file + '.tmp.' + str(os.getpid())
+        try:
+            shutil.copyfile(shared_obj, tmp_obj)
+            _atomic_replace(tmp_obj, obj_file)
+            self._restore_shared_bitcode(shared_obj, obj_file)
+            get_dependency_tracker().write_deps(deps, obj_file)
+        except OSError as e:
+            logger.debug(f"Failed to restore {obj_file} from shared cache: {e}")
+            if os.path.exists(tmp_obj):
+                os.remove(tmp_obj)
+            return False
+        logger.debug(f"Restored {obj_file} from shared cache")
+        return True
+
+    def _restore_shared_bitcode(self, shared_obj, obj_file):
+        """Copy the LTO bitcode sidecar of a shared-cache entry, if any."""
+        from .lto import bitcode_file_for
+        from .cache import BuildCache
+        import shutil
+
+        shared_bc = bitcode_file_for(shared_obj)
+        bc_file = bitcode_file_for(obj_file)
+        if not os.path.exists(shared_bc):
+            BuildCache._delete_files(bc_file)
+            return
+        tmp_bc = bc_file + '.tmp.' + str(os.getpid())
+        shutil.copyfile(shared_bc, tmp_bc)
+        _atomic_replace(tmp_bc, bc_file)
+
+    def _publish_shared_object(self, group_key, group):
+        """Publish a freshly written object and its deps to the shared cache."""
+        from .shared_cache import get_shared_object_cache
+
+        from ..config import config
+
+        cache = get_shared_object_cache()
+        # Instrumented objects are tied to this build's profile sidecars.
+        if cache is None or config.pgo_generate:
+            return
         obj_file = group['obj_file']
-        return (
-            bool(source_file)
-            and BuildCache.check_obj_uptodate(obj_file, source_file)
-            and self._cached_source_embed_deps_uptodate(group)
-            and self._cached_object_covers_pending_symbols(group_key, group)
+        deps = get_dependency_tracker().load_deps(obj_file)
+        if deps and cache.publish(group_key, group['source_file'], obj_file, deps):
+            with self._state_lock:
+                self._shared_cache_published = True
+
+    def _evict_shared_cache(self):
+        """Trim the shared cache to ``config.cache_max_size`` after publishing."""
+        with self._state_lock:
+            published = self._shared_cache_published
+            self._shared_cache_published = False
+        if not published:
+            return
+
+        from .shared_cache import get_shared_object_cache
+        from ..config import config
+
+        cache = get_shared_object_cache()
+        if cache is not None:
+            cache.evict(int(config.cache_max_size) * 1024 * 1024)
+
+    def _group_content_key(self, group_key, group, embed_files):
+        """Compute the content key for a group's object artifact."""
+        from .cache import BuildCache
+        return BuildCache.compute_content_key(
+            group_key, group.get('source_file'), embed_files,
         )
 
-    def _cached_source_embed_deps_uptodate(self, group) -> bool:
-        """Check cached object is newer than every source-embed dependency.
+    def _cached_content_key_matches(self, group_key, group) -> bool:
+        """Check the cached object was built from the current inputs.
+
+        The key covers the normalized source of the group's file and of every
+        source-embed dependency (code or type layouts baked into the object by
+        value), the group key and the codegen knobs.  Serving a stale object
+        for a changed embed source would leave a baked-in frame size that no
+        longer matches -> silent memory corruption, so such sources are part
+        of the key rather than link-time edges.
 
-        A source-embed dependency means this group's object embeds, by value,
-        code or a type layout owned by another source file (e.g. a cross-module
-        inlined yield generator and the structs it allocates). The cache only
-        tracks each group's own mtime, so without this check a layout change in
-        the dependency would be served from a stale .o whose baked-in frame size
-        no longer matches -> silent memory corruption. We conservatively treat
-        the cache as stale whenever a dependency source is newer than the .o.
+        Pending functions are additionally compared one by one against the
+        per-function AST digests persisted with the object.
         """
         obj_file = group.get('obj_file')
         if not obj_file:
-            return True
+            return False
 
         from .deps import get_dependency_tracker
         from .cache import BuildCache
+        from ..logger import logger
 
         deps = get_dependency_tracker().load_deps(obj_file)
         if not deps:
-            return True
+            return False
 
-        for group_dep in deps.group_dependencies:
-            if getattr(group_dep, 'dependency_type', None) != "source_embed":
-                continue
-            target_group = getattr(group_dep, 'target_group', None)
-            if target_group is None or not target_group.file:
-                continue
-            if not BuildCache.check_obj_uptodate(obj_file, target_group.file):
-                from ..logger import logger
+        content_key = self._group_content_key(
+            group_key, group, deps.get_source_embed_files(),
+        )
+        if not BuildCache.check_obj_content_uptodate(
+            obj_file, content_key, deps.content_key,
+        ):
+            logger.debug(
+                f"Cache miss for {group_key}: content key changed "
+                f"({deps.content_key} -> {content_key})"
+            )
+            return False
+
+        for symbol, ast_hash in self._get_pending_function_hashes(group_key).items():
+            cached_hash = deps.function_hashes.get(symbol)
+            if cached_hash is not None and cached_hash != ast_hash:
                 logger.debug(
-                    f"Cache miss for {group.get('source_file')}: source-embed "
-                    f"dependency {target_group.file} is newer than {obj_file}"
+                    f"Cache miss for {group_key}: AST of {symbol} changed"
                 )
                 return False
 
@@ -767,6 +903,7 @@ class OutputManager:
             )
 
         self._restore_deps_from_cache(group_key, group)
+        self._refresh_binding_snapshot(group_key, group)
         self._flushed_groups.add(group_key)
 
         if group_key in self._pending_compilations:
@@ -775,40 +912,160 @@ class OutputManager:
 
         return 'cached'
 
+    def binding_snapshot(self, group_key, source_file, obj_file):
+        """Return the deps record of a group whose bindings can be reused.
+
+        The record qualifies while its content key still matches the
+        group's current inputs, i.e. while the object would be a cache hit.
+        The result is computed once per group and process.
+
+        Returns:
+            GroupDeps with a non-empty ``bindings`` map, or None
+        """
+        with self._state_lock:
+            if group_key in self._binding_snapshots:
+                return self._binding_snapshots[group_key]
+
+        from .cache import BuildCache
+
+        deps = get_dependency_tracker().load_deps(obj_file)
+        if deps is not None and deps.bindings:
+            content_key = BuildCache.compute_content_key(
+                group_key, source_file, deps.get_source_embed_files(),
+            )
+            if not BuildCache.check_obj_content_uptodate(
+                obj_file, content_key, deps.content_key,
+            ):
+                deps = None
+        else:
+            deps = None
+        with self._state_lock:
+            self._binding_snapshots[group_key] = deps
+        return deps
+
+    def _refresh_binding_snapshot(self, group_key, group):
+        """Backfill the binding snapshot of a cache hit whose record lacks it."""
+        from ..config import config
+        if not config.binding_snapshots:
+            return
+        from .bindings import snapshot_group_bindings
+        import dataclasses
+
+        obj_file = group['obj_file']
+        dep_tracker = get_dependency_tracker()
+        deps = dep_tracker.load_deps(obj_file)
+        if deps is None:
+            return
+        bindings = snapshot_group_bindings(group_key, group.get('all_wrappers') or [])
+        if bindings and bindings != deps.bindings:
+            dep_tracker.write_deps(dataclasses.replace(deps, bindings=bindings), obj_file)
+
     def _commit_empty_group(self, group_key, group):
         """Commit OutputManager state when no functions materialized."""
         self._flushed_groups.add(group_key)
         group['wrappers'] = []
         return 'empty'
 
+    def _object_lock(self, group):
+        """Cross-process lock of a group's object file (none for JIT groups)."""
+        if group.get('jit'):
+            return nullcontext()
+        return file_lock(group['obj_file'] + '.lock')
+
+    def _publish_jit_group(self, group_key, group, compile_result: _CompileResult):
+        """Optimize a JIT group's module and hand it to the in-process JIT.
+
+        Nothing is written: no object, no deps record and no shared-cache
+        entry.  The dependencies recorded during compilation stay in memory,
+        where the JIT executor reads them.
+        """
+        from ..config import config
+        from ..jit_executor import get_jit_executor
+
+        compiler = group['compiler']
+        llvm_module = compiler.parse_module()
+        if llvm_module is None:
+            raise RuntimeError(f"Module verification failed for group {group_key}")
+        compiler.optimize_module(int(config.opt_level), llvm_module)
+        # The engine takes ownership of the module it is given.
+        get_jit_executor().add_module(group_key, llvm_module.clone())
+        group['compiled_symbols'] = (
+            set(group.get('compiled_symbols', set())) | compile_result.compiled_symbols
+        )
+
     def _publish_group_object(self, group_key, group, compile_result: _CompileResult):
         """Publish the compiled LLVM module as IR, object, and deps files."""
+        if group.get('jit'):
+            self._publish_jit_group(group_key, group, compile_result)
+            return
         compiler = group['compiler']
         obj_file = group['obj_file']
 
         existing_symbols = set(group.get('compiled_symbols', set()))
         compiled_symbols = existing_symbols | compile_result.compiled_symbols
 
-        if not compiler.verify_module():
-            raise RuntimeError(f"Module verification failed for group {group_key}")
-
         from ..config import config
 
+        inline_threshold = self._apply_pgo(group_key, group, compiler)
+
+        # Functions unchanged since the last rebuild reuse their optimized
+        # bodies; the module to optimize only declares them.
+        from . import fncache
+        reuse_plan = None
+        reuse = None
+        if fncache.function_cache_enabled():
+            reuse_plan = fncache.plan_function_reuse(
+                compiler.module, obj_file, inline_threshold)
+            if reuse_plan.reusable:
+                reuse = (reuse_plan.bitcode, sorted(reuse_plan.reusable))
+
+        # Single text round-trip: the verified ModuleRef is optimized and
+        # emitted in place.
+        llvm_module = compiler.parse_module(
+            reuse_plan.ir_text if reuse_plan is not None else None)
+        if llvm_module is None:
+            raise RuntimeError(f"Module verification failed for group {group_key}")
+
         if config.save_unopt_ir:
             unopt_ir_file = group['ir_file'].replace('.ll', '.unopt.ll')
             with open(unopt_ir_file, 'w') as f:
                 f.write(str(compiler.module))
 
         opt_level = int(config.opt_level)
-        compiler.optimize_module(optimization_level=opt_level)
+        # The optimized module is kept as bitcode for LTO links and for the
+        # function cache.
+        want_bitcode = bool(config.lto) or reuse_plan is not None
+        from .scheduler import offload, process_pool_active
+        if process_pool_active():
+            # Under the process executor, ship the IR text to a worker
+            # process that optimizes and emits outside this process' GIL.
+            # Only what is written below comes back.
+            from ..compiler import optimize_and_emit_object, target_machine_options
+            optimized_ir, bitcode, obj_bytes = offload(
+                optimize_and_emit_object, str(llvm_module), opt_level,
+                target_machine_options(), bool(config.vectorize), inline_threshold,
+                reuse, bool(config.save_ir), want_bitcode,
+            )
+            if optimized_ir is not None:
+                compiler.set_optimized_ir(optimized_ir)
+        else:
+            compiler.optimize_module(opt_level, llvm_module, inline_threshold)
+            if reuse is not None:
+                fncache.link_reused_functions(llvm_module, *reuse)
+            obj_bytes = compiler.emit_object(llvm_module)
+            bitcode = llvm_module.as_bitcode() if want_bitcode else None
 
         # Write .o atomically so concurrent readers never see a half-written file.
         # The .ll text is a debug artifact, controlled by config.save_ir.
         tmp_obj = obj_file + '.tmp.' + str(os.getpid())
         if config.save_ir:
             compiler.save_ir_to_file(group['ir_file'])
-        compiler.compile_to_object(tmp_obj)
+        with open(tmp_obj, 'wb') as f:
+            f.write(obj_bytes)
         _atomic_replace(tmp_obj, obj_file)
+        self._write_group_bitcode(obj_file, bitcode, config.lto)
+        if reuse_plan is not None:
+            fncache.store_function_cache(obj_file, reuse_plan.keys, bitcode)
 
         group['compiled_symbols'] = compiled_symbols
         self._save_group_deps(
@@ -817,7 +1074,57 @@ class OutputManager:
             obj_file,
             group,
             compiled_symbols=compiled_symbols,
+            function_hashes=compile_result.function_hashes,
         )
+        self._publish_shared_object(group_key, group)
+
+    def _apply_pgo(self, group_key, group, compiler):
+        """Instrument or profile-annotate a group's module before optimization.
+
+        Returns:
+            Profile-derived inline threshold, or None for the static default
+        """
+        from ..config import config
+        from . import pgo
+
+        obj_file = group['obj_file']
+        if config.pgo_generate:
+            table_name = '__pc_prof_' + hashlib.sha256(
+                repr(tuple(group_key)).encode('utf-8')
+            ).hexdigest()[:16]
+            manifest = pgo.instrument_module(compiler.module, table_name)
+            if manifest is not None:
+                pgo.write_manifest(obj_file, manifest)
+            return None
+
+        pgo.write_manifest(obj_file, None)
+        if not config.pgo_use:
+            return None
+        profile = pgo.load_profile(config.pgo_use)
+        if profile is None:
+            return None
+        summary = pgo.apply_profile(compiler.module, profile)
+        if not summary['annotated']:
+            return None
+        return pgo.inline_threshold_for(summary, int(config.opt_level))
+
+    def _write_group_bitcode(self, obj_file, bitcode, enabled):
+        """Write (or drop) the optimized bitcode sidecar used by LTO links.
+
+        Written after the object so that a sidecar is never older than the
+        object it belongs to; older sidecars are treated as stale.
+        """
+        from .lto import bitcode_file_for
+        from .cache import BuildCache
+
+        bc_file = bitcode_file_for(obj_file)
+        if not enabled:
+            BuildCache._delete_files(bc_file)
+            return
+        tmp_bc = bc_file + '.tmp.' + str(os.getpid())
+        with open(tmp_bc, 'wb') as f:
+            f.write(bitcode)
+        _atomic_replace(tmp_bc, bc_file)
 
     def _commit_compiled_group(self, group_key, group):
         """Commit OutputManager state after publishing a fresh object."""
@@ -833,16 +1140,13 @@ class OutputManager:
             self._active_build_groups.add(group_key)
 
         try:
-            obj_file = group['obj_file']
             # File lock covers the entire cache-check -> compile -> write cycle.
             # This remains the cross-process guard; the scheduler handles only
             # in-process task ordering.
-            lockfile_path = obj_file + '.lock'
-
-            with file_lock(lockfile_path):
+            with self._object_lock(group):
                 # Check cache inside the lock so that waiting processes
                 # see the .o written by the winner and skip compilation.
-                if self._group_object_cache_hit(group_key, group):
+                if self._locked_group_object_cache_hit(group_key, group):
                     return _GroupObjectTaskResult(group_key, group, 'cached')
 
                 # Cache miss -- this process is the first to compile this .o.
@@ -913,12 +1217,11 @@ class OutputManager:
 
         try:
             # Cache check under the file lock: another process may be
-            # mid-publish of the same .o/.deps, and only the .o rename is
-            # atomic.  Codegen is serialized, so the lock never contends
-            # in-process.
-            lockfile_path = group['obj_file'] + '.lock'
-            with file_lock(lockfile_path):
-                if self._group_object_cache_hit(group_key, group):
+            # mid-publish of the same .o and deps record, and only the .o
+            # rename is atomic.  Codegen is serialized, so the lock never
+            # contends in-process.
+            with self._object_lock(group):
+                if self._locked_group_object_cache_hit(group_key, group):
                     return _CodegenTaskResult(group_key, group, 'cached')
 
             try:
@@ -971,12 +1274,10 @@ class OutputManager:
         Acquires the file lock and re-checks cache inside it.  Multiple
         compile tasks for different groups run in parallel.
         """
-        obj_file = group['obj_file']
-        lockfile_path = obj_file + '.lock'
-
-        with file_lock(lockfile_path):
+        with self._object_lock(group):
             # Re-check cache inside the lock — another process may have
-            # published the .o while we were waiting.
+            # published the .o while we were waiting.  The shared cache was
+            # already consulted before codegen.
             if self._group_object_cache_hit(group_key, group):
                 return _GroupObjectTaskResult(group_key, group, 'cached')
 
@@ -1217,10 +1518,14 @@ class OutputManager:
         3. Write .ll and .o files
         
         Cache check is done here, at flush time:
-        - If .o is up-to-date (newer than source), skip compilation
+        - If the .o content key matches the current inputs, skip compilation
         - Otherwise, compile and regenerate .o
         """
         from ..logger import logger
+        from ..config import config
+        if config.pgo_generate:
+            from .pgo import ensure_profile_dump_registered
+            ensure_profile_dump_registered()
         # Check if any group has already loaded its library
         from ..native_executor import get_multi_so_executor
         executor = get_multi_so_executor()
@@ -1253,14 +1558,20 @@ class OutputManager:
         self._pre_materialize_effect_groups()
         self._pre_materialize_referenced_default_templates()
         from .scheduler import BuildScheduler, BuildSchedulerError
-        object_workers = int(os.environ.get('PC_OBJECT_BUILD_WORKERS', '1') or '1')
+        from ..config import config
+        object_workers = _object_build_workers(config.build_executor)
         # Phase-split build (Scheme A): codegen is serialized via implicit
         # DAG chaining (one at a time); compile tasks run in parallel on
-        # remaining workers.  object_workers>=2 enables pipelining.
+        # remaining workers.  object_workers>=2 enables pipelining.  With the
+        # process executor, compile tasks optimize and emit in worker
+        # processes.
         tasks = self._plan_pending_codegen_tasks()
         if tasks:
             try:
-                BuildScheduler(max_workers=object_workers).run(tasks)
+                BuildScheduler(
+                    max_workers=object_workers,
+                    executor=config.build_executor,
+                ).run(tasks)
             except BuildSchedulerError as exc:
                 self._requeue_unfinished_groups()
                 if len(exc.failures) == 1:
@@ -1269,12 +1580,14 @@ class OutputManager:
             except Exception:
                 self._requeue_unfinished_groups()
                 raise
+            finally:
+                self._evict_shared_cache()
 
         # Don't clear pending groups - they serve as metadata cache for subsequent runs
     
     def _restore_deps_from_cache(self, group_key, group):
         """
-        Restore dependency information from .deps file on cache hit.
+        Restore persisted dependency information on cache hit.
         
         This ensures that link libraries/objects are properly registered
         even when we skip compilation.
@@ -1314,11 +1627,12 @@ class OutputManager:
 
 
     
-    def _save_group_deps(self, group_key, compiler, obj_file, group=None, compiled_symbols=None):
+    def _save_group_deps(self, group_key, compiler, obj_file, group=None, compiled_symbols=None,
+                         function_hashes=None):
         """
         Save dependency information for a compiled group.
 
-        Persists link libraries/objects to `.deps` file. Group dependencies
+        Persists link libraries/objects to the deps index. Group dependencies
         are recorded at call time in `compile.py` and `type_converter.py`.
 
 
@@ -1328,6 +1642,7 @@ class OutputManager:
             obj_file: Path to .o file
             group: Optional group info dict (for accessing wrappers)
             compiled_symbols: Optional complete symbol set for the current .o
+            function_hashes: Optional symbol -> AST digest map for the current .o
         """
         from .deps import get_dependency_tracker
 
@@ -1347,7 +1662,7 @@ class OutputManager:
             # Link libraries and objects are recorded incrementally during
             # compilation (via callable_lowering.record_extern_dependency and
             # cimport).  We do NOT dump the global registry here — that would
-            # pollute every group's .deps with unrelated libraries from other
+            # pollute every group's deps with unrelated libraries from other
             # groups compiled in the same process.
             
             if compiled_symbols is not None:
@@ -1366,6 +1681,23 @@ class OutputManager:
             from ..config import config
             group_deps.debug_info = bool(config.debug_info)
 
+            if function_hashes:
+                group_deps.function_hashes.update(function_hashes)
+
+            if group and config.binding_snapshots:
+                from .bindings import snapshot_group_bindings
+                group_deps.bindings = snapshot_group_bindings(
+                    group_key, group.get('all_wrappers') or [],
+                )
+
+            # Content key over the inputs this object was just built from.
+            # Source-embed edges recorded during this compilation are part of
+            # the key, so the next cache check recomputes it from the same set.
+            if group:
+                group_deps.content_key = self._group_content_key(
+                    group_key, group, group_deps.get_source_embed_files(),
+                )
+
             # Save to file
             dep_tracker.save_deps(group_key, obj_file)
     
@@ -1399,6 +1731,7 @@ class OutputManager:
         self._flushed_groups.clear()
         self._group_object_task_seq = 0
         self._active_build_groups.clear()
+        self._binding_snapshots.clear()
         from ..effect_graph import EffectGraph
         self._effect_graph = EffectGraph()
     
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Profile-guided optimization for pythoc.
+
+PGO is a two-phase workflow driven by two config knobs:
+
+1. **Instrumented build** (``config.pgo_generate`` / ``PC_PGO_GENERATE`` set
+   to a profile path).  Every group gets one counter table: per function an
+   entry counter followed by a (taken, not taken) pair per conditional
+   branch.  The table layout is recorded in a sidecar next to the object
+   (``foo.o`` -> ``foo.prof.json``).  When the process exits, the counters of
+   every loaded group are read back and merged into the profile file.
+2. **Optimized build** (``config.pgo_use`` / ``PC_PGO_USE``).  Branches get
+   ``!prof`` branch weights, functions get ``function_entry_count``
+   metadata, never-executed functions are marked ``cold`` and hot ones
+   ``inlinehint``, and the inline threshold of groups containing hot code
+   is raised.
+
+Profiles are keyed by function name and carry a checksum of the function's
+control flow; counts recorded for a function whose shape has changed since
+are ignored.  The profile is JSON::
+
+    {"version": 1,
+     "functions": {"<name>": {"checksum": "...", "entry": N,
+                              "branches": [[taken, not_taken], ...]}}}
+
+Only code loaded into the recording Python process is profiled; standalone
+executables built from instrumented objects do not write a profile.
+"""
+
+import atexit
+import ctypes
+import hashlib
+import json
+import os
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from llvmlite import ir
+
+from ..logger import logger
+
+
+PROFILE_VERSION = 1
+
+# A function is hot when its entry count reaches this fraction of the
+# hottest function in the profile.
+HOT_FRACTION = 0.01
+
+_profile_cache: Dict[Tuple[str, int, int], dict] = {}
+_profile_cache_lock = threading.Lock()
+
+# Counter layout of every module instrumented by this process.
+_manifests: "weakref.WeakKeyDictionary[ir.Module, dict]" = weakref.WeakKeyDictionary()
+_dump_registered = False
+
+
+def profile_manifest_for(obj_file: str) -> str:
+    """Return the counter-layout sidecar path of a group object."""
+    return os.path.splitext(obj_file)[0] + '.prof.json'
+
+
+def _conditional_branches(func: ir.Function) -> List[ir.Instruction]:
+    return [
+        block.terminator for block in func.blocks
+        if isinstance(block.terminator, ir.instructions.ConditionalBranch)
+    ]
+
+
+def function_checksum(func: ir.Function) -> str:
+    """Digest of a function's control-flow shape (blocks and terminators)."""
+    shape = [
+        block.terminator.opname if block.terminator is not None else ''
+        for block in func.blocks
+    ]
+    return hashlib.sha256(','.join(shape).encode('utf-8')).hexdigest()[:16]
+
+
+def _profiled_functions(module: ir.Module) -> List[ir.Function]:
+    return [
+        func for func in module.functions
+        if isinstance(func, ir.Function) and func.blocks
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Phase 1: instrumentation and profile dump
+# ---------------------------------------------------------------------------
+
+
+def instrument_module(module: ir.Module, table_name: str) -> Optional[dict]:
+    """
+    Add entry and branch counters to every function defined in *module*.
+
+    A group's module is republished with more functions as code is added to
+    it; instrumenting it again counts the new functions in slots appended to
+    the existing table, leaving the already counted ones as they are.
+
+    Args:
+        module: Unoptimized module of one group
+        table_name: Exported symbol name of the group's counter table
+
+    Returns:
+        Counter-layout manifest of the whole table, or None when there is
+        nothing to count or the table was not added by this function
+    """
+    table = module.globals.get(table_name)
+    previous = _manifests.get(module) if table is not None else None
+    if table is not None and (previous is None or previous['table'] != table_name):
+        return None
+    known = previous['functions'] if previous is not None else {}
+    functions = [
+        func for func in _profiled_functions(module) if func.name not in known
+    ]
+    if not functions:
+        return previous
+
+    layout = []
+    offset = previous['size'] if previous is not None else 0
+    for func in functions:
+        branches = _conditional_branches(func)
+        layout.append((func, branches, offset))
+        offset += 1 + 2 * len(branches)
+
+    i64 = ir.IntType(64)
+    table_type = ir.ArrayType(i64, offset)
+    if table is None:
+        table = ir.GlobalVariable(module, table_type, name=table_name)
+    else:
+        _resize_table(module, table, known, table_type)
+    table.initializer = ir.Constant(table_type, None)
+
+    manifest = {'version': PROFILE_VERSION, 'table': table_name, 'size': offset,
+                'functions': dict(known)}
+    for func, branches, base in layout:
+        manifest['functions'][func.name] = {
+            'checksum': function_checksum(func),
+            'offset': base,
+            'branches': len(branches),
+        }
+        builder = ir.IRBuilder()
+        builder.position_at_start(func.blocks[0])
+        _increment(builder, table, ir.Constant(i64, base))
+        for i, branch in enumerate(branches):
+            builder.position_before(branch)
+            slot = builder.select(
+                branch.operands[0],
+                ir.Constant(i64, base + 1 + 2 * i),
+                ir.Constant(i64, base + 2 + 2 * i),
+            )
+            _increment(builder, table, slot)
+    _manifests[module] = manifest
+    return manifest
+
+
+def _resize_table(module: ir.Module, table: ir.GlobalVariable, counted,
+                  table_type: ir.ArrayType):
+    """Retype *table*, and the counter updates of *counted* functions."""
+    table.value_type = table_type
+    table.type = table_type.as_pointer(table.addrspace)
+    table._clear_string_cache()
+    for name in counted:
+        for block in module.get_global(name).blocks:
+            for instr in block.instructions:
+                if (isinstance(instr, ir.instructions.GEPInstr)
+                        and instr.pointer is table):
+                    instr.source_etype = table_type
+                    instr._clear_string_cache()
+
+
+def _increment(builder: ir.IRBuilder, table: ir.GlobalVariable, index):
+    i64 = ir.IntType(64)
+    slot = builder.gep(table, [ir.Constant(i64, 0), index], inbounds=True)
+    builder.store(builder.add(builder.load(slot), ir.Constant(i64, 1)), slot)
+
+
+def write_manifest(obj_file: str, manifest: Optional[dict]):
+    """Write (or drop) the counter-layout sidecar of *obj_file*."""
+    from .output_manager import _atomic_replace
+
+    path = profile_manifest_for(obj_file)
+    if manifest is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    tmp_path = path + '.tmp.' + str(os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    _atomic_replace(tmp_path, path)
+
+
+def _counter_lookup_handles() -> list:
+    handles = []
+    try:
+        handles.append(ctypes.CDLL(None))
+    except OSError:
+        pass
+    from ..native_executor import get_multi_so_executor
+    handles.extend(get_multi_so_executor().loaded_libs.values())
+    return handles
+
+
+def _read_table(handles, name: str, size: int) -> Optional[List[int]]:
+    array_type = ctypes.c_uint64 * size
+    for handle in handles:
+        if handle is None:
+            continue
+        try:
+            return list(array_type.in_dll(handle, name))
+        except (ValueError, AttributeError, TypeError):
+            continue
+    return None
+
+
+def collect_profile(obj_files) -> dict:
+    """Read the counters of every loaded instrumented group in *obj_files*."""
+    functions = {}
+    handles = None
+    for obj_file in obj_files:
+        try:
+            with open(profile_manifest_for(obj_file), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get('version') != PROFILE_VERSION:
+            continue
+        if handles is None:
+            handles = _counter_lookup_handles()
+        counters = _read_table(handles, manifest['table'], manifest['size'])
+        if counters is None:
+            # Instrumented but never loaded in this process.
+            continue
+        for name, info in manifest['functions'].items():
+            base = info['offset']
+            branches = [
+                [counters[base + 1 + 2 * i], counters[base + 2 + 2 * i]]
+                for i in range(info['branches'])
+            ]
+            record = {'checksum': info['checksum'], 'entry': counters[base],
+                      'branches': branches}
+            functions[name] = merge_function_records(functions.get(name), record)
+    return {'version': PROFILE_VERSION, 'functions': functions}
+
+
+def merge_function_records(old: Optional[dict], new: dict) -> dict:
+    """Sum two records of the same function; a changed checksum wins."""
+    if old is None or old.get('checksum') != new['checksum']:
+        return new
+    if len(old['branches']) != len(new['branches']):
+        return new
+    return {
+        'checksum': new['checksum'],
+        'entry': old['entry'] + new['entry'],
+        'branches': [
+            [a[0] + b[0], a[1] + b[1]]
+            for a, b in zip(old['branches'], new['branches'])
+        ],
+    }
+
+
+def merge_profiles(base: dict, update: dict) -> dict:
+    """Merge *update* into *base*, summing counts of unchanged functions."""
+    functions = dict(base.get('functions', {}))
+    for name, record in update.get('functions', {}).items():
+        functions[name] = merge_function_records(functions.get(name), record)
+    return {'version': PROFILE_VERSION, 'functions': functions}
+
+
+def dump_profile(path: str, obj_files) -> bool:
+    """Merge the live counters of *obj_files* into the profile at *path*."""
+    from .output_manager import _atomic_replace
+
+    profile = collect_profile(obj_files)
+    if not profile['functions']:
+        return False
+    existing = _read_profile_file(path)
+    if existing is not None:
+        profile = merge_profiles(existing, profile)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp.' + str(os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(profile, f, indent=1, sort_keys=True)
+    _atomic_replace(tmp_path, path)
+    logger.debug(f"Wrote PGO profile for {len(profile['functions'])} functions to {path}")
+    return True
+
+
+def _atexit_dump_profile():
+    from ..config import config
+    from .output_manager import get_output_manager
+
+    path = config.pgo_generate
+    if not path:
+        return
+    obj_files = [
+        group.get('obj_file')
+        for group in get_output_manager().get_all_groups().values()
+        if group.get('obj_file')
+    ]
+    try:
+        dump_profile(path, obj_files)
+    except Exception as e:
+        logger.warning(f"Failed to write PGO profile {path}: {e}")
+
+
+def ensure_profile_dump_registered():
+    """Register the exit-time profile dump once per process."""
+    global _dump_registered
+    if not _dump_registered:
+        _dump_registered = True
+        atexit.register(_atexit_dump_profile)
+
+
+# ---------------------------------------------------------------------------
+# Phase 2: profile use
+# ---------------------------------------------------------------------------
+
+
+def _read_profile_file(path: str) -> Optional[dict]:
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != PROFILE_VERSION:
+        return None
+    return data
+
+
+def load_profile(path: str) -> Optional[dict]:
+    """Load a profile, memoized per (path, mtime, size)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _profile_cache_lock:
+        if key in _profile_cache:
+            return _profile_cache[key]
+    profile = _read_profile_file(path)
+    if profile is not None:
+        entries = [r['entry'] for r in profile['functions'].values()]
+        profile['max_entry'] = max(entries, default=0)
+    with _profile_cache_lock:
+        _profile_cache[key] = profile
+    return profile
+
+
+def _scaled_weights(taken: int, not_taken: int) -> Tuple[int, int]:
+    """Fit a count pair into LLVM's 32-bit branch weights."""
+    limit = 0xFFFFFFFF
+    largest = max(taken, not_taken)
+    if largest > limit:
+        scale = largest / limit
+        taken, not_taken = int(taken / scale), int(not_taken / scale)
+    # Zero weights read as "no information" in places; keep them positive.
+    return max(taken, 1), max(not_taken, 1)
+
+
+def apply_profile(module: ir.Module, profile: dict) -> dict:
+    """
+    Annotate *module* with the counts recorded in *profile*.
+
+    Returns:
+        Summary dict with the number of ``annotated``, ``hot`` and ``cold``
+        functions
+    """
+    summary = {'annotated': 0, 'hot': 0, 'cold': 0}
+    records = profile.get('functions', {})
+    hot_cutoff = max(1, int(profile.get('max_entry', 0) * HOT_FRACTION))
+    i64 = ir.IntType(64)
+
+    for func in _profiled_functions(module):
+        record = records.get(func.name)
+        if record is None or record.get('checksum') != function_checksum(func):
+            continue
+        branches = _conditional_branches(func)
+        if len(branches) != len(record['branches']):
+            continue
+
+        entry = int(record['entry'])
+        func.set_metadata('prof', module.add_metadata([
+            ir.MetaDataString(module, 'function_entry_count'),
+            ir.Constant(i64, entry),
+        ]))
+        for branch, (taken, not_taken) in zip(branches, record['branches']):
+            if taken or not_taken:
+                branch.set_weights(_scaled_weights(int(taken), int(not_taken)))
+
+        if entry == 0:
+            func.attributes.add('cold')
+            summary['cold'] += 1
+        elif entry >= hot_cutoff:
+            if 'noinline' not in func.attributes:
+                func.attributes.add('inlinehint')
+            summary['hot'] += 1
+        summary['annotated'] += 1
+    return summary
+
+
+def inline_threshold_for(summary: dict, optimization_level: int) -> int:
+    """Inline threshold for a group, given its :func:`apply_profile` summary.
+
+    Groups with hot functions inline twice as aggressively as the static
+    default (225 at O2, 500 at O3); groups that only hold never-executed
+    code inline conservatively to keep them small.
+    """
+    base = 225 if optimization_level <= 2 else 500
+    if summary['hot']:
+        return base * 2
+    if summary['annotated'] and summary['cold'] == summary['annotated']:
+        return base // 3
+    return base
@@ -8,17 +8,11 @@ callbacks.
 from __future__ import annotations
 
 import os
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Iterable, List, Sequence, Tuple
 
 from .scheduler import BuildTask
 
 
-def _deps_file_for_obj(obj_file: Optional[str]) -> Optional[str]:
-    if not obj_file:
-        return None
-    return obj_file[:-2] + '.deps' if obj_file.endswith('.o') else obj_file + '.deps'
-
-
 def plan_group_object_tasks(output_manager, groups: Sequence[Tuple[Tuple, dict]]) -> List[BuildTask]:
     """Plan tasks that compile pending groups into object/deps artifacts.
 
@@ -43,7 +37,6 @@ def plan_group_object_tasks(output_manager, groups: Sequence[Tuple[Tuple, dict]]
             outputs=(
                 group.get('ir_file'),
                 obj_file,
-                _deps_file_for_obj(obj_file),
             ),
             resources=tuple(resource for resource in resources if resource),
             run=lambda group_key=group_key, group=group: output_manager._build_group_object_task(
@@ -104,7 +97,6 @@ def plan_compile_object_task(
         outputs=(
             group.get('ir_file'),
             obj_file,
-            _deps_file_for_obj(obj_file),
         ),
         run=lambda gk=group_key, g=group, cr=compile_result: output_manager._compile_object_task(gk, g, cr),
         on_success=output_manager._compile_on_success,
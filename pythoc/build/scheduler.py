@@ -2,22 +2,121 @@
 
 The scheduler coordinates in-process task parallelism. Cross-process safety
 is still handled by the existing file locks around artifact publication.
+
+Tasks always run on scheduler threads.  With the ``process`` executor kind,
+the scheduler additionally owns a process pool, and tasks may hand picklable,
+CPU-bound work (LLVM optimization and object emission) to it via
+:func:`offload`, so that work is not serialized by the GIL.
 """
 
 from __future__ import annotations
 
+import atexit
+import multiprocessing
 import os
 import threading
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+from ..logger import logger
+
 
 TaskFn = Callable[[], object]
 CacheFn = Callable[[], bool]
 CommitFn = Callable[["TaskResult"], Optional[Iterable["BuildTask"]]]
 
 
+EXECUTOR_KINDS = ("thread", "process")
+
+# The process executor's worker pool.  There is one per process, started
+# once and shared by every scheduler run; ``BuildScheduler.max_workers``
+# bounds how much of it a run uses.
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+_process_pool_refused = False
+
+# Per-thread pointer to the process pool of the scheduler running the task.
+_task_context = threading.local()
+
+
+def start_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Start the shared process pool if it is not running, and return it.
+
+    Workers are forked so they never re-import ``__main__`` (which would
+    re-run user ``@compile`` decorators).  Forking while other threads run
+    can deadlock the child on a lock one of them held, so the pool is only
+    started while the calling thread is the only one; ``pythoc`` starts it
+    on import when the process executor is configured.  Returns None when
+    the pool cannot be started (no ``fork``, or other threads are alive);
+    callers then fall back to running work on threads.
+    """
+    global _process_pool, _process_pool_refused
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    with _process_pool_lock:
+        if _process_pool is not None:
+            return _process_pool
+        if threading.active_count() > 1:
+            if not _process_pool_refused:
+                _process_pool_refused = True
+                logger.warning(
+                    "Not forking build worker processes while other threads "
+                    "are running; building objects on threads instead"
+                )
+            return None
+        pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        # Fork every worker now, before this pool's own management thread
+        # or any scheduler thread exists.
+        pool.submit(int).result()
+        _process_pool = pool
+        return pool
+
+
+def _shutdown_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(_shutdown_process_pool)
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+
+def process_pool_active() -> bool:
+    """Return whether the current task runs under a ``process`` executor."""
+    return getattr(_task_context, "process_pool", None) is not None
+
+
+def offload(fn: Callable, *args):
+    """Run ``fn(*args)`` on the current task's process pool and return its value.
+
+    *fn* and *args* must be picklable.  Outside a ``process`` executor task
+    the call runs inline, so callers need no executor-specific code path.
+    """
+    pool = getattr(_task_context, "process_pool", None)
+    if pool is None:
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        _discard_process_pool(pool)
+        raise
+
+
 @dataclass
 class TaskResult:
     """Execution result for one task."""
@@ -65,12 +164,18 @@ class BuildSchedulerError(RuntimeError):
 class BuildScheduler:
     """Run build tasks in topological order with per-output serialization."""
 
-    def __init__(self, max_workers: Optional[int] = None):
+    def __init__(self, max_workers: Optional[int] = None, executor: str = "thread"):
         if max_workers is None:
             max_workers = int(os.environ.get("PC_BUILD_WORKERS", "0") or "0")
         if max_workers <= 0:
             max_workers = os.cpu_count() or 1
+        if executor not in EXECUTOR_KINDS:
+            raise ValueError(
+                f"Unknown build executor {executor!r}; expected one of {EXECUTOR_KINDS}"
+            )
         self.max_workers = max(1, max_workers)
+        self.executor = executor
+        self._process_pool: Optional[ProcessPoolExecutor] = None
         self._output_locks: Dict[str, threading.Lock] = {}
         self._output_locks_guard = threading.Lock()
         # Track resources/outputs held by *running* tasks so the dispatch
@@ -158,6 +263,9 @@ class BuildScheduler:
         if not task_map:
             return {}
 
+        if self.executor == "process":
+            self._process_pool = start_process_pool()
+
         with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
             while ready or running:
                 # Dispatch loop: scan ready queue for tasks whose resources/
@@ -241,12 +349,14 @@ class BuildScheduler:
         locks = self._locks_for_task(task)
         for lock in locks:
             lock.acquire()
+        _task_context.process_pool = self._process_pool
         try:
             if task.cache_check is not None and task.cache_check():
                 return TaskResult(task_id=task.id, kind=task.kind, skipped=True)
             value = task.run()
             return TaskResult(task_id=task.id, kind=task.kind, value=value)
         finally:
+            _task_context.process_pool = None
             for lock in reversed(locks):
                 lock.release()
 
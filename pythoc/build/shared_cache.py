@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Shared, content-addressed object cache for pythoc.
+
+The per-project ``build/`` tree stays the working area that the linker and
+loader consume.  When ``config.cache_dir`` (``PC_CACHE_DIR``) is set, every
+freshly compiled group object is also published into a shared store, and a
+local cache miss first tries to restore the object from that store before
+compiling.  Separate processes, users, checkouts and machines that share the
+directory therefore compile each group (e.g. the std/runtime groups) once.
+
+Layout under the cache root::
+
+    objects/<base[:2]>/<base>/<content_key>.o
+    objects/<base[:2]>/<base>/<content_key>.deps
+    objects/<base[:2]>/<base>/<content_key>.bc     (LTO builds only)
+
+``base`` is the group's content key computed without its source-embed
+dependencies, so it can be derived before the group's dependency list is
+known (e.g. from a fresh checkout with an empty ``build/``).  Each entry's
+``.deps`` records those embed sources; an entry is restored only when the
+full content key recomputed from them matches the entry's own key.
+
+Absolute paths inside a stored ``.deps`` are rewritten relative to the pythoc
+package directory and the current working directory, so entries remain
+valid for other checkouts and installations.  Entries are published with
+``_atomic_replace`` (object first, ``.deps`` last as the commit marker) and
+evicted least-recently-used once the store grows past
+``config.cache_max_size`` MiB.  The store's size is tracked in a ``usage``
+file next to ``objects/``, so the store is only scanned once that bound is
+crossed.
+"""
+
+import json
+import os
+import shutil
+from typing import List, Optional, Tuple
+
+from ..logger import logger
+from .cache import BuildCache
+from .deps import DEPS_VERSION, GroupDeps
+from .lto import bitcode_file_for
+
+
+_PYTHOC_ROOT = '{pythoc}'
+_CWD_ROOT = '{cwd}'
+
+
+def _relocation_roots() -> List[Tuple[str, str]]:
+    """Return (placeholder, absolute directory) pairs, most specific first."""
+    pythoc_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    roots = [(_PYTHOC_ROOT, pythoc_dir), (_CWD_ROOT, os.getcwd())]
+    return sorted(roots, key=lambda r: len(r[1]), reverse=True)
+
+
+def _relocate_path(path, roots):
+    if not isinstance(path, str) or not os.path.isabs(path):
+        return path
+    for placeholder, root in roots:
+        if path.startswith(root + os.sep):
+            rel = os.path.relpath(path, root)
+            return placeholder + '/' + rel.replace(os.sep, '/')
+    return path
+
+
+def _expand_path(path, roots):
+    if not isinstance(path, str):
+        return path
+    for placeholder, root in roots:
+        if path.startswith(placeholder + '/'):
+            rel = path[len(placeholder) + 1:]
+            return os.path.join(root, *rel.split('/'))
+    return path
+
+
+def _map_deps_paths(data: dict, fn) -> dict:
+    """Apply *fn* to every path stored in a serialized GroupDeps dict."""
+    data = dict(data)
+    if data.get('group_keys'):
+        data['group_keys'] = [
+            [fn(key[0])] + list(key[1:]) for key in data['group_keys']
+        ]
+    if data.get('group_key'):
+        key = data['group_key']
+        data['group_key'] = [fn(key[0])] + list(key[1:])
+    for dep in data.get('group_dependencies', []):
+        if dep.get('target_group'):
+            key = dep['target_group']
+            dep['target_group'] = [fn(key[0])] + list(key[1:])
+    data['link_objects'] = [fn(p) for p in data.get('link_objects', [])]
+    return data
+
+
+class SharedObjectCache:
+    """Content-addressed store of group objects shared across builds."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.objects_dir = os.path.join(self.root, 'objects')
+        # Bytes in the store as of the last scan plus what was published
+        # since; missing until the first eviction scan.
+        self.usage_file = os.path.join(self.root, 'usage')
+
+    def _entry_dir(self, base_key: str) -> str:
+        return os.path.join(self.objects_dir, base_key[:2], base_key)
+
+    def lookup(self, group_key, source_file: str) -> Optional[Tuple[str, GroupDeps]]:
+        """
+        Find an entry built from the current inputs of a group.
+
+        Args:
+            group_key: Group key tuple
+            source_file: Source file the group is compiled from
+
+        Returns:
+            (object path, GroupDeps with local paths) or None on a miss
+        """
+        base_key = BuildCache.compute_content_key(group_key, source_file)
+        if base_key is None:
+            return None
+        entry_dir = self._entry_dir(base_key)
+        try:
+            names = os.listdir(entry_dir)
+        except OSError:
+            return None
+
+        roots = _relocation_roots()
+        for name in names:
+            if not name.endswith('.deps'):
+                continue
+            entry_key = name[:-len('.deps')]
+            deps_path = os.path.join(entry_dir, name)
+            obj_path = os.path.join(entry_dir, entry_key + '.o')
+            try:
+                with open(deps_path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if data.get('version') != DEPS_VERSION:
+                continue
+
+            deps = GroupDeps.from_dict(_map_deps_paths(
+                data, lambda p: _expand_path(p, roots),
+            ))
+            if deps.content_key != entry_key:
+                continue
+            content_key = BuildCache.compute_content_key(
+                group_key, source_file, deps.get_source_embed_files(),
+            )
+            if content_key != entry_key or not os.path.exists(obj_path):
+                continue
+
+            # Refresh recency for LRU eviction.
+            try:
+                os.utime(obj_path, None)
+                os.utime(deps_path, None)
+            except OSError:
+                pass
+            logger.debug(f"Shared cache hit for {group_key}: {obj_path}")
+            return obj_path, deps
+        return None
+
+    def publish(self, group_key, source_file: str, obj_file: str, deps: GroupDeps) -> bool:
+        """
+        Publish a freshly compiled group object into the store.
+
+        Args:
+            group_key: Group key tuple
+            source_file: Source file the group is compiled from
+            obj_file: Local object file to publish
+            deps: Dependency record persisted next to *obj_file*
+
+        Returns:
+            bool: True if the entry was written
+        """
+        from .output_manager import _atomic_replace
+
+        base_key = BuildCache.compute_content_key(group_key, source_file)
+        if base_key is None or not deps.content_key:
+            return False
+        entry_dir = self._entry_dir(base_key)
+        obj_path = os.path.join(entry_dir, deps.content_key + '.o')
+        deps_path = os.path.join(entry_dir, deps.content_key + '.deps')
+        bc_path = bitcode_file_for(obj_path)
+
+        roots = _relocation_roots()
+        data = _map_deps_paths(deps.to_dict(), lambda p: _relocate_path(p, roots))
+        tmp_suffix = '.tmp.' + str(os.getpid())
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            shutil.copyfile(obj_file, obj_path + tmp_suffix)
+            _atomic_replace(obj_path + tmp_suffix, obj_path)
+            if os.path.exists(bitcode_file_for(obj_file)):
+                shutil.copyfile(bitcode_file_for(obj_file), bc_path + tmp_suffix)
+                _atomic_replace(bc_path + tmp_suffix, bc_path)
+            with open(deps_path + tmp_suffix, 'w') as f:
+                json.dump(data, f, indent=2)
+            _atomic_replace(deps_path + tmp_suffix, deps_path)
+            size = sum(
+                os.path.getsize(path) for path in (obj_path, deps_path, bc_path)
+                if os.path.exists(path)
+            )
+        except OSError as e:
+            logger.debug(f"Failed to publish {obj_file} to shared cache: {e}")
+            BuildCache._delete_files(
+                obj_path + tmp_suffix, deps_path + tmp_suffix, bc_path + tmp_suffix,
+            )
+            return False
+        self._add_usage(size)
+        logger.debug(f"Published {obj_file} to shared cache: {obj_path}")
+        return True
+
+    def _read_usage(self) -> Optional[int]:
+        try:
+            with open(self.usage_file, 'r') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_usage(self, total: int):
+        from .output_manager import _atomic_replace
+
+        tmp_file = self.usage_file + '.tmp.' + str(os.getpid())
+        try:
+            with open(tmp_file, 'w') as f:
+                f.write(str(total))
+            _atomic_replace(tmp_file, self.usage_file)
+        except OSError:
+            BuildCache._delete_files(tmp_file)
+
+    def _add_usage(self, size: int):
+        """Count *size* published bytes towards the tracked store size."""
+        from ..utils.link_utils import file_lock
+
+        try:
+            with file_lock(self.usage_file + '.lock'):
+                total = self._read_usage()
+                if total is not None:
+                    self._write_usage(total + size)
+        except (OSError, TimeoutError) as e:
+            logger.debug(f"Failed to update shared cache usage: {e}")
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        Evict least recently used entries until the store fits *max_bytes*.
+
+        The store is only scanned when its tracked size exceeds *max_bytes*
+        (or is unknown); the scan then records the size it found.
+
+        Returns:
+            int: Number of entries removed
+        """
+        from ..utils.link_utils import file_lock
+
+        try:
+            with file_lock(self.usage_file + '.lock'):
+                total = self._read_usage()
+                if total is not None and total <= max_bytes:
+                    return 0
+                removed, total = self._evict_scanned(max_bytes)
+                self._write_usage(total)
+        except (OSError, TimeoutError) as e:
+            logger.debug(f"Failed to evict from shared cache {self.root}: {e}")
+            return 0
+        return removed
+
+    def _evict_scanned(self, max_bytes: int) -> Tuple[int, int]:
+        """Scan the store and evict; return (entries removed, bytes left)."""
+        entries = []
+        total = 0
+        for dirpath, _dirnames, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                if not name.endswith('.deps'):
+                    continue
+                deps_path = os.path.join(dirpath, name)
+                obj_path = deps_path[:-len('.deps')] + '.o'
+                try:
+                    size = os.path.getsize(deps_path)
+                    recency = os.path.getmtime(deps_path)
+                    if os.path.exists(obj_path):
+                        size += os.path.getsize(obj_path)
+                        recency = max(recency, os.path.getmtime(obj_path))
+                    if os.path.exists(bitcode_file_for(obj_path)):
+                        size += os.path.getsize(bitcode_file_for(obj_path))
+                except OSError:
+                    continue
+                entries.append((recency, size, deps_path, obj_path))
+                total += size
+
+        removed = 0
+        for _recency, size, deps_path, obj_path in sorted(entries):
+            if total <= max_bytes:
+                break
+            # Drop the commit marker first so readers never see a .deps
+            # whose object is already gone.
+            BuildCache._delete_files(deps_path, obj_path, bitcode_file_for(obj_path))
+            total -= size
+            removed += 1
+            try:
+                os.rmdir(os.path.dirname(deps_path))
+            except OSError:
+                pass
+        if removed:
+            logger.debug(f"Evicted {removed} entries from shared cache {self.root}")
+        return removed, total
+
+
+def get_shared_object_cache() -> Optional[SharedObjectCache]:
+    """Return the shared object cache configured by ``config.cache_dir``."""
+    from ..config import config
+    root = config.cache_dir
+    if not root:
+        return None
+    return SharedObjectCache(root)
@@ -69,6 +69,9 @@ from .atomic import (
     atomic_load_i32, atomic_store_i32,
 )
 
+# Cache prefetch hint
+from .prefetch import prefetch
+
 # Python type wrapper
 from .python_type import PythonType, is_python_type, pyconst
 
@@ -182,6 +185,7 @@ __all__ = [
     'atomic_load_i64', 'atomic_store_i64',
     'atomic_fetch_add_i64', 'atomic_cas_i64',
     'atomic_load_i32', 'atomic_store_i32',
+    'prefetch',
     
     # Python type wrapper
     'PythonType',
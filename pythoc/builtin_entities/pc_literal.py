@@ -18,6 +18,8 @@ Design differences from pc_list / pc_tuple / pc_dict:
 
 from __future__ import annotations
 
+import ctypes as ct
+import functools
 import operator
 from typing import Any, Optional, TYPE_CHECKING
 
@@ -25,6 +27,13 @@ if TYPE_CHECKING:
     pass
 
 
+_INT_CTYPES = frozenset((
+    ct.c_int8, ct.c_int16, ct.c_int32, ct.c_int64,
+    ct.c_uint8, ct.c_uint16, ct.c_uint32, ct.c_uint64,
+))
+_FLOAT_CTYPES = frozenset((ct.c_float, ct.c_double))
+
+
 def _get_type_width(pc_type) -> int:
     return getattr(pc_type, '_size_bytes', 0) * 8
 
@@ -206,8 +215,6 @@ class pc_literal:
     @classmethod
     def _from_ctypes_result(cls, ctypes_result, pc_type):
         """Wrap a ctypes return value from native execution."""
-        import ctypes as ct
-
         if pc_type is None:
             return ctypes_result
 
@@ -242,6 +249,43 @@ class pc_literal:
 
         return ctypes_result
 
+    @classmethod
+    def _from_native_scalar(cls, value, pc_type):
+        """Wrap a scalar native result ctypes already turned into a Python
+        int/bool/float of the right width (the per-call fast path)."""
+        inst = object.__new__(cls)
+        init = object.__setattr__
+        init(inst, '_value', value)
+        init(inst, '_pc_type', pc_type)
+        init(inst, '_fields', None)
+        init(inst, '_field_names', None)
+        init(inst, '_ctypes_owner', None)
+        return inst
+
+    @classmethod
+    def _scalar_result_converter(cls, pc_type, restype):
+        """Return ``convert(result)`` equivalent to
+        ``_from_ctypes_result(result, pc_type)`` when ctypes already hands
+        back a Python number of the right kind for *restype*, else None."""
+        if restype in _FLOAT_CTYPES:
+            ok = _is_float(pc_type)
+        elif restype is ct.c_bool:
+            ok = _is_bool_type(pc_type)
+        elif restype in _INT_CTYPES:
+            ok = _is_integer(pc_type)
+        else:
+            ok = False
+        return functools.partial(cls._from_native_scalar, pc_type=pc_type) if ok else None
+
+    @property
+    def _as_parameter_(self):
+        # Lets ctypes pass scalar literals to functions with argtypes set
+        # without going through _to_ctypes().
+        if (self._ctypes_owner is None and self._fields is None
+                and isinstance(self._value, (int, float))):
+            return self._value
+        raise AttributeError('_as_parameter_')
+
     @classmethod
     def _struct_from_ctypes(cls, ct_struct, pc_type):
         """Wrap a ctypes.Structure as a struct pc_literal.
@@ -402,8 +446,6 @@ class pc_literal:
 
     def _to_ctypes(self, param_type):
         """Convert this pc_literal to a ctypes value for native execution."""
-        import ctypes as ct
-
         # Owner-backed path: we already hold a live ctypes object created
         # by a previous native call.  Preserve native memory semantics
         # instead of round-tripping through Python field copies.
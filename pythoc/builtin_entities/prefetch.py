@@ -0,0 +1,65 @@
+import ast
+
+from llvmlite import ir
+
+from .base import BuiltinFunction
+from ..logger import logger
+from ..valueref import ensure_ir, wrap_value
+
+
+class prefetch(BuiltinFunction):
+    """prefetch(p) / prefetch(p, write) -> None
+
+    Hint that the memory at pointer *p* will be read (or, with a true
+    constant *write*, written) soon, so the CPU can start loading its cache
+    line.  Lowers to ``llvm.prefetch`` with maximum temporal locality; it
+    never faults, so *p* may point anywhere.
+    """
+
+    @classmethod
+    def get_name(cls) -> str:
+        return 'prefetch'
+
+    @classmethod
+    def handle_type_call(cls, visitor, func_ref, args, node: ast.Call):
+        from .types import void
+
+        if len(args) not in (1, 2):
+            logger.error(
+                "prefetch() takes 1 or 2 arguments",
+                node=node, exc_type=TypeError,
+            )
+        rw = 0
+        if len(args) == 2:
+            if not args[1].is_python_value():
+                logger.error(
+                    "prefetch(): 'write' must be a compile-time constant",
+                    node=node, exc_type=TypeError,
+                )
+            rw = 1 if args[1].get_python_value() else 0
+
+        addr = ensure_ir(args[0])
+        if not isinstance(addr.type, ir.PointerType):
+            logger.error(
+                f"prefetch() expects a pointer, got {addr.type}",
+                node=node, exc_type=TypeError,
+            )
+        i8_ptr = ir.IntType(8).as_pointer()
+        if addr.type != i8_ptr:
+            addr = visitor.builder.bitcast(addr, i8_ptr)
+
+        i32 = ir.IntType(32)
+        name = 'llvm.prefetch.p0'
+        try:
+            fn = visitor.module.get_global(name)
+        except KeyError:
+            fn = ir.Function(
+                visitor.module,
+                ir.FunctionType(ir.VoidType(), [i8_ptr, i32, i32, i32]),
+                name,
+            )
+        # locality 3: keep in all cache levels; cache type 1: data.
+        visitor.builder.call(fn, [
+            addr, ir.Constant(i32, rw), ir.Constant(i32, 3), ir.Constant(i32, 1),
+        ])
+        return wrap_value(None, kind='python', type_hint=void)
@@ -5,6 +5,7 @@ Public API:
 - ``normalize_ast_call_args``  -- AST visit_Call path (keyword binding + carrier packing)
 - ``normalize_typed_collectors`` -- func.handle_call convergence point (carrier packing only)
 - ``pack_native_call_args``    -- Python wrapper -> native call (ctypes struct packing)
+- ``native_call_packs_args``   -- whether a positional native call needs packing
 - ``build_varargs_carrier``    -- pc_tuple carrier builder (shared by the above)
 - ``build_kwargs_carrier``     -- pc_dict carrier builder (shared by the above)
 - ``lower_compile_handle_call``-- shared handle_call for @compile / meta compile_api wrappers
@@ -300,6 +301,19 @@ def lower_compile_handle_call(wrapper, visitor, func_ref, args, node):
 # Python-side native wrapper binding
 # ---------------------------------------------------------------------------
 
+def native_call_packs_args(wrapper) -> bool:
+    """Whether ``pack_native_call_args`` may change a call without kwargs.
+
+    Only typed ``*args`` / ``**kwargs`` collectors are rebuilt; every other
+    positional call is passed through, so callers can skip packing.
+    """
+    func_info = getattr(wrapper, '_func_info', None)
+    if func_info is None:
+        return False
+    return bool(getattr(func_info, 'has_varargs', False)
+                or getattr(func_info, 'has_kwargs', False))
+
+
 def pack_native_call_args(wrapper, args: tuple, kwargs: dict) -> tuple:
     """Bind Python call arguments and lower typed collectors for native calls.
 
@@ -84,6 +84,7 @@ def lower_compile_wrapper(
     _ensure_materialized(func_info)
 
     # --- Step 4: Record group dependency ---
+    _reject_jit_callee(binding_state, caller_group_key, node)
     _record_dependency(func_info, binding_state, caller_group_key)
 
     # --- Step 5: Declare or find function in module ---
@@ -105,6 +106,20 @@ def _ensure_materialized(func_info):
         materialize_specialization(callee_w, DEFAULT_EFFECT_KEY, {})
 
 
+def _reject_jit_callee(binding_state, caller_group_key, node=None):
+    """@jit code lives only in memory: shared libraries cannot call it."""
+    if not binding_state.jit or not caller_group_key:
+        return
+    from .build.output_manager import get_output_manager
+    caller_group = get_output_manager().get_group(caller_group_key)
+    if caller_group is not None and not caller_group.get('jit'):
+        logger.error(
+            f"Cannot call @jit function '{binding_state.original_name}' from "
+            f"a @compile function; make the caller @jit too",
+            node=node, exc_type=TypeError,
+        )
+
+
 def _record_dependency(func_info, binding_state, caller_group_key):
     """Record group dependency (caller -> callee).
 
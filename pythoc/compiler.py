@@ -4,9 +4,10 @@ Enhanced version with modular architecture and comprehensive functionality
 """
 
 import ast
+import functools
 import sys
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from llvmlite import ir, binding
 from .ast_visitor import LLVMIRVisitor
 from .registry import get_unified_registry
@@ -29,6 +30,43 @@ binding.initialize_native_asmparser()
 _USE_NEW_PM = not hasattr(binding, 'create_function_pass_manager')
 
 
+@functools.lru_cache(maxsize=None)
+def _host_cpu():
+    """Return (name, feature string) of the host CPU."""
+    return binding.get_host_cpu_name(), binding.get_host_cpu_features().flatten()
+
+
+def target_machine_options() -> Dict[str, str]:
+    """Return the ``cpu``/``features`` target machine options from config.
+
+    ``"native"`` resolves to the host CPU name / feature string, like
+    ``-march=native``.  ``target_cpu="native"`` also implies the host
+    features unless ``target_features`` is set explicitly.  Empty values keep
+    LLVM's baseline for the triple.
+    """
+    cpu = (config.target_cpu or '').strip()
+    features = (config.target_features or '').strip()
+    if cpu == 'native':
+        cpu = _host_cpu()[0]
+        if not features:
+            features = 'native'
+    if features == 'native':
+        features = _host_cpu()[1]
+    return {'cpu': cpu, 'features': features}
+
+
+def _create_target_machine(triple: str, target_options=None, **kwargs):
+    """Create a target machine for *triple* honoring the configured CPU."""
+    if target_options is None:
+        target_options = target_machine_options()
+    target = binding.Target.from_triple(triple)
+    return target.create_target_machine(
+        cpu=target_options['cpu'],
+        features=target_options['features'],
+        **kwargs,
+    )
+
+
 @dataclass
 class _ResolvedFunctionDeclaration:
     """Compiler-local callable declaration data."""
@@ -50,7 +88,9 @@ class LLVMCompiler:
     def __init__(self, user_globals=None):
         self.module = None
         self.compiled_functions = []
-        # Optimized IR text cache, invalidated whenever a new body is added.
+        # Optimized module (binding ModuleRef) and its lazily printed IR text,
+        # invalidated whenever a new body is added.
+        self._optimized_module = None
         self._optimized_ir = None
         self._debug_info = None
 
@@ -71,8 +111,7 @@ class LLVMCompiler:
             triple = triple.replace('-windows-msvc', '-windows-gnu')
         self.module.triple = triple
         # Set data layout for correct struct size calculation
-        target = binding.Target.from_triple(self.module.triple)
-        target_machine = target.create_target_machine()
+        target_machine = _create_target_machine(self.module.triple)
         self.module.data_layout = target_machine.target_data
         return self.module
     
@@ -223,6 +262,7 @@ class LLVMCompiler:
         logger.debug(f"compile_function_from_ast: {ast_node.name}")
 
         # Any new body added to the module invalidates previously cached optimized IR.
+        self._optimized_module = None
         self._optimized_ir = None
 
         # Only create a fresh module if requested or if no module exists
@@ -596,6 +636,9 @@ class LLVMCompiler:
     
     def get_ir(self) -> str:
         """Return LLVM IR as text, preferring the optimized version if present."""
+        if self._optimized_ir is None and self._optimized_module is not None:
+            # Optimized IR lives as a ModuleRef; print it only on demand.
+            self._optimized_ir = str(self._optimized_module)
         if self._optimized_ir:
             return self._optimized_ir
         if self.module is None:
@@ -609,15 +652,22 @@ class LLVMCompiler:
         
         with open(filename, 'w') as f:
             f.write(self.get_ir())
-    
-    def verify_module(self) -> bool:
-        """Verify the LLVM module"""
+
+    def parse_module(self, ir_text: Optional[str] = None):
+        """Parse and verify the LLVM module, returning a binding ModuleRef.
+
+        This is the only IR text round-trip of the build pipeline:
+        optimization and object emission then work on the returned ModuleRef
+        in place.  *ir_text* replaces the printed module (e.g. a variant with
+        reused functions only declared).  Returns None when there is no
+        module.
+        """
         if self.module is None:
-            return False
+            return None
         
         # Parse the module to check for errors
         try:
-            module_str = str(self.module)
+            module_str = str(self.module) if ir_text is None else ir_text
             llvm_module = binding.parse_assembly(module_str)
             llvm_module.verify()
         except Exception as e:
@@ -625,7 +675,7 @@ class LLVMCompiler:
             import tempfile
             import os
             try:
-                ir_str = str(self.module)
+                ir_str = module_str
                 # Create temp file in system temp directory
                 fd, ir_path = tempfile.mkstemp(suffix='.ll', prefix='pythoc_error_')
                 with os.fdopen(fd, 'w') as f:
@@ -634,9 +684,15 @@ class LLVMCompiler:
             except Exception as write_err:
                 logger.error(f"Verification failed: {e}\n(Failed to write IR: {write_err})")
             raise e
-        return True
+        return llvm_module
     
-    def optimize_module(self, optimization_level: int = 2):
+    def verify_module(self) -> bool:
+        """Verify the LLVM module"""
+        return self.parse_module() is not None
+    
+    def optimize_module(
+        self, optimization_level: int = 2, llvm_module=None, inline_threshold=None
+    ):
         """Optimize the LLVM module.
 
         The pipeline runs multiple FPM<->MPM rounds so that inlining exposes
@@ -644,53 +700,175 @@ class LLVMCompiler:
 
         Supports both the legacy pass manager (llvmlite <0.45) and the new
         pass manager (llvmlite >=0.45) transparently.
+
+        Args:
+            optimization_level: LLVM optimization level (0..3)
+            llvm_module: ModuleRef from :meth:`parse_module` to optimize in
+                place; parsed from the module when omitted
+            inline_threshold: Profile-derived inline threshold, see
+                :meth:`optimize_llvm_module`
         """
         if self.module is None:
             return
 
-        try:
-            llvm_module = binding.parse_assembly(str(self.module))
-            ir_text = str(llvm_module)
+        if llvm_module is None:
+            llvm_module = self.parse_module()
+        self.optimize_llvm_module(
+            llvm_module, optimization_level, inline_threshold=inline_threshold)
+        self._optimized_module = llvm_module
+        self._optimized_ir = None
 
+    def set_optimized_ir(self, ir_text: str):
+        """Adopt optimized IR produced outside this compiler (e.g. by a worker)."""
+        self._optimized_module = None
+        self._optimized_ir = ir_text
+
+    @staticmethod
+    def optimize_llvm_module(
+        llvm_module, optimization_level: int = 2, target_options=None, vectorize=None,
+        inline_threshold=None,
+    ):
+        """Run the optimization pipeline in place on a binding ModuleRef.
+
+        O0-O2 run pythoc's own pass sets.  O3 runs LLVM's default per-module
+        pipeline, which adds LICM, loop-idiom recognition and (unless
+        *vectorize* is false) the loop and SLP vectorizers.
+
+        *target_options* (see :func:`target_machine_options`) and *vectorize*
+        default to the current config.  An explicit *inline_threshold* (from
+        a PGO profile) replaces the static 225/500 and selects the default
+        pipeline from O2 on, since pythoc's own O2 pass set has no
+        cost-model inliner.
+        """
+        try:
+            if target_options is None:
+                target_options = target_machine_options()
+            if vectorize is None:
+                vectorize = bool(config.vectorize)
             rounds = 1 if optimization_level <= 1 else 2
-            inline_threshold = 225 if optimization_level <= 2 else 500
+            default_pipeline = optimization_level >= 3
+            if inline_threshold is None:
+                inline_threshold = 225 if optimization_level <= 2 else 500
+            elif optimization_level >= 2:
+                default_pipeline = True
+
+            if default_pipeline:
+                LLVMCompiler._run_default_pipeline(
+                    llvm_module, optimization_level, inline_threshold,
+                    target_options, vectorize)
+                return
 
             for _ in range(rounds):
-                ir_text = self._run_function_passes(ir_text, optimization_level)
-                ir_text = self._run_module_passes(
-                    ir_text, optimization_level, inline_threshold)
+                LLVMCompiler._run_function_passes(
+                    llvm_module, optimization_level, target_options)
+                LLVMCompiler._run_module_passes(
+                    llvm_module, optimization_level, inline_threshold, target_options)
 
             # Final FPM cleanup after the last inlining round
-            ir_text = self._run_function_passes(ir_text, optimization_level)
-
-            self._optimized_ir = ir_text
+            LLVMCompiler._run_function_passes(
+                llvm_module, optimization_level, target_options)
 
         except Exception as e:
             raise RuntimeError(f"Optimization failed: {e}")
 
     @staticmethod
-    def _run_function_passes(ir_text: str, opt_level: int) -> str:
-        """Run function-level optimization passes."""
+    def optimize_whole_program(
+        llvm_module, optimization_level: int = 2, target_options=None, vectorize=None
+    ):
+        """Optimize a module merged from several groups (link-time pipeline).
+
+        Always runs LLVM's default pipeline, at O2 or above: unlike pythoc's
+        own O2 pass set it includes the cost-model inliner, so calls across
+        former group boundaries are inlined and internalized leftovers are
+        removed by global DCE.
+        """
+        try:
+            if target_options is None:
+                target_options = target_machine_options()
+            if vectorize is None:
+                vectorize = bool(config.vectorize)
+            optimization_level = max(optimization_level, 2)
+            inline_threshold = 225 if optimization_level <= 2 else 500
+            LLVMCompiler._run_default_pipeline(
+                llvm_module, optimization_level, inline_threshold,
+                target_options, vectorize)
+        except Exception as e:
+            raise RuntimeError(f"Link-time optimization failed: {e}")
+
+    @staticmethod
+    def drop_unreferenced_globals(llvm_module):
+        """Run global DCE in place: drop unreferenced discardable globals."""
         if _USE_NEW_PM:
-            return LLVMCompiler._run_function_passes_new(ir_text, opt_level)
-        return LLVMCompiler._run_function_passes_legacy(ir_text, opt_level)
+            pb = LLVMCompiler._make_pass_builder(llvm_module)
+            pm = binding.create_new_module_pass_manager()
+            pm.add_global_dead_code_eliminate_pass()
+            pm.run(llvm_module, pb)
+            return
+        pm = binding.create_module_pass_manager()
+        pm.add_global_dce_pass()
+        pm.run(llvm_module)
+
+    @staticmethod
+    def _run_function_passes(llvm_module, opt_level: int, target_options=None):
+        """Run function-level optimization passes in place."""
+        if _USE_NEW_PM:
+            return LLVMCompiler._run_function_passes_new(
+                llvm_module, opt_level, target_options)
+        return LLVMCompiler._run_function_passes_legacy(llvm_module, opt_level)
 
     @staticmethod
     def _run_module_passes(
-        ir_text: str, opt_level: int, inline_threshold: int
-    ) -> str:
-        """Run module-level optimization passes."""
+        llvm_module, opt_level: int, inline_threshold: int, target_options=None
+    ):
+        """Run module-level optimization passes in place."""
         if _USE_NEW_PM:
             return LLVMCompiler._run_module_passes_new(
-                ir_text, opt_level, inline_threshold)
+                llvm_module, opt_level, inline_threshold, target_options)
         return LLVMCompiler._run_module_passes_legacy(
-            ir_text, opt_level, inline_threshold)
+            llvm_module, opt_level, inline_threshold)
+
+    @staticmethod
+    def _run_default_pipeline(
+        llvm_module, opt_level: int, inline_threshold: int,
+        target_options=None, vectorize: bool = True,
+    ):
+        """Run LLVM's default per-module pipeline in place."""
+        if _USE_NEW_PM:
+            return LLVMCompiler._run_default_pipeline_new(
+                llvm_module, opt_level, inline_threshold, target_options, vectorize)
+        return LLVMCompiler._run_default_pipeline_legacy(
+            llvm_module, opt_level, inline_threshold, target_options, vectorize)
 
     # ---- Legacy pass manager (llvmlite <0.45, LLVM 14) ----
 
     @staticmethod
-    def _run_function_passes_legacy(ir_text: str, opt_level: int) -> str:
-        llvm_module = binding.parse_assembly(ir_text)
+    def _run_default_pipeline_legacy(
+        llvm_module, opt_level: int, inline_threshold: int,
+        target_options=None, vectorize: bool = True,
+    ):
+        tm = _create_target_machine(llvm_module.triple, target_options)
+        pmb = binding.create_pass_manager_builder()
+        pmb.opt_level = opt_level
+        pmb.inlining_threshold = inline_threshold
+        pmb.loop_vectorize = vectorize
+        pmb.slp_vectorize = vectorize
+
+        fpm = binding.create_function_pass_manager(llvm_module)
+        pm = binding.create_module_pass_manager()
+        tm.add_analysis_passes(fpm)
+        tm.add_analysis_passes(pm)
+        pmb.populate(fpm)
+        pmb.populate(pm)
+
+        fpm.initialize()
+        for func in llvm_module.functions:
+            if not func.is_declaration:
+                fpm.run(func)
+        fpm.finalize()
+        pm.run(llvm_module)
+
+    @staticmethod
+    def _run_function_passes_legacy(llvm_module, opt_level: int):
         fpm = binding.create_function_pass_manager(llvm_module)
 
         fpm.add_sroa_pass()
@@ -729,13 +907,11 @@ class LLVMCompiler:
             if not func.is_declaration:
                 fpm.run(func)
         fpm.finalize()
-        return str(llvm_module)
 
     @staticmethod
     def _run_module_passes_legacy(
-        ir_text: str, opt_level: int, inline_threshold: int
-    ) -> str:
-        llvm_module = binding.parse_assembly(ir_text)
+        llvm_module, opt_level: int, inline_threshold: int
+    ):
         pm = binding.create_module_pass_manager()
 
         if opt_level >= 1:
@@ -750,22 +926,36 @@ class LLVMCompiler:
             pm.add_global_dce_pass()
 
         pm.run(llvm_module)
-        return str(llvm_module)
 
     # ---- New pass manager (llvmlite >=0.45, LLVM 18+) ----
 
     @staticmethod
-    def _make_pass_builder(llvm_module):
+    def _make_pass_builder(llvm_module, target_options=None):
         """Create a PassBuilder for the new pass manager API."""
-        target = binding.Target.from_triple(llvm_module.triple)
-        tm = target.create_target_machine()
+        tm = _create_target_machine(llvm_module.triple, target_options)
         pto = binding.create_pipeline_tuning_options()
         return binding.create_pass_builder(tm, pto)
 
     @staticmethod
-    def _run_function_passes_new(ir_text: str, opt_level: int) -> str:
-        llvm_module = binding.parse_assembly(ir_text)
-        pb = LLVMCompiler._make_pass_builder(llvm_module)
+    def _run_default_pipeline_new(
+        llvm_module, opt_level: int, inline_threshold: int,
+        target_options=None, vectorize: bool = True,
+    ):
+        tm = _create_target_machine(llvm_module.triple, target_options)
+        pto = binding.create_pipeline_tuning_options(speed_level=opt_level)
+        pto.inlining_threshold = inline_threshold
+        pto.loop_vectorization = vectorize
+        pto.slp_vectorization = vectorize
+        pto.loop_interleaving = vectorize
+        pto.loop_unrolling = True
+        pb = binding.create_pass_builder(tm, pto)
+        pb.getModulePassManager().run(llvm_module, pb)
+
+    @staticmethod
+    def _run_function_passes_new(llvm_module, opt_level: int, target_options=None):
+        # A fresh PassBuilder per pass manager: reusing one across the
+        # pipeline keeps stale analyses alive and measured slower.
+        pb = LLVMCompiler._make_pass_builder(llvm_module, target_options)
         fpm = binding.create_new_function_pass_manager()
 
         fpm.add_sroa_pass()
@@ -784,6 +974,7 @@ class LLVMCompiler:
             fpm.add_simplify_cfg_pass()
 
             # LICM is not exposed in the new PM; loop-rotate + delete suffice.
+            # O3 gets LICM from the default pipeline instead.
             fpm.add_loop_rotate_pass()
             fpm.add_loop_deletion_pass()
 
@@ -802,14 +993,12 @@ class LLVMCompiler:
         for func in llvm_module.functions:
             if not func.is_declaration:
                 fpm.run(func, pb)
-        return str(llvm_module)
 
     @staticmethod
     def _run_module_passes_new(
-        ir_text: str, opt_level: int, inline_threshold: int
-    ) -> str:
-        llvm_module = binding.parse_assembly(ir_text)
-        pb = LLVMCompiler._make_pass_builder(llvm_module)
+        llvm_module, opt_level: int, inline_threshold: int, target_options=None
+    ):
+        pb = LLVMCompiler._make_pass_builder(llvm_module, target_options)
         pm = binding.create_new_module_pass_manager()
 
         if opt_level >= 1:
@@ -824,28 +1013,36 @@ class LLVMCompiler:
             pm.add_global_dead_code_eliminate_pass()
 
         pm.run(llvm_module, pb)
-        return str(llvm_module)
     
     def compile_to_object(self, filename: str):
         """Compile the LLVM IR to an object file"""
         if self.module is None:
             raise RuntimeError("No module to compile")
         
-        # Use optimized IR if available, otherwise use original module
-        ir_to_compile = self.get_ir()
-        
-        # Parse the IR
-        llvm_module = binding.parse_assembly(ir_to_compile)
+        # Use the optimized ModuleRef if available, otherwise parse the IR
+        if self._optimized_module is not None:
+            llvm_module = self._optimized_module
+        else:
+            llvm_module = binding.parse_assembly(self.get_ir())
         
+        # Compile to object code
+        with open(filename, 'wb') as f:
+            f.write(self.emit_object(llvm_module))
+
+    @staticmethod
+    def emit_object(llvm_module, target_options=None) -> bytes:
+        """Emit object code for a binding ModuleRef, targeting its triple.
+
+        *target_options* (see :func:`target_machine_options`) defaults to
+        the current config.
+        """
         # Create a target machine with PIC relocation model
         # This is critical for shared libraries to support lazy symbol resolution
         # and circular dependencies between .so files
-        target = binding.Target.from_triple(self.module.triple)
-        target_machine = target.create_target_machine(reloc='pic', codemodel='default')
-        
-        # Compile to object code
-        with open(filename, 'wb') as f:
-            f.write(target_machine.emit_object(llvm_module))
+        target_machine = _create_target_machine(
+            llvm_module.triple, target_options, reloc='pic', codemodel='default',
+        )
+        return target_machine.emit_object(llvm_module)
     
     def compile_to_executable(self, output_name: str, obj_file: str):
         """
@@ -873,4 +1070,36 @@ class LLVMCompiler:
         
         # Use the unified link_executable function
         link_executable([obj_file], output_name)
-        return True
\ No newline at end of file
+        return True
+
+
+def optimize_and_emit_object(
+    ir_text: str, optimization_level: int, target_options=None, vectorize=None,
+    inline_threshold=None, reuse=None, want_ir=False, want_bitcode=False,
+):
+    """Optimize IR text and emit it as an object file.
+
+    Module-level so it can be shipped to a process-pool worker; only the IR
+    text crosses the process boundary.  Workers do not see config changes
+    made after they were forked, so callers pass *target_options* and
+    *vectorize* resolved in the parent.
+
+    *reuse* is an optional (cached bitcode, function names) pair whose
+    optimized bodies are linked in after optimization (see
+    :mod:`pythoc.build.fncache`).
+
+    Returns:
+        (optimized IR text if *want_ir*, optimized bitcode if
+        *want_bitcode*, object file bytes); what was not asked for is None
+    """
+    llvm_module = binding.parse_assembly(ir_text)
+    LLVMCompiler.optimize_llvm_module(
+        llvm_module, optimization_level, target_options, vectorize, inline_threshold)
+    if reuse is not None:
+        from .build.fncache import link_reused_functions
+        link_reused_functions(llvm_module, *reuse)
+    return (
+        str(llvm_module) if want_ir else None,
+        llvm_module.as_bitcode() if want_bitcode else None,
+        LLVMCompiler.emit_object(llvm_module, target_options),
+    )
@@ -185,15 +185,125 @@ _register(
 )
 _register(
     'opt_level', 'PC_OPT_LEVEL', 2, _to_int,
-    'LLVM optimisation level (0..3) applied before object emission.',
+    'LLVM optimisation level (0..3) applied before object emission.  '
+    'O3 runs LLVM\'s default per-module pipeline (LICM, loop idioms, '
+    'vectorization).',
     'Sampled when each compile group is flushed.',
 )
+_register(
+    'vectorize', 'PC_VECTORIZE', True, _to_bool,
+    'Run the loop and SLP vectorizers in the O3 pipeline.  Part of the '
+    'object cache key.',
+    'Sampled when each compile group is flushed.',
+)
+_register(
+    'lto', 'PC_LTO', False, _to_bool,
+    'Link-time optimization: each group also keeps its bitcode next to '
+    'the .o, and compile_to_executable / compile_to_dynamic_library merge '
+    'the selected groups\' bitcode, internalize unexported symbols and '
+    'optimize the whole program into one object.  Part of the object '
+    'cache key.',
+    'Sampled when each compile group is flushed and at link time.',
+)
+_register(
+    'pgo_generate', 'PC_PGO_GENERATE', None, _to_str,
+    'Profile path for an instrumented (PGO phase 1) build.  Every group '
+    'counts function entries and conditional-branch outcomes; the counts '
+    'of loaded groups are merged into this file when the process exits.  '
+    'Part of the object cache key.',
+    'Sampled when each compile group is flushed and at process exit.',
+)
+_register(
+    'pgo_use', 'PC_PGO_USE', None, _to_str,
+    'Profile written by a pgo_generate run (PGO phase 2).  Recorded counts '
+    'become branch weights and function entry counts, and raise the inline '
+    'threshold of groups with hot code.  The profile\'s content is part of '
+    'the object cache key.',
+    'Sampled when each compile group is flushed.',
+)
+_register(
+    'function_cache', 'PC_FUNCTION_CACHE', True, _to_bool,
+    'Keep each rebuilt group\'s optimized module next to its .o and, on '
+    'the next rebuild, reuse the optimized bodies of functions whose IR, '
+    'callees, globals and type layouts are unchanged, so only edited '
+    'functions and their callers are re-optimized.  Inactive at O0, with '
+    'debug_info and with pgo_generate.',
+    'Sampled when each compile group is flushed.',
+)
+_register(
+    'binding_snapshots', 'PC_BINDING_SNAPSHOTS', True, _to_bool,
+    'Persist the signatures of each compiled group\'s functions with its '
+    'deps record, and bind @compile functions of groups whose object is '
+    'still fresh from that snapshot: no getsource, parse or annotation '
+    'resolution unless the group actually has to be recompiled.',
+    'Read when each @compile function is registered and when its group '
+    'is flushed.',
+)
+_register(
+    'merged_library', 'PC_MERGED_LIBRARY', False, _to_bool,
+    'Link every flushed group object into one process-wide shared library '
+    '(build/_merged/) instead of loading one library per group, so native '
+    'symbols resolve through a single handle.  Groups first needed after '
+    'it was loaded go into one more merged library, linked against the '
+    'earlier ones.',
+    'Read on the first native call of each @compile function.',
+)
+_register(
+    'async_workers', 'PC_ASYNC_WORKERS', 0, _to_int,
+    'Worker threads running fn.async_call() calls.  0 uses one per CPU.',
+    'Read when the first fn.async_call() creates the worker pool.',
+)
 _register(
     'debug_info', 'PC_DEBUG_INFO', False, _to_bool,
     'Emit DWARF debug info (line tables for functions/source lines) into '
     'object files and linked binaries.',
     'Sampled when each compile group is flushed.',
 )
+_register(
+    'target_cpu', 'PC_TARGET_CPU', '', _to_str,
+    'CPU to generate code for, e.g. "skylake" or "native" for the host '
+    'CPU (the -march=native equivalent; also implies the host features '
+    'unless target_features is set).  Empty targets the triple\'s '
+    'baseline CPU.  Part of the object cache key.',
+    'Sampled when each compile group is flushed.',
+)
+_register(
+    'target_features', 'PC_TARGET_FEATURES', '', _to_str,
+    'LLVM target feature string, e.g. "+avx2,+fma", or "native" for the '
+    'host CPU features.  Empty uses the target CPU\'s defaults.  Part of '
+    'the object cache key.',
+    'Sampled when each compile group is flushed.',
+)
+_register(
+    'build_executor', 'PC_BUILD_EXECUTOR', 'thread',
+    lambda s: s.strip().lower(),
+    'Executor kind for object builds: "thread" or "process".  "process" '
+    'ships each group\'s IR text to a forked worker pool that optimizes '
+    'it and returns the object bytes, so the LLVM back end scales across '
+    'cores.  The pool has one worker per CPU and is forked once, when '
+    'pythoc is imported with PC_BUILD_EXECUTOR=process or else at the '
+    'first flush.  PC_OBJECT_BUILD_WORKERS bounds how many groups build '
+    'at once (default one per CPU; thread builds default to one).  Falls '
+    'back to threads where fork is unavailable or other threads are '
+    'running when the pool would be forked.',
+    'Read at the start of each flush.',
+)
+_register(
+    'cache_dir', 'PC_CACHE_DIR', None, _to_str,
+    'Root of a shared, content-addressed object cache.  Group objects '
+    'are published here after compilation and restored into the local '
+    'build/ tree on a cache miss, so separate processes, checkouts and '
+    'machines sharing the directory compile each group once.  None '
+    'disables the shared cache.',
+    'Read when each compile group is cache-checked or published.',
+)
+_register(
+    'cache_max_size', 'PC_CACHE_MAX_SIZE', 2048, _to_int,
+    'Size bound of the shared object cache in MiB.  Least recently used '
+    'entries are evicted once a flush publishes new objects past it; the '
+    'store is only scanned when its tracked size crosses the bound.',
+    'Read after each flush that published into the shared cache.',
+)
 
 
 # --- cimport / external toolchain ----------------------------------------
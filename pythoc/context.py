@@ -54,6 +54,8 @@ class FunctionBindingState:
     compiler: Optional[Any] = None
     so_file: Optional[str] = None
     is_template: bool = False
+    # Compiled into the in-process JIT (@jit) instead of a shared library.
+    jit: bool = False
     captured_effect_context: Optional[Any] = None
     effect_override_names: Optional[Any] = None
     captured_symbols: Optional[Any] = None
@@ -43,6 +43,8 @@ def clear_registry():
     from ..native_executor import get_multi_so_executor
     executor = get_multi_so_executor()
     executor.clear()
+    from ..jit_executor import get_jit_executor
+    get_jit_executor().clear()
 
 
 def get_function_source(func_name, source_file=None):
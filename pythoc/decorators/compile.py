@@ -13,16 +13,17 @@ from functools import wraps
 import inspect
 import os
 import ast
+import hashlib
 import sys
 from typing import Any, List, Optional
 
-from ..call_normalization import pack_native_call_args
+from ..call_normalization import native_call_packs_args, pack_native_call_args
 
 # Sentinel value to distinguish "not provided" from "provided as None"
 _SCOPE_NOT_PROVIDED = object()
 
 from ..compiler import LLVMCompiler
-from ..registry import register_struct_from_class, _unified_registry
+from ..registry import register_struct_from_class, _unified_registry, FunctionInfo
 from ..context import FunctionBindingState
 
 from .structs import (
@@ -39,12 +40,15 @@ from ..utils import (
     get_build_paths,
     normalize_suffix,
     get_function_file_and_source,
+    get_function_file_with_inspect,
     get_function_start_line,
 )
 from ..build import (
     get_output_manager,
     flush_all_pending_outputs,
 )
+from ..build.bindings import decode_binding
+from ..config import config
 from ..logger import logger, set_source_context
 
 
@@ -469,6 +473,7 @@ def _materialize_single_specialization(template_wrapper, effect_key, effect_bind
             captured_symbols=state.captured_symbols,
             effect_scope=original_scope,
             effect_override_names=effect_override_names,
+            jit=state.jit,
         )
 
     state.effect_specialized_cache[effect_key] = specialized_wrapper
@@ -759,7 +764,7 @@ def get_compiler(source_file, user_globals, has_suffix=False):
     return compiler
 
 
-def compile(func_or_class=None, suffix=None, attrs=None,
+def compile(func_or_class=None, suffix=None, attrs=None, nogil=False,
             _effect_suffix=None, _effect_scope=_SCOPE_NOT_PROVIDED):
     """
     Compile a Python function or class to native code.
@@ -771,6 +776,10 @@ def compile(func_or_class=None, suffix=None, attrs=None,
         attrs: Set of LLVM function-level attributes (e.g. {'readnone', 'nounwind'}).
                Applied to cross-module `declare` so the optimizer can treat calls
                as pure/no-side-effect, enabling CSE and store forwarding.
+        nogil: Guarantee that calls from Python run without the GIL, so
+               Python threads can run the function in parallel.  Rejected
+               (TypeError) if a parameter could make the call re-enter
+               Python, see ``_require_nogil``.
         _effect_suffix: Internal parameter for effect override (from with effect(suffix=X)).
                 This IS contagious - propagates to transitive calls that use effects.
         _effect_scope: Internal parameter for transitive effect compilation.
@@ -805,22 +814,20 @@ def compile(func_or_class=None, suffix=None, attrs=None,
     else:
         effect_suffix = _effect_suffix
     
-    if func_or_class is None:
-        def decorator(f):
-            return _compile_impl(f, 
+    def decorator(f):
+        if nogil and inspect.isclass(f):
+            raise TypeError(f"nogil applies to functions, not to class {f.__name__}")
+        wrapper = _compile_impl(f, 
                                 compile_suffix=compile_suffix,
                                 effect_suffix=effect_suffix,
                                 captured_symbols=captured_symbols,
                                 effect_scope=_effect_scope,
                                 fn_attrs=fn_attrs)
-        return decorator
+        return _require_nogil(wrapper) if nogil else wrapper
 
-    return _compile_impl(func_or_class, 
-                        compile_suffix=compile_suffix,
-                        effect_suffix=effect_suffix,
-                        captured_symbols=captured_symbols,
-                        effect_scope=_effect_scope,
-                        fn_attrs=fn_attrs)
+    if func_or_class is None:
+        return decorator
+    return decorator(func_or_class)
 
 
 def _compile_impl(func_or_class, 
@@ -829,7 +836,8 @@ def _compile_impl(func_or_class,
                   captured_symbols=None,
                   effect_scope=_SCOPE_NOT_PROVIDED,
                   effect_override_names=None,
-                  fn_attrs=None):
+                  fn_attrs=None,
+                  jit=False):
     """Internal implementation of compile decorator.
     
     Uses 4-tuple group_key: (source_file, scope, compile_suffix, effect_suffix)
@@ -843,6 +851,8 @@ def _compile_impl(func_or_class,
                      _SCOPE_NOT_PROVIDED means use get_definition_scope().
                      None means module-level scope.
         fn_attrs: Set of LLVM function-level attributes for cross-module declares.
+        jit: Run the group from the in-process JIT (see ``decorators.jit``)
+            instead of a shared library.
     """
     if inspect.isclass(func_or_class):
         return _compile_dynamic_class(
@@ -858,15 +868,23 @@ def _compile_impl(func_or_class,
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        binding = getattr(wrapper, '_binding', getattr(wrapper, '_state', None))
-        if binding and binding.is_template:
-            materialize_specialization(wrapper, DEFAULT_EFFECT_KEY, {})
-
-        if not hasattr(wrapper, '_native_func'):
-            wrapper._native_func = executor.execute_function(wrapper)
-
-        args = pack_native_call_args(wrapper, args, kwargs)
-        return wrapper._native_func(*args)
+        native_func = wrapper.__dict__.get('_native_func')
+        if native_func is None:
+            binding = getattr(wrapper, '_binding', getattr(wrapper, '_state', None))
+            if binding and binding.is_template:
+                materialize_specialization(wrapper, DEFAULT_EFFECT_KEY, {})
+            native_func = wrapper._native_func = executor.execute_function(wrapper)
+
+        if kwargs or native_call_packs_args(wrapper):
+            args = pack_native_call_args(wrapper, args, kwargs)
+        return native_func(*args)
+
+    snapshot_wrapper = _try_bind_from_snapshot(
+        func, wrapper, compile_suffix, effect_suffix, captured_symbols,
+        effect_scope, effect_override_names, fn_attrs,
+    )
+    if snapshot_wrapper is not None:
+        return snapshot_wrapper
     
     source_file, source_code = get_function_file_and_source(func)
     
@@ -1167,6 +1185,7 @@ def _compile_impl(func_or_class,
         name=func.__name__,
         source_file=source_file,
         source_code=func_source,
+        ast_hash=hashlib.sha256(ast.dump(func_ast).encode('utf-8')).hexdigest()[:16],
         return_type_hint=return_type_hint,
         param_type_hints=param_type_hints,
         param_names=param_names,
@@ -1177,14 +1196,45 @@ def _compile_impl(func_or_class,
         has_kwargs=resolved_kwargs.is_typed,
     )
 
-    group_compiler = compiler
-    
+    return _register_wrapper(
+        wrapper, func_info, compiler, group_key, (ir_file, obj_file, so_file),
+        mangled_name=mangled_name,
+        actual_func_name=actual_func_name,
+        compile_suffix=compile_suffix,
+        effect_suffix=effect_suffix,
+        captured_symbols=captured_symbols,
+        effect_override_names=effect_override_names,
+        user_globals=user_globals,
+        load_source=lambda: (func_ast, func_source, start_line),
+        jit=jit,
+    )
+
+
+def _register_wrapper(wrapper, func_info, compiler, group_key, paths, *,
+                      mangled_name, actual_func_name, compile_suffix,
+                      effect_suffix, captured_symbols, effect_override_names,
+                      user_globals, load_source, jit=False):
+    """Bind *wrapper* to its group and queue its deferred compilation.
+
+    Args:
+        wrapper: The @compile wrapper being registered
+        func_info: FunctionInfo with the resolved signature
+        compiler: Compiler of the function's source file
+        group_key: 4-tuple group key
+        paths: (ir_file, obj_file, so_file) of the group
+        load_source: Returns ``(func_ast, func_source, start_line)``; only
+            called when the function is actually lowered
+        jit: Whether the group runs from the in-process JIT
+    """
+    source_file = func_info.source_file
+    ir_file, obj_file, so_file = paths
+    output_manager = get_output_manager()
     group = output_manager.get_or_create_group(
-        group_key, group_compiler, ir_file, obj_file, so_file, 
-        source_file
+        group_key, compiler, ir_file, obj_file, so_file, 
+        source_file, jit=jit,
     )
     compiler = group['compiler']
-    logger.debug(f"@compile {func.__name__}: group_key={group_key}")
+    logger.debug(f"@compile {func_info.name}: group_key={group_key}")
     
     from ..effect import capture_effect_context, capture_effect_override_names
     from ..effect import restore_effect_context
@@ -1202,7 +1252,7 @@ def _compile_impl(func_or_class,
         so_file=so_file,
         source_file=source_file,
         mangled_name=mangled_name,
-        original_name=func.__name__,
+        original_name=func_info.name,
         actual_func_name=actual_func_name,
         group_key=group_key,
         compile_suffix=compile_suffix,
@@ -1212,6 +1262,7 @@ def _compile_impl(func_or_class,
         captured_symbols=captured_symbols,
         compilation_globals=dict(user_globals),
         wrapper=wrapper,
+        jit=jit,
     )
     func_info.binding_state = binding_state
     wrapper._func_info = func_info
@@ -1219,16 +1270,9 @@ def _compile_impl(func_or_class,
     wrapper._binding = binding_state
     wrapper._state = binding_state  # Compatibility alias; `_binding` is canonical.
 
-    # Always queue compilation callback - cache check is done at flush time
-    # These closure locals are needed because they are AST/source artifacts
-    # that don't belong on FunctionBindingState (they are compilation inputs,
-    # not per-function state).
-    _func_ast = func_ast
-    _func_source = func_source
-    _param_type_hints = param_type_hints
-    _return_type_hint = return_type_hint
-    _start_line = start_line
-
+    # Always queue compilation callback - cache check is done at flush time.
+    # The AST/source are compilation inputs, not per-function state, so they
+    # stay behind ``load_source`` rather than on FunctionBindingState.
     def compile_callback(comp):
         """Deferred compilation callback.
 
@@ -1236,6 +1280,7 @@ def _compile_impl(func_or_class,
         not from closure locals that duplicate the same data.
         """
         st = wrapper._binding
+        _func_ast, _func_source, _start_line = load_source()
         start_effect_tracking()
 
         if st.effect_suffix:
@@ -1250,8 +1295,8 @@ def _compile_impl(func_or_class,
                     _func_ast,
                     _func_source,
                     reset_module=False,
-                    param_type_hints=_param_type_hints,
-                    return_type_hint=_return_type_hint,
+                    param_type_hints=func_info.param_type_hints,
+                    return_type_hint=func_info.return_type_hint,
                     user_globals=st.compilation_globals,
                     group_key=st.group_key,
                     func_state=st,
@@ -1284,7 +1329,7 @@ def _compile_impl(func_or_class,
     if _should_be_template:
         binding_state.is_template = True
         binding_state.template_compile_callback = compile_callback
-        logger.debug(f"@compile {func.__name__}: created as template (suppress active)")
+        logger.debug(f"@compile {func_info.name}: created as template (suppress active)")
     else:
         output_manager.queue_compilation(group_key, compile_callback, func_info)
         binding_state.is_template = False
@@ -1317,10 +1362,185 @@ def _compile_impl(func_or_class,
         return lower_compile_handle_call(wrapper, visitor, func_ref, args, node)
 
     wrapper.handle_call = handle_call
+    _attach_call_api(wrapper)
     wrapper._is_compiled = True
     return wrapper
 
 
+def _require_nogil(wrapper):
+    """
+    Check that calls to a @compile function can run without the GIL.
+
+    The native call itself always runs with the GIL released (ctypes drops
+    it around foreign calls); arguments are converted and buffers pinned
+    before, and the result converted after.  Such a call only takes the GIL
+    back if the native code calls into Python, which it can only do through
+    a function pointer (a ctypes callback) it is handed, directly or inside
+    a pointed-to struct or array.
+
+    Args:
+        wrapper: @compile function
+
+    Returns:
+        *wrapper*, marked ``nogil``
+
+    Raises:
+        TypeError: a function pointer is reachable from a parameter
+    """
+    func_info = getattr(wrapper, '_func_info', None)
+    if func_info is None:
+        raise TypeError(f"{wrapper!r} is not a @compile function")
+    for name in func_info.param_names:
+        pc_type = func_info.param_type_hints.get(name)
+        if _reaches_function_pointer(pc_type, set()):
+            raise TypeError(
+                f"{func_info.name}() cannot be nogil: parameter '{name}' is or "
+                f"refers to a function pointer, and Python callbacks need the GIL"
+            )
+    wrapper.nogil = True
+    return wrapper
+
+
+def _reaches_function_pointer(pc_type, seen):
+    """Whether a value of *pc_type* can lead native code to a function pointer.
+
+    Follows pointee, array element and struct/union field types; *seen*
+    holds the types already visited, so that self-referential structs end.
+    """
+    if not isinstance(pc_type, type) or pc_type in seen:
+        return False
+    seen.add(pc_type)
+    from ..builtin_entities import func as func_type
+    if issubclass(pc_type, func_type):
+        return True
+    for attr in ('pointee_type', 'element_type'):
+        if _reaches_function_pointer(getattr(pc_type, attr, None), seen):
+            return True
+    resolve = getattr(pc_type, '_ensure_field_types_resolved', None)
+    if resolve is not None:
+        try:
+            resolve()
+        except TypeError:
+            # A forward reference not defined yet; its fields stay strings
+            # and are skipped below.
+            pass
+    for field_type in getattr(pc_type, '_field_types', None) or ():
+        if _reaches_function_pointer(field_type, seen):
+            return True
+    return False
+
+
+def _attach_call_api(wrapper):
+    """Give a @compile wrapper its ``map`` / ``vectorize`` / ``async_call`` methods."""
+    def vectorize():
+        """Return the batched form of this function (see ``pythoc.vectorize``)."""
+        from ..vectorize import vectorize as vectorize_wrapper
+        return vectorize_wrapper(wrapper)
+
+    def map(*args, out=None):
+        """Call this function for every element of buffer arguments."""
+        return vectorize()(*args, out=out)
+
+    def async_call(*args, **kwargs):
+        """Run this function on a worker thread; returns an asyncio future."""
+        from ..aio import async_call as async_call_wrapper
+        return async_call_wrapper(wrapper, *args, **kwargs)
+
+    wrapper.vectorize = vectorize
+    wrapper.map = map
+    wrapper.async_call = async_call
+
+
+def _try_bind_from_snapshot(func, wrapper, compile_suffix, effect_suffix,
+                            captured_symbols, effect_scope,
+                            effect_override_names, fn_attrs):
+    """Bind a module-level function from its group's binding snapshot.
+
+    Skips ``getsource -> ast.parse -> annotation resolution`` when the
+    group's object is fresh and its deps record carries the function's
+    signature (see ``build.bindings``).  The source is only loaded if the
+    group has to be recompiled after all.
+
+    Returns:
+        The registered wrapper, or None to take the regular path
+    """
+    if not config.binding_snapshots:
+        return None
+    if (compile_suffix is not None or effect_suffix is not None
+            or effect_scope is not _SCOPE_NOT_PROVIDED
+            or effect_override_names is not None
+            or '<' in func.__qualname__ or hasattr(func, '__pc_source__')):
+        return None
+    from ..effect import is_effect_suffix_suppressed, effect as _effect_singleton
+    if (is_effect_suffix_suppressed()
+            and _effect_singleton._get_current_suffix() is not None):
+        return None
+
+    source_file = get_function_file_with_inspect(func)
+    if not source_file or not os.path.isfile(source_file):
+        return None
+    group_key = (source_file, None, None, None)
+    output_manager = get_output_manager()
+    group = output_manager.get_group(group_key)
+    if group is not None:
+        # Re-registrations keep the regular path and its wrapper reuse.
+        if group_key not in output_manager._pending_groups:
+            return None
+        for existing in group.get('all_wrappers', []):
+            binding = getattr(existing, '_binding', None)
+            if binding is not None and binding.original_name == func.__name__:
+                return None
+
+    _build_dir, ir_file, obj_file, so_file = get_build_paths(source_file)
+    deps = output_manager.binding_snapshot(group_key, source_file, obj_file)
+    if deps is None or func.__name__ not in deps.bindings:
+        return None
+    signature = decode_binding(deps.bindings[func.__name__], fn_attrs)
+    if signature is None:
+        return None
+
+    from .visible import get_all_accessible_symbols
+    user_globals = get_all_accessible_symbols(
+        func,
+        include_closure=True,
+        include_builtins=True,
+        captured_symbols=captured_symbols
+    )
+    compiler = get_compiler(source_file=source_file, user_globals=user_globals)
+    func_info = FunctionInfo(
+        name=func.__name__,
+        source_file=source_file,
+        ast_hash=deps.function_hashes.get(func.__name__),
+        overload_enabled=False,
+        fn_attrs=fn_attrs or set(),
+        **signature,
+    )
+
+    loaded = []
+
+    def load_source():
+        if not loaded:
+            _source_file, func_source = get_function_file_and_source(func)
+            _get_registry().register_function_source(
+                source_file, func.__name__, func_source)
+            func_ast = ast.parse(func_source).body[0]
+            loaded.append((func_ast, func_source, get_function_start_line(func)))
+        return loaded[0]
+
+    logger.debug(f"@compile {func.__name__}: bound from binding snapshot")
+    return _register_wrapper(
+        wrapper, func_info, compiler, group_key, (ir_file, obj_file, so_file),
+        mangled_name=None,
+        actual_func_name=func.__name__,
+        compile_suffix=None,
+        effect_suffix=None,
+        captured_symbols=captured_symbols,
+        effect_override_names=None,
+        user_globals=user_globals,
+        load_source=load_source,
+    )
+
+
 def _clone_binding_to_wrapper(binding, existing, wrapper):
     """Clone binding state from *existing* wrapper onto *new* wrapper."""
     import copy
@@ -1359,6 +1579,7 @@ def _clone_binding_to_wrapper(binding, existing, wrapper):
             wrapper, target_effect_suffix, effect_overrides)
 
     wrapper.get_effect_specialized = get_effect_specialized
+    _attach_call_api(wrapper)
 
 
 def _try_reuse_cached_wrapper(
@@ -3,7 +3,7 @@ import sys
 
 
 class ExternFunctionWrapper:
-    def __init__(self, func, lib, calling_convention, return_type, param_types, **kwargs):
+    def __init__(self, func, lib, calling_convention, **kwargs):
         self.func = func
         self.func_name = func.__name__
         # The C symbol name used for linking and ctypes lookup.  Defaults to
@@ -13,10 +13,33 @@ class ExternFunctionWrapper:
         self.c_name = kwargs.pop('name', func.__name__)
         self.lib = lib
         self.calling_convention = calling_convention
-        self.return_type = return_type
-        self.param_types = param_types
         self.config = kwargs
         self._ctypes_func = None
+        # Annotations are resolved on first use: libc alone declares a few
+        # hundred externs, most of which a given program never calls.
+        self._resolved = None
+
+    @property
+    def return_type(self):
+        return self._resolve()['return_type']
+
+    @property
+    def param_types(self):
+        return self._resolve()['param_types']
+
+    @property
+    def _extern_config(self):
+        return self._resolve()
+
+    def _resolve(self):
+        if self._resolved is None:
+            config = dict(self.config)
+            if self.c_name != self.func_name:
+                config['name'] = self.c_name
+            self._resolved = _resolve_extern_signature(
+                self.func, self.lib, self.calling_convention, config,
+            )
+        return self._resolved
 
     def handle_call(self, visitor, func_ref, args, node):
         """Handle @extern function call by lowering to func type.
@@ -86,53 +109,54 @@ class ExternFunctionWrapper:
         return f"ExternFunctionWrapper({self.func_name}, lib={self.lib})"
 
 
-def extern(func=None, *, lib=None, calling_convention="cdecl", **kwargs):
-    def decorator(f):
-        import inspect
-        sig = inspect.signature(f)
-        resolved_annotations = {}
-        if getattr(f, '__annotations__', None):
-            from ..type_resolver import TypeResolver
-            from .annotation_resolver import (
-                build_annotation_namespace,
-                resolve_annotations_dict,
-            )
+def _resolve_extern_signature(f, lib, calling_convention, config):
+    import inspect
+    sig = inspect.signature(f)
+    resolved_annotations = {}
+    if getattr(f, '__annotations__', None):
+        from ..type_resolver import TypeResolver
+        from .annotation_resolver import (
+            build_annotation_namespace,
+            resolve_annotations_dict,
+        )
 
-            is_dynamic = '.<locals>.' in f.__qualname__
-            type_resolver = TypeResolver(user_globals=f.__globals__)
-            eval_namespace = build_annotation_namespace(
-                f.__globals__, is_dynamic=is_dynamic,
-            )
-            resolved_annotations = resolve_annotations_dict(
-                f.__annotations__, eval_namespace, type_resolver,
-            )
+        is_dynamic = '.<locals>.' in f.__qualname__
+        type_resolver = TypeResolver(user_globals=f.__globals__)
+        eval_namespace = build_annotation_namespace(
+            f.__globals__, is_dynamic=is_dynamic,
+        )
+        resolved_annotations = resolve_annotations_dict(
+            f.__annotations__, eval_namespace, type_resolver,
+        )
+
+    return_type = resolved_annotations.get('return', sig.return_annotation)
+    if return_type == inspect.Signature.empty:
+        return_type = None
 
-        return_type = resolved_annotations.get('return', sig.return_annotation)
-        if return_type == inspect.Signature.empty:
-            return_type = None
+    param_types = []
+    for name, param in sig.parameters.items():
+        param_type = resolved_annotations.get(name, param.annotation)
+        param_types.append((name, param_type))
+    return {
+        'lib': lib,
+        'calling_convention': calling_convention,
+        'signature': sig,
+        'function': f,
+        'return_type': return_type,
+        'param_types': param_types,
+        **config
+    }
 
-        param_types = []
-        for name, param in sig.parameters.items():
-            param_type = resolved_annotations.get(name, param.annotation)
-            param_types.append((name, param_type))
+
+def extern(func=None, *, lib=None, calling_convention="cdecl", **kwargs):
+    def decorator(f):
         # Note: No longer registering in registry - info is stored on wrapper
         wrapper = ExternFunctionWrapper(
             func=f,
             lib=lib or 'c',
             calling_convention=calling_convention,
-            return_type=return_type,
-            param_types=param_types,
             **kwargs
         )
         wrapper._is_extern = True
-        wrapper._extern_config = {
-            'lib': lib or 'c',
-            'calling_convention': calling_convention,
-            'signature': sig,
-            'function': f,
-            'return_type': return_type,
-            'param_types': param_types,
-            **kwargs
-        }
         return wrapper
     return decorator(func) if func else decorator
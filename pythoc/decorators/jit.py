@@ -1,11 +1,62 @@
 # -*- coding: utf-8 -*-
-import os
-from functools import wraps
-from ..compiler import LLVMCompiler
+"""
+@jit: compile a function like @compile and run it from memory.
 
+The function goes into its own group (compile suffix ``jit``, so its
+symbol is ``name_jit``).  When the group is flushed its optimized module
+is added to the in-process MCJIT engine (see :mod:`pythoc.jit_executor`)
+instead of being written as an object file and linked into a shared
+library.
+"""
+import inspect
 
-def jit(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        pass
-    return wrapper
+from .compile import _compile_impl, _require_nogil, _SCOPE_NOT_PROVIDED
+from .visible import capture_caller_symbols
+
+
+JIT_SUFFIX = 'jit'
+
+
+def jit(func=None, attrs=None, nogil=False):
+    """
+    Just-in-time compile a function into the current process.
+
+    @jit functions take the same language as @compile functions and may
+    call @compile functions, @extern functions and other @jit functions.
+    @compile functions cannot call @jit functions: their shared libraries
+    cannot see JIT code.
+
+    Args:
+        func: Function to compile
+        attrs: Set of LLVM function-level attributes, as for @compile
+        nogil: Guarantee that calls run without the GIL, as for @compile
+
+    Examples:
+        @jit
+        def add(a: i32, b: i32) -> i32:
+            return a + b
+
+        add(1, 2)  # compiled in memory on the first call
+    """
+    captured_symbols = capture_caller_symbols(depth=1)
+    fn_attrs = set(attrs) if attrs else set()
+    from ..effect import get_current_effect_suffix
+    effect_suffix = get_current_effect_suffix()
+
+    def decorator(f):
+        if inspect.isclass(f):
+            raise TypeError(f"@jit applies to functions, use @compile for {f.__name__}")
+        wrapper = _compile_impl(
+            f,
+            compile_suffix=JIT_SUFFIX,
+            effect_suffix=effect_suffix,
+            captured_symbols=captured_symbols,
+            effect_scope=_SCOPE_NOT_PROVIDED,
+            fn_attrs=fn_attrs,
+            jit=True,
+        )
+        return _require_nogil(wrapper) if nogil else wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
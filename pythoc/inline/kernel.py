@@ -278,12 +278,21 @@ def merge_inline_globals(visitor, inline_result):
     merged = dict(old or {})
     merged.update(inline_result.required_globals)
     visitor.ctx.user_globals = merged
+    _reset_python_global_cache(visitor)
     return old
 
 
 def restore_globals(visitor, old_globals):
     """Restore previously saved user_globals."""
     visitor.ctx.user_globals = old_globals
+    _reset_python_global_cache(visitor)
+
+
+def _reset_python_global_cache(visitor):
+    # Names resolved against the previous globals may be shadowed (or
+    # un-shadowed) now, e.g. two instances of one @inline factory.
+    if hasattr(visitor, '_python_global_cache'):
+        visitor._python_global_cache = {}
 
 
 @contextmanager
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+In-process JIT execution for @jit functions.
+
+A @jit group is built like any @compile group up to the optimized LLVM
+module.  That module is then handed to one process-wide MCJIT engine
+instead of being written as an object file and linked into a shared
+library, so calling a @jit function needs no linker, no build files and no
+``dlopen``.
+
+Functions are bound through the same ctypes signatures
+:class:`MultiSOExecutor` computes.  Symbols a @jit group takes from regular
+@compile groups are resolved from their shared libraries, which are linked
+and loaded (``RTLD_GLOBAL``) the first time a @jit group depending on them
+is finalized.  The reverse is not possible: shared libraries cannot see
+JIT code, so @compile functions cannot call @jit functions.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from llvmlite import binding
+
+from .build import flush_all_pending_outputs, get_dependency_tracker
+from .logger import logger
+
+
+class JITExecutor:
+    """Execute @jit functions from an in-process MCJIT engine"""
+
+    def __init__(self):
+        self._engine = None
+        # Callables bound to code in the current engine.
+        self._bound = weakref.WeakSet()
+        # (engine, its bound callables) for engines replaced by clear():
+        # each is kept until none of its callables is alive any more.
+        self._retired_engines: List[Tuple[Any, weakref.WeakSet]] = []
+        # (group_key, ModuleRef) built since the engine was last finalized.
+        self._pending: List[Tuple[tuple, Any]] = []
+        # cimport object files the pending modules link against.
+        self._pending_objects: List[str] = []
+        self._jit_groups: Set[tuple] = set()
+        self._loaded_libraries: Set[str] = set()
+        self._loaded_objects: Set[str] = set()
+        self.function_cache: Dict[Tuple[tuple, str], Callable] = {}
+        self._lock = threading.RLock()
+
+    def add_module(self, group_key: tuple, llvm_module):
+        """
+        Queue a group's optimized module for the engine.
+
+        Args:
+            group_key: Group the module was built for
+            llvm_module: Optimized binding ModuleRef; the engine takes
+                ownership of it
+        """
+        with self._lock:
+            self._pending.append((group_key, llvm_module))
+            self._jit_groups.add(group_key)
+
+    def execute_function(self, wrapper) -> Callable:
+        """
+        Return a Python callable for a @jit function, compiling it first
+
+        Args:
+            wrapper: The @jit wrapper with its binding state
+
+        Returns:
+            Python callable wrapper for the native function
+        """
+        state = wrapper._state
+        func_name = state.actual_func_name or state.original_name
+        cache_key = (state.group_key, func_name)
+        native_func = self.function_cache.get(cache_key)
+        if native_func is not None:
+            return native_func
+
+        flush_all_pending_outputs()
+
+        with self._lock:
+            native_func = self.function_cache.get(cache_key)
+            if native_func is not None:
+                return native_func
+            self._finalize()
+            address = self._engine.get_function_address(func_name) if self._engine else 0
+            if not address:
+                raise RuntimeError(f"Function {func_name} not found in the JIT")
+
+            from .native_executor import get_multi_so_executor
+            executor = get_multi_so_executor()
+            signature = executor.get_native_signature(wrapper)
+            if signature is None:
+                raise RuntimeError(f"Function {func_name} has no signature")
+            # restype/argtypes are set on the instance by bind_native_function.
+            native = ctypes.CFUNCTYPE(None)(address)
+            native_func = executor.bind_native_function(
+                native, signature, executor.get_param_pc_types(wrapper))
+            self._bound.add(native_func)
+            self.function_cache[cache_key] = native_func
+            return native_func
+
+    def _finalize(self):
+        """Add the pending modules, and what they need, to the engine."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self._free_retired_engines()
+        for group_key, _module in pending:
+            self._load_dependencies(group_key)
+        if self._engine is None:
+            self._engine = self._create_engine(pending[0][1].triple)
+        for _group_key, module in pending:
+            self._engine.add_module(module)
+        objects, self._pending_objects = self._pending_objects, []
+        for obj_file in objects:
+            self._engine.add_object_file(obj_file)
+        self._engine.finalize_object()
+        logger.debug(f"JIT: finalized {len(pending)} group(s)")
+
+    @staticmethod
+    def _create_engine(triple: str):
+        from .compiler import _create_target_machine
+
+        target_machine = _create_target_machine(triple, codemodel='jitdefault')
+        backing_module = binding.parse_assembly("")
+        backing_module.triple = triple
+        return binding.create_mcjit_compiler(backing_module, target_machine)
+
+    def _load_dependencies(self, group_key: tuple):
+        """Make the symbols a JIT group imports resolvable in this process."""
+        deps = get_dependency_tracker().get_or_create_group_deps(group_key)
+        for lib in deps.link_libraries:
+            self._load_library(lib)
+        for obj_file in deps.link_objects:
+            if obj_file not in self._loaded_objects:
+                self._loaded_objects.add(obj_file)
+                self._pending_objects.append(obj_file)
+
+        from .native_executor import get_multi_so_executor
+        executor = get_multi_so_executor()
+        for group_dep in deps.group_dependencies:
+            if getattr(group_dep, 'dependency_type', None) == "source_embed":
+                continue
+            target = group_dep.target_group
+            if target is None:
+                continue
+            target_key = target.to_tuple()
+            if target_key == group_key or target_key in self._jit_groups:
+                continue
+            executor.load_group_library(target)
+
+    def _load_library(self, lib: str):
+        """Load an ``@extern(lib=...)`` / cimport library into the process."""
+        if lib in self._loaded_libraries:
+            return
+        self._loaded_libraries.add(lib)
+        path: Optional[str] = lib if os.path.exists(lib) else ctypes.util.find_library(lib)
+        if path is None:
+            # Part of the process already (libc, libm, ...).
+            return
+        binding.load_library_permanently(path)
+
+    def _free_retired_engines(self):
+        """Dispose of retired engines none of whose callables is alive."""
+        live = []
+        for engine, bound in self._retired_engines:
+            if len(bound):
+                live.append((engine, bound))
+            else:
+                engine.close()
+        self._retired_engines = live
+
+    def clear(self):
+        """
+        Forget every JIT group; later @jit groups start a fresh engine.
+
+        Callables already handed out stay valid: the old engine's code is
+        freed, at a later ``clear()`` or engine finalization, only once all
+        of them have been garbage collected.
+        """
+        with self._lock:
+            if self._engine is not None:
+                self._retired_engines.append((self._engine, self._bound))
+                self._bound = weakref.WeakSet()
+            self._engine = None
+            self._pending = []
+            self._pending_objects = []
+            self._jit_groups.clear()
+            self.function_cache.clear()
+            self._free_retired_engines()
+
+
+# Global JIT executor instance
+_jit_executor = None
+
+
+def get_jit_executor() -> JITExecutor:
+    """Get or create the global JIT executor"""
+    global _jit_executor
+    if _jit_executor is None:
+        _jit_executor = JITExecutor()
+    return _jit_executor
@@ -1,29 +1,17 @@
 """
 PC Compiler - Standard C Library Functions
 Provides pre-defined extern declarations for common C library functions
+
+Header modules are loaded on first access: ``pythoc.libc.printf`` imports
+``pythoc.libc.stdio`` (and registers its externs and structs) the first time
+it is looked up, so ``import pythoc`` does not pay for every header.
 """
 
-from ..decorators import extern
+import importlib
+import sys
+from types import ModuleType
 
-# Export all C library functions
-from .stdio import *
-from .stdlib import *
-from .string import *
-from .math import *
-from .memory import *
-from .ctype import *
-from .stddef import *
-from .stdint import *
-from .time import *
-from .unistd import *
-from .dlfcn import *
-from .errno import *
-from .signal import *
-from .setjmp import *
-from .stdarg import *
-from .dispatch import *
-from .semaphore import *
-from .ucontext import *
+from ..decorators import extern
 
 # POSIX-specific modules with platform-dependent layouts (sys/types.h,
 # sys/stat.h, sys/resource.h, sys/mman.h, pthread.h, fcntl.h) are NOT
@@ -32,70 +20,145 @@ from .ucontext import *
 # this namespace.  Import them explicitly from their submodules instead, e.g.
 # ``from pythoc.libc.sys_stat import stat, stat_``.
 
-__all__ = [
+# Header module -> names re-exported from it, in the order the headers are
+# star-imported.
+_EXPORTS = {
     # stdio.h
-    'FILE',
-    'printf', 'scanf', 'puts', 'getchar', 'putchar', 'fopen', 'fclose', 'freopen',
-    'fread', 'fwrite', 'fgets', 'fputs', 'fprintf', 'fscanf', 'fflush',
+    'stdio': (
+        'FILE',
+        'printf', 'scanf', 'puts', 'getchar', 'putchar', 'fopen', 'fclose', 'freopen',
+        'fread', 'fwrite', 'fgets', 'fputs', 'fprintf', 'fscanf', 'fflush',
+    ),
 
     # stdlib.h functions
-    'malloc', 'free', 'calloc', 'realloc', 'exit', 'abort', 'atoi', 'atof',
-    'strtol', 'strtod', 'rand', 'srand', 'system',
+    'stdlib': (
+        'malloc', 'free', 'calloc', 'realloc', 'exit', 'abort', 'atoi', 'atof',
+        'strtol', 'strtod', 'rand', 'srand', 'system',
+    ),
 
     # string.h functions
-    'strlen', 'strcpy', 'strncpy', 'strcat', 'strncat', 'strcmp', 'strncmp',
-    'strchr', 'strstr', 'memcpy', 'memset', 'memcmp', 'memmove',
+    'string': (
+        'strlen', 'strcpy', 'strncpy', 'strcat', 'strncat', 'strcmp', 'strncmp',
+        'strchr', 'strstr', 'memcpy', 'memset', 'memcmp', 'memmove',
+    ),
 
     # math.h functions
-    'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'atan2', 'sinh', 'cosh', 'tanh',
-    'exp', 'log', 'log10', 'pow', 'sqrt', 'ceil', 'floor', 'fabs', 'fmod',
-    'ldexp', 'ldexpl',
+    'math': (
+        'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'atan2', 'sinh', 'cosh', 'tanh',
+        'exp', 'log', 'log10', 'pow', 'sqrt', 'ceil', 'floor', 'fabs', 'fmod',
+        'ldexp', 'ldexpl',
+    ),
 
     # Memory management utilities
-    'memalloc', 'memfree', 'memzero',
+    'memory': ('memalloc', 'memfree', 'memzero'),
 
     # ctype.h
-    'isalpha', 'isdigit', 'isspace', 'isalnum', 'isupper', 'islower',
-    'toupper', 'tolower',
+    'ctype': (
+        'isalpha', 'isdigit', 'isspace', 'isalnum', 'isupper', 'islower',
+        'toupper', 'tolower',
+    ),
 
     # stddef.h typedefs
-    'size_t', 'ssize_t', 'ptrdiff_t', 'wchar_t',
+    'stddef': ('size_t', 'ssize_t', 'ptrdiff_t', 'wchar_t'),
 
     # stdint.h / inttypes.h typedefs
-    'int8_t', 'int16_t', 'int32_t', 'int64_t',
-    'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t',
-    'intptr_t', 'uintptr_t', 'intmax_t', 'uintmax_t',
+    'stdint': (
+        'int8_t', 'int16_t', 'int32_t', 'int64_t',
+        'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t',
+        'intptr_t', 'uintptr_t', 'intmax_t', 'uintmax_t',
+    ),
 
     # time.h / sys/time.h
-    'timeval', 'gettimeofday', 'time',
+    'time': ('timeval', 'gettimeofday', 'time'),
 
     # unistd.h
-    'sysconf', 'getpid', 'getcwd', 'close', 'read', 'write', 'lseek',
-    'access', 'isatty', 'getpagesize', 'mprotect',
+    'unistd': (
+        'sysconf', 'getpid', 'getcwd', 'close', 'read', 'write', 'lseek',
+        'access', 'isatty', 'getpagesize', 'mprotect',
+    ),
 
     # dlfcn.h
-    'dlopen', 'dlsym', 'dlclose', 'dlerror',
+    'dlfcn': ('dlopen', 'dlsym', 'dlclose', 'dlerror'),
 
     # errno.h
-    '__error',
+    'errno': ('__error',),
 
     # signal.h
-    'siginfo_t', 'sigset_t', 'sigaction', 'signal', 'raise_', 'sigaction_',
-    'sigemptyset', 'sigfillset', 'sigprocmask',
+    'signal': (
+        'siginfo_t', 'sigset_t', 'sigaction', 'signal', 'raise_', 'sigaction_',
+        'sigemptyset', 'sigfillset', 'sigprocmask',
+    ),
 
     # setjmp.h
-    'jmp_buf', 'sigjmp_buf', 'setjmp', 'longjmp',
+    'setjmp': ('jmp_buf', 'sigjmp_buf', 'setjmp', 'longjmp'),
 
     # stdarg.h
-    'va_list',
+    'stdarg': ('va_list',),
 
     # dispatch.h
-    'dispatch_semaphore_t', 'dispatch_time_t',
-    'dispatch_semaphore_create', 'dispatch_semaphore_wait', 'dispatch_semaphore_signal',
+    'dispatch': (
+        'dispatch_semaphore_t', 'dispatch_time_t',
+        'dispatch_semaphore_create', 'dispatch_semaphore_wait', 'dispatch_semaphore_signal',
+    ),
 
     # semaphore.h
-    'sem_t', 'sem_init', 'sem_wait', 'sem_post', 'sem_destroy',
+    'semaphore': ('sem_t', 'sem_init', 'sem_wait', 'sem_post', 'sem_destroy'),
 
     # ucontext.h
-    'ucontext_t',
-]
+    'ucontext': ('ucontext_t',),
+}
+
+_HEADER_OF = {name: header for header, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_HEADER_OF)
+
+
+def _bind_exports(header, module):
+    for name in _EXPORTS[header]:
+        globals()[name] = getattr(module, name)
+
+
+def _load_all_headers():
+    """Bind everything ``from .<header> import *`` would, for every header."""
+    for header in _EXPORTS:
+        module = importlib.import_module('.' + header, __name__)
+        names = getattr(module, '__all__', None)
+        if names is None:
+            names = [name for name in vars(module) if not name.startswith('_')]
+        for name in names:
+            globals()[name] = getattr(module, name)
+
+
+def __getattr__(name):
+    header = _HEADER_OF.get(name)
+    if header is not None:
+        _bind_exports(header, importlib.import_module('.' + header, __name__))
+        return globals()[name]
+    if name.startswith('__'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in _EXPORTS:
+        return importlib.import_module('.' + name, __name__)
+    # Helpers a header exports without being listed above.
+    _load_all_headers()
+    try:
+        return globals()[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LibcModule(ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a header binds the submodule on this package; the time,
+        # signal and setjmp functions keep their names, as they did when
+        # every header was star-imported here.
+        if isinstance(value, ModuleType) and _HEADER_OF.get(name) == name:
+            _bind_exports(name, value)
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LibcModule
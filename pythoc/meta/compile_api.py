@@ -46,6 +46,7 @@ def compile_ast(
     effect_scope=None,
     copy_ast=True,
     debug=False,
+    jit=False,
 ):
     """Compile an ast.FunctionDef through the standard @compile lifecycle.
 
@@ -69,6 +70,7 @@ def compile_ast(
         debug_source: Optional debug source text.
         effect_suffix: Effect suffix for effect specialization.
         effect_scope: Effect scope override.
+        jit: Run the function from the in-process JIT, like @jit.
 
     Returns:
         A compiled wrapper function (same shape as @compile produces).
@@ -229,6 +231,7 @@ def compile_ast(
         name=func_name,
         source_file=source_file,
         source_code=source_code,
+        ast_hash=_ast_content_hash,
         return_type_hint=return_type_hint,
         param_type_hints=param_type_hints,
         param_names=param_names,
@@ -247,7 +250,7 @@ def compile_ast(
 
     # Get or create group
     group = output_manager.get_or_create_group(
-        group_key, compiler, ir_file, obj_file, so_file, source_file
+        group_key, compiler, ir_file, obj_file, so_file, source_file, jit=jit
     )
     compiler = group['compiler']
 
@@ -280,6 +283,7 @@ def compile_ast(
         effect_override_names=effect_override_names,
         compilation_globals=dict(user_globals),
         wrapper=wrapper,
+        jit=jit,
     )
     func_info.binding_state = binding_state
     wrapper._func_info = func_info
@@ -8,12 +8,119 @@ This version creates one shared library per source file and loads them all with
 import os
 import sys
 import ctypes
+import hashlib
 import subprocess
+import threading
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple, Set
 from llvmlite import ir
 
+from .buffers import acquire_buffer, is_buffer, scalar_ctype
+from .builtin_entities.pc_literal import pc_literal
 from .utils.link_utils import get_shared_lib_extension
-from .build import BuildCache, get_dependency_tracker
+from .build import BuildCache, get_dependency_tracker, get_output_manager
+from .config import config
+from .logger import logger
+
+
+# ctypes types the scalar call fast path passes straight through argtypes.
+_SCALAR_CTYPES = frozenset((
+    ctypes.c_bool,
+    ctypes.c_int8, ctypes.c_int16, ctypes.c_int32, ctypes.c_int64,
+    ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32, ctypes.c_uint64,
+    ctypes.c_float, ctypes.c_double,
+))
+
+
+def _identity(value):
+    return value
+
+
+# ctypes instances are converted by the existing ctypes rules, even where
+# they also export the buffer protocol (a pointer object's buffer is the
+# pointer itself, not what it points to).
+_CTYPES_DATA = (ctypes._SimpleCData, ctypes._Pointer, ctypes.Structure, ctypes.Union)
+
+# ctypes array type -> by-value Structure holding it.
+_array_value_ctypes: Dict[Any, Any] = {}
+
+# Merged libraries of earlier runs are removed once unused for this long.
+_MERGED_LIBRARY_GRACE_SECONDS = 24 * 60 * 60
+
+
+def _array_value_ctype(array_ctype):
+    """Return the by-value argument type for an ``array[T, N]`` parameter."""
+    struct_type = _array_value_ctypes.get(array_ctype)
+    if struct_type is None:
+        struct_type = type(f"array_{array_ctype.__name__}", (ctypes.Structure,),
+                           {'_fields_': [('data', array_ctype)], '_array_value_': True})
+        _array_value_ctypes[array_ctype] = struct_type
+    return struct_type
+
+
+def _buffer_converter(pc_type, param_ctype) -> Optional[Callable]:
+    """
+    Return ``convert(arg, views)`` letting a parameter take a buffer object.
+
+    ``ptr[T]`` parameters get the buffer's address and ``array[T, N]``
+    parameters a by-value copy of its contents, both read straight from the
+    exporter's memory.  The element layout is checked against ``T``.  Pinned
+    views are appended to *views* for the caller to release after the call;
+    arguments that are not buffers are returned unchanged.
+    """
+    if pc_type is None or param_ctype is None:
+        return None
+    if getattr(pc_type, '_is_pointer', False):
+        elem_ctype = scalar_ctype(getattr(pc_type, 'pointee_type', None))
+        # Byte, void and aggregate pointers take any buffer, as in C.
+        if elem_ctype is not None and ctypes.sizeof(elem_ctype) == 1:
+            elem_ctype = None
+
+        def convert_pointer(arg, views):
+            if isinstance(arg, (int, _CTYPES_DATA)) or arg is None or not is_buffer(arg):
+                return arg
+            view = acquire_buffer(arg)
+            views.append(view)
+            if elem_ctype is not None and not view.matches(elem_ctype):
+                raise TypeError(
+                    f"buffer of '{view.format}' cannot be passed as {pc_type.get_name()}"
+                )
+            return view.address
+        return convert_pointer
+
+    if getattr(param_ctype, '_array_value_', False):
+        array_ctype = param_ctype._fields_[0][1]
+        elem_ctype = array_ctype
+        count = 1
+        while issubclass(elem_ctype, ctypes.Array):
+            count *= elem_ctype._length_
+            elem_ctype = elem_ctype._type_
+
+        def convert_array(arg, views):
+            if isinstance(arg, param_ctype):
+                return arg
+            if isinstance(arg, array_ctype):
+                return param_ctype(arg)
+            if isinstance(arg, (list, tuple)):
+                return param_ctype(_ctypes_array_from(array_ctype, arg))
+            view = acquire_buffer(arg)
+            views.append(view)
+            if not view.matches(elem_ctype) or view.count != count:
+                raise TypeError(
+                    f"{pc_type.get_name()} needs a buffer of {count} "
+                    f"'{elem_ctype._type_}' elements, got {view.count} of '{view.format}'"
+                )
+            return param_ctype.from_address(view.address)
+        return convert_array
+    return None
+
+
+def _ctypes_array_from(array_ctype, values):
+    """Build a (nested) ctypes array from (nested) Python sequences."""
+    elem_ctype = array_ctype._type_
+    if issubclass(elem_ctype, ctypes.Array):
+        values = [_ctypes_array_from(elem_ctype, row) for row in values]
+    return array_ctype(*values)
 
 
 class MultiSOExecutor:
@@ -21,6 +128,7 @@ class MultiSOExecutor:
     
     def __init__(self):
         self.loaded_libs = {}  # source_file -> ctypes.CDLL
+        self._lock = threading.RLock()
         self.function_cache = {}  # func_name -> ctypes function wrapper
         self.lib_dependencies = {}  # source_file -> [dependent_source_files]
         self.lib_mtimes = {}  # source_file -> mtime when loaded
@@ -33,6 +141,12 @@ class MultiSOExecutor:
         # up-to-date by _compile_dependencies_recursive.  Invalidated when any
         # relink occurs within this process.
         self._verified_deps: Set[str] = set()
+        # Merged-library mode (config.merged_library): group .o -> handle of
+        # the merged library it was linked into, and the merged libraries
+        # loaded so far, in load order.
+        self._merged_objs: Dict[str, Any] = {}
+        self._merged_libs: List[str] = []
+        self._merged_failed = False
         
     def compile_source_to_so(
         self,
@@ -300,7 +414,7 @@ class MultiSOExecutor:
         """
         Get dependencies for a library using the deps system.
         
-        First tries to load from .deps file (persisted deps), then falls back
+        First tries the persisted deps of the group's object, then falls back
         to imported_user_functions from compiler for compatibility.
         
         Args:
@@ -316,7 +430,7 @@ class MultiSOExecutor:
         dependencies = []
         seen_so_files = set()
         
-        # Try to load deps from .deps file first
+        # Try the persisted deps first
         lib_ext = get_shared_lib_extension()
         obj_file = so_file.replace(lib_ext, '.o')
         dep_tracker = get_dependency_tracker()
@@ -533,17 +647,6 @@ class MultiSOExecutor:
         if signature is None:
             raise RuntimeError(f"Function {func_name} not found in module")
         
-        return_type, param_types, return_pc_type = signature
-        
-        # Filter out None types (linear/zero-size types) from param_types
-        # Keep track of which indices have real types
-        real_param_indices = []
-        real_param_types = []
-        for i, pt in enumerate(param_types):
-            if pt is not None:
-                real_param_indices.append(i)
-                real_param_types.append(pt)
-        
         # Get function from library
         try:
             native_func = getattr(lib, func_name)
@@ -557,6 +660,99 @@ class MultiSOExecutor:
                     continue
             else:
                 raise RuntimeError(f"Function {func_name} not found in any loaded library")
+
+        bound = self.bind_native_function(
+            native_func, signature, self.get_param_pc_types(wrapper))
+        self.function_cache[cache_key] = bound
+        return bound
+
+    def bind_native_function(self, native_func, signature: Tuple,
+                             param_pc_types: Optional[List[Any]] = None) -> Callable:
+        """
+        Wrap a ctypes function so it can be called with Python/pc values.
+
+        Args:
+            native_func: ctypes function object (from a library or an address);
+                its ``restype``/``argtypes`` are set here
+            signature: (ctypes_return_type, [ctypes_param_types],
+                pc_return_type_hint) from :meth:`get_native_signature`
+            param_pc_types: pythoc type of every parameter; lets ``ptr[T]``
+                and ``array[T, N]`` parameters take buffer objects
+
+        Returns:
+            Python callable taking every declared parameter, including the
+            zero-size ones that have no native slot
+        """
+        # The generic binding sets restype/argtypes, which the fast path needs.
+        generic = self._bind_generic_call(native_func, signature, param_pc_types)
+        fast = self._bind_scalar_call(native_func, signature, generic)
+        return fast if fast is not None else generic
+
+    @staticmethod
+    def _bind_scalar_call(native_func, signature: Tuple, generic: Callable) -> Optional[Callable]:
+        """
+        Fast path for signatures made only of scalar ints/floats/bools.
+
+        ctypes converts the arguments itself from ``argtypes`` (scalar
+        pc_literals expose ``_as_parameter_``) and the result is wrapped
+        without re-dispatching on its type.  Anything ctypes rejects is
+        retried through *generic*, which never reached the native code.
+
+        Returns:
+            Python callable, or None if the signature is not all-scalar
+        """
+        return_type, param_types, return_pc_type = signature
+        if not all(pt in _SCALAR_CTYPES for pt in param_types):
+            return None
+        if return_type is None:
+            convert = None
+        elif return_pc_type is None:
+            convert = _identity
+        elif return_type in _SCALAR_CTYPES:
+            convert = pc_literal._scalar_result_converter(return_pc_type, return_type)
+            if convert is None:
+                return None
+        else:
+            return None
+
+        argument_error = ctypes.ArgumentError
+        if convert is None:
+            def call(*args):
+                try:
+                    native_func(*args)
+                except argument_error:
+                    return generic(*args)
+                return None
+        else:
+            def call(*args):
+                try:
+                    result = native_func(*args)
+                except argument_error:
+                    return generic(*args)
+                return convert(result)
+        return call
+
+    @staticmethod
+    def _bind_generic_call(native_func, signature: Tuple,
+                           param_pc_types: Optional[List[Any]] = None) -> Callable:
+        """Bind any signature, converting every argument and the result."""
+        return_type, param_types, return_pc_type = signature
+        
+        # Filter out None types (linear/zero-size types) from param_types
+        # Keep track of which indices have real types
+        real_param_indices = []
+        real_param_types = []
+        for i, pt in enumerate(param_types):
+            if pt is not None:
+                real_param_indices.append(i)
+                real_param_types.append(pt)
+        # Per real parameter: converter for buffer arguments, or None.
+        buffer_converters = [
+            _buffer_converter(param_pc_types[i] if param_pc_types else None,
+                              param_types[i])
+            for i in real_param_indices
+        ]
+        has_buffer_params = any(buffer_converters)
         
         # Set function signature (only real types)
         native_func.restype = return_type
@@ -566,7 +762,21 @@ class MultiSOExecutor:
         def wrapper(*args):
             # Filter args to only include those at real_param_indices
             filtered_args = [args[i] for i in real_param_indices if i < len(args)]
-            
+            if has_buffer_params:
+                # Buffers stay pinned until the native call has returned.
+                views = []
+                try:
+                    filtered_args = [
+                        convert(arg, views) if convert is not None else arg
+                        for arg, convert in zip(filtered_args, buffer_converters)
+                    ]
+                    return call(filtered_args)
+                finally:
+                    for view in views:
+                        view.release()
+            return call(filtered_args)
+
+        def call(filtered_args):
             c_args = []
             for arg, param_type in zip(filtered_args, real_param_types):
                 # pc_literal carries its own conversion (handles scalar,
@@ -590,11 +800,9 @@ class MultiSOExecutor:
             if return_type is None:
                 return None
             if return_pc_type is not None:
-                from .builtin_entities.pc_literal import pc_literal
                 return pc_literal._from_ctypes_result(result, return_pc_type)
             return result
         
-        self.function_cache[cache_key] = wrapper
         return wrapper
     
     def _get_function_signature(self, func_name: str, compiler, wrapper=None) -> Optional[Tuple]:
@@ -606,19 +814,39 @@ class MultiSOExecutor:
         Returns:
             (ctypes_return_type, [ctypes_param_types], pc_return_type_hint) or None
         """
+        return self.get_native_signature(wrapper)
+
+    def get_native_signature(self, wrapper) -> Optional[Tuple]:
+        """Return (ctypes_return_type, [ctypes_param_types], pc_return_type_hint)
+        of a @compile wrapper, or None if it has no function info.
+
+        Zero-size parameters map to None and have no native slot.
+        """
         func_info = None
         if wrapper is not None:
             func_info = getattr(wrapper, '_func_info', None)
         
         if func_info:
             return_type = self._pc_type_to_ctypes(func_info.return_type_hint)
-            param_types = [
-                self._pc_type_to_ctypes(func_info.param_type_hints.get(name))
-                for name in func_info.param_names
-            ]
+            param_types = []
+            for name in func_info.param_names:
+                param_type = self._pc_type_to_ctypes(func_info.param_type_hints.get(name))
+                # Arrays are passed by value, like a C struct holding the
+                # array; a bare ctypes array would be passed by address.
+                if isinstance(param_type, type) and issubclass(param_type, ctypes.Array):
+                    param_type = _array_value_ctype(param_type)
+                param_types.append(param_type)
             return (return_type, param_types, func_info.return_type_hint)
         
         return None
+
+    @staticmethod
+    def get_param_pc_types(wrapper) -> Optional[List[Any]]:
+        """Return the pythoc type of every parameter of a @compile wrapper."""
+        func_info = getattr(wrapper, '_func_info', None)
+        if func_info is None:
+            return None
+        return [func_info.param_type_hints.get(name) for name in func_info.param_names]
     
     def _pc_type_to_ctypes(self, pc_type) -> Any:
         """Convert pythoc type to ctypes type.
@@ -648,6 +876,9 @@ class MultiSOExecutor:
         self.function_cache.clear()
         self.lib_dependencies.clear()
         self.lib_mtimes.clear()
+        self._merged_objs.clear()
+        self._merged_libs.clear()
+        self._merged_failed = False
     
     def has_loaded_library(self, source_file: str) -> bool:
         """Check if a library for the given source file is already loaded"""
@@ -678,7 +909,16 @@ class MultiSOExecutor:
         # Extract metadata from wrapper
         if not (hasattr(wrapper, '_state') and wrapper._state):
             raise RuntimeError(f"Function was not properly compiled (missing metadata)")
-
+        # Threads calling functions for the first time at once compile, link
+        # and load them one at a time.
+        with self._lock:
+            if getattr(wrapper._state, 'jit', False):
+                from .jit_executor import get_jit_executor
+                return get_jit_executor().execute_function(wrapper)
+            return self._execute_library_function(wrapper)
+
+    def _execute_library_function(self, wrapper) -> Callable:
+        """Link, load and bind the shared-library function of *wrapper*."""
         source_file = wrapper._state.source_file
         so_file = wrapper._state.so_file
         compiler = wrapper._state.compiler
@@ -703,13 +943,48 @@ class MultiSOExecutor:
         # Flush pending outputs before checking files
         from .build import flush_all_pending_outputs
         flush_all_pending_outputs()
+
+        if config.merged_library and self.load_merged_library(so_file):
+            return self.get_function(actual_func_name, compiler, so_file, wrapper=wrapper)
         
-        # Check if we need to compile shared library from .o
+        dependencies, relinked = self.link_shared_library(
+            source_file, so_file, label=func_name,
+        )
+        if relinked and so_file in self.loaded_libs:
+            # Drop the stale library and the functions taken from it.
+            del self.loaded_libs[so_file]
+            keys_to_remove = [k for k in self.function_cache.keys() if k.startswith(f"{so_file}:")]
+            for key in keys_to_remove:
+                del self.function_cache[key]
+            if hasattr(wrapper, '_native_func'):
+                delattr(wrapper, '_native_func')
+
+        # Load library with dependencies
+        self.load_library_with_dependencies(source_file, so_file, dependencies)
+        
+        # Get and cache the native function - pass wrapper for direct func_info access
+        native_func = self.get_function(actual_func_name, compiler, so_file, wrapper=wrapper)
+        return native_func
+    
+    def link_shared_library(self, source_file: str, so_file: str,
+                            label: Optional[str] = None) -> Tuple[List[Tuple[str, str]], bool]:
+        """
+        Link a group's shared library, and the libraries it depends on, if stale.
+
+        Args:
+            source_file: Source file of the group
+            so_file: Shared library of the group
+            label: What the library is linked for, used in error messages
+
+        Returns:
+            (dependencies, relinked): the group's (dep_source_file, dep_so_file)
+            pairs and whether ``so_file`` itself was linked
+        """
         lib_ext = get_shared_lib_extension()
         obj_file = so_file.replace(lib_ext, '.o')
 
         # Collect dependencies from persisted deps graph (source of truth)
-        dependencies = self._get_dependencies(wrapper._state.compiler, source_file, so_file)
+        dependencies = self._get_dependencies(None, source_file, so_file)
 
         # Ensure all dependencies are compiled first (all platforms).
         self._compile_dependencies_recursive(dependencies, set())
@@ -721,36 +996,178 @@ class MultiSOExecutor:
         )
 
         # Check if .so/.dll needs re-linking.
-        # Only check direct inputs: the group's own .o and .deps file.
-        # Transitive dependency changes are handled by their own relink cycle.
-        relink_inputs = [obj_file]
-        deps_file = obj_file.replace('.o', '.deps')
-        if os.path.exists(deps_file):
-            relink_inputs.append(deps_file)
+        # Only check the direct input: the group's own .o (its deps record is
+        # only ever rewritten together with it).  Transitive dependency
+        # changes are handled by their own relink cycle.
+        if not BuildCache.check_so_needs_relink(so_file, [obj_file]):
+            return dependencies, False
+        if not os.path.exists(obj_file):
+            raise RuntimeError(f"Object file {obj_file} not found for {label or so_file}")
+        self.compile_source_to_so(obj_file, so_file, extra_link_libraries=extra_link_libraries)
+        return dependencies, True
 
-        need_compile = BuildCache.check_so_needs_relink(so_file, relink_inputs)
+    def load_group_library(self, group_key) -> Optional[str]:
+        """
+        Make sure the shared library of a group is loaded, linking it if stale.
 
-        if need_compile:
-            if not os.path.exists(obj_file):
-                raise RuntimeError(f"Object file {obj_file} not found for {func_name}")
-            # If recompiling, unload the old library first
+        Args:
+            group_key: GroupKey of the group
+
+        Returns:
+            Path of the group's shared library (keys ``loaded_libs``), or
+            None if the group has no source file to derive it from
+        """
+        so_file = self._derive_so_file_from_group_key(group_key)
+        if so_file is None:
+            return None
+        with self._lock:
             if so_file in self.loaded_libs:
-                del self.loaded_libs[so_file]
-                # Also clear cached functions from this library
-                keys_to_remove = [k for k in self.function_cache.keys() if k.startswith(f"{so_file}:")]
-                for key in keys_to_remove:
-                    del self.function_cache[key]
-                if hasattr(wrapper, '_native_func'):
-                    delattr(wrapper, '_native_func')
-            self.compile_source_to_so(obj_file, so_file, extra_link_libraries=extra_link_libraries)
+                return so_file
+            if config.merged_library and self.load_merged_library(so_file):
+                return so_file
+            dependencies, _relinked = self.link_shared_library(group_key.file, so_file)
+            self.load_library_with_dependencies(group_key.file, so_file, dependencies)
+        return so_file
+
+    def library_load_order(self, so_file: str,
+                           dependencies: List[Tuple[str, str]]) -> List[str]:
+        """Return ``so_file`` and every library it depends on, dependencies first."""
+        order: List[str] = []
+        self._collect_all_libs(so_file, dependencies, set(), order)
+        return order
+
+    def load_merged_library(self, so_file: str) -> bool:
+        """
+        Load a group from a merged library instead of its own shared library.
+
+        The first call links the objects of every flushed group, and of the
+        groups they depend on, into one shared library under
+        ``build/_merged/``.  A group that is not part of any loaded merged
+        library yet is linked, with every other such group, into one more
+        library (resolving into the earlier ones) instead of relinking a
+        library that is already running, so its global state is kept.
+
+        Args:
+            so_file: Shared library of the group (keys ``loaded_libs``)
+
+        Returns:
+            True if the group is now loaded, False if merging failed and the
+            per-group libraries have to be used instead
+        """
+        lib_ext = get_shared_lib_extension()
+        obj_file = so_file.replace(lib_ext, '.o')
+        lib = self._merged_objs.get(obj_file)
+        if lib is not None:
+            self.loaded_libs[so_file] = lib
+            return True
+        if self._merged_failed:
+            return False
+
+        obj_files = self._unmerged_group_objects()
+        if obj_file not in obj_files:
+            if not os.path.exists(obj_file):
+                raise RuntimeError(f"Object file {obj_file} not found for {so_file}")
+            obj_files.append(obj_file)
+        obj_files.sort()
+
+        link_libraries: List[str] = []
+        if self._shared_dependency_link_mode() != 'dynamic':
+            link_libraries.extend(self._merged_libs)
+        for obj in obj_files:
+            for lib_name in self._get_persisted_link_libraries(obj):
+                if lib_name not in link_libraries:
+                    link_libraries.append(lib_name)
+
+        digest = hashlib.sha1('\n'.join(obj_files + link_libraries).encode('utf-8'))
+        merged_so = os.path.join('build', '_merged', f"merged.{digest.hexdigest()[:16]}{lib_ext}")
+        try:
+            if BuildCache.check_so_needs_relink(merged_so, obj_files):
+                self.compile_source_to_so(
+                    obj_files[0], merged_so,
+                    extra_obj_files=obj_files[1:],
+                    extra_link_libraries=link_libraries,
+                )
+            else:
+                # Reused: mark it as recently used so no other run's
+                # eviction removes it (see below).
+                os.utime(merged_so)
+            lib = self._load_single_library(merged_so, merged_so)
+            if lib is None:
+                raise RuntimeError(f"{merged_so} has unresolved symbols")
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Cannot use a merged library, loading per-group libraries: {e}")
+            self._merged_failed = True
+            return False
+
+        logger.debug(f"Loaded {len(obj_files)} groups from {merged_so}")
+        self._merged_libs.append(merged_so)
+        for obj in obj_files:
+            self._merged_objs[obj] = lib
+            self.loaded_libs[os.path.splitext(obj)[0] + lib_ext] = lib
+        if len(self._merged_libs) == 1:
+            self._evict_superseded_merged_libraries(os.path.dirname(merged_so))
+        return True
+
+    def _evict_superseded_merged_libraries(self, merged_dir: str):
+        """
+        Remove the merged libraries of earlier runs that have gone unused.
+
+        Every distinct set of groups links its own merged library, so they
+        pile up as code changes.  Only libraries not linked or reused for
+        ``_MERGED_LIBRARY_GRACE_SECONDS`` are removed, so one that a
+        concurrent run is about to load is kept; so is one whose lock is held
+        (being linked) or that the OS refuses to delete (a DLL in use).
+        Lock files are left in place: another process may be waiting on one.
+        """
+        from .utils.link_utils import file_lock
+
+        lib_ext = get_shared_lib_extension()
+        live = {os.path.abspath(path) for path in self._merged_libs}
+        cutoff = time.time() - _MERGED_LIBRARY_GRACE_SECONDS
+        try:
+            names = os.listdir(merged_dir)
+        except OSError:
+            return
+        for name in sorted(names):
+            if not (name.startswith('merged.') and name.endswith(lib_ext)):
+                continue
+            path = os.path.join(merged_dir, name)
+            if os.path.abspath(path) in live:
+                continue
+            try:
+                with file_lock(path + '.lock', timeout=0):
+                    if os.path.getmtime(path) >= cutoff:
+                        continue
+                    os.remove(path)
+            except (OSError, TimeoutError):
+                continue
+            logger.debug(f"Removed superseded merged library {path}")
+
+    def _unmerged_group_objects(self) -> List[str]:
+        """Object files of the flushed groups, and of their transitive
+        dependencies, that no loaded merged library contains yet."""
+        lib_ext = get_shared_lib_extension()
+        result: List[str] = []
+        seen: Set[str] = set(self._merged_objs)
+        pending = [
+            (group.get('source_file'), group['so_file'])
+            for group in list(get_output_manager().get_all_groups().values())
+            if group.get('so_file')
+        ]
+        # One walk over the dependency graph shared by all groups; a group
+        # already merged had its dependencies merged with it.
+        while pending:
+            source_file, so_file = pending.pop()
+            obj_file = so_file.replace(lib_ext, '.o')
+            if obj_file in seen:
+                continue
+            seen.add(obj_file)
+            if not os.path.exists(obj_file):
+                continue
+            result.append(obj_file)
+            pending.extend(self._get_library_dependencies(source_file, so_file))
+        return result
 
-        # Load library with dependencies
-        self.load_library_with_dependencies(source_file, so_file, dependencies)
-        
-        # Get and cache the native function - pass wrapper for direct func_info access
-        native_func = self.get_function(actual_func_name, compiler, so_file, wrapper=wrapper)
-        return native_func
-    
     def _collect_dependent_obj_files(self, so_file: str, source_file: str, visited: Set[str]) -> List[str]:
         """
         Collect all object files that a .so depends on.
@@ -788,14 +1205,14 @@ class MultiSOExecutor:
     def _collect_dependent_obj_files_transitive(self, source_file: str, so_file: str) -> List[str]:
         """Collect dependent groups' object files recursively.
 
-        This follows the persisted group-dependency graph (from `.deps` files)
+        This follows the persisted group-dependency graph (from the deps index)
         and returns a de-duplicated list of dependency `.o` files.
 
         NOTE: The returned list does NOT include this group's own `.o`.
 
         Results are cached per (source_file, so_file) for the duration of the
         current top-level execute_function() call to avoid redundant DFS
-        traversals and .deps file I/O.
+        traversals and deps lookups.
         """
         cache_key = (source_file, so_file)
         if cache_key in self._transitive_obj_cache:
@@ -869,15 +1286,10 @@ class MultiSOExecutor:
                     _collect_jobs(dep_deps)
 
                 # Check if this dependency needs linking.
-                # Only check direct inputs (own .o + .deps); transitive
+                # Only check the direct input (own .o); transitive
                 # dependency changes are handled by their own relink cycle.
                 if os.path.exists(dep_obj_file):
-                    relink_inputs = [dep_obj_file]
-                    dep_deps_file = dep_obj_file.replace('.o', '.deps')
-                    if os.path.exists(dep_deps_file):
-                        relink_inputs.append(dep_deps_file)
-
-                    if BuildCache.check_so_needs_relink(dep_so_file, relink_inputs):
+                    if BuildCache.check_so_needs_relink(dep_so_file, [dep_obj_file]):
                         link_jobs.append((dep_obj_file, dep_so_file, dep_deps))
 
         _collect_jobs(dependencies)
@@ -990,10 +1402,10 @@ class MultiSOExecutor:
         BuildScheduler(max_workers=max_workers).run(tasks)
     
     def _get_persisted_link_libraries(self, obj_file: str) -> List[str]:
-        """Read link_libraries from the persisted .deps file for a group.
+        """Read link_libraries from the persisted deps of a group.
 
         These are libraries registered via ``@extern(lib=...)`` or ``cimport``
-        and stored in the group's ``.deps`` file.  On Windows we need them at
+        and stored in the group's deps record.  On Windows we need them at
         link time in addition to the inter-group dependency DLLs.
         """
         dep_tracker = get_dependency_tracker()
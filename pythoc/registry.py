@@ -107,6 +107,9 @@ class FunctionInfo:
     param_type_hints: Dict[str, Any] = field(default_factory=dict)
     param_names: List[str] = field(default_factory=list)  # Ordered parameter names
     source_code: Optional[str] = None
+    # Digest of the normalized function AST; keys the per-function entry of
+    # the content-addressed object cache (see build.cache).
+    ast_hash: Optional[str] = None
     is_compiled: bool = False
     overload_enabled: bool = False  # Whether overloading is enabled for this function
     # Effect system: track which effects this function uses (e.g., {'rng', 'd_impl'})
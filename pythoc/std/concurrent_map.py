@@ -0,0 +1,164 @@
+"""Thread-safe hash map for code running on several threads at once.
+
+``ConcurrentHashMap`` splits the key space into shards, each a
+``FlatHashMap`` guarded by its own ``SpinLock``.  A key's shard is chosen by
+the top bits of its remixed hash, so operations on different shards never
+contend; each shard sits on its own cache lines so that their locks do not
+share one.
+
+Values are copied out under the shard lock rather than returned by pointer:
+another thread may move or erase the slot as soon as the lock is released.
+"""
+
+from __future__ import annotations
+from pythoc import *
+from pythoc.libc.stdlib import malloc, free
+from pythoc.builtin_entities import atomic_load_i64
+
+from pythoc.std.hash import resolve_key_functions, _mix64, _HASH_K_MUL
+from pythoc.std.map import FlatHashMap, _align_up, _CACHE_LINE
+from pythoc.std.runtime.platform import (
+    SpinLock, spinlock_init, spinlock_lock, spinlock_unlock,
+)
+
+
+def ConcurrentHashMap(key_type, value_type, shards=64, hash_fn=None, eq_fn=None):
+    """Factory producing a sharded, lock-per-shard hash map for ``key_type``.
+
+    Usage mirrors ``FlatHashMap``::
+
+        Counts = ConcurrentHashMap(u64, i64)
+        m: Counts
+        Counts.init(ptr(m))
+        Counts.insert(ptr(m), 7, 1)         # from any thread
+        v: i64
+        if Counts.find(ptr(m), 7, ptr(v)):
+            ...
+
+    ``shards`` (a power of two) bounds how many threads can update the map
+    at the same time; ``hash_fn`` and ``eq_fn`` are as for ``FlatHashMap``.
+    """
+    if not isinstance(shards, int) or shards < 1 or shards & (shards - 1):
+        raise ValueError(
+            f"ConcurrentHashMap: shards must be a power of two, got {shards}"
+        )
+    # The shard tables are built from the caller's functions, so that they
+    # are the same FlatHashMap instances the caller would get.
+    table_fns = (hash_fn, eq_fn)
+    hash_fn, eq_fn, fn_suffix = resolve_key_functions(
+        "ConcurrentHashMap", key_type, hash_fn, eq_fn)
+    _Table = FlatHashMap(key_type, value_type, u64, *table_fns)
+
+    n_shards = shards
+    shard_bits = shards.bit_length() - 1
+    type_suffix = (key_type, value_type, shards) + fn_suffix
+
+    @compile(suffix=type_suffix)
+    class _Shard:
+        lock: SpinLock
+        table: _Table
+
+    @inline
+    def _stride() -> u64:
+        return _align_up(sizeof(_Shard))
+
+    @compile(suffix=type_suffix)
+    class _ConcurrentHashMap:
+        alloc: ptr[i8]
+        shards: ptr[i8]
+
+        def init(m: ptr[_ConcurrentHashMap]) -> None:
+            raw: ptr[i8] = malloc(n_shards * _stride() + _CACHE_LINE - 1)
+            m.alloc = raw
+            m.shards = raw + ((_CACHE_LINE - (u64(raw) & (_CACHE_LINE - 1))) & (_CACHE_LINE - 1))
+            i: u64 = 0
+            while i < n_shards:
+                s: ptr[_Shard] = _ConcurrentHashMap._shard_at(m, i)
+                spinlock_init(ptr(s.lock))
+                _Table.init(ptr(s.table))
+                i += 1
+
+        def destroy(m: ptr[_ConcurrentHashMap]) -> None:
+            """Free all shards; no other thread may use *m* any more."""
+            i: u64 = 0
+            while i < n_shards:
+                _Table.destroy(ptr(_ConcurrentHashMap._shard_at(m, i).table))
+                i += 1
+            free(m.alloc)
+            m.alloc = nullptr
+            m.shards = nullptr
+
+        def _shard_at(m: ptr[_ConcurrentHashMap], i: u64) -> ptr[_Shard]:
+            return ptr[_Shard](m.shards + i * _stride())
+
+        def _shard_for(m: ptr[_ConcurrentHashMap], h: u64) -> ptr[_Shard]:
+            # The tables index slots with the low bits of the hash, so the
+            # shard takes the high ones -- of the hash mixed again, as a
+            # custom hash_fn may leave them all zero.
+            if shard_bits == 0:
+                return ptr[_Shard](m.shards)
+            return _ConcurrentHashMap._shard_at(m, _mix64(h, _HASH_K_MUL) >> (64 - shard_bits))
+
+        def size(m: ptr[_ConcurrentHashMap]) -> u64:
+            """Number of elements; exact only while no thread modifies *m*."""
+            total: u64 = 0
+            i: u64 = 0
+            while i < n_shards:
+                s: ptr[_Shard] = _ConcurrentHashMap._shard_at(m, i)
+                total += u64(atomic_load_i64(ptr[i64](ptr[void](ptr(s.table.size)))))
+                i += 1
+            return total
+
+        def clear(m: ptr[_ConcurrentHashMap]) -> None:
+            i: u64 = 0
+            while i < n_shards:
+                s: ptr[_Shard] = _ConcurrentHashMap._shard_at(m, i)
+                spinlock_lock(ptr(s.lock))
+                _Table.clear(ptr(s.table))
+                spinlock_unlock(ptr(s.lock))
+                i += 1
+
+        def insert(m: ptr[_ConcurrentHashMap], key: key_type, value: value_type) -> bool:
+            """Insert or update ``key -> value``; True if *key* was absent."""
+            h: u64 = hash_fn(key)
+            s: ptr[_Shard] = _ConcurrentHashMap._shard_for(m, h)
+            t: ptr[_Table] = ptr(s.table)
+            spinlock_lock(ptr(s.lock))
+            added: bool = _Table.insert_hashed(t, key, value, h)
+            spinlock_unlock(ptr(s.lock))
+            return added
+
+        def find(m: ptr[_ConcurrentHashMap], key: key_type,
+                 out: ptr[value_type]) -> bool:
+            """Copy the value of *key* to ``out[0]``; False if it is absent."""
+            h: u64 = hash_fn(key)
+            s: ptr[_Shard] = _ConcurrentHashMap._shard_for(m, h)
+            t: ptr[_Table] = ptr(s.table)
+            found: bool = False
+            spinlock_lock(ptr(s.lock))
+            idx: u64 = _Table.find_slot_hashed(t, key, h)
+            if idx != _Table.capacity(t):
+                out[0] = t.values[idx]
+                found = True
+            spinlock_unlock(ptr(s.lock))
+            return found
+
+        def contains(m: ptr[_ConcurrentHashMap], key: key_type) -> bool:
+            h: u64 = hash_fn(key)
+            s: ptr[_Shard] = _ConcurrentHashMap._shard_for(m, h)
+            t: ptr[_Table] = ptr(s.table)
+            spinlock_lock(ptr(s.lock))
+            found: bool = _Table.find_slot_hashed(t, key, h) != _Table.capacity(t)
+            spinlock_unlock(ptr(s.lock))
+            return found
+
+        def erase(m: ptr[_ConcurrentHashMap], key: key_type) -> bool:
+            h: u64 = hash_fn(key)
+            s: ptr[_Shard] = _ConcurrentHashMap._shard_for(m, h)
+            t: ptr[_Table] = ptr(s.table)
+            spinlock_lock(ptr(s.lock))
+            erased: bool = _Table.erase_hashed(t, key, h)
+            spinlock_unlock(ptr(s.lock))
+            return erased
+
+    return _ConcurrentHashMap
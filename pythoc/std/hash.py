@@ -0,0 +1,339 @@
+"""Hash and equality functions for std.set / std.map keys.
+
+``default_hash(T)`` and ``default_eq(T)`` derive the functions a
+``FlatHashSet`` / ``FlatHashMap`` uses for key type ``T``:
+
+- integers and pointers hash their value (pointers by address)
+- structs and arrays combine the hashes of their fields / elements (arrays
+  decay to pointers when passed, so a table key wraps them in a struct)
+- ``Bytes`` hashes and compares the bytes it points to
+
+All of them are ``@inline``, so a table's probe loop compiles to straight-line
+hashing code for its key type.  Floating-point keys are not supported (NaN and
+-0.0 break hash/equality consistency); pass ``hash_fn`` / ``eq_fn`` to the
+container factories for those, or to override the defaults.
+"""
+
+from pythoc import *
+from pythoc.libc.string import memcpy, memcmp
+
+
+# Constants from Abseil's MixingHashState.  kStaticRandomData[0] is used as a
+# fixed seed; the multiplier kMul is chosen so that the 128-bit product spreads
+# entropy across all output bits.
+_HASH_K_MUL = u64(0x79d5f9e0de1e8cf5)
+_HASH_SEED = u64(0x243f6a8885a308d3)
+
+# wyhash's secret, for byte strings.
+_WYP0 = u64(0xa0761d6478bd642f)
+_WYP1 = u64(0xe7037ed1a0b428db)
+
+
+@inline
+def _mix64(a: u64, b: u64) -> u64:
+    """Return high64(a*b) ^ low64(a*b) without using a 128-bit type."""
+    a_lo: u64 = a & u64(0xFFFFFFFF)
+    a_hi: u64 = a >> 32
+    b_lo: u64 = b & u64(0xFFFFFFFF)
+    b_hi: u64 = b >> 32
+
+    lo: u64 = a_lo * b_lo
+    mid1: u64 = a_lo * b_hi
+    mid2: u64 = a_hi * b_lo
+    hi: u64 = a_hi * b_hi
+
+    mid: u64 = mid1 + mid2
+    mid_carry: u64 = u64(0)
+    if mid < mid1:
+        mid_carry = u64(1)
+
+    mid_lo_shifted: u64 = (mid & u64(0xFFFFFFFF)) << 32
+    low64: u64 = lo + mid_lo_shifted
+    carry: u64 = (mid >> 32) + (mid_carry << 32)
+    if low64 < lo:
+        carry += 1
+    high64: u64 = hi + carry
+
+    return high64 ^ low64
+
+
+@inline
+def _read64(p: ptr[u8]) -> u64:
+    v: u64 = 0
+    memcpy(ptr(v), p, 8)
+    return v
+
+
+@inline
+def _read32(p: ptr[u8]) -> u64:
+    v: u32 = 0
+    memcpy(ptr(v), p, 4)
+    return u64(v)
+
+
+@inline
+def hash_bytes(data: ptr[u8], n: u64) -> u64:
+    """wyhash-style hash of the *n* bytes at *data*."""
+    seed: u64 = _HASH_SEED
+    a: u64 = 0
+    b: u64 = 0
+    if n <= 16:
+        if n >= 4:
+            # Two (possibly overlapping) pairs of 4-byte words cover 4..16.
+            q: u64 = (n >> 3) << 2
+            a = (_read32(data) << 32) | _read32(data + q)
+            b = (_read32(data + n - 4) << 32) | _read32(data + n - 4 - q)
+        elif n > 0:
+            a = (u64(data[0]) << 16) | (u64(data[n >> 1]) << 8) | u64(data[n - 1])
+    else:
+        p: ptr[u8] = data
+        rest: u64 = n
+        while rest > 16:
+            seed = _mix64(_read64(p) ^ _WYP0, _read64(p + 8) ^ seed)
+            p = p + 16
+            rest -= 16
+        a = _read64(p + rest - 16)
+        b = _read64(p + rest - 8)
+    return _mix64(_WYP0 ^ n, _mix64(a ^ _WYP0, b ^ seed ^ _WYP1))
+
+
+@compile
+class Bytes:
+    """Byte string key: *size* bytes at *data*, hashed and compared by
+    content.  The table stores the pointer, not a copy of the bytes."""
+    data: ptr[u8]
+    size: u64
+
+
+_SCALAR_INTEGER_TYPES = [i8, i16, i32, i64, u8, u16, u32, u64]
+
+# Derived functions, by key type; filled on first use.
+_DEFAULT_HASH = {}
+_DEFAULT_EQ = {}
+
+
+# Parameters are left unannotated: each function serves several key types,
+# and the argument's own type is the one it is instantiated with.
+
+
+@inline
+def _scalar_hash(key) -> u64:
+    """Abseil-style hash for integer and pointer keys.
+
+    Mirrors ``absl::Hash``'s IntegralFastPath: cast to unsigned 64-bit and mix
+    with a seed and the fixed multiplier ``kMul``.
+    """
+    return _mix64(_HASH_SEED ^ u64(key), _HASH_K_MUL)
+
+
+@inline
+def _identity_eq(a, b) -> bool:
+    return a == b
+
+
+@inline
+def _bytes_hash(key) -> u64:
+    return hash_bytes(key.data, key.size)
+
+
+@inline
+def _bytes_eq(a, b) -> bool:
+    if a.size != b.size:
+        return False
+    return memcmp(a.data, b.data, a.size) == 0
+
+
+def _struct_hash(field_hashes):
+    @inline
+    def struct_hash(key) -> u64:
+        h: u64 = _HASH_SEED
+        for i in range(len(field_hashes)):
+            h = _mix64(h ^ field_hashes[i](key[i]), _HASH_K_MUL)
+        return h
+    return struct_hash
+
+
+def _struct_eq(field_eqs):
+    @inline
+    def struct_eq(a, b) -> bool:
+        same: bool = True
+        for i in range(len(field_eqs)):
+            if same:
+                same = field_eqs[i](a[i], b[i])
+        return same
+    return struct_eq
+
+
+# Array arguments decay to a pointer to their first element.
+def _array_hash(n_elements, element_hash):
+    @inline
+    def array_hash(key) -> u64:
+        h: u64 = _HASH_SEED
+        i: u64 = 0
+        while i < n_elements:
+            h = _mix64(h ^ element_hash(key[i]), _HASH_K_MUL)
+            i += 1
+        return h
+    return array_hash
+
+
+def _array_eq(n_elements, element_eq):
+    @inline
+    def array_eq(a, b) -> bool:
+        same: bool = True
+        i: u64 = 0
+        while same and i < n_elements:
+            same = element_eq(a[i], b[i])
+            i += 1
+        return same
+    return array_eq
+
+
+def _array_element_type(key_type):
+    """Type of ``key[i]`` for an array type."""
+    dims = tuple(key_type.dimensions)
+    if len(dims) == 1:
+        return key_type.element_type
+    return array[(key_type.element_type,) + dims[1:]]
+
+
+def _derive(key_type):
+    """Build (hash, eq) for *key_type*, or None if it is not hashable."""
+    if key_type in _SCALAR_INTEGER_TYPES or getattr(key_type, '_is_pointer', False):
+        return _scalar_hash, _identity_eq
+    if key_type is Bytes:
+        return _bytes_hash, _bytes_eq
+    if getattr(key_type, 'is_array', lambda: False)():
+        element = _array_element_type(key_type)
+        if default_hash(element) is None:
+            return None
+        length = key_type.dimensions[0]
+        return (_array_hash(length, default_hash(element)),
+                _array_eq(length, default_eq(element)))
+    is_struct = getattr(key_type, 'is_struct_type', lambda: False)
+    if getattr(key_type, '_is_struct', False) or is_struct():
+        key_type._ensure_field_types_resolved()
+        fields = list(key_type._field_types)
+        if not fields or any(default_hash(t) is None for t in fields):
+            return None
+        return (_struct_hash([default_hash(t) for t in fields]),
+                _struct_eq([default_eq(t) for t in fields]))
+    return None
+
+
+def _lookup(key_type):
+    if key_type not in _DEFAULT_HASH:
+        derived = _derive(key_type)
+        if derived is None:
+            return None
+        _DEFAULT_HASH[key_type], _DEFAULT_EQ[key_type] = derived
+    return key_type
+
+
+def default_hash(key_type):
+    """Derived ``hash(key: key_type) -> u64``, or None if unsupported."""
+    if _lookup(key_type) is None:
+        return None
+    return _DEFAULT_HASH[key_type]
+
+
+def default_eq(key_type):
+    """Derived ``eq(a: key_type, b: key_type) -> bool``, or None if unsupported."""
+    if _lookup(key_type) is None:
+        return None
+    return _DEFAULT_EQ[key_type]
+
+
+def resolve_key_functions(container, key_type, hash_fn=None, eq_fn=None):
+    """Pick the hash and equality functions a container uses for *key_type*.
+
+    Returns:
+        (hash_fn, eq_fn, suffix) where *suffix* names any user-supplied
+        functions, for the container's compile suffix
+
+    Raises:
+        TypeError: *key_type* is an array, or no function was given and
+            none can be derived for it
+    """
+    if getattr(key_type, 'is_array', lambda: False)():
+        raise TypeError(
+            f"{container}: array key type {key_type} cannot be passed by "
+            f"value; wrap it in a struct"
+        )
+    suffix = ()
+    if hash_fn is None:
+        hash_fn = default_hash(key_type)
+        if hash_fn is None:
+            raise TypeError(
+                f"{container}: no default hash for key type {key_type}; "
+                f"supported: integers, pointers, Bytes, and structs/arrays "
+                f"of those, or pass hash_fn="
+            )
+    else:
+        suffix += (_function_name(hash_fn),)
+    if eq_fn is None:
+        eq_fn = default_eq(key_type)
+        if eq_fn is None:
+            raise TypeError(
+                f"{container}: no default equality for key type {key_type}; "
+                f"pass eq_fn="
+            )
+    else:
+        suffix += (_function_name(eq_fn),)
+    return hash_fn, eq_fn, suffix
+
+
+def _function_name(fn, _seen=None):
+    name = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', fn)}"
+    # An @inline function is expanded into the container's own object, so
+    # what it computes is part of the container's identity: its body, and
+    # the values it closes over or reads from its globals.  Otherwise two
+    # scripts both run as __main__, an edited script, or two closures of
+    # one factory would share a cached object.
+    func_ast = getattr(fn, '_func_ast', None)
+    if func_ast is None:
+        return name
+    import ast
+    import hashlib
+    if _seen is None:
+        _seen = set()
+    _seen.add(id(fn))
+    hasher = hashlib.sha256(ast.dump(func_ast).encode('utf-8'))
+    original = getattr(fn, '_original_func', None)
+    code = getattr(original, '__code__', None)
+    if code is not None:
+        cells = original.__closure__ or ()
+        for var, cell in zip(code.co_freevars, cells):
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                continue
+            hasher.update(f"\0{var}={_value_key(value, _seen)}".encode('utf-8'))
+        for var in sorted(set(code.co_names)):
+            if var in original.__globals__:
+                value = original.__globals__[var]
+                hasher.update(f"\0{var}={_value_key(value, _seen)}".encode('utf-8'))
+    return f"{name}@{hasher.hexdigest()[:12]}"
+
+
+def _value_key(value, seen):
+    """Stable text for a value an @inline key function refers to."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        return '(' + ','.join(_value_key(v, seen) for v in value) + ')'
+    if getattr(value, '_func_ast', None) is not None:
+        if id(value) in seen:
+            return f"{value.__module__}.{value.__qualname__}"
+        return _function_name(value, seen)
+    if hasattr(value, 'get_name'):
+        try:
+            return value.get_name()
+        except TypeError:
+            pass
+    if isinstance(value, type) or callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', value)}"
+    if hasattr(value, '__name__'):
+        # Modules
+        return value.__name__
+    return repr(value)
@@ -2,6 +2,7 @@ from __future__ import annotations
 from pythoc import *
 from pythoc.libc.stdlib import malloc, free
 from pythoc.libc.string import memset, memcpy
+from pythoc.builtin_entities import prefetch
 
 
 # Control byte constants (signed i8 representation).
@@ -12,19 +13,42 @@ _CTRL_DELETED = i8(-2)      # 0xFE: tombstone
 _LOAD_NUM = 7
 _LOAD_DEN = 8
 
-# Minimum non-zero capacity.
+# Minimum non-zero capacity; capacities are _MIN_CAPACITY * 2**k.
 _MIN_CAPACITY = 16
 
+# A full table (at most _DROP_DELETES_NUM/_DROP_DELETES_DEN live) is rehashed
+# in place to reclaim its tombstones instead of doubling.
+_DROP_DELETES_NUM = 25
+_DROP_DELETES_DEN = 32
 
-# Re-use the identity hash/equality wrappers from std.set so both containers
-# share the same compiled helpers for scalar integer keys.
+# Tables are one malloc block laid out as ctrl | keys | values, each section
+# starting on its own cache line.
+_CACHE_LINE = 64
+
+# find_many / insert_many hash this many keys and prefetch their first probe
+# groups before resolving any of them, so the cache misses overlap.
+_BATCH = 16
+
+
+from pythoc.std.hash import resolve_key_functions
+
+# Re-use the control byte group operations from std.set.
 from pythoc.std.set import (
-    _DEFAULT_HASH as _DEFAULT_HASH,
-    _DEFAULT_EQ as _DEFAULT_EQ,
+    _GROUP_WIDTH as _GROUP_WIDTH,
+    _group_load as _group_load,
+    _group_match as _group_match,
+    _group_match_empty as _group_match_empty,
+    _group_match_empty_or_deleted as _group_match_empty_or_deleted,
+    _group_lowest as _group_lowest,
 )
 
 
-def FlatHashMap(key_type, value_type, size_type=u64):
+@inline
+def _align_up(n: u64) -> u64:
+    return (n + (_CACHE_LINE - 1)) & ~u64(_CACHE_LINE - 1)
+
+
+def FlatHashMap(key_type, value_type, size_type=u64, hash_fn=None, eq_fn=None):
     """Factory producing a flat hash map specialized for ``key_type``.
 
     The returned object is the compiled ``_FlatHashMap`` class itself, with
@@ -40,26 +64,25 @@ def FlatHashMap(key_type, value_type, size_type=u64):
     Instance-level attribute access resolves struct fields and class-level
     access resolves class attributes (methods), so a field and a method may
     share the same name without ambiguity.
+
+    Keys are hashed and compared as in ``FlatHashSet``; ``hash_fn`` and
+    ``eq_fn`` override the functions derived from ``key_type``.
     """
-    if key_type not in _DEFAULT_HASH:
-        raise TypeError(
-            f"FlatHashMap: no default hash for key type {key_type}. "
-            f"Supported: {list(_DEFAULT_HASH.keys())}"
-        )
+    hash_fn, eq_fn, fn_suffix = resolve_key_functions(
+        "FlatHashMap", key_type, hash_fn, eq_fn)
     if not (hasattr(size_type, '_is_integer') and size_type._is_integer):
         raise TypeError(
             f"FlatHashMap: size_type must be a PythoC integer type, got {size_type}"
         )
 
-    hash_fn = _DEFAULT_HASH[key_type]
-    eq_fn = _DEFAULT_EQ[key_type]
-    type_suffix = (key_type, value_type, size_type)
+    type_suffix = (key_type, value_type, size_type) + fn_suffix
 
     @compile(suffix=type_suffix)
     class _FlatHashMap:
         size: size_type
         capacity: size_type
         growth_left: size_type
+        alloc: ptr[i8]
         ctrl: ptr[i8]
         keys: ptr[key_type]
         values: ptr[value_type]
@@ -68,21 +91,15 @@ def FlatHashMap(key_type, value_type, size_type=u64):
             m.size = 0
             m.capacity = 0
             m.growth_left = 0
+            m.alloc = nullptr
             m.ctrl = nullptr
             m.keys = nullptr
             m.values = nullptr
 
         def destroy(m: ptr[_FlatHashMap]) -> None:
             if m.capacity > 0:
-                free(m.ctrl)
-                free(m.keys)
-                free(m.values)
-            m.size = 0
-            m.capacity = 0
-            m.growth_left = 0
-            m.ctrl = nullptr
-            m.keys = nullptr
-            m.values = nullptr
+                free(m.alloc)
+            _FlatHashMap.init(m)
 
         def size(m: ptr[_FlatHashMap]) -> size_type:
             return m.size
@@ -92,116 +109,298 @@ def FlatHashMap(key_type, value_type, size_type=u64):
 
         def clear(m: ptr[_FlatHashMap]) -> None:
             if m.capacity > 0:
-                memset(m.ctrl, -128, m.capacity)
+                memset(m.ctrl, -128, m.capacity + _GROUP_WIDTH)
             m.size = 0
             m.growth_left = m.capacity * _LOAD_NUM / _LOAD_DEN
 
-        def find(m: ptr[_FlatHashMap], key: key_type) -> ptr[value_type]:
-            if m.capacity == 0:
-                return nullptr
+        def _set_ctrl(m: ptr[_FlatHashMap], idx: size_type, c: i8) -> None:
+            m.ctrl[idx] = c
+            if idx < _GROUP_WIDTH:
+                m.ctrl[m.capacity + idx] = c
 
-            h: u64 = hash_fn(key)
-            h2: i8 = i8(u8(h & 0x7F))
-            idx: size_type = size_type(h >> 7) % m.capacity
-            cap: size_type = m.capacity
+        def _find_slot(m: ptr[_FlatHashMap], key: key_type, h: u64) -> size_type:
+            """Slot holding *key*, or ``m.capacity`` if it is absent."""
+            h2: u64 = h & 0x7F
+            mask: size_type = m.capacity - 1
+            pos: size_type = size_type(h >> 7) & mask
+            step: size_type = 0
+
+            while True:
+                g: u64 = _group_load(ptr(m.ctrl[pos]))
+                hits: u64 = _group_match(g, h2)
+                while hits != 0:
+                    idx: size_type = (pos + size_type(_group_lowest(hits))) & mask
+                    if eq_fn(m.keys[idx], key):
+                        return idx
+                    hits = hits & (hits - 1)
+                if _group_match_empty(g) != 0:
+                    return m.capacity
+                step += _GROUP_WIDTH
+                pos = (pos + step) & mask
+
+        def _find_first_non_full(m: ptr[_FlatHashMap], h: u64) -> size_type:
+            """First empty or deleted slot on the probe sequence of *h*."""
+            mask: size_type = m.capacity - 1
+            pos: size_type = size_type(h >> 7) & mask
+            step: size_type = 0
 
             while True:
-                c: i8 = m.ctrl[idx]
-                if c == _CTRL_EMPTY:
-                    return nullptr
-                if c == h2:
-                    slot_key: ptr[key_type] = ptr(m.keys[idx])
-                    if eq_fn(slot_key[0], key):
-                        return ptr(m.values[idx])
-                idx = (idx + 1) % cap
+                g: u64 = _group_load(ptr(m.ctrl[pos]))
+                free_slots: u64 = _group_match_empty_or_deleted(g)
+                if free_slots != 0:
+                    return (pos + size_type(_group_lowest(free_slots))) & mask
+                step += _GROUP_WIDTH
+                pos = (pos + step) & mask
+
+        def find_slot_hashed(m: ptr[_FlatHashMap], key: key_type, h: u64) -> size_type:
+            """Slot holding *key*, or ``capacity(m)`` if it is absent.
+
+            *h* must be ``hash_fn(key)``; for callers that hash keys
+            themselves.  The slot is valid until the next insert or erase.
+            """
+            if m.capacity == 0:
+                return 0
+            return _FlatHashMap._find_slot(m, key, h)
+
+        def find(m: ptr[_FlatHashMap], key: key_type) -> ptr[value_type]:
+            idx: size_type = _FlatHashMap.find_slot_hashed(m, key, hash_fn(key))
+            if idx == m.capacity:
+                return nullptr
+            return ptr(m.values[idx])
 
         def contains(m: ptr[_FlatHashMap], key: key_type) -> bool:
             return _FlatHashMap.find(m, key) != nullptr
 
-        def _insert_no_grow(m: ptr[_FlatHashMap], key: key_type, value: value_type) -> bool:
-            h: u64 = hash_fn(key)
-            h2: i8 = i8(u8(h & 0x7F))
-            idx: size_type = size_type(h >> 7) % m.capacity
-            cap: size_type = m.capacity
-            first_deleted: size_type = cap
+        def find_many(m: ptr[_FlatHashMap], keys: ptr[key_type], n: u64,
+                      out: ptr[ptr[value_type]]) -> u64:
+            """Set ``out[i] = find(m, keys[i])`` for each of the *n* keys.
 
-            while True:
-                c: i8 = m.ctrl[idx]
-                if c == _CTRL_EMPTY:
-                    if first_deleted < cap:
-                        idx = first_deleted
-                    m.ctrl[idx] = h2
-                    m.keys[idx] = key
-                    m.values[idx] = value
-                    m.size += 1
-                    m.growth_left -= 1
-                    return True
-                if c == _CTRL_DELETED:
-                    if first_deleted == cap:
-                        first_deleted = idx
-                elif c == h2:
-                    slot_key: ptr[key_type] = ptr(m.keys[idx])
-                    if eq_fn(slot_key[0], key):
-                        m.values[idx] = value
-                        return False
-                idx = (idx + 1) % cap
-
-        def _rehash(m: ptr[_FlatHashMap], newcapacity: size_type) -> None:
+            Returns the number of keys found.
+            """
+            found: u64 = 0
+            if m.capacity == 0:
+                i: u64 = 0
+                while i < n:
+                    out[i] = nullptr
+                    i += 1
+                return found
+
+            hashes: array[u64, _BATCH]
+            mask: size_type = m.capacity - 1
+            base: u64 = 0
+            while base < n:
+                count: u64 = n - base
+                if count > _BATCH:
+                    count = _BATCH
+                j: u64 = 0
+                while j < count:
+                    h: u64 = hash_fn(keys[base + j])
+                    hashes[j] = h
+                    pos: size_type = size_type(h >> 7) & mask
+                    prefetch(ptr(m.ctrl[pos]))
+                    prefetch(ptr(m.keys[pos]))
+                    j += 1
+                j = 0
+                while j < count:
+                    idx: size_type = _FlatHashMap._find_slot(m, keys[base + j], hashes[j])
+                    if idx == m.capacity:
+                        out[base + j] = nullptr
+                    else:
+                        out[base + j] = ptr(m.values[idx])
+                        found += 1
+                    j += 1
+                base += count
+            return found
+
+        def _insert_no_grow(m: ptr[_FlatHashMap], key: key_type, value: value_type,
+                            h: u64) -> bool:
+            idx: size_type = _FlatHashMap._find_slot(m, key, h)
+            if idx != m.capacity:
+                m.values[idx] = value
+                return False
+            idx = _FlatHashMap._find_first_non_full(m, h)
+            if m.ctrl[idx] == _CTRL_EMPTY:
+                m.growth_left -= 1
+            _FlatHashMap._set_ctrl(m, idx, i8(u8(h & 0x7F)))
+            m.keys[idx] = key
+            m.values[idx] = value
+            m.size += 1
+            return True
+
+        def _capacity_for(n: size_type) -> size_type:
+            """Smallest capacity holding *n* elements within the load factor."""
+            cap: size_type = _MIN_CAPACITY
+            while cap * _LOAD_NUM / _LOAD_DEN < n:
+                cap = cap * 2
+            return cap
+
+        def _allocate(m: ptr[_FlatHashMap], capacity: size_type) -> None:
+            """Point *m* at a new, empty table; the old one is not freed."""
+            ctrl_bytes: u64 = _align_up(u64(capacity) + _GROUP_WIDTH)
+            keys_bytes: u64 = _align_up(u64(capacity) * sizeof(key_type))
+            values_bytes: u64 = u64(capacity) * sizeof(value_type)
+            raw: ptr[i8] = malloc(ctrl_bytes + keys_bytes + values_bytes + _CACHE_LINE - 1)
+            base: ptr[i8] = raw + ((_CACHE_LINE - (u64(raw) & (_CACHE_LINE - 1))) & (_CACHE_LINE - 1))
+            memset(base, -128, u64(capacity) + _GROUP_WIDTH)
+
+            m.alloc = raw
+            m.ctrl = base
+            m.keys = ptr[key_type](base + ctrl_bytes)
+            m.values = ptr[value_type](base + ctrl_bytes + keys_bytes)
+            m.capacity = capacity
+            m.growth_left = capacity * _LOAD_NUM / _LOAD_DEN - m.size
+
+        def _resize(m: ptr[_FlatHashMap], newcapacity: size_type) -> None:
+            old_alloc: ptr[i8] = m.alloc
             old_ctrl: ptr[i8] = m.ctrl
             old_keys: ptr[key_type] = m.keys
             old_values: ptr[value_type] = m.values
             old_cap: size_type = m.capacity
 
-            new_ctrl: ptr[i8] = malloc(newcapacity)
-            memset(new_ctrl, -128, newcapacity)
-            new_keys: ptr[key_type] = malloc(newcapacity * sizeof(key_type))
-            new_values: ptr[value_type] = malloc(newcapacity * sizeof(value_type))
-
-            m.ctrl = new_ctrl
-            m.keys = new_keys
-            m.values = new_values
-            m.capacity = newcapacity
-            m.size = 0
-            m.growth_left = newcapacity * _LOAD_NUM / _LOAD_DEN
+            _FlatHashMap._allocate(m, newcapacity)
 
+            # Keys are unique, so each goes straight to its first free slot.
             if old_cap > 0:
                 i: size_type = 0
                 while i < old_cap:
                     c: i8 = old_ctrl[i]
                     if c != _CTRL_EMPTY and c != _CTRL_DELETED:
-                        _FlatHashMap._insert_no_grow(m, old_keys[i], old_values[i])
+                        h: u64 = hash_fn(old_keys[i])
+                        idx: size_type = _FlatHashMap._find_first_non_full(m, h)
+                        _FlatHashMap._set_ctrl(m, idx, c)
+                        m.keys[idx] = old_keys[i]
+                        m.values[idx] = old_values[i]
                     i += 1
-                free(old_ctrl)
-                free(old_keys)
-                free(old_values)
+                free(old_alloc)
 
-        def insert(m: ptr[_FlatHashMap], key: key_type, value: value_type) -> bool:
-            if m.growth_left == 0:
-                new_cap: size_type = _MIN_CAPACITY
-                if m.capacity > 0:
-                    new_cap = m.capacity * 2
-                _FlatHashMap._rehash(m, new_cap)
-            return _FlatHashMap._insert_no_grow(m, key, value)
+        def _drop_deletes_without_resize(m: ptr[_FlatHashMap]) -> None:
+            """Rehash in place, turning every tombstone back into EMPTY."""
+            cap: size_type = m.capacity
+            mask: size_type = cap - 1
 
-        def erase(m: ptr[_FlatHashMap], key: key_type) -> bool:
+            # Mark the live slots DELETED (still to be placed) and the
+            # tombstones EMPTY.
+            i: size_type = 0
+            while i < cap:
+                c: i8 = m.ctrl[i]
+                if c == _CTRL_DELETED:
+                    m.ctrl[i] = _CTRL_EMPTY
+                elif c != _CTRL_EMPTY:
+                    m.ctrl[i] = _CTRL_DELETED
+                i += 1
+            memcpy(ptr(m.ctrl[cap]), m.ctrl, _GROUP_WIDTH)
+
+            i = 0
+            while i < cap:
+                if m.ctrl[i] != _CTRL_DELETED:
+                    i += 1
+                    continue
+                h: u64 = hash_fn(m.keys[i])
+                h2: i8 = i8(u8(h & 0x7F))
+                target: size_type = _FlatHashMap._find_first_non_full(m, h)
+                pos: size_type = size_type(h >> 7) & mask
+                if ((i - pos) & mask) / _GROUP_WIDTH == ((target - pos) & mask) / _GROUP_WIDTH:
+                    # Already in the first group a lookup would reach.
+                    _FlatHashMap._set_ctrl(m, i, h2)
+                    i += 1
+                elif m.ctrl[target] == _CTRL_EMPTY:
+                    _FlatHashMap._set_ctrl(m, target, h2)
+                    m.keys[target] = m.keys[i]
+                    m.values[target] = m.values[i]
+                    _FlatHashMap._set_ctrl(m, i, _CTRL_EMPTY)
+                    i += 1
+                else:
+                    # target holds an element not placed yet: swap the two
+                    # and place that one next, from slot i.
+                    _FlatHashMap._set_ctrl(m, target, h2)
+                    key: key_type = m.keys[target]
+                    value: value_type = m.values[target]
+                    m.keys[target] = m.keys[i]
+                    m.values[target] = m.values[i]
+                    m.keys[i] = key
+                    m.values[i] = value
+
+            m.growth_left = cap * _LOAD_NUM / _LOAD_DEN - m.size
+
+        def _rehash_and_grow_if_necessary(m: ptr[_FlatHashMap]) -> None:
             if m.capacity == 0:
-                return False
+                _FlatHashMap._resize(m, _MIN_CAPACITY)
+            elif u64(m.size) * _DROP_DELETES_DEN <= u64(m.capacity) * _DROP_DELETES_NUM:
+                _FlatHashMap._drop_deletes_without_resize(m)
+            else:
+                _FlatHashMap._resize(m, m.capacity * 2)
+
+        def reserve(m: ptr[_FlatHashMap], n: size_type) -> None:
+            """Make room for *n* elements in total without rehashing."""
+            if n > m.size + m.growth_left:
+                cap: size_type = _FlatHashMap._capacity_for(n)
+                if cap < m.capacity:
+                    cap = m.capacity
+                _FlatHashMap._resize(m, cap)
+
+        def shrink_to_fit(m: ptr[_FlatHashMap]) -> None:
+            """Shrink to the smallest capacity holding the current elements."""
+            if m.size == 0:
+                _FlatHashMap.destroy(m)
+                return
+            cap: size_type = _FlatHashMap._capacity_for(m.size)
+            if cap < m.capacity:
+                _FlatHashMap._resize(m, cap)
+
+        def insert_hashed(m: ptr[_FlatHashMap], key: key_type, value: value_type,
+                          h: u64) -> bool:
+            """``insert`` with *h* = ``hash_fn(key)`` computed by the caller."""
+            if m.growth_left == 0:
+                _FlatHashMap._rehash_and_grow_if_necessary(m)
+            return _FlatHashMap._insert_no_grow(m, key, value, h)
 
-            h: u64 = hash_fn(key)
-            h2: i8 = i8(u8(h & 0x7F))
-            idx: size_type = size_type(h >> 7) % m.capacity
-            cap: size_type = m.capacity
+        def insert(m: ptr[_FlatHashMap], key: key_type, value: value_type) -> bool:
+            return _FlatHashMap.insert_hashed(m, key, value, hash_fn(key))
+
+        def insert_many(m: ptr[_FlatHashMap], keys: ptr[key_type],
+                        values: ptr[value_type], n: u64) -> u64:
+            """Insert or update ``keys[i] -> values[i]`` for each of the *n*
+            pairs, in order.
+
+            Returns the number of keys that were not already present.
+            """
+            hashes: array[u64, _BATCH]
+            added: u64 = 0
+            base: u64 = 0
+            while base < n:
+                count: u64 = n - base
+                if count > _BATCH:
+                    count = _BATCH
+                # Grow before the batch, so its probes are not invalidated.
+                if u64(m.growth_left) < count:
+                    _FlatHashMap.reserve(m, m.size + size_type(count))
+                mask: size_type = m.capacity - 1
+                j: u64 = 0
+                while j < count:
+                    h: u64 = hash_fn(keys[base + j])
+                    hashes[j] = h
+                    pos: size_type = size_type(h >> 7) & mask
+                    prefetch(ptr(m.ctrl[pos]), True)
+                    prefetch(ptr(m.keys[pos]), True)
+                    j += 1
+                j = 0
+                while j < count:
+                    if _FlatHashMap._insert_no_grow(m, keys[base + j], values[base + j], hashes[j]):
+                        added += 1
+                    j += 1
+                base += count
+            return added
+
+        def erase_hashed(m: ptr[_FlatHashMap], key: key_type, h: u64) -> bool:
+            """``erase`` with *h* = ``hash_fn(key)`` computed by the caller."""
+            idx: size_type = _FlatHashMap.find_slot_hashed(m, key, h)
+            if idx == m.capacity:
+                return False
+            _FlatHashMap._set_ctrl(m, idx, _CTRL_DELETED)
+            m.size -= 1
+            return True
 
-            while True:
-                c: i8 = m.ctrl[idx]
-                if c == _CTRL_EMPTY:
-                    return False
-                if c == h2:
-                    slot_key: ptr[key_type] = ptr(m.keys[idx])
-                    if eq_fn(slot_key[0], key):
-                        m.ctrl[idx] = _CTRL_DELETED
-                        m.size -= 1
-                        return True
-                idx = (idx + 1) % cap
+        def erase(m: ptr[_FlatHashMap], key: key_type) -> bool:
+            return _FlatHashMap.erase_hashed(m, key, hash_fn(key))
 
     return _FlatHashMap
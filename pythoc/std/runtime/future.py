@@ -20,7 +20,9 @@ from pythoc.logger import logger
 from pythoc.type_converter import get_base_type
 from pythoc.valueref import wrap_value
 
-from .spawn_typed import _TypedTask, _extract_params, _extract_return_type
+from .spawn_typed import (
+    _TypedTask, _extract_params, _extract_return_type, _target_suffix_key,
+)
 from .executor_effect import DefaultExecutor, ExecutorHandle
 
 effect.default(executor=DefaultExecutor)
@@ -87,6 +89,9 @@ def _FutureTask(target_fn, *, stack_size=None, suffix=None, executor_binding=Non
         _FUTURE_ABI_VERSION,
         "future",
         fn_name,
+        # Struct types print without their compile suffix, so same-named
+        # targets from different groups need the group to stay apart.
+        _target_suffix_key(target_fn),
         tuple(t for _, t in param_info),
         ret_type,
         executor_suffix,
@@ -2,6 +2,7 @@ from __future__ import annotations
 from pythoc import *
 from pythoc.libc.stdlib import malloc, free
 from pythoc.libc.string import memset, memcpy
+from pythoc.std.hash import resolve_key_functions
 
 
 # Control byte constants (signed i8 representation).
@@ -12,68 +13,61 @@ _CTRL_DELETED = i8(-2)      # 0xFE: tombstone
 _LOAD_NUM = 7
 _LOAD_DEN = 8
 
-# Minimum non-zero capacity.
+# Minimum non-zero capacity.  Capacities are always _MIN_CAPACITY * 2**k, so
+# slot indices wrap with ``& (capacity - 1)``.
 _MIN_CAPACITY = 16
 
+# Control bytes are probed a group at a time, as one u64 (SWAR).  The ctrl
+# array has _GROUP_WIDTH bytes past the end that mirror its first ones, so a
+# group starting at any slot can be loaded without wrapping.
+_GROUP_WIDTH = 8
+_GROUP_LSBS = u64(0x0101010101010101)
+_GROUP_MSBS = u64(0x8080808080808080)
 
-# Constants from Abseil's MixingHashState.  kStaticRandomData[0] is used as a
-# fixed seed; the multiplier kMul is chosen so that the 128-bit product spreads
-# entropy across all output bits.
-_HASH_K_MUL = u64(0x79d5f9e0de1e8cf5)
-_HASH_SEED = u64(0x243f6a8885a308d3)
 
+# Group operations on 8 control bytes loaded little-endian: byte k of the
+# group is slot ``pos + k``.  A match mask has the top bit of byte k set for
+# every matching slot.
 
-@compile
-def _mix64(a: u64, b: u64) -> u64:
-    """Return high64(a*b) ^ low64(a*b) without using a 128-bit type."""
-    a_lo: u64 = a & u64(0xFFFFFFFF)
-    a_hi: u64 = a >> 32
-    b_lo: u64 = b & u64(0xFFFFFFFF)
-    b_hi: u64 = b >> 32
 
-    lo: u64 = a_lo * b_lo
-    mid1: u64 = a_lo * b_hi
-    mid2: u64 = a_hi * b_lo
-    hi: u64 = a_hi * b_hi
+@inline
+def _group_load(ctrl: ptr[i8]) -> u64:
+    g: u64 = 0
+    memcpy(ptr(g), ctrl, _GROUP_WIDTH)
+    return g
 
-    mid: u64 = mid1 + mid2
-    mid_carry: u64 = u64(0)
-    if mid < mid1:
-        mid_carry = u64(1)
 
-    mid_lo_shifted: u64 = (mid & u64(0xFFFFFFFF)) << 32
-    low64: u64 = lo + mid_lo_shifted
-    carry: u64 = (mid >> 32) + (mid_carry << 32)
-    if low64 < lo:
-        carry += 1
-    high64: u64 = hi + carry
+@inline
+def _group_match(g: u64, h2: u64) -> u64:
+    """Slots whose control byte is *h2*.
 
-    return high64 ^ low64
-
-
-@compile
-def _scalar_hash(T: param, key: T) -> u64:
-    """Abseil-style hash for scalar integer keys.
-
-    Mirrors ``absl::Hash``'s IntegralFastPath: cast to unsigned 64-bit and mix
-    with a seed and the fixed multiplier ``kMul``.
+    May also report a full slot right above a real match, which the key
+    comparison rejects; never reports an empty or deleted slot.
     """
-    v: u64 = u64(key)
-    return _mix64(_HASH_SEED ^ v, _HASH_K_MUL)
+    x: u64 = g ^ (_GROUP_LSBS * h2)
+    return (x - _GROUP_LSBS) & ~x & _GROUP_MSBS
+
 
+@inline
+def _group_match_empty(g: u64) -> u64:
+    # EMPTY (0x80) is the only control byte with bit 7 set and bit 1 clear.
+    return g & ~(g << 6) & _GROUP_MSBS
 
-@compile
-def _identity_eq(T: param, a: T, b: T) -> bool:
-    return a == b
 
+@inline
+def _group_match_empty_or_deleted(g: u64) -> u64:
+    # EMPTY (0x80) and DELETED (0xFE) both have bit 7 set and bit 0 clear.
+    return g & ~(g << 7) & _GROUP_MSBS
 
-_SCALAR_INTEGER_TYPES = [i8, i16, i32, i64, u8, u16, u32, u64]
 
-_DEFAULT_HASH = {t: _scalar_hash(t) for t in _SCALAR_INTEGER_TYPES}
-_DEFAULT_EQ = {t: _identity_eq(t) for t in _SCALAR_INTEGER_TYPES}
+@inline
+def _group_lowest(mask: u64) -> u64:
+    """Index of the lowest slot in a non-zero match mask."""
+    bit: u64 = (mask & (~mask + 1)) >> 7
+    return (bit * u64(0x0001020304050607)) >> 56
 
 
-def FlatHashSet(key_type, size_type=u64):
+def FlatHashSet(key_type, size_type=u64, hash_fn=None, eq_fn=None):
     """Factory producing a flat hash set specialized for ``key_type``.
 
     The returned object is the compiled ``_FlatHashSet`` class itself, with
@@ -89,20 +83,21 @@ def FlatHashSet(key_type, size_type=u64):
     Instance-level attribute access resolves struct fields and class-level
     access resolves class attributes (methods), so a field and a method may
     share the same name without ambiguity.
+
+    Keys are hashed and compared with ``pythoc.std.hash.default_hash`` /
+    ``default_eq`` for ``key_type`` (integers, pointers, ``Bytes``, and
+    structs/arrays of those).  ``hash_fn(key) -> u64`` and
+    ``eq_fn(a, b) -> bool`` replace them; make them ``@inline`` so they
+    compile into the probe loop.
     """
-    if key_type not in _DEFAULT_HASH:
-        raise TypeError(
-            f"FlatHashSet: no default hash for key type {key_type}. "
-            f"Supported: {list(_DEFAULT_HASH.keys())}"
-        )
+    hash_fn, eq_fn, fn_suffix = resolve_key_functions(
+        "FlatHashSet", key_type, hash_fn, eq_fn)
     if not (hasattr(size_type, '_is_integer') and size_type._is_integer):
         raise TypeError(
             f"FlatHashSet: size_type must be a PythoC integer type, got {size_type}"
         )
 
-    hash_fn = _DEFAULT_HASH[key_type]
-    eq_fn = _DEFAULT_EQ[key_type]
-    type_suffix = (key_type, size_type)
+    type_suffix = (key_type, size_type) + fn_suffix
 
     @compile(suffix=type_suffix)
     class _FlatHashSet:
@@ -137,79 +132,96 @@ def FlatHashSet(key_type, size_type=u64):
 
         def clear(s: ptr[_FlatHashSet]) -> None:
             if s.capacity > 0:
-                memset(s.ctrl, -128, s.capacity)
+                memset(s.ctrl, -128, s.capacity + _GROUP_WIDTH)
             s.size = 0
             s.growth_left = s.capacity * _LOAD_NUM / _LOAD_DEN
 
-        def find(s: ptr[_FlatHashSet], key: key_type) -> ptr[key_type]:
-            if s.capacity == 0:
-                return nullptr
+        def _set_ctrl(s: ptr[_FlatHashSet], idx: size_type, c: i8) -> None:
+            s.ctrl[idx] = c
+            if idx < _GROUP_WIDTH:
+                s.ctrl[s.capacity + idx] = c
 
-            h: u64 = hash_fn(key)
-            h2: i8 = i8(u8(h & 0x7F))
-            idx: size_type = size_type(h >> 7) % s.capacity
-            cap: size_type = s.capacity
+        def _find_slot(s: ptr[_FlatHashSet], key: key_type, h: u64) -> size_type:
+            """Slot holding *key*, or ``s.capacity`` if it is absent."""
+            h2: u64 = h & 0x7F
+            mask: size_type = s.capacity - 1
+            pos: size_type = size_type(h >> 7) & mask
+            step: size_type = 0
 
             while True:
-                c: i8 = s.ctrl[idx]
-                if c == _CTRL_EMPTY:
-                    return nullptr
-                if c == h2:
-                    slot: ptr[key_type] = ptr(s.slots[idx])
-                    if eq_fn(slot[0], key):
-                        return slot
-                idx = (idx + 1) % cap
+                g: u64 = _group_load(ptr(s.ctrl[pos]))
+                hits: u64 = _group_match(g, h2)
+                while hits != 0:
+                    idx: size_type = (pos + size_type(_group_lowest(hits))) & mask
+                    if eq_fn(s.slots[idx], key):
+                        return idx
+                    hits = hits & (hits - 1)
+                if _group_match_empty(g) != 0:
+                    return s.capacity
+                step += _GROUP_WIDTH
+                pos = (pos + step) & mask
+
+        def _find_first_non_full(s: ptr[_FlatHashSet], h: u64) -> size_type:
+            """First empty or deleted slot on the probe sequence of *h*."""
+            mask: size_type = s.capacity - 1
+            pos: size_type = size_type(h >> 7) & mask
+            step: size_type = 0
+
+            while True:
+                g: u64 = _group_load(ptr(s.ctrl[pos]))
+                free_slots: u64 = _group_match_empty_or_deleted(g)
+                if free_slots != 0:
+                    return (pos + size_type(_group_lowest(free_slots))) & mask
+                step += _GROUP_WIDTH
+                pos = (pos + step) & mask
+
+        def find(s: ptr[_FlatHashSet], key: key_type) -> ptr[key_type]:
+            if s.capacity == 0:
+                return nullptr
+            idx: size_type = _FlatHashSet._find_slot(s, key, hash_fn(key))
+            if idx == s.capacity:
+                return nullptr
+            return ptr(s.slots[idx])
 
         def contains(s: ptr[_FlatHashSet], key: key_type) -> bool:
             return _FlatHashSet.find(s, key) != nullptr
 
         def _insert_no_grow(s: ptr[_FlatHashSet], key: key_type) -> bool:
             h: u64 = hash_fn(key)
-            h2: i8 = i8(u8(h & 0x7F))
-            idx: size_type = size_type(h >> 7) % s.capacity
-            cap: size_type = s.capacity
-            first_deleted: size_type = cap
-
-            while True:
-                c: i8 = s.ctrl[idx]
-                if c == _CTRL_EMPTY:
-                    if first_deleted < cap:
-                        idx = first_deleted
-                    s.ctrl[idx] = h2
-                    s.slots[idx] = key
-                    s.size += 1
-                    s.growth_left -= 1
-                    return True
-                if c == _CTRL_DELETED:
-                    if first_deleted == cap:
-                        first_deleted = idx
-                elif c == h2:
-                    slot: ptr[key_type] = ptr(s.slots[idx])
-                    if eq_fn(slot[0], key):
-                        return False
-                idx = (idx + 1) % cap
+            if _FlatHashSet._find_slot(s, key, h) != s.capacity:
+                return False
+            idx: size_type = _FlatHashSet._find_first_non_full(s, h)
+            if s.ctrl[idx] == _CTRL_EMPTY:
+                s.growth_left -= 1
+            _FlatHashSet._set_ctrl(s, idx, i8(u8(h & 0x7F)))
+            s.slots[idx] = key
+            s.size += 1
+            return True
 
         def _rehash(s: ptr[_FlatHashSet], newcapacity: size_type) -> None:
             old_ctrl: ptr[i8] = s.ctrl
             old_slots: ptr[key_type] = s.slots
             old_cap: size_type = s.capacity
 
-            new_ctrl: ptr[i8] = malloc(newcapacity)
-            memset(new_ctrl, -128, newcapacity)
+            new_ctrl: ptr[i8] = malloc(newcapacity + _GROUP_WIDTH)
+            memset(new_ctrl, -128, newcapacity + _GROUP_WIDTH)
             new_slots: ptr[key_type] = malloc(newcapacity * sizeof(key_type))
 
             s.ctrl = new_ctrl
             s.slots = new_slots
             s.capacity = newcapacity
-            s.size = 0
-            s.growth_left = newcapacity * _LOAD_NUM / _LOAD_DEN
+            s.growth_left = newcapacity * _LOAD_NUM / _LOAD_DEN - s.size
 
+            # Keys are unique, so each goes straight to its first free slot.
             if old_cap > 0:
                 i: size_type = 0
                 while i < old_cap:
                     c: i8 = old_ctrl[i]
                     if c != _CTRL_EMPTY and c != _CTRL_DELETED:
-                        _FlatHashSet._insert_no_grow(s, old_slots[i])
+                        h: u64 = hash_fn(old_slots[i])
+                        idx: size_type = _FlatHashSet._find_first_non_full(s, h)
+                        _FlatHashSet._set_ctrl(s, idx, c)
+                        s.slots[idx] = old_slots[i]
                     i += 1
                 free(old_ctrl)
                 free(old_slots)
@@ -225,22 +237,11 @@ def FlatHashSet(key_type, size_type=u64):
         def erase(s: ptr[_FlatHashSet], key: key_type) -> bool:
             if s.capacity == 0:
                 return False
-
-            h: u64 = hash_fn(key)
-            h2: i8 = i8(u8(h & 0x7F))
-            idx: size_type = size_type(h >> 7) % s.capacity
-            cap: size_type = s.capacity
-
-            while True:
-                c: i8 = s.ctrl[idx]
-                if c == _CTRL_EMPTY:
-                    return False
-                if c == h2:
-                    slot: ptr[key_type] = ptr(s.slots[idx])
-                    if eq_fn(slot[0], key):
-                        s.ctrl[idx] = _CTRL_DELETED
-                        s.size -= 1
-                        return True
-                idx = (idx + 1) % cap
+            idx: size_type = _FlatHashSet._find_slot(s, key, hash_fn(key))
+            if idx == s.capacity:
+                return False
+            _FlatHashSet._set_ctrl(s, idx, _CTRL_DELETED)
+            s.size -= 1
+            return True
 
     return _FlatHashSet
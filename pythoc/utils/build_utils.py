@@ -286,6 +286,18 @@ def _build_selected_link_plan(symbols: Sequence[Any]) -> _LinkPlan:
     return _collect_group_link_plan(group_keys)
 
 
+def _apply_lto(obj_files: List[str], output_path: str,
+               preserve_symbols: Iterable[str]) -> List[str]:
+    """Merge the bitcode of *obj_files* into one LTO object when enabled."""
+    from ..config import config
+    from ..build.lto import lto_link_objects
+
+    if not config.lto:
+        return obj_files
+    lto_obj = os.path.splitext(output_path)[0] + '.lto.o'
+    return lto_link_objects(obj_files, lto_obj, preserve_symbols)
+
+
 def link_executable(obj_files: List[str], output_path: str) -> str:
     """Link object files into a native executable."""
     from .link_utils import try_link_with_linkers
@@ -360,6 +372,7 @@ def compile_to_executable(output_path: Optional[str] = None,
     if not obj_files:
         raise RuntimeError("No @compile decorated functions found. Nothing to compile.")
 
+    obj_files = _apply_lto(obj_files, output_path, preserve_symbols=['main'])
     return link_executable(obj_files, output_path)
 
 
@@ -402,7 +415,11 @@ def compile_to_dynamic_library(
         get_shared_lib_extension(),
         use_lib_prefix=sys.platform != 'win32',
     )
-    return link_dynamic_library(plan.obj_files, output_path, plan.link_libraries)
+    preserve_symbols: Set[str] = set()
+    for symbol in selected_symbols:
+        preserve_symbols |= _function_names(symbol)
+    obj_files = _apply_lto(plan.obj_files, output_path, preserve_symbols)
+    return link_dynamic_library(obj_files, output_path, plan.link_libraries)
 
 
 def export_c_headers(
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Batched calls of scalar @compile functions over buffers.
+
+``fn.map(xs, ys)`` calls ``fn`` once per element of the buffers ``xs`` and
+``ys`` (anything exporting the buffer protocol: ``array.array``, NumPy
+arrays, ``bytearray``, ...) and returns the results as a new buffer.  The
+loop runs natively: for each combination of buffer and scalar arguments a
+driver function is generated and compiled into its own group::
+
+    def fn_map(n: u64, out: ptr[R], a0: ptr[T0], a1: T1):
+        for i in seq(n):
+            out[i] = fn(a0[i], a1)
+
+so Python crosses into native code once per batch instead of once per
+element.  Buffers are passed by address without copying (see
+:mod:`pythoc.buffers`); plain Python numbers are broadcast.
+"""
+
+import ast
+import threading
+from typing import Dict, Optional, Tuple
+
+from .buffers import acquire_buffer, is_buffer, new_buffer, scalar_ctype
+from .builtin_entities import ptr, seq, u64, void
+
+
+class VectorizedFunction:
+    """Element-wise batched form of a scalar @compile function"""
+
+    def __init__(self, wrapper):
+        func_info = getattr(wrapper, '_func_info', None)
+        if func_info is None:
+            raise TypeError(f"{wrapper!r} is not a @compile function")
+        self._wrapper = wrapper
+        self._name = func_info.name
+        self._param_types = [func_info.param_type_hints.get(name)
+                             for name in func_info.param_names]
+        self._param_ctypes = []
+        for name, pc_type in zip(func_info.param_names, self._param_types):
+            ctype = scalar_ctype(pc_type)
+            if ctype is None:
+                raise TypeError(
+                    f"{self._name}.map() needs scalar parameters, "
+                    f"'{name}' is {_type_name(pc_type)}"
+                )
+            self._param_ctypes.append(ctype)
+        self._return_type = func_info.return_type_hint
+        if self._return_type is void:
+            self._return_type = None
+        self._return_ctype = None
+        if self._return_type is not None:
+            self._return_ctype = scalar_ctype(self._return_type)
+            if self._return_ctype is None:
+                raise TypeError(
+                    f"{self._name}.map() needs a scalar return type, "
+                    f"got {_type_name(self._return_type)}"
+                )
+        # (is_buffer per argument) -> compiled driver
+        self._drivers: Dict[Tuple[bool, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, out=None):
+        """
+        Call the function for every element of the buffer arguments.
+
+        Args:
+            *args: One value per parameter; buffers are iterated over
+                (all with the same shape), Python numbers are passed to
+                every call
+            out: Optional writable buffer for the results, with the shape
+                of the inputs and the return type's element layout
+
+        Returns:
+            *out*, or a new buffer of results: a NumPy array if the first
+            buffer argument is one, a ``memoryview`` otherwise.  None if the
+            function returns void.
+        """
+        if len(args) != len(self._param_ctypes):
+            raise TypeError(
+                f"{self._name}.map() takes {len(self._param_ctypes)} arguments "
+                f"({len(args)} given)"
+            )
+        pattern = tuple(is_buffer(arg) for arg in args)
+        if not any(pattern):
+            raise TypeError(f"{self._name}.map() needs at least one buffer argument")
+
+        views = []
+        try:
+            native_args = []
+            shape = None
+            like = None
+            for i, (arg, as_buffer) in enumerate(zip(args, pattern)):
+                if not as_buffer:
+                    native_args.append(arg)
+                    continue
+                view = acquire_buffer(arg)
+                views.append(view)
+                if not view.matches(self._param_ctypes[i]):
+                    raise TypeError(
+                        f"{self._name}.map() argument {i + 1}: buffer of "
+                        f"'{view.format}' cannot hold "
+                        f"{_type_name(self._param_types[i])} elements"
+                    )
+                if shape is None:
+                    shape, like = view.shape, arg
+                elif view.shape != shape:
+                    raise ValueError(
+                        f"{self._name}.map() buffers have different shapes: "
+                        f"{shape} and {view.shape}"
+                    )
+                native_args.append(view.address)
+            count = views[0].count
+
+            out_address = None
+            if self._return_ctype is not None:
+                if out is None:
+                    out = new_buffer(self._return_ctype, shape, like=like)
+                out_view = acquire_buffer(out, writable=True)
+                views.append(out_view)
+                if not out_view.matches(self._return_ctype) or out_view.count != count:
+                    raise TypeError(
+                        f"{self._name}.map() out must hold {count} "
+                        f"{_type_name(self._return_type)} elements"
+                    )
+                out_address = out_view.address
+            elif out is not None:
+                raise TypeError(f"{self._name}.map() has no results to store in out")
+
+            if count:
+                self._driver(pattern)(count, out_address, *native_args)
+        finally:
+            for view in views:
+                view.release()
+        return out
+
+    def _driver(self, pattern: Tuple[bool, ...]):
+        driver = self._drivers.get(pattern)
+        if driver is not None:
+            return driver
+        with self._lock:
+            driver = self._drivers.get(pattern)
+            if driver is None:
+                driver = self._drivers[pattern] = self._compile_driver(pattern)
+            return driver
+
+    def _compile_driver(self, pattern: Tuple[bool, ...]):
+        """Generate and compile the native loop for one buffer/scalar pattern."""
+        from .meta import compile_ast
+
+        state = self._wrapper._state
+        names = [f"a{i}" for i in range(len(pattern))]
+        call_args = ', '.join(
+            f"{name}[i]" if as_buffer else name for name, as_buffer in zip(names, pattern))
+        call = f"fn({call_args})"
+        body = f"out[i] = {call}" if self._return_type is not None else call
+        source = (
+            f"def {self._name}_map(n, out, {', '.join(names)}):\n"
+            f"    for i in seq(n):\n"
+            f"        {body}\n"
+        )
+
+        param_types = {'n': u64, 'out': ptr[self._return_type or void]}
+        for name, pc_type, as_buffer in zip(names, self._param_types, pattern):
+            param_types[name] = ptr[pc_type] if as_buffer else pc_type
+        layout = ''.join('p' if as_buffer else 's' for as_buffer in pattern)
+        return compile_ast(
+            ast.parse(source).body[0],
+            param_types=param_types,
+            return_type=void,
+            suffix=("map", state.actual_func_name or state.original_name, layout),
+            source_file=state.source_file,
+            source_code=source,
+            user_globals={'fn': self._wrapper, 'seq': seq},
+            copy_ast=False,
+            jit=state.jit,
+        )
+
+
+def vectorize(wrapper) -> VectorizedFunction:
+    """
+    Return the batched form of a scalar @compile function.
+
+    The result is cached on the function, so its drivers are compiled once.
+
+    Args:
+        wrapper: @compile function whose parameters and return type are
+            scalar integers, floats or bools
+
+    Returns:
+        VectorizedFunction; ``vectorize(fn)(xs)`` is ``fn.map(xs)``
+    """
+    vectorized: Optional[VectorizedFunction] = wrapper.__dict__.get('_vectorized')
+    if vectorized is None:
+        vectorized = wrapper._vectorized = VectorizedFunction(wrapper)
+    return vectorized
+
+
+def _type_name(pc_type) -> str:
+    if hasattr(pc_type, 'get_name'):
+        return pc_type.get_name()
+    return getattr(pc_type, '__name__', repr(pc_type))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+std.concurrent_map.ConcurrentHashMap scalability microbenchmark
+
+Splits 2**k u64 keys among 1, 2, 4, ... up to N runtime workers, each
+inserting and then looking up its share, and prints ns per operation for
+each worker count.  The "locked" rows run the same tasks against a single
+shard, i.e. one FlatHashMap behind one SpinLock.
+"""
+
+from pythoc import i8, i32, i64, u64, f64, ptr, void, compile, nullptr
+from pythoc.libc.stdlib import atoi
+from pythoc.libc.stdio import printf
+from pythoc.libc.time import timeval, gettimeofday
+from pythoc.std.concurrent_map import ConcurrentHashMap
+from pythoc.std.runtime import runtime_start, runtime_shutdown, Future
+from pythoc.std.runtime.platform import atomic_fetch_add_i64
+
+ShardedMap = ConcurrentHashMap(u64, u64)
+LockedMap = ConcurrentHashMap(u64, u64, shards=1)
+
+
+@compile
+def now_us() -> f64:
+    tv: timeval
+    gettimeofday(ptr(tv), nullptr)
+    return f64(tv.tv_sec) * 1e6 + f64(tv.tv_usec)
+
+
+@compile
+def key_of(i: u64) -> u64:
+    return i * u64(0x9E3779B97F4A7C15)
+
+
+def make_bench(Map, label):
+    @compile(suffix=label)
+    def work(m: ptr[Map], first: u64, count: u64, hits: ptr[i64]) -> void:
+        i: u64 = first
+        while i < first + count:
+            Map.insert(m, key_of(i), i)
+            i += 1
+        found: i64 = 0
+        value: u64 = 0
+        i = first
+        while i < first + count:
+            if Map.find(m, key_of(i), ptr(value)):
+                found += 1
+            i += 1
+        atomic_fetch_add_i64(hits, found)
+
+    @compile(suffix=label)
+    def run(workers: i32, n: u64) -> f64:
+        """ns per operation for *n* inserts and *n* finds on *workers*."""
+        m: Map
+        Map.init(ptr(m))
+        hits: i64 = 0
+        rt = runtime_start(workers)
+        t0: f64 = now_us()
+        share: u64 = n / u64(workers)
+        w: u64 = 0
+        while w < u64(workers):
+            f = Future.spawn(work, ptr(m), w * share, share, ptr(hits))
+            Future.detach(f)
+            w += 1
+        runtime_shutdown(rt)
+        t1: f64 = now_us()
+        if hits != i64(share * u64(workers)) or Map.size(ptr(m)) != u64(hits):
+            printf("CHECK %s: %lld of %llu keys found\n", label, hits, share * u64(workers))
+        Map.destroy(ptr(m))
+        return (t1 - t0) * 1e3 / f64(2 * share * u64(workers))
+
+    return run
+
+
+run_sharded = make_bench(ShardedMap, "sharded")
+run_locked = make_bench(LockedMap, "locked")
+
+
+@compile
+def main(argc: i32, argv: ptr[ptr[i8]]) -> i32:
+    n: u64 = u64(1) << u64(atoi(argv[1]))
+    max_workers: i32 = atoi(argv[2])
+    workers: i32 = 1
+    while workers <= max_workers:
+        printf("WORKERS locked %d %.2f\n", workers, run_locked(workers, n))
+        printf("WORKERS sharded %d %.2f\n", workers, run_sharded(workers, n))
+        workers = workers * 2
+    return 0
+
+
+if __name__ == "__main__":
+    from pythoc import compile_to_executable
+    compile_to_executable()
@@ -0,0 +1,45 @@
+// Hash map microbenchmark baseline: absl::flat_hash_map<uint64_t, uint64_t>.
+// Equivalent to test/example/hashmap_pc.py; prints ns per operation for
+// each phase.
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <sys/time.h>
+
+#include "absl/container/flat_hash_map.h"
+
+static double now_us() {
+    struct timeval tv;
+    gettimeofday(&tv, nullptr);
+    return tv.tv_sec * 1e6 + tv.tv_usec;
+}
+
+static uint64_t key_of(uint64_t i) { return i * 0x9E3779B97F4A7C15ull; }
+
+int main(int argc, char** argv) {
+    uint64_t n = 1ull << atoi(argv[1]);
+    absl::flat_hash_map<uint64_t, uint64_t> m;
+    uint64_t check = 0;
+
+    double t0 = now_us();
+    for (uint64_t i = 0; i < n; i++) m.insert({key_of(i), i});
+    double t1 = now_us();
+    for (uint64_t i = 0; i < n; i++) {
+        auto it = m.find(key_of(i));
+        if (it != m.end()) check += it->second;
+    }
+    double t2 = now_us();
+    for (uint64_t i = n; i < 2 * n; i++) {
+        if (m.find(key_of(i)) != m.end()) check += 1;
+    }
+    double t3 = now_us();
+    for (uint64_t i = 0; i < n; i++) check += m.erase(key_of(i));
+    double t4 = now_us();
+
+    printf("PHASE insert %.2f\n", (t1 - t0) * 1e3 / n);
+    printf("PHASE find_hit %.2f\n", (t2 - t1) * 1e3 / n);
+    printf("PHASE find_miss %.2f\n", (t3 - t2) * 1e3 / n);
+    printf("PHASE erase %.2f\n", (t4 - t3) * 1e3 / n);
+    printf("CHECK %llu\n", (unsigned long long)check);
+    return 0;
+}
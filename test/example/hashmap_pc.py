@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+PC hash map microbenchmark (equivalent to test/example/hashmap.cc)
+
+Times insert, successful and unsuccessful lookups and erase of 2**k u64
+keys in a std.map.FlatHashMap and prints ns per operation for each phase.
+The insert_many / find_many phases repeat insert and find_hit through the
+batched entry points (no absl counterpart).
+"""
+
+from pythoc import i8, i32, u64, f64, ptr, compile, nullptr
+from pythoc.libc.stdlib import atoi, malloc, free
+from pythoc.libc.stdio import printf
+from pythoc.libc.time import timeval, gettimeofday
+from pythoc.std.map import FlatHashMap
+
+U64Map = FlatHashMap(u64, u64)
+
+
+@compile
+def now_us() -> f64:
+    tv: timeval
+    gettimeofday(ptr(tv), nullptr)
+    return f64(tv.tv_sec) * 1e6 + f64(tv.tv_usec)
+
+
+@compile
+def key_of(i: u64) -> u64:
+    return i * u64(0x9E3779B97F4A7C15)
+
+
+@compile
+def main(argc: i32, argv: ptr[ptr[i8]]) -> i32:
+    n: u64 = u64(1) << u64(atoi(argv[1]))
+    m: U64Map
+    mp = ptr(m)
+    U64Map.init(mp)
+    check: u64 = 0
+
+    t0: f64 = now_us()
+    i: u64 = 0
+    while i < n:
+        U64Map.insert(mp, key_of(i), i)
+        i += 1
+    t1: f64 = now_us()
+    i = 0
+    while i < n:
+        value: ptr[u64] = U64Map.find(mp, key_of(i))
+        if value != nullptr:
+            check += value[0]
+        i += 1
+    t2: f64 = now_us()
+    i = n
+    while i < 2 * n:
+        if U64Map.find(mp, key_of(i)) != nullptr:
+            check += 1
+        i += 1
+    t3: f64 = now_us()
+    i = 0
+    while i < n:
+        if U64Map.erase(mp, key_of(i)):
+            check += 1
+        i += 1
+    t4: f64 = now_us()
+    U64Map.destroy(mp)
+
+    keys: ptr[u64] = malloc(n * 8)
+    values: ptr[u64] = malloc(n * 8)
+    out: ptr[ptr[u64]] = malloc(n * 8)
+    i = 0
+    while i < n:
+        keys[i] = key_of(i)
+        values[i] = i
+        i += 1
+    U64Map.init(mp)
+    t5: f64 = now_us()
+    U64Map.insert_many(mp, keys, values, n)
+    t6: f64 = now_us()
+    check += U64Map.find_many(mp, keys, n, out)
+    t7: f64 = now_us()
+    U64Map.destroy(mp)
+    free(keys)
+    free(values)
+    free(out)
+
+    printf("PHASE insert %.2f\n", (t1 - t0) * 1e3 / f64(n))
+    printf("PHASE find_hit %.2f\n", (t2 - t1) * 1e3 / f64(n))
+    printf("PHASE find_miss %.2f\n", (t3 - t2) * 1e3 / f64(n))
+    printf("PHASE erase %.2f\n", (t4 - t3) * 1e3 / f64(n))
+    printf("PHASE insert_many %.2f\n", (t6 - t5) * 1e3 / f64(n))
+    printf("PHASE find_many %.2f\n", (t7 - t6) * 1e3 / f64(n))
+    printf("CHECK %llu\n", check)
+    return 0
+
+
+if __name__ == "__main__":
+    from pythoc import compile_to_executable
+    compile_to_executable()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Integration tests for fn.async_call(): awaitable native calls.
+"""
+
+import array
+import asyncio
+import unittest
+
+from pythoc import compile, jit, i32, u64, f64, ptr, seq
+from pythoc.builtin_entities import atomic_load_i32
+
+SPIN_LIMIT = 2000000000
+
+
+@compile(nogil=True)
+def wait_for_flag(flag: ptr[i32], limit: u64) -> u64:
+    spins: u64 = 0
+    while spins < limit and atomic_load_i32(flag) == 0:
+        spins = spins + 1
+    return spins
+
+
+@compile
+def dot(xs: ptr[f64], ys: ptr[f64], n: u64) -> f64:
+    total: f64 = 0.0
+    for i in seq(n):
+        total = total + xs[i] * ys[i]
+    return total
+
+
+@jit
+def add_one(x: i32) -> i32:
+    return x + 1
+
+
+class TestAsyncCall(unittest.TestCase):
+    def test_event_loop_runs_during_call(self):
+        async def main():
+            # The call only returns early if the loop can run the
+            # coroutine that sets the flag while the call is in progress.
+            flag = array.array('i', [0])
+            pending = wait_for_flag.async_call(flag, SPIN_LIMIT)
+            await asyncio.sleep(0.01)
+            flag[0] = 1
+            return await pending
+
+        self.assertLess(asyncio.run(main()), SPIN_LIMIT)
+
+    def test_gather(self):
+        xs = array.array('d', [1.0, 2.0, 3.0])
+
+        async def main():
+            return await asyncio.gather(
+                dot.async_call(xs, xs, 3),
+                dot.async_call(xs, xs, 2),
+                add_one.async_call(41),
+            )
+
+        self.assertEqual(asyncio.run(main()), [14.0, 5.0, 42])
+
+    def test_errors(self):
+        async def main():
+            await dot.async_call(array.array('i', [1]), array.array('d', [1.0]), 1)
+
+        with self.assertRaises(TypeError):
+            asyncio.run(main())
+        with self.assertRaises(RuntimeError):
+            add_one.async_call(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Integration tests for passing buffer objects to ptr[T] and array[T, N]
+parameters, and for pointer_view().
+"""
+
+import array
+import ctypes
+import unittest
+
+from pythoc import compile, seq, i8, i32, u8, u64, f64, array as pc_array, ptr, pointer_view
+
+
+@compile
+def sum3(a: pc_array[i32, 3]) -> i32:
+    return a[0] + a[1] + a[2]
+
+
+@compile
+def grid_corner(a: pc_array[i32, 2, 3]) -> i32:
+    return a[1][2]
+
+
+@compile
+def checksum(p: ptr[u8], n: u64) -> u64:
+    total: u64 = 0
+    for i in seq(n):
+        total = total + u64(p[i])
+    return total
+
+
+@compile
+def slen(s: ptr[i8]) -> i32:
+    n: i32 = 0
+    while s[n] != 0:
+        n = n + 1
+    return n
+
+
+@compile
+def scale(p: ptr[f64], n: u64, k: f64) -> ptr[f64]:
+    for i in seq(n):
+        p[i] = p[i] * k
+    return p
+
+
+class TestBufferArgs(unittest.TestCase):
+    def test_array_param_sources(self):
+        self.assertEqual(sum3((ctypes.c_int32 * 3)(1, 2, 3)), 6)
+        self.assertEqual(sum3([4, 5, 6]), 15)
+        self.assertEqual(sum3(array.array('i', [7, 8, 9])), 24)
+
+    def test_nested_array_param(self):
+        self.assertEqual(grid_corner([[1, 2, 3], [4, 5, 6]]), 6)
+        self.assertEqual(grid_corner(array.array('i', range(6))), 5)
+
+    def test_byte_pointer_takes_any_buffer(self):
+        self.assertEqual(checksum(b"\x01\x02\x03", 3), 6)
+        self.assertEqual(checksum(bytearray(b"\xff"), 1), 255)
+        self.assertEqual(checksum(array.array('d', [1.0]), 8), 0xF0 + 0x3F)
+
+    def test_c_string_from_bytes(self):
+        self.assertEqual(slen(b"hello\0"), 5)
+        self.assertEqual(slen(memoryview(b"hi\0").toreadonly()), 2)
+
+    def test_pointer_writes_in_place(self):
+        xs = array.array('d', [1.0, 2.0])
+        result = scale(xs, 2, 3.0)
+        self.assertEqual(xs.tolist(), [3.0, 6.0])
+
+        view = pointer_view(result, 2)
+        self.assertEqual(view.format, 'd')
+        self.assertEqual(view.tolist(), [3.0, 6.0])
+        view[0] = 9.0
+        self.assertEqual(xs[0], 9.0)
+
+    def test_mismatched_buffers(self):
+        with self.assertRaises(TypeError):
+            scale(array.array('f', [1.0]), 1, 2.0)
+        with self.assertRaises(TypeError):
+            sum3(array.array('i', [1, 2]))
+        with self.assertRaises(TypeError):
+            sum3(array.array('d', [1.0, 2.0, 3.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Test `python -m pythoc freeze`: bundles load without pythoc or llvmlite."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HELPER_SOURCE = """
+from pythoc import compile, i32
+
+@compile
+def twice(x: i32) -> i32:
+    return x * 2
+"""
+
+APP_SOURCE = """
+from pythoc import compile, i32, f64
+from frozen_helper import twice
+
+@compile
+class Point:
+    x: f64
+    y: f64
+
+@compile
+def add(a: i32, b: i32) -> i32:
+    return twice(a) + b
+
+@compile
+def make_point(x: f64) -> Point:
+    p: Point
+    p.x = x
+    p.y = x + 1.0
+    return p
+
+@compile
+def norm2(p: Point) -> f64:
+    return p.x * p.x + p.y * p.y
+
+if __name__ == "__main__":
+    raise SystemExit("the __main__ block must not run while freezing")
+"""
+
+LOADER_SOURCE = """
+import sys
+import frozen_app
+from frozen_app import add, make_point, norm2
+print(add(20, 2), make_point(2.0).y, norm2(make_point(3.0)))
+print(frozen_app.twice(21))
+print('llvmlite' in sys.modules, 'pythoc' in sys.modules)
+"""
+
+
+def _env(pythonpath):
+    env = os.environ.copy()
+    env.pop("PYTHONPATH", None)
+    if pythonpath:
+        env["PYTHONPATH"] = pythonpath
+    return env
+
+
+class TestFreeze(unittest.TestCase):
+    def test_freeze_and_load_without_pythoc(self):
+        with tempfile.TemporaryDirectory() as work, tempfile.TemporaryDirectory() as deploy:
+            with open(os.path.join(work, "frozen_helper.py"), "w") as f:
+                f.write(HELPER_SOURCE)
+            app = os.path.join(work, "app.py")
+            with open(app, "w") as f:
+                f.write(APP_SOURCE)
+
+            bundle = os.path.join(deploy, "frozen_app")
+            result = subprocess.run(
+                [sys.executable, "-m", "pythoc", "freeze", app, "-o", bundle],
+                capture_output=True, text=True, cwd=work, env=_env(WORKSPACE),
+                stdin=subprocess.DEVNULL,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+            with open(os.path.join(bundle, "manifest.json")) as f:
+                manifest = json.load(f)
+            # Dependencies are loaded first.
+            stems = [os.path.splitext(lib)[0] for lib in manifest["libraries"]]
+            self.assertEqual(stems, ["lib/frozen_helper", "lib/app"])
+            self.assertEqual(manifest["names"]["add"], ["app:add"])
+
+            result = subprocess.run(
+                [sys.executable, "-c", LOADER_SOURCE],
+                capture_output=True, text=True, cwd=deploy, env=_env(None),
+                stdin=subprocess.DEVNULL,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(result.stdout.split("\n")[:3], ["42 3.0 25.0", "42", "False False"])
+
+    def test_freeze_rejects_program_without_functions(self):
+        with tempfile.TemporaryDirectory() as work:
+            app = os.path.join(work, "empty.py")
+            with open(app, "w") as f:
+                f.write("x = 1\n")
+            result = subprocess.run(
+                [sys.executable, "-m", "pythoc", "freeze", app],
+                capture_output=True, text=True, cwd=work, env=_env(WORKSPACE),
+                stdin=subprocess.DEVNULL,
+            )
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("no @compile functions", result.stderr)
+            self.assertFalse(os.path.exists(os.path.join(work, "empty_frozen")))
+
+
+if __name__ == "__main__":
+    unittest.main()
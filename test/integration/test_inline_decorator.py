@@ -263,6 +263,39 @@ def test_complex_example():
     assert abs_example(0) == 0
     print("OK test_complex_example passed")
 
+# ============================================================================
+# Test: inline functions from one factory, with different closures
+# ============================================================================
+
+def make_scaled(factor, inner):
+    @inline
+    def scaled(x) -> i32:
+        return inner(x) * factor
+    return scaled
+
+
+@inline
+def identity(x) -> i32:
+    return x
+
+
+times_3 = make_scaled(3, identity)
+times_30 = make_scaled(10, times_3)
+
+
+@compile
+def factory_inline(x: i32) -> i32:
+    # times_30 inlines times_3: same body, same closure names, other values.
+    return times_30(x) + times_3(x)
+
+
+def test_factory_closures():
+    """Test nested inline instances of one factory"""
+    assert factory_inline(1) == 33
+    assert factory_inline(2) == 66
+    print("OK test_factory_closures passed")
+
+
 # ============================================================================
 # Main test runner
 # ============================================================================
@@ -283,6 +316,7 @@ def main():
         ("Compile-time constants", test_constant),
         ("Inline with comparisons", test_range),
         ("Complex example", test_complex_example),
+        ("Factory closures", test_factory_closures),
     ]
     
     passed = 0
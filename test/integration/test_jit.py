@@ -0,0 +1,118 @@
+"""Test @jit: functions run from the in-process JIT, without build files."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HELPER_SOURCE = """
+from pythoc import compile, jit, i32
+
+@compile
+def twice(x: i32) -> i32:
+    return x * 2
+
+@jit
+def inc(x: i32) -> i32:
+    return x + 1
+"""
+
+LATE_SOURCE = """
+from pythoc import jit, i32
+from jit_helper import inc, twice
+
+@jit
+def late(x: i32) -> i32:
+    return inc(twice(x))
+"""
+
+APP_SOURCE = """
+from pythoc import compile, jit, i32, f64
+from jit_helper import twice, inc
+
+@compile
+class Point:
+    x: f64
+    y: f64
+
+@jit
+def add(a: i32, b: i32) -> i32:
+    return twice(a) + inc(b)
+
+@jit
+def norm2(p: Point) -> f64:
+    return p.x * p.x + p.y * p.y
+
+@jit
+def make_point(x: f64) -> Point:
+    p: Point
+    p.x = x
+    p.y = x + 1.0
+    return p
+
+print(int(add(20, 1)), float(norm2(make_point(3.0))))
+
+# A @jit group first needed after the engine is finalized.
+from jit_late import late
+print(int(late(5)), int(add(1, 1)))
+"""
+
+BAD_SOURCE = """
+from pythoc import compile, i32
+from jit_helper import inc
+
+@compile
+def caller(x: i32) -> i32:
+    return inc(x)
+
+caller(1)
+"""
+
+
+def _run(work, script):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = WORKSPACE
+    return subprocess.run(
+        [sys.executable, script],
+        capture_output=True, text=True, cwd=work, env=env,
+        stdin=subprocess.DEVNULL,
+    )
+
+
+class TestJIT(unittest.TestCase):
+    def _write(self, work, sources):
+        for name, source in sources:
+            with open(os.path.join(work, name), "w") as f:
+                f.write(source)
+
+    def test_jit_runs_from_memory(self):
+        with tempfile.TemporaryDirectory() as work:
+            self._write(work, (("jit_helper.py", HELPER_SOURCE),
+                               ("jit_late.py", LATE_SOURCE),
+                               ("app.py", APP_SOURCE)))
+            for _run_kind in ("cold", "warm"):
+                result = _run(work, "app.py")
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.split("\n")[:2], ["42 25.0", "11 4"])
+
+            built = []
+            for root, _dirs, files in os.walk(os.path.join(work, "build")):
+                built.extend(f for f in files if f.endswith((".o", ".so")))
+            # Only the @compile group of jit_helper is built to disk.
+            self.assertEqual(sorted(built), ["jit_helper.o", "jit_helper.so"])
+
+    def test_compile_cannot_call_jit(self):
+        with tempfile.TemporaryDirectory() as work:
+            self._write(work, (("jit_helper.py", HELPER_SOURCE),
+                               ("bad.py", BAD_SOURCE)))
+            result = _run(work, "bad.py")
+            self.assertNotEqual(result.returncode, 0)
+            self.assertIn("Cannot call @jit function 'inc'", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
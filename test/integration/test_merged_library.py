@@ -0,0 +1,75 @@
+"""Test config.merged_library: all groups load from one shared library."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HELPER_SOURCE = """
+from pythoc import compile, i32
+
+@compile
+def twice(x: i32) -> i32:
+    return x * 2
+"""
+
+LATE_SOURCE = """
+from pythoc import compile, i32
+from merged_helper import twice
+
+@compile
+def quad(x: i32) -> i32:
+    return twice(twice(x))
+"""
+
+APP_SOURCE = """
+from pythoc import compile, i32
+from pythoc.native_executor import get_multi_so_executor
+from merged_helper import twice
+
+@compile
+def add(a: i32, b: i32) -> i32:
+    return twice(a) + b
+
+executor = get_multi_so_executor()
+print(int(add(20, 2)), len(executor._merged_libs),
+      len({id(lib) for lib in executor.loaded_libs.values()}))
+
+# A group first needed after the merged library is loaded.
+from merged_late import quad
+print(int(quad(5)), int(add(1, 1)), len(executor._merged_libs))
+"""
+
+
+class TestMergedLibrary(unittest.TestCase):
+    def test_groups_share_one_library(self):
+        with tempfile.TemporaryDirectory() as work:
+            for name, source in (("merged_helper.py", HELPER_SOURCE),
+                                 ("merged_late.py", LATE_SOURCE),
+                                 ("app.py", APP_SOURCE)):
+                with open(os.path.join(work, name), "w") as f:
+                    f.write(source)
+            env = os.environ.copy()
+            env["PYTHONPATH"] = WORKSPACE
+            env["PC_MERGED_LIBRARY"] = "1"
+
+            for _run in ("cold", "warm"):
+                result = subprocess.run(
+                    [sys.executable, "app.py"],
+                    capture_output=True, text=True, cwd=work, env=env,
+                    stdin=subprocess.DEVNULL,
+                )
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.split("\n")[:2], ["42 1 1", "20 3 2"])
+
+            merged = [f for f in os.listdir(os.path.join(work, "build", "_merged"))
+                      if not f.endswith(".lock")]
+            self.assertEqual(len(merged), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Integration tests for @compile(nogil=True): native calls from Python threads
+run without the GIL.
+"""
+
+import array
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pythoc import compile, jit, seq, i32, u64, f64, ptr, func
+from pythoc import array as pc_array
+from pythoc.builtin_entities import atomic_load_i32
+
+SPIN_LIMIT = 2000000000
+
+
+@compile(nogil=True)
+def wait_for(flag: ptr[i32], limit: u64) -> u64:
+    """Spin until *flag* is set, or for *limit* iterations."""
+    spins: u64 = 0
+    while spins < limit and atomic_load_i32(flag) == 0:
+        spins = spins + 1
+    return spins
+
+
+@compile(nogil=True)
+def sum_squares(xs: ptr[f64], n: u64) -> f64:
+    total: f64 = 0.0
+    for i in seq(n):
+        total = total + xs[i] * xs[i]
+    return total
+
+
+@compile
+class Callback:
+    fn: func[i32, i32]
+    arg: i32
+
+
+@compile
+class Node:
+    next: ptr['Node']
+    value: i32
+
+
+@compile(nogil=True)
+def first_value(n: ptr[Node]) -> i32:
+    return n.value
+
+
+@jit(nogil=True)
+def triple(x: i32) -> i32:
+    return x * 3
+
+
+class TestNoGIL(unittest.TestCase):
+    def test_python_runs_during_native_call(self):
+        # wait_for() only returns early if this thread can set the flag
+        # while the other one is inside the native loop.
+        flag = array.array('i', [0])
+        result = []
+        worker = threading.Thread(target=lambda: result.append(wait_for(flag, SPIN_LIMIT)))
+        worker.start()
+        time.sleep(0.05)
+        flag[0] = 1
+        worker.join()
+        self.assertLess(result[0], SPIN_LIMIT)
+
+    def test_thread_pool(self):
+        chunks = [array.array('d', [float(k)] * 1000) for k in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            totals = list(pool.map(lambda xs: sum_squares(xs, len(xs)), chunks))
+        self.assertEqual(totals, [1000.0 * k * k for k in range(8)])
+
+    def test_jit_function(self):
+        self.assertTrue(triple.nogil)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            self.assertEqual(list(pool.map(triple, range(4))), [0, 3, 6, 9])
+
+    def test_function_pointer_parameter_rejected(self):
+        with self.assertRaises(TypeError):
+            @compile(nogil=True)
+            def apply(f: func[i32, i32], x: i32) -> i32:
+                return f(x)
+
+    def test_function_pointer_in_struct_rejected(self):
+        with self.assertRaises(TypeError):
+            @compile(nogil=True)
+            def call_through(cb: ptr[Callback]) -> i32:
+                return cb.fn(cb.arg)
+        with self.assertRaises(TypeError):
+            @compile(nogil=True)
+            def call_first(cbs: ptr[pc_array[Callback, 2]]) -> i32:
+                return cbs[0][0].fn(cbs[0][0].arg)
+
+    def test_self_referential_struct_allowed(self):
+        self.assertTrue(first_value.nogil)
+
+
+if __name__ == "__main__":
+    unittest.main()
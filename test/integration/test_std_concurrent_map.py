@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Integration tests for pythoc.std.concurrent_map.ConcurrentHashMap.
+
+Coverage:
+- insert/find/contains/erase/clear from a single thread, for one shard
+  and for many
+- struct keys and custom hash_fn/eq_fn, as for FlatHashMap
+- runtime tasks on several workers inserting, finding and erasing
+  disjoint and overlapping key ranges at the same time
+- failure cases (bad shard count, unsupported key type)
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from pythoc import i32, i64, u32, u64, bool, ptr, void, compile, inline
+from pythoc.std.concurrent_map import ConcurrentHashMap
+from pythoc.std.runtime import runtime_start, runtime_shutdown, Future
+from pythoc.std.runtime.platform import atomic_fetch_add_i64
+
+
+U64Map = ConcurrentHashMap(u64, i64)
+I32Map = ConcurrentHashMap(i32, i64, shards=8)
+OneShardMap = ConcurrentHashMap(u64, i64, shards=1)
+
+ALL_MAPS = [U64Map, I32Map, OneShardMap]
+KEY_TYPES = {U64Map: u64, I32Map: i32, OneShardMap: u64}
+
+
+@compile
+class PairKey:
+    a: u32
+    b: u32
+
+
+PairMap = ConcurrentHashMap(PairKey, i64, shards=4)
+
+
+@inline
+def _mod_hash(key: u64) -> u64:
+    return key % 7
+
+
+@inline
+def _mod_eq(a: u64, b: u64) -> bool:
+    return a == b
+
+
+ModMap = ConcurrentHashMap(u64, i64, hash_fn=_mod_hash, eq_fn=_mod_eq)
+
+
+@inline
+def _identity_hash(key: u64) -> u64:
+    return key
+
+
+# Every hash has its top bits clear: shards come from the remixed hash.
+IdentityMap = ConcurrentHashMap(u64, i64, shards=16, hash_fn=_identity_hash)
+
+
+def _make_basic_tester(api, key_type, count: i32):
+    @compile(suffix=(api, count, "basic"))
+    def run() -> i32:
+        m: api
+        mp: ptr[api] = ptr(m)
+        api.init(mp)
+        v: i64 = 0
+
+        if api.size(mp) != 0 or api.find(mp, key_type(1), ptr(v)) or api.erase(mp, key_type(1)):
+            return 1
+
+        i: i32 = 0
+        while i < count:
+            if not api.insert(mp, key_type(i), i64(i) * 3):
+                return 2
+            i += 1
+        if api.size(mp) != count:
+            return 3
+        if api.insert(mp, key_type(5), i64(-5)):
+            return 4
+
+        i = 0
+        while i < count:
+            if not api.find(mp, key_type(i), ptr(v)):
+                return 5
+            if i == 5:
+                if v != -5:
+                    return 6
+            elif v != i64(i) * 3:
+                return 7
+            i += 1
+        if api.contains(mp, key_type(count)):
+            return 8
+
+        i = 0
+        while i < count:
+            if i % 2 == 0 and not api.erase(mp, key_type(i)):
+                return 9
+            i += 1
+        if api.size(mp) != count / 2:
+            return 10
+        if api.contains(mp, key_type(0)) or not api.contains(mp, key_type(1)):
+            return 11
+
+        api.clear(mp)
+        if api.size(mp) != 0 or api.contains(mp, key_type(1)):
+            return 12
+        if not api.insert(mp, key_type(1), i64(1)):
+            return 13
+
+        api.destroy(mp)
+        return 0
+    return run
+
+
+def _make_struct_key_tester(count: i32):
+    @compile(suffix=(count, "struct_key"))
+    def run() -> i32:
+        m: PairMap
+        mp: ptr[PairMap] = ptr(m)
+        PairMap.init(mp)
+
+        k: PairKey
+        i: i32 = 0
+        while i < count:
+            k.a = u32(i)
+            k.b = u32(i * 7)
+            PairMap.insert(mp, k, i64(i))
+            i += 1
+        v: i64 = 0
+        k.a = u32(3)
+        k.b = u32(21)
+        if not PairMap.find(mp, k, ptr(v)) or v != 3:
+            return 1
+        k.b = u32(22)
+        if PairMap.contains(mp, k):
+            return 2
+
+        PairMap.destroy(mp)
+        return 0
+    return run
+
+
+def _make_custom_functions_tester(count: i32):
+    @compile(suffix=(count, "custom_functions"))
+    def run() -> i32:
+        m: ModMap
+        mp: ptr[ModMap] = ptr(m)
+        ModMap.init(mp)
+
+        i: u64 = 0
+        while i < count:
+            ModMap.insert(mp, i, i64(i))
+            i += 1
+        if ModMap.size(mp) != count:
+            return 1
+        v: i64 = 0
+        i = 0
+        while i < count:
+            if not ModMap.find(mp, i, ptr(v)) or v != i64(i):
+                return 2
+            i += 1
+
+        ModMap.destroy(mp)
+        return 0
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Concurrent access from runtime workers
+# ---------------------------------------------------------------------------
+
+def _make_concurrent_tester(api, workers: i32, per_task: i32):
+    total: i32 = workers * per_task
+
+    @compile(suffix=(api, workers, per_task, "concurrent_worker"))
+    def worker(m: ptr[api], first: u64, errors: ptr[i64]) -> void:
+        bad: i64 = 0
+        value: i64 = 0
+        i: u64 = first
+        while i < first + per_task:
+            api.insert(m, i, i64(i))
+            # A key every task writes: the value is one of theirs.
+            api.insert(m, u64(total), i64(first))
+            i += 1
+        i = first
+        while i < first + per_task:
+            if not api.find(m, i, ptr(value)) or value != i64(i):
+                bad += 1
+            i += 1
+        # Erase every other key of this task's range.
+        i = first
+        while i < first + per_task:
+            if i % 2 == 0 and not api.erase(m, i):
+                bad += 1
+            i += 1
+        atomic_fetch_add_i64(errors, bad)
+
+    @compile(suffix=(api, workers, per_task, "concurrent"))
+    def run() -> i32:
+        m: api
+        mp: ptr[api] = ptr(m)
+        api.init(mp)
+        errors: i64 = 0
+
+        rt = runtime_start(workers)
+        w: u64 = 0
+        while w < u64(workers):
+            f = Future.spawn(worker, mp, w * u64(per_task), ptr(errors))
+            Future.detach(f)
+            w += 1
+        runtime_shutdown(rt)
+
+        if errors != 0:
+            return 1
+        if api.size(mp) != u64(total / 2 + 1):
+            return 2
+        value: i64 = 0
+        i: u64 = 0
+        while i < u64(total):
+            if api.find(mp, i, ptr(value)) != (i % 2 == 1):
+                return 3
+            i += 1
+        if not api.find(mp, u64(total), ptr(value)) or value % i64(per_task) != 0:
+            return 4
+
+        api.destroy(mp)
+        return 0
+    return run
+
+
+def test_basic():
+    for api in ALL_MAPS:
+        result = _make_basic_tester(api, KEY_TYPES[api], 1000)()
+        assert result == 0, f"basic failed for {api.__name__}: {result}"
+    print("OK test_basic")
+
+
+def test_struct_key():
+    result = _make_struct_key_tester(500)()
+    assert result == 0, f"struct_key failed: {result}"
+    print("OK test_struct_key")
+
+
+def test_custom_functions():
+    result = _make_custom_functions_tester(200)()
+    assert result == 0, f"custom_functions failed: {result}"
+    print("OK test_custom_functions")
+
+
+def test_concurrent():
+    for api in (U64Map, OneShardMap, IdentityMap):
+        for workers in (1, 4):
+            result = _make_concurrent_tester(api, workers, 5000)()
+            assert result == 0, f"concurrent failed for {api.__name__} on {workers} workers: {result}"
+    print("OK test_concurrent")
+
+
+# ---------------------------------------------------------------------------
+# Failure tests
+# ---------------------------------------------------------------------------
+
+def test_bad_factory_args():
+    for shards in (0, 3, 48, "64"):
+        try:
+            ConcurrentHashMap(u64, i64, shards=shards)
+        except ValueError as e:
+            if "shards must be a power of two" not in str(e):
+                raise AssertionError(f"unexpected error message: {e}")
+        else:
+            raise AssertionError(f"ConcurrentHashMap(shards={shards!r}) should raise ValueError")
+
+    from pythoc import f64
+    try:
+        ConcurrentHashMap(f64, i64)
+    except TypeError as e:
+        if "no default hash" not in str(e):
+            raise AssertionError(f"unexpected error message: {e}")
+    else:
+        raise AssertionError("ConcurrentHashMap(f64, i64) should raise TypeError")
+
+    print("OK test_bad_factory_args")
+
+
+if __name__ == '__main__':
+    test_basic()
+    test_struct_key()
+    test_custom_functions()
+    test_concurrent()
+    test_bad_factory_args()
+    print("All ConcurrentHashMap tests passed!")
@@ -9,7 +9,11 @@ Coverage:
 - value mutation via returned pointer
 - repeated updates of the same key
 - tombstone reuse and clear-then-reuse
+- sliding-window churn of inserts and erases, with bounded capacity
+- reserve / shrink_to_fit and the cache-line aligned table layout
 - deterministic stress test with mixed operations
+- derived hashing for struct, pointer and Bytes keys; custom hash_fn/eq_fn
+- batched insert_many / find_many
 - failure cases (unsupported key type, bad factory args)
 """
 
@@ -22,9 +26,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from pythoc import (
     i8, i16, i32, i64, u8, u16, u32, u64,
-    bool, ptr, compile, nullptr, array,
+    bool, ptr, compile, inline, nullptr, array,
 )
 from pythoc.std.map import FlatHashMap
+from pythoc.std.hash import Bytes
 
 
 I8Map = FlatHashMap(i8, i64)
@@ -42,6 +47,49 @@ ALL_MAPS = [
 ]
 
 STRESS_MAPS = [I32Map, I64Map, U64Map]
+STRESS_KEY_TYPES = {I32Map: i32, I64Map: i64, U64Map: u64}
+
+
+@compile
+class PairKey:
+    a: u32
+    b: u32
+
+
+@compile
+class GridKey:
+    cells: array[i16, 4]
+    tag: u8
+
+
+@inline
+def _mod_hash(key: u64) -> u64:
+    # Few distinct values and a zero probe start: every key collides.
+    return key % 1000 % 16
+
+
+@inline
+def _mod_eq(a: u64, b: u64) -> bool:
+    return a % 1000 == b % 1000
+
+
+PairMap = FlatHashMap(PairKey, i64)
+GridMap = FlatHashMap(GridKey, i64)
+PtrMap = FlatHashMap(ptr[i64], i64)
+BytesMap = FlatHashMap(Bytes, i64)
+ModMap = FlatHashMap(u64, i64, hash_fn=_mod_hash, eq_fn=_mod_eq)
+
+
+def _make_eq(always):
+    @inline
+    def eq(a: u64, b: u64) -> bool:
+        return (a == b) or always
+    return eq
+
+
+# Two closures with one body: each map must get its own eq.
+ExactMap = FlatHashMap(u64, i64, hash_fn=_mod_hash, eq_fn=_make_eq(False))
+AnyMap = FlatHashMap(u64, i64, hash_fn=_mod_hash, eq_fn=_make_eq(True))
 
 
 # ---------------------------------------------------------------------------
@@ -114,6 +162,286 @@ def _make_update_tester(api, base: i32):
     return run
 
 
+# ---------------------------------------------------------------------------
+# Batched operations
+# ---------------------------------------------------------------------------
+
+def _make_batch_tester(api, key_type, count: i32):
+    half: i32 = count // 2
+
+    @compile(suffix=(api, count, "batch"))
+    def run() -> i32:
+        m: api
+        mp: ptr[api] = ptr(m)
+        api.init(mp)
+
+        keys: array[key_type, count]
+        values: array[i64, count]
+        out: array[ptr[i64], count]
+
+        if api.find_many(mp, ptr(keys[0]), 0, ptr(out[0])) != 0:
+            return 1
+
+        # The second half repeats the first half's keys: later values win.
+        i: i32 = 0
+        while i < count:
+            keys[i] = key_type(i % half)
+            values[i] = i64(i)
+            i += 1
+        if api.insert_many(mp, ptr(keys[0]), ptr(values[0]), count) != half:
+            return 2
+        if api.size(mp) != half:
+            return 3
+
+        if api.find_many(mp, ptr(keys[0]), count, ptr(out[0])) != count:
+            return 4
+        i = 0
+        while i < count:
+            if out[i] == nullptr or out[i][0] != i64(i % half + half):
+                return 5
+            i += 1
+
+        # Re-inserting erased keys lands on tombstones.
+        i = 0
+        while i < half:
+            if i % 2 == 0:
+                api.erase(mp, keys[i])
+            i += 1
+        if api.insert_many(mp, ptr(keys[0]), ptr(values[0]), half) != (half + 1) // 2:
+            return 6
+
+        i = 0
+        while i < count:
+            keys[i] = key_type(i + count)
+            i += 1
+        if api.find_many(mp, ptr(keys[0]), count, ptr(out[0])) != 0:
+            return 7
+        i = 0
+        while i < count:
+            if out[i] != nullptr:
+                return 8
+            i += 1
+
+        api.destroy(mp)
+        return 0
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Derived and custom key functions
+# ---------------------------------------------------------------------------
+
+def _make_struct_key_tester(count: i32):
+    @compile(suffix=(count, "struct_key"))
+    def run() -> i32:
+        m: PairMap
+        mp: ptr[PairMap] = ptr(m)
+        PairMap.init(mp)
+
+        k: PairKey
+        i: i32 = 0
+        while i < count:
+            k.a = u32(i)
+            k.b = u32(i) * 7
+            PairMap.insert(mp, k, i64(i))
+            i += 1
+        if PairMap.size(mp) != count:
+            return 1
+
+        i = 0
+        while i < count:
+            k.a = u32(i)
+            k.b = u32(i) * 7
+            p = PairMap.find(mp, k)
+            if p == nullptr or p[0] != i64(i):
+                return 2
+            # Same fields, swapped or off by one: different keys.
+            k.b = u32(i) * 7 + 1
+            if PairMap.contains(mp, k):
+                return 3
+            i += 1
+
+        k.a = 5
+        k.b = 35
+        if not PairMap.erase(mp, k) or PairMap.contains(mp, k):
+            return 4
+
+        PairMap.destroy(mp)
+        return 0
+    return run
+
+
+def _make_array_field_key_tester(count: i32):
+    @compile(suffix=(count, "array_field_key"))
+    def run() -> i32:
+        m: GridMap
+        mp: ptr[GridMap] = ptr(m)
+        GridMap.init(mp)
+
+        k: GridKey
+        i: i32 = 0
+        while i < count:
+            k.cells[0] = i16(i)
+            k.cells[1] = -i16(i)
+            k.cells[2] = i16(i) * 2
+            k.cells[3] = 3
+            k.tag = u8(i % 2)
+            GridMap.insert(mp, k, i64(i))
+            i += 1
+
+        i = 0
+        while i < count:
+            k.cells[0] = i16(i)
+            k.cells[1] = -i16(i)
+            k.cells[2] = i16(i) * 2
+            k.cells[3] = 3
+            k.tag = u8(i % 2)
+            p = GridMap.find(mp, k)
+            if p == nullptr or p[0] != i64(i):
+                return 1
+            k.cells[3] = 4
+            if GridMap.contains(mp, k):
+                return 2
+            k.cells[3] = 3
+            k.tag = u8(1 - i % 2)
+            if GridMap.contains(mp, k):
+                return 3
+            i += 1
+
+        GridMap.destroy(mp)
+        return 0
+    return run
+
+
+def _make_pointer_key_tester():
+    @compile(suffix="pointer_key")
+    def run() -> i32:
+        m: PtrMap
+        mp: ptr[PtrMap] = ptr(m)
+        PtrMap.init(mp)
+
+        # Keys are addresses: equal values at different addresses differ.
+        cells: array[i64, 64]
+        i: i32 = 0
+        while i < 64:
+            cells[i] = 0
+            PtrMap.insert(mp, ptr(cells[i]), i64(i))
+            i += 1
+
+        i = 0
+        while i < 64:
+            p = PtrMap.find(mp, ptr(cells[i]))
+            if p == nullptr or p[0] != i64(i):
+                return 1
+            i += 1
+
+        other: i64 = 0
+        if PtrMap.contains(mp, ptr(other)):
+            return 2
+
+        PtrMap.destroy(mp)
+        return 0
+    return run
+
+
+def _make_bytes_key_tester(count: i32):
+    @compile(suffix=(count, "bytes_key"))
+    def run() -> i32:
+        m: BytesMap
+        mp: ptr[BytesMap] = ptr(m)
+        BytesMap.init(mp)
+
+        # Two copies of the same bytes: keys from one must find keys
+        # inserted from the other.  Lengths 0..40 cover every size class
+        # of hash_bytes.
+        stored: array[u8, 256]
+        probe: array[u8, 256]
+        i: i32 = 0
+        while i < 256:
+            stored[i] = u8(i * 37)
+            probe[i] = u8(i * 37)
+            i += 1
+
+        # Key i is the (distinct) bytes from offset i; only key 0 is empty.
+        k: Bytes
+        n: u64
+        i = 0
+        while i < count:
+            n = u64(i % 40)
+            if i > 0:
+                n += 1
+            k.data = ptr(stored[i])
+            k.size = n
+            BytesMap.insert(mp, k, i64(i))
+            i += 1
+        if BytesMap.size(mp) != count:
+            return 1
+
+        i = 0
+        while i < count:
+            n = u64(i % 40)
+            if i > 0:
+                n += 1
+            k.data = ptr(probe[i])
+            k.size = n
+            p = BytesMap.find(mp, k)
+            if p == nullptr or p[0] != i64(i):
+                return 2
+            k.size = n + 1
+            if BytesMap.contains(mp, k):
+                return 3
+            i += 1
+
+        BytesMap.destroy(mp)
+        return 0
+    return run
+
+
+def _make_custom_functions_tester(count: i32):
+    @compile(suffix=(count, "custom_functions"))
+    def run() -> i32:
+        m: ModMap
+        mp: ptr[ModMap] = ptr(m)
+        ModMap.init(mp)
+
+        i: u64 = 0
+        while i < u64(count):
+            ModMap.insert(mp, i, i64(i))
+            i += 1
+        if ModMap.size(mp) != count:
+            return 1
+
+        # eq_fn compares keys modulo 1000, so these update existing entries.
+        i = 0
+        while i < u64(count):
+            if ModMap.insert(mp, i + 1000, -i64(i)):
+                return 2
+            p = ModMap.find(mp, i + 2000)
+            if p == nullptr or p[0] != -i64(i):
+                return 3
+            i += 1
+        if ModMap.size(mp) != count:
+            return 4
+
+        ModMap.destroy(mp)
+        return 0
+    return run
+
+
+def _make_closure_eq_tester(api, label):
+    @compile(suffix=(label, "closure_eq"))
+    def run() -> bool:
+        """Whether key 17 (same hash) is found in a map holding only key 1."""
+        m: api
+        mp: ptr[api] = ptr(m)
+        api.init(mp)
+        api.insert(mp, u64(1), i64(1))
+        found: bool = api.contains(mp, u64(17))
+        api.destroy(mp)
+        return found
+    return run
+
+
 # ---------------------------------------------------------------------------
 # Large scale
 # ---------------------------------------------------------------------------
@@ -353,6 +681,100 @@ def _make_tombstone_tester(api, base: i32):
     return run
 
 
+def _make_churn_tester(api, steps: i32, window: i32):
+    # Keys enter and leave a sliding window, so probe sequences run over
+    # tombstones and wrap around the end of the control bytes.
+    @compile(suffix=(api, steps, window, "churn"))
+    def run() -> i32:
+        m: api
+        mp: ptr[api] = ptr(m)
+        api.init(mp)
+
+        i: i32 = 0
+        while i < steps:
+            api.insert(mp, i, i64(i) * 3)
+            if i >= window:
+                if not api.erase(mp, i - window):
+                    return 1
+                if api.contains(mp, i - window):
+                    return 2
+                if api.size(mp) != window:
+                    return 3
+            p = api.find(mp, i)
+            if p == nullptr or p[0] != i64(i) * 3:
+                return 4
+            i += 1
+
+        j: i32 = steps - window
+        while j < steps:
+            if not api.contains(mp, j):
+                return 5
+            j += 1
+
+        # Tombstones are reclaimed in place rather than by doubling.
+        if api.capacity(mp) > 4 * window:
+            return 6
+
+        api.destroy(mp)
+        return 0
+    return run
+
+
+def _make_reserve_tester(api, count: i32):
+    @compile(suffix=(api, count, "reserve"))
+    def run() -> i32:
+        m: api
+        mp: ptr[api] = ptr(m)
+        api.init(mp)
+
+        api.reserve(mp, count)
+        cap: u64 = u64(api.capacity(mp))
+        if cap < u64(count):
+            return 1
+        if u64(m.ctrl) % 64 != 0 or u64(m.keys) % 64 != 0 or u64(m.values) % 64 != 0:
+            return 2
+
+        i: i32 = 0
+        while i < count:
+            api.insert(mp, i, i64(i) + 1)
+            i += 1
+        if u64(api.capacity(mp)) != cap:
+            return 3
+
+        # Shrinking below the element count is a no-op.
+        api.reserve(mp, 1)
+        if u64(api.capacity(mp)) != cap:
+            return 4
+
+        i = 0
+        while i < count - 10:
+            api.erase(mp, i)
+            i += 1
+        api.shrink_to_fit(mp)
+        if api.capacity(mp) != 16:
+            return 5
+        i = count - 10
+        while i < count:
+            p = api.find(mp, i)
+            if p == nullptr or p[0] != i64(i) + 1:
+                return 6
+            i += 1
+
+        while i > count - 10:
+            i -= 1
+            api.erase(mp, i)
+        api.shrink_to_fit(mp)
+        if api.capacity(mp) != 0 or api.contains(mp, 0):
+            return 7
+        api.insert(mp, 5, 6)
+        if api.size(mp) != 1:
+            return 8
+
+        api.destroy(mp)
+        return 0
+    return run
+
+
 def _make_clear_reuse_tester(api, count: i32):
     @compile(suffix=(api, count, "clear_reuse"))
     def run() -> i32:
@@ -552,6 +974,49 @@ def test_update():
     print("OK test_update")
 
 
+def test_batch():
+    for api in STRESS_MAPS:
+        result = _make_batch_tester(api, STRESS_KEY_TYPES[api], 1000)()
+        assert result == 0, f"batch failed for {api.__name__}: {result}"
+    print("OK test_batch")
+
+
+def test_struct_key():
+    result = _make_struct_key_tester(2000)()
+    assert result == 0, f"struct_key failed: {result}"
+    print("OK test_struct_key")
+
+
+def test_array_field_key():
+    result = _make_array_field_key_tester(500)()
+    assert result == 0, f"array_field_key failed: {result}"
+    print("OK test_array_field_key")
+
+
+def test_pointer_key():
+    result = _make_pointer_key_tester()()
+    assert result == 0, f"pointer_key failed: {result}"
+    print("OK test_pointer_key")
+
+
+def test_bytes_key():
+    result = _make_bytes_key_tester(200)()
+    assert result == 0, f"bytes_key failed: {result}"
+    print("OK test_bytes_key")
+
+
+def test_custom_functions():
+    result = _make_custom_functions_tester(300)()
+    assert result == 0, f"custom_functions failed: {result}"
+    print("OK test_custom_functions")
+
+
+def test_closure_key_functions():
+    assert not _make_closure_eq_tester(ExactMap, "exact")(), "ExactMap matched a different key"
+    assert _make_closure_eq_tester(AnyMap, "any")(), "AnyMap ran ExactMap's eq"
+    print("OK test_closure_key_functions")
+
+
 def test_large_scale():
     for api in STRESS_MAPS:
         result = _make_large_scale_tester(api, 10000)()
@@ -594,6 +1059,20 @@ def test_tombstone():
     print("OK test_tombstone")
 
 
+def test_churn():
+    for api in STRESS_MAPS:
+        result = _make_churn_tester(api, 20000, 100)()
+        assert result == 0, f"churn failed for {api.__name__}: {result}"
+    print("OK test_churn")
+
+
+def test_reserve():
+    for api in STRESS_MAPS:
+        result = _make_reserve_tester(api, 1000)()
+        assert result == 0, f"reserve failed for {api.__name__}: {result}"
+    print("OK test_reserve")
+
+
 def test_clear_reuse():
     for api in STRESS_MAPS:
         result = _make_clear_reuse_tester(api, 1000)()
@@ -637,6 +1116,17 @@ def test_unsupported_key_type():
     raise AssertionError("FlatHashMap(f64, i64) should raise TypeError")
 
 
+def test_unhashable_key_types():
+    from pythoc import f64, struct
+    for key_type in (struct[u32, f64], array[u32, 4]):
+        try:
+            FlatHashMap(key_type, i64)
+        except TypeError:
+            continue
+        raise AssertionError(f"FlatHashMap({key_type}, i64) should raise TypeError")
+    print("OK test_unhashable_key_types")
+
+
 def test_bad_factory_args():
     try:
         FlatHashMap(42, i64)
@@ -661,14 +1151,24 @@ if __name__ == '__main__':
     test_update()
     test_empty_ops()
     test_tombstone()
+    test_churn()
+    test_batch()
+    test_struct_key()
+    test_array_field_key()
+    test_pointer_key()
+    test_bytes_key()
+    test_custom_functions()
+    test_closure_key_functions()
     test_large_scale()
     test_collision_heavy()
     test_repeated_rehash()
     test_value_mutation()
     test_repeated_update()
+    test_reserve()
     test_clear_reuse()
     test_multiple_instances()
     test_stress()
     test_unsupported_key_type()
+    test_unhashable_key_types()
     test_bad_factory_args()
     print("All FlatHashMap tests passed!")
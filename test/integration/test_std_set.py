@@ -8,6 +8,7 @@ Coverage:
 - load-factor boundary and repeated rehash
 - tombstone reuse and clear-then-reuse
 - deterministic stress test with mixed operations
+- struct keys hashed field by field
 - failure cases (unsupported key type, bad factory args)
 """
 
@@ -44,6 +45,15 @@ ALL_SETS = [
 STRESS_SETS = [I32Set, I64Set, U64Set]
 
 
+@compile
+class EdgeKey:
+    node: ptr[i32]
+    port: u16
+
+
+EdgeSet = FlatHashSet(EdgeKey)
+
+
 # ---------------------------------------------------------------------------
 # Basic correctness
 # ---------------------------------------------------------------------------
@@ -482,6 +492,41 @@ def _make_multiple_instances_tester(api, count: i32):
     return run
 
 
+def _make_struct_key_tester(count: i32):
+    @compile(suffix=(count, "struct_key"))
+    def run() -> i32:
+        s: EdgeSet
+        sp: ptr[EdgeSet] = ptr(s)
+        EdgeSet.init(sp)
+
+        nodes: array[i32, 8]
+        k: EdgeKey
+        i: i32 = 0
+        while i < count:
+            k.node = ptr(nodes[i % 8])
+            k.port = u16(i / 8)
+            if not EdgeSet.insert(sp, k):
+                return 1
+            i += 1
+        if EdgeSet.size(sp) != count:
+            return 2
+
+        i = 0
+        while i < count:
+            k.node = ptr(nodes[i % 8])
+            k.port = u16(i / 8)
+            if EdgeSet.insert(sp, k):
+                return 3
+            k.port = u16(count)
+            if EdgeSet.contains(sp, k):
+                return 4
+            i += 1
+
+        EdgeSet.destroy(sp)
+        return 0
+    return run
+
+
 # ---------------------------------------------------------------------------
 # Test runners
 # ---------------------------------------------------------------------------
@@ -507,6 +552,12 @@ def test_find():
     print("OK test_find")
 
 
+def test_struct_key():
+    result = _make_struct_key_tester(800)()
+    assert result == 0, f"struct_key failed: {result}"
+    print("OK test_struct_key")
+
+
 def test_large_scale():
     for api in STRESS_SETS:
         result = _make_large_scale_tester(api, 10000)()
@@ -602,6 +653,7 @@ if __name__ == '__main__':
     test_find()
     test_empty_ops()
     test_tombstone()
+    test_struct_key()
     test_large_scale()
     test_collision_heavy()
     test_repeated_rehash()
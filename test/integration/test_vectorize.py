@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Integration tests for fn.map() / fn.vectorize(): batched calls over buffers.
+"""
+
+import array
+import unittest
+
+from pythoc import compile, jit, i32, i64, u8, f64, bool as pc_bool, ptr
+
+
+@compile
+def axpy(a: f64, x: f64, y: f64) -> f64:
+    return a * x + y
+
+
+@compile
+def square(x: i32) -> i32:
+    return x * x
+
+
+@compile
+def is_odd(x: i64) -> pc_bool:
+    return x % 2 == 1
+
+
+@compile
+def low_byte(x: i32) -> u8:
+    return u8(x)
+
+
+@jit
+def negate(x: i32) -> i32:
+    return -x
+
+
+@compile
+def deref(p: ptr[i32]) -> i32:
+    return p[0]
+
+
+class TestMap(unittest.TestCase):
+    def test_buffers_and_broadcast_scalars(self):
+        xs = array.array('d', [1.0, 2.0, 3.0])
+        ys = array.array('d', [10.0, 20.0, 30.0])
+        self.assertEqual(axpy.map(2.0, xs, ys).tolist(), [12.0, 24.0, 36.0])
+        self.assertEqual(axpy.map(xs, 0.5, ys).tolist(), [10.5, 21.0, 31.5])
+
+    def test_result_element_types(self):
+        self.assertEqual(square.map(array.array('i', range(5))).tolist(), [0, 1, 4, 9, 16])
+        self.assertEqual(is_odd.map(array.array('q', [3, 4])).tolist(), [True, False])
+        result = low_byte.map(array.array('i', [0x1ff, 7]))
+        self.assertEqual(result.format, 'B')
+        self.assertEqual(result.tolist(), [0xff, 7])
+
+    def test_out_and_read_only_inputs(self):
+        out = array.array('i', [0, 0])
+        data = memoryview(bytes(array.array('i', [7, 8]))).cast('i')
+        self.assertIs(square.map(data, out=out), out)
+        self.assertEqual(out.tolist(), [49, 64])
+
+    def test_shapes(self):
+        grid = memoryview(bytearray(array.array('i', range(6)).tobytes())).cast('B').cast('i', (2, 3))
+        self.assertEqual(square.map(grid).tolist(), [[0, 1, 4], [9, 16, 25]])
+        self.assertEqual(square.map(array.array('i')).tolist(), [])
+
+    def test_large_batch(self):
+        xs = array.array('d', [1.5]) * 100000
+        result = axpy.map(2.0, xs, xs)
+        self.assertEqual(len(result), 100000)
+        self.assertEqual(result[99999], 4.5)
+
+    def test_jit_function(self):
+        self.assertEqual(negate.vectorize()(array.array('i', [1, -2])).tolist(), [-1, 2])
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            square.map(array.array('d', [1.0]))
+        with self.assertRaises(TypeError):
+            square.map(3)
+        with self.assertRaises(ValueError):
+            axpy.map(1.0, array.array('d', [1.0]), array.array('d', [1.0, 2.0]))
+        with self.assertRaises(TypeError):
+            square.map(array.array('i', [1]), out=array.array('i', [0, 0]))
+        with self.assertRaises(TypeError):
+            deref.map(array.array('i', [1]))
+        self.assertIs(square.vectorize(), square.vectorize())
+
+
+if __name__ == "__main__":
+    unittest.main()
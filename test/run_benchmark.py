@@ -32,6 +32,11 @@ BENCHMARK_RUNS = 5
 # Test parameters
 BINARY_TREE_DEPTH = 20
 NSIEVE_SIZE = 15
+HASHMAP_LOG2_KEYS = 20
+CONCURRENT_MAP_LOG2_KEYS = 20
+
+# abseil libraries the flat_hash_map baseline links against.
+ABSL_LIBS = ["-labsl_hash", "-labsl_city", "-labsl_low_level_hash", "-labsl_raw_hash_set"]
 
 
 def run_command(cmd, capture=True, cwd=None):
@@ -65,7 +70,7 @@ def compile_c_program(c_file, output_exe):
     return True
 
 
-def compile_pc_program(pc_file, output_exe):
+def compile_pc_program(pc_file, output_exe, env_overrides=None):
     """Compile PC program: run Python to generate executable"""
     print(f"  Compiling PC: {pc_file.name}...")
     
@@ -75,8 +80,9 @@ def compile_pc_program(pc_file, output_exe):
     env = os.environ.copy()
     env['PYTHONPATH'] = str(workspace)
     env['PC_OPT_LEVEL'] = '3'  # Enable maximum optimization
+    env.update(env_overrides or {})
     
-    print(f"    Compiling with PC_OPT_LEVEL=3...")
+    print(f"    Compiling with PC_OPT_LEVEL={env['PC_OPT_LEVEL']}...")
     result = subprocess.run(
         [sys.executable, str(pc_file)],
         capture_output=True,
@@ -183,6 +189,122 @@ def benchmark_binary_tree():
     return {"name": "binary_tree", "c_avg": c_avg, "pc_avg": pc_avg, "ratio": ratio}
 
 
+def run_phase_benchmark(exe_path, args, runs):
+    """Run a benchmark executable that reports ``PHASE <name> <ns/op>``
+    lines; return {name: [ns/op per run]}"""
+    phases = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [str(exe_path)] + [str(a) for a in args],
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL
+        )
+        if result.returncode != 0:
+            print(f"    ERROR running {exe_path.name}: {result.stderr}")
+            return None
+        for line in result.stdout.splitlines():
+            if line.startswith("PHASE "):
+                _, name, ns = line.split()
+                phases.setdefault(name, []).append(float(ns))
+    return phases
+
+
+def benchmark_hashmap():
+    """Benchmark std.map.FlatHashMap insert / find / erase against
+    absl::flat_hash_map (skipped if abseil is not installed)"""
+    print("\n" + "="*70)
+    print("HASH MAP BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    example_dir = workspace / "test" / "example"
+    build_dir = workspace / "build" / "test" / "example"
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    exe_suffix = get_exe_suffix()
+    cc_file = example_dir / "hashmap.cc"
+    pc_file = example_dir / "hashmap_pc.py"
+    cc_exe = build_dir / f"hashmap_absl_bench{exe_suffix}"
+    pc_exe = build_dir / f"hashmap_pc{exe_suffix}"
+
+    print(f"\n[1/2] Compilation (not timed)")
+    print(f"  Compiling C++: {cc_file.name}...")
+    result = run_command(["g++", "-O3", "-std=c++17", "-o", str(cc_exe), str(cc_file)] + ABSL_LIBS)
+    has_baseline = result.returncode == 0
+    if not has_baseline:
+        print("    abseil not available, skipping the baseline")
+    # LTO lets the map inline its hash and equality helpers, as a header-only
+    # C++ map does.
+    if not compile_pc_program(pc_file, pc_exe, env_overrides={'PC_LTO': '1'}):
+        return None
+
+    print(f"\n[2/2] Benchmarking (2^{HASHMAP_LOG2_KEYS} u64 keys)")
+    runs = {}
+    for label, exe in (("absl", cc_exe), ("PC", pc_exe)):
+        if label == "absl" and not has_baseline:
+            continue
+        run_phase_benchmark(exe, [HASHMAP_LOG2_KEYS], WARMUP_RUNS)
+        phases = run_phase_benchmark(exe, [HASHMAP_LOG2_KEYS], BENCHMARK_RUNS)
+        if phases is None:
+            return None
+        runs[label] = {name: sum(ns) / len(ns) for name, ns in phases.items()}
+
+    by_phase = {}
+    for name, pc_ns in runs["PC"].items():
+        row = {"pc": pc_ns}
+        if name in runs.get("absl", {}):
+            row["absl"] = runs["absl"][name]
+            row["ratio"] = pc_ns / row["absl"]
+            print(f"    {name:10s}: absl {row['absl']:7.2f} ns/op | PC {pc_ns:7.2f} ns/op | {row['ratio']:.2f}x")
+        else:
+            print(f"    {name:10s}: PC {pc_ns:7.2f} ns/op")
+        by_phase[name] = row
+
+    return {"name": "hashmap", "by_phase": by_phase}
+
+
+def benchmark_concurrent_map():
+    """Benchmark std.concurrent_map.ConcurrentHashMap on 1, 2, 4, ... runtime
+    workers (up to the CPU count), against the same map with a single lock"""
+    print("\n" + "="*70)
+    print("CONCURRENT HASH MAP SCALING BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    example_dir = workspace / "test" / "example"
+    pc_file = example_dir / "concurrent_map_pc.py"
+    pc_exe = workspace / "build" / "test" / "example" / f"concurrent_map_pc{get_exe_suffix()}"
+
+    print(f"\n[1/2] Compilation (not timed)")
+    if not compile_pc_program(pc_file, pc_exe, env_overrides={'PC_LTO': '1'}):
+        return None
+
+    max_workers = os.cpu_count() or 1
+    print(f"\n[2/2] Benchmarking (2^{CONCURRENT_MAP_LOG2_KEYS} u64 keys, up to {max_workers} workers)")
+    args = [str(pc_exe), str(CONCURRENT_MAP_LOG2_KEYS), str(max_workers)]
+    samples = {}
+    for _ in range(WARMUP_RUNS + BENCHMARK_RUNS):
+        result = subprocess.run(args, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+        if result.returncode != 0:
+            print(f"    ERROR running {pc_exe.name}: {result.stderr}")
+            return None
+        for line in result.stdout.splitlines():
+            if line.startswith("WORKERS "):
+                _, label, workers, ns = line.split()
+                samples.setdefault((label, int(workers)), []).append(float(ns))
+
+    by_workers = {}
+    for (label, workers), ns in sorted(samples.items(), key=lambda item: item[0][1]):
+        ns = ns[WARMUP_RUNS:]
+        by_workers.setdefault(workers, {})[label] = sum(ns) / len(ns)
+    for workers, row in by_workers.items():
+        print(f"    {workers:2d} worker(s): locked {row['locked']:7.2f} ns/op | "
+              f"sharded {row['sharded']:7.2f} ns/op")
+
+    return {"name": "concurrent_map", "by_workers": by_workers}
+
+
 def benchmark_compile_speed():
     """Benchmark compile speed by running integration tests serially"""
     print("\n" + "="*70)
@@ -256,6 +378,452 @@ def benchmark_compile_speed():
     }
 
 
+# Optimization pass sets compared by --pass-sets: (label, env overrides)
+PASS_SETS = [
+    ("O2", {"PC_OPT_LEVEL": "2"}),
+    ("O3-novec", {"PC_OPT_LEVEL": "3", "PC_VECTORIZE": "0"}),
+    ("O3", {"PC_OPT_LEVEL": "3", "PC_VECTORIZE": "1"}),
+]
+
+PASS_SET_PROGRAMS = [
+    # (name, PC source, executable stem, args)
+    ("binary_tree", "pc_binary_tree_test.py", "pc_binary_tree_test", [BINARY_TREE_DEPTH]),
+    ("nsieve", "nsieve_pc.py", "nsieve_pc", [NSIEVE_SIZE]),
+]
+
+
+def benchmark_pass_sets():
+    """Benchmark runtime of the PC examples under each optimization pass set"""
+    print("\n" + "="*70)
+    print("PASS SET BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    example_dir = workspace / "test" / "example"
+    build_dir = workspace / "build" / "test" / "example"
+    build_dir.mkdir(parents=True, exist_ok=True)
+    exe_suffix = get_exe_suffix()
+
+    import shutil
+    results = []
+    for name, source, stem, args in PASS_SET_PROGRAMS:
+        pc_exe = build_dir / f"{stem}{exe_suffix}"
+        row = {"name": name}
+        for label, env_overrides in PASS_SETS:
+            print(f"\n  {name} [{label}]:")
+            if not compile_pc_program(example_dir / source, pc_exe, env_overrides):
+                return None
+            # Keep a copy per pass set; the example always writes pc_exe.
+            set_exe = build_dir / f"{stem}_{label}{exe_suffix}"
+            shutil.copy2(pc_exe, set_exe)
+            run_benchmark(set_exe, args, WARMUP_RUNS)
+            times = run_benchmark(set_exe, args, BENCHMARK_RUNS)
+            if times is None:
+                return None
+            row[label] = sum(times) / len(times)
+        results.append(row)
+
+    labels = [label for label, _ in PASS_SETS]
+    print(f"\n{'='*70}")
+    print(f"RESULTS (average seconds):")
+    print("  " + f"{'program':15s}" + "".join(f" | {label:>9s}" for label in labels))
+    for row in results:
+        print("  " + f"{row['name']:15s}" + "".join(f" | {row[label]:9.4f}" for label in labels))
+    print(f"{'='*70}")
+
+    return results
+
+
+FLUSH_BENCH_FUNCTIONS = 150
+FLUSH_BENCH_OPT_LEVELS = (2, 3)
+
+FLUSH_BENCH_HEADER = """\
+import time
+from pythoc import i32, compile, seq
+from pythoc.decorators.compile import flush_all_pending_outputs
+"""
+
+FLUSH_BENCH_FUNCTION = """
+@compile
+def f{i}(n: i32) -> i32:
+    acc: i32 = {i}
+    for k in seq(n):
+        if k % 3 == 0:
+            acc += k * {i}
+        else:
+            acc = acc ^ (k + {callee}(k & 7))
+    return acc
+"""
+
+FLUSH_BENCH_FOOTER = """
+start = time.perf_counter()
+flush_all_pending_outputs()
+print(f"FLUSH_TIME: {time.perf_counter() - start:.4f}")
+"""
+
+
+def benchmark_flush_time():
+    """Benchmark back-end flush time (optimize + emit) of one large group"""
+    print("\n" + "="*70)
+    print("FLUSH TIME BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    bench_dir = workspace / "build" / "bench"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    bench_file = bench_dir / "flush_bench.py"
+
+    parts = [FLUSH_BENCH_HEADER]
+    for i in range(FLUSH_BENCH_FUNCTIONS):
+        callee = f"f{i - 1}" if i else "i32"
+        parts.append(FLUSH_BENCH_FUNCTION.format(i=i, callee=callee))
+    parts.append(FLUSH_BENCH_FOOTER)
+    bench_file.write_text("".join(parts))
+
+    print(f"\n  One group with {FLUSH_BENCH_FUNCTIONS} functions, fresh build per run")
+
+    import shutil
+    results = {}
+    for opt_level in FLUSH_BENCH_OPT_LEVELS:
+        env = os.environ.copy()
+        env['PYTHONPATH'] = str(workspace)
+        env['PC_OPT_LEVEL'] = str(opt_level)
+        times = []
+        for _ in range(WARMUP_RUNS + BENCHMARK_RUNS):
+            # Artifacts of build/bench/flush_bench.py land in build/build/bench.
+            shutil.rmtree(workspace / "build" / "build" / "bench", ignore_errors=True)
+            result = subprocess.run(
+                [sys.executable, str(bench_file)],
+                capture_output=True,
+                text=True,
+                cwd=str(workspace),
+                env=env,
+                stdin=subprocess.DEVNULL
+            )
+            if result.returncode != 0:
+                print(f"    ERROR: {result.stderr[-500:]}")
+                return None
+            for line in result.stdout.splitlines():
+                if line.startswith("FLUSH_TIME:"):
+                    times.append(float(line.split(":")[1]))
+        times = times[WARMUP_RUNS:]
+        if not times:
+            print("    ERROR: no FLUSH_TIME reported")
+            return None
+        avg = sum(times) / len(times)
+        results[opt_level] = avg
+        print(f"    O{opt_level}: {avg:.4f}s  (min: {min(times):.4f}s, max: {max(times):.4f}s)")
+
+    print(f"\n{'='*70}")
+    print(f"RESULTS:")
+    for opt_level, avg in results.items():
+        print(f"  flush_O{opt_level}: {avg:.4f}s")
+    print(f"{'='*70}")
+
+    return {"name": "flush_time", "by_opt_level": results}
+
+
+STARTUP_TOP_MODULES = 10
+
+STARTUP_BENCH_SCRIPT = """
+import sys, time
+before = len(sys.modules)
+start = time.perf_counter()
+import pythoc
+elapsed = time.perf_counter() - start
+print(f"IMPORT_TIME: {elapsed:.4f}")
+print(f"IMPORT_MODULES: {len(sys.modules) - before}")
+"""
+
+
+def benchmark_startup():
+    """Benchmark `import pythoc` wall time and the number of modules it loads"""
+    print("\n" + "="*70)
+    print("STARTUP BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    env = os.environ.copy()
+    env['PYTHONPATH'] = str(workspace)
+
+    times = []
+    modules = None
+    for _ in range(WARMUP_RUNS + BENCHMARK_RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_BENCH_SCRIPT],
+            capture_output=True,
+            text=True,
+            cwd=str(workspace),
+            env=env,
+            stdin=subprocess.DEVNULL
+        )
+        if result.returncode != 0:
+            print(f"    ERROR: {result.stderr[-500:]}")
+            return None
+        for line in result.stdout.splitlines():
+            if line.startswith("IMPORT_TIME:"):
+                times.append(float(line.split(":")[1]))
+            elif line.startswith("IMPORT_MODULES:"):
+                modules = int(line.split(":")[1])
+    times = times[WARMUP_RUNS:]
+    if not times:
+        print("    ERROR: no IMPORT_TIME reported")
+        return None
+    avg = sum(times) / len(times)
+    print(f"\n  import pythoc: {avg:.4f}s  (min: {min(times):.4f}s, max: {max(times):.4f}s)")
+    print(f"  modules imported: {modules}")
+
+    # -X importtime reports per-module self time on stderr.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pythoc"],
+        capture_output=True,
+        text=True,
+        cwd=str(workspace),
+        env=env,
+        stdin=subprocess.DEVNULL
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), name.strip()))
+    if rows:
+        print("  slowest modules (self time):")
+        for self_us, name in sorted(rows, reverse=True)[:STARTUP_TOP_MODULES]:
+            print(f"    {self_us / 1000:8.2f}ms  {name}")
+
+    return {"name": "startup", "avg": avg, "modules": modules}
+
+
+LOAD_BENCH_MODULES = 100
+
+LOAD_BENCH_MODULE = """
+from pythoc import i32, compile
+{import_line}
+
+@compile
+def g{i}(n: i32) -> i32:
+    return {body}
+"""
+
+LOAD_BENCH_MAIN = """
+import sys, time
+sys.path.insert(0, {bench_dir!r})
+from load_m{last} import g{last}
+start = time.perf_counter()
+g{last}(1)
+print(f"LOAD_TIME: {{time.perf_counter() - start:.4f}}")
+"""
+
+
+def benchmark_load_time():
+    """Benchmark the first native call of a program of many small groups,
+    one library per group vs. one merged library (warm object cache)"""
+    print("\n" + "="*70)
+    print("LIBRARY LOAD BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    bench_dir = workspace / "build" / "bench" / "load_bench"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(LOAD_BENCH_MODULES):
+        if i:
+            import_line = f"from load_m{i - 1} import g{i - 1}"
+            body = f"g{i - 1}(n) + {i}"
+        else:
+            import_line, body = "", "n"
+        (bench_dir / f"load_m{i}.py").write_text(
+            LOAD_BENCH_MODULE.format(import_line=import_line, i=i, body=body))
+    script = LOAD_BENCH_MAIN.format(bench_dir=str(bench_dir), last=LOAD_BENCH_MODULES - 1)
+
+    print(f"\n  {LOAD_BENCH_MODULES} groups, each calling the previous one")
+
+    results = {}
+    for label, merged in (("per-group", "0"), ("merged", "1")):
+        env = os.environ.copy()
+        env['PYTHONPATH'] = str(workspace)
+        env['PC_MERGED_LIBRARY'] = merged
+        times = []
+        for _ in range(WARMUP_RUNS + BENCHMARK_RUNS):
+            result = subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                cwd=str(workspace),
+                env=env,
+                stdin=subprocess.DEVNULL
+            )
+            if result.returncode != 0:
+                print(f"    ERROR: {result.stderr[-500:]}")
+                return None
+            for line in result.stdout.splitlines():
+                if line.startswith("LOAD_TIME:"):
+                    times.append(float(line.split(":")[1]))
+        times = times[WARMUP_RUNS:]
+        if not times:
+            print("    ERROR: no LOAD_TIME reported")
+            return None
+        avg = sum(times) / len(times)
+        results[label] = avg
+        print(f"    {label:10s}: {avg:.4f}s  (min: {min(times):.4f}s, max: {max(times):.4f}s)")
+
+    return {"name": "load_time", "by_mode": results}
+
+
+CALL_BENCH_CALLS = 200000
+
+CALL_BENCH_SCRIPT = """
+import array, time
+from pythoc import compile, i32, f64
+
+@compile
+def add(a: i32, b: i32) -> i32:
+    return a + b
+
+@compile
+def scale(x: f64, k: f64) -> f64:
+    return x * k
+
+add(1, 2)
+scale(1.0, 2.0)
+
+def per_call(fn, *args):
+    start = time.perf_counter()
+    for _ in range({calls}):
+        fn(*args)
+    return (time.perf_counter() - start) / {calls} * 1e9
+
+print(f"CALL_NS:add_i32:{{per_call(add, 1, 2):.1f}}")
+print(f"CALL_NS:add_pc_literal:{{per_call(add, i32(1), i32(2)):.1f}}")
+print(f"CALL_NS:scale_f64:{{per_call(scale, 1.5, 2.0):.1f}}")
+
+# Per element of one batched call through scale.map().
+xs = array.array('d', [1.5]) * {calls}
+scale.map(xs[:1], 2.0)
+start = time.perf_counter()
+scale.map(xs, 2.0)
+print(f"CALL_NS:scale_f64_map:{{(time.perf_counter() - start) / {calls} * 1e9:.1f}}")
+"""
+
+
+def benchmark_call_overhead():
+    """Benchmark the Python -> native call overhead of tiny @compile functions,
+    per call and per element of a batched fn.map() call"""
+    print("\n" + "="*70)
+    print("CALL OVERHEAD BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    env = os.environ.copy()
+    env['PYTHONPATH'] = str(workspace)
+    bench_dir = workspace / "build" / "bench" / "call_bench"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    script = bench_dir / "call_bench.py"
+    script.write_text(CALL_BENCH_SCRIPT.format(calls=CALL_BENCH_CALLS))
+
+    samples = {}
+    for _ in range(WARMUP_RUNS + BENCHMARK_RUNS):
+        result = subprocess.run(
+            [sys.executable, str(script)],
+            capture_output=True,
+            text=True,
+            cwd=str(bench_dir),
+            env=env,
+            stdin=subprocess.DEVNULL
+        )
+        if result.returncode != 0:
+            print(f"    ERROR: {result.stderr[-500:]}")
+            return None
+        for line in result.stdout.splitlines():
+            if line.startswith("CALL_NS:"):
+                _, label, ns = line.split(":")
+                samples.setdefault(label, []).append(float(ns))
+
+    results = {}
+    for label, times in samples.items():
+        times = times[WARMUP_RUNS:]
+        results[label] = sum(times) / len(times)
+        print(f"    {label:15s}: {results[label]:8.1f} ns/call  (min: {min(times):.1f})")
+
+    return {"name": "call_overhead", "by_call": results}
+
+
+THREAD_BENCH_SCRIPT = """
+import array, os, time
+from concurrent.futures import ThreadPoolExecutor
+from pythoc import compile, seq, u64, f64, ptr
+
+@compile(nogil=True)
+def kernel(xs: ptr[f64], n: u64, rounds: u64) -> f64:
+    total: f64 = 0.0
+    for r in seq(rounds):
+        for i in seq(n):
+            total = total + xs[i] * xs[i]
+    return total
+
+tasks = {tasks}
+chunk = array.array('d', [1.0]) * 4096
+kernel(chunk, len(chunk), 1)
+
+def run(workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: kernel(chunk, len(chunk), {rounds}), range(tasks)))
+    return time.perf_counter() - start
+
+workers = 1
+while workers <= max(os.cpu_count() or 1, 1) and workers <= tasks:
+    print(f"THREADS:{{workers}}:{{run(workers):.6f}}")
+    workers *= 2
+"""
+
+
+def benchmark_thread_scaling():
+    """Benchmark a nogil @compile kernel run from a ThreadPoolExecutor with
+    1, 2, 4, ... worker threads (up to the CPU count)"""
+    print("\n" + "="*70)
+    print("THREAD SCALING BENCHMARK")
+    print("="*70)
+
+    workspace = Path(__file__).parent.parent
+    env = os.environ.copy()
+    env['PYTHONPATH'] = str(workspace)
+    bench_dir = workspace / "build" / "bench" / "thread_bench"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    script = bench_dir / "thread_bench.py"
+    script.write_text(THREAD_BENCH_SCRIPT.format(tasks=16, rounds=2000))
+
+    samples = {}
+    for _ in range(WARMUP_RUNS + BENCHMARK_RUNS):
+        result = subprocess.run(
+            [sys.executable, str(script)],
+            capture_output=True,
+            text=True,
+            cwd=str(bench_dir),
+            env=env,
+            stdin=subprocess.DEVNULL
+        )
+        if result.returncode != 0:
+            print(f"    ERROR: {result.stderr[-500:]}")
+            return None
+        for line in result.stdout.splitlines():
+            if line.startswith("THREADS:"):
+                _, workers, seconds = line.split(":")
+                samples.setdefault(int(workers), []).append(float(seconds))
+
+    results = {}
+    for workers, times in sorted(samples.items()):
+        times = times[WARMUP_RUNS:]
+        results[workers] = sum(times) / len(times)
+    baseline = results.get(1)
+    for workers, avg in results.items():
+        speedup = baseline / avg if baseline and avg > 0 else 0.0
+        print(f"    {workers:2d} thread(s): {avg:.4f}s  ({speedup:.2f}x)")
+
+    return {"name": "thread_scaling", "by_workers": results}
+
+
 def benchmark_nsieve():
     """Benchmark nsieve (C vs PC)"""
     print("\n" + "="*70)
@@ -318,6 +886,22 @@ def main():
     parser = argparse.ArgumentParser(description='PC vs C performance benchmarks')
     parser.add_argument('--compile-speed', action='store_true',
                         help='Also run compile speed benchmark (for CI)')
+    parser.add_argument('--flush-time', action='store_true',
+                        help='Also run back-end flush time benchmark')
+    parser.add_argument('--pass-sets', action='store_true',
+                        help='Also compare O2 / O3 / O3 without vectorization')
+    parser.add_argument('--startup', action='store_true',
+                        help='Also measure `import pythoc` time and module count')
+    parser.add_argument('--load-time', action='store_true',
+                        help='Also compare per-group and merged library loading')
+    parser.add_argument('--call-overhead', action='store_true',
+                        help='Also measure Python -> native call overhead')
+    parser.add_argument('--threads', action='store_true',
+                        help='Also measure nogil kernel scaling over Python threads')
+    parser.add_argument('--hashmap', action='store_true',
+                        help='Also compare std.map.FlatHashMap with absl::flat_hash_map')
+    parser.add_argument('--concurrent-map', action='store_true',
+                        help='Also measure std.concurrent_map scaling over runtime workers')
     args = parser.parse_args()
     
     print("\n" + "="*70)
@@ -340,8 +924,42 @@ def main():
     # Compile speed benchmark (only with --compile-speed flag)
     if args.compile_speed:
         compile_result = benchmark_compile_speed()
+
+    flush_result = None
+    if args.flush_time:
+        flush_result = benchmark_flush_time()
+
+    pass_set_results = None
+    if args.pass_sets:
+        pass_set_results = benchmark_pass_sets()
+
+    startup_result = None
+    if args.startup:
+        startup_result = benchmark_startup()
+
+    load_result = None
+    if args.load_time:
+        load_result = benchmark_load_time()
+
+    call_result = None
+    if args.call_overhead:
+        call_result = benchmark_call_overhead()
+
+    thread_result = None
+    if args.threads:
+        thread_result = benchmark_thread_scaling()
+
+    hashmap_result = None
+    if args.hashmap:
+        hashmap_result = benchmark_hashmap()
+
+    concurrent_map_result = None
+    if args.concurrent_map:
+        concurrent_map_result = benchmark_concurrent_map()
     
-    if results or compile_result:
+    if (results or compile_result or flush_result or pass_set_results or startup_result
+            or load_result or call_result or thread_result or hashmap_result
+            or concurrent_map_result):
         print("\n" + "="*70)
         print("SUMMARY")
         print("="*70)
@@ -360,6 +978,50 @@ def main():
             print("\nCompile Speed:")
             print(f"  Total: {compile_result['total_time']:.2f}s for {compile_result['total_tests']} tests")
             print(f"  Average: {compile_result['avg_per_test']:.3f}s per test")
+
+        # Flush time results
+        if flush_result:
+            print("\nFlush Time:")
+            for opt_level, avg in flush_result['by_opt_level'].items():
+                print(f"  O{opt_level}: {avg:.4f}s per flush")
+
+        # Pass set results
+        if pass_set_results:
+            print("\nPass Sets:")
+            for row in pass_set_results:
+                cells = " | ".join(f"{label}: {row[label]:.4f}s" for label, _ in PASS_SETS)
+                print(f"  {row['name']:15s} | {cells}")
+
+        # Startup results
+        if startup_result:
+            print("\nStartup:")
+            print(f"  import pythoc: {startup_result['avg']:.4f}s, {startup_result['modules']} modules")
+
+        if load_result:
+            print("\nLibrary Load (first call):")
+            for mode, avg in load_result['by_mode'].items():
+                print(f"  {mode:10s}: {avg:.4f}s")
+
+        if call_result:
+            print("\nCall Overhead:")
+            for label, ns in call_result['by_call'].items():
+                print(f"  {label:15s}: {ns:.1f} ns/call")
+
+        if thread_result:
+            print("\nThread Scaling (nogil kernel):")
+            for workers, avg in thread_result['by_workers'].items():
+                print(f"  {workers:2d} thread(s): {avg:.4f}s")
+
+        if hashmap_result:
+            print("\nHash Map (ns/op):")
+            for name, row in hashmap_result['by_phase'].items():
+                baseline = f"absl: {row['absl']:.2f} | " if 'absl' in row else ""
+                print(f"  {name:10s} | {baseline}PC: {row['pc']:.2f}")
+
+        if concurrent_map_result:
+            print("\nConcurrent Hash Map (ns/op):")
+            for workers, row in concurrent_map_result['by_workers'].items():
+                print(f"  {workers:2d} worker(s) | locked: {row['locked']:.2f} | sharded: {row['sharded']:.2f}")
         
         print("="*70)
     else:
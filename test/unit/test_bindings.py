@@ -0,0 +1,88 @@
+"""Unit tests for binding snapshots of compiled groups."""
+
+import unittest
+
+from pythoc import array, compile, f64, i32, ptr, void
+from pythoc.build.bindings import (
+    BINDINGS_VERSION,
+    decode_binding,
+    decode_type,
+    encode_type,
+)
+from pythoc.build.deps import GroupDeps, GroupKey
+from pythoc.type_id import get_type_id
+
+
+@compile
+class SnapshotPair:
+    a: i32
+    b: f64
+
+
+def _entry(**overrides):
+    entry = {
+        'version': BINDINGS_VERSION,
+        'params': ['p', 'n'],
+        'types': {'p': ['ptr', 'f64'], 'n': 'i32'},
+        'return': 'f64',
+        'type_id': get_type_id(ptr[f64]) + ',' + get_type_id(i32) + '->' + get_type_id(f64),
+        'attrs': [],
+        'llvm_varargs': False,
+        'varargs': False,
+        'kwargs': False,
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestTypeDescriptors(unittest.TestCase):
+    def _round_trip(self, pc_type):
+        desc = encode_type(pc_type)
+        self.assertIsNotNone(desc)
+        self.assertEqual(get_type_id(decode_type(desc)), get_type_id(pc_type))
+        return desc
+
+    def test_builtin_types(self):
+        self.assertEqual(self._round_trip(i32), 'i32')
+        self.assertEqual(self._round_trip(void), 'void')
+
+    def test_pointer_and_array(self):
+        self.assertEqual(self._round_trip(ptr[f64]), ['ptr', 'f64'])
+        self.assertEqual(self._round_trip(array[i32, 2, 3]), ['array', 'i32', [2, 3]])
+
+    def test_named_type(self):
+        desc = self._round_trip(ptr[SnapshotPair])
+        self.assertEqual(desc, ['ptr', ['ref', __name__, 'SnapshotPair']])
+        self.assertIs(decode_type(desc[1]), SnapshotPair)
+
+    def test_unreachable_named_type(self):
+        self.assertIsNone(decode_type(['ref', __name__, 'Missing']))
+        self.assertIsNone(decode_type(['ref', __name__, 'f.<locals>.T']))
+        self.assertIsNone(encode_type(42))
+
+
+class TestDecodeBinding(unittest.TestCase):
+    def test_decode(self):
+        decoded = decode_binding(_entry(), [])
+        self.assertEqual(decoded['param_names'], ['p', 'n'])
+        self.assertIs(decoded['param_type_hints']['n'], i32)
+        self.assertIs(decoded['return_type_hint'], f64)
+        self.assertFalse(decoded['has_varargs'])
+
+    def test_stale_entries_are_rejected(self):
+        self.assertIsNone(decode_binding(_entry(version=BINDINGS_VERSION + 1), []))
+        self.assertIsNone(decode_binding(_entry(), ['noinline']))
+        self.assertIsNone(decode_binding(_entry(type_id='i32->i32'), []))
+        self.assertIsNone(decode_binding(_entry(types={'p': 'nope', 'n': 'i32'}), []))
+
+
+class TestDepsRecord(unittest.TestCase):
+    def test_bindings_round_trip(self):
+        key = GroupKey('/tmp/mod.py', None, None, None)
+        deps = GroupDeps(group_key=key, bindings={'f': _entry()})
+        self.assertEqual(GroupDeps.from_dict(deps.to_dict()).bindings, {'f': _entry()})
+        self.assertNotIn('bindings', GroupDeps(group_key=key).to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Unit tests for zero-copy buffer access (pythoc.buffers)."""
+
+import array
+import ctypes
+import unittest
+
+from pythoc.buffers import (
+    acquire_buffer, element_kind, is_buffer, new_buffer, pointer_view, scalar_ctype,
+)
+from pythoc.builtin_entities import f16, f64, i32, ptr
+
+
+class TestBuffers(unittest.TestCase):
+    def test_view_of_writable_buffer(self):
+        data = array.array('i', [1, 2, 3])
+        with acquire_buffer(data, writable=True) as view:
+            self.assertEqual(view.shape, (3,))
+            self.assertEqual(view.count, 3)
+            self.assertTrue(view.matches(ctypes.c_int32))
+            self.assertFalse(view.matches(ctypes.c_uint32))
+            ctypes.c_int32.from_address(view.address + 4).value = 20
+        self.assertEqual(data.tolist(), [1, 20, 3])
+
+    def test_read_only_buffer_is_not_copied(self):
+        data = b"\x01\x02"
+        with acquire_buffer(data) as view:
+            self.assertTrue(view.readonly)
+            self.assertEqual(ctypes.string_at(view.address, 2), data)
+        with self.assertRaises(TypeError):
+            acquire_buffer(data, writable=True)
+
+    def test_rejected_objects(self):
+        self.assertFalse(is_buffer(3))
+        with self.assertRaises(TypeError):
+            acquire_buffer(3)
+        with self.assertRaises(TypeError):
+            acquire_buffer(memoryview(bytes(8))[::2])
+
+    def test_element_kinds(self):
+        self.assertEqual(element_kind('d'), 'float')
+        self.assertEqual(element_kind('=Q'), 'uint')
+        self.assertEqual(element_kind('?'), 'bool')
+        self.assertIsNone(element_kind('2i'))
+        self.assertIsNone(element_kind('T{i:x:}'))
+
+    def test_new_buffer(self):
+        grid = new_buffer(ctypes.c_double, (2, 3))
+        self.assertEqual(grid.shape, (2, 3))
+        self.assertEqual(grid.format, 'd')
+        self.assertEqual(new_buffer(ctypes.c_bool, (0,)).tolist(), [])
+
+    def test_scalar_ctype(self):
+        self.assertIs(scalar_ctype(i32), ctypes.c_int32)
+        self.assertIs(scalar_ctype(f64), ctypes.c_double)
+        self.assertIsNone(scalar_ctype(f16))
+        self.assertIsNone(scalar_ctype(ptr[i32]))
+
+    def test_pointer_view(self):
+        data = (ctypes.c_int32 * 3)(1, 2, 3)
+        view = pointer_view(ctypes.addressof(data), 3, i32)
+        self.assertEqual(view.format, 'i')
+        self.assertEqual(view.tolist(), [1, 2, 3])
+        view[1] = 20
+        self.assertEqual(list(data), [1, 20, 3])
+        self.assertEqual(pointer_view(ctypes.addressof(data), 2).tobytes(),
+                         bytes(data)[:2])
+        self.assertEqual(pointer_view(0, 0, i32).tolist(), [])
+        with self.assertRaises(ValueError):
+            pointer_view(0, 1, i32)
+        with self.assertRaises(ValueError):
+            pointer_view(ctypes.addressof(data), -1, i32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unit tests for the content-addressed object cache key."""
+
+import os
+import tempfile
+import time
+import unittest
+
+from pythoc.build.cache import BuildCache, source_digest
+from pythoc.build.deps import GroupDeps, GroupKey
+from pythoc.config import config
+
+
+class TestContentKey(unittest.TestCase):
+    def setUp(self):
+        config.reset()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self._tmpdir.name, "mod.py")
+        self._write(self.source, "def f(x):\n    return x + 1\n")
+        self.group_key = (self.source, None, None, None)
+
+    def tearDown(self):
+        config.reset()
+        self._tmpdir.cleanup()
+
+    def _write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def _key(self, embed_files=()):
+        return BuildCache.compute_content_key(self.group_key, self.source, embed_files)
+
+    def test_touch_keeps_key(self):
+        before = self._key()
+        future = time.time() + 100
+        os.utime(self.source, (future, future))
+        self.assertEqual(before, self._key())
+
+    def test_comment_and_formatting_keep_key(self):
+        before = self._key()
+        self._write(self.source, "# comment\ndef f(x):\n\n    return x  +  1\n")
+        self.assertEqual(before, self._key())
+
+    def test_line_shift_changes_key_with_debug_info(self):
+        shifted = "# comment\n\ndef f(x):\n    return x + 1\n"
+        before = self._key()
+        with config.override(debug_info=True):
+            debug_before = self._key()
+            self._write(self.source, shifted)
+            self.assertNotEqual(debug_before, self._key())
+        self.assertEqual(before, self._key())
+
+    def test_code_change_changes_key(self):
+        before = self._key()
+        self._write(self.source, "def f(x):\n    return x + 2\n")
+        self.assertNotEqual(before, self._key())
+
+    def test_group_key_suffix_changes_key(self):
+        base = self._key()
+        suffixed = BuildCache.compute_content_key(
+            (self.source, None, "i64", None), self.source,
+        )
+        self.assertNotEqual(base, suffixed)
+
+    def test_opt_level_changes_key(self):
+        with config.override(opt_level=0):
+            o0 = self._key()
+        with config.override(opt_level=3):
+            o3 = self._key()
+        self.assertNotEqual(o0, o3)
+
+    def test_target_cpu_changes_key(self):
+        baseline = self._key()
+        with config.override(target_cpu="native"):
+            native = self._key()
+        with config.override(target_features="+avx2"):
+            avx2 = self._key()
+        self.assertEqual(len({baseline, native, avx2}), 3)
+
+    def test_embed_source_change_changes_key(self):
+        embed = os.path.join(self._tmpdir.name, "types.py")
+        self._write(embed, "X = 1\n")
+        before = self._key([embed])
+        self._write(embed, "X = 2\n")
+        self.assertNotEqual(before, self._key([embed]))
+
+    def test_missing_source_has_no_key(self):
+        missing = os.path.join(self._tmpdir.name, "missing.py")
+        self.assertIsNone(source_digest(missing))
+        self.assertIsNone(self._key([missing]))
+
+    def test_check_obj_content_uptodate_requires_object(self):
+        key = self._key()
+        obj_file = os.path.join(self._tmpdir.name, "mod.o")
+        self.assertFalse(BuildCache.check_obj_content_uptodate(obj_file, key, key))
+        self._write(obj_file, "")
+        self.assertTrue(BuildCache.check_obj_content_uptodate(obj_file, key, key))
+        self.assertFalse(BuildCache.check_obj_content_uptodate(obj_file, key, None))
+
+
+class TestGroupDepsContentFields(unittest.TestCase):
+    def test_round_trip(self):
+        deps = GroupDeps(group_key=GroupKey("/tmp/a.py", None, None, None))
+        deps.content_key = "abc"
+        deps.function_hashes = {"f": "123"}
+        deps.add_group_dependency(GroupKey("/tmp/t.py", None, None, None), "source_embed")
+        deps.add_group_dependency(GroupKey("/tmp/c.py", None, None, None), "function_call")
+
+        restored = GroupDeps.from_dict(deps.to_dict())
+
+        self.assertEqual(restored.content_key, "abc")
+        self.assertEqual(restored.function_hashes, {"f": "123"})
+        self.assertEqual(restored.get_source_embed_files(), ["/tmp/t.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
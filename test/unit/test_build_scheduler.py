@@ -1,8 +1,19 @@
+import multiprocessing
+import os
 import threading
 import time
 import unittest
+from unittest import mock
 
-from pythoc.build.scheduler import BuildScheduler, BuildSchedulerError, BuildTask
+from pythoc.build import scheduler
+from pythoc.build.output_manager import _object_build_workers
+from pythoc.build.scheduler import (
+    BuildScheduler,
+    BuildSchedulerError,
+    BuildTask,
+    offload,
+    process_pool_active,
+)
 
 
 class TestBuildScheduler(unittest.TestCase):
@@ -97,6 +108,76 @@ class TestBuildScheduler(unittest.TestCase):
         self.assertIn("a", cm.exception.failures)
         self.assertIn("b", cm.exception.blocked)
 
+    def test_offload_runs_inline_on_thread_executor(self):
+        result = BuildScheduler(max_workers=1).run([
+            BuildTask(id="a", kind="test", run=lambda: offload(os.getpid)),
+        ])
+
+        self.assertEqual(result["a"].value, os.getpid())
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(),
+        "process executor requires fork",
+    )
+    def test_offload_runs_in_worker_process_on_process_executor(self):
+        result = BuildScheduler(max_workers=2, executor="process").run([
+            BuildTask(id="a", kind="test", run=lambda: offload(os.getpid)),
+            BuildTask(id="b", kind="test", run=lambda: offload(abs, -3)),
+        ])
+
+        self.assertNotEqual(result["a"].value, os.getpid())
+        self.assertEqual(result["b"].value, 3)
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(),
+        "process executor requires fork",
+    )
+    def test_process_pool_active_only_inside_process_tasks(self):
+        thread_result = BuildScheduler(max_workers=1).run([
+            BuildTask(id="a", kind="test", run=process_pool_active),
+        ])
+        process_result = BuildScheduler(max_workers=1, executor="process").run([
+            BuildTask(id="a", kind="test", run=process_pool_active),
+        ])
+
+        self.assertFalse(thread_result["a"].value)
+        self.assertTrue(process_result["a"].value)
+        self.assertFalse(process_pool_active())
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(),
+        "process executor requires fork",
+    )
+    def test_process_executors_share_one_pool(self):
+        pools = [
+            BuildScheduler(max_workers=workers, executor="process").run([
+                BuildTask(
+                    id="a", kind="test",
+                    run=lambda: scheduler._task_context.process_pool,
+                ),
+            ])["a"].value
+            for workers in (1, 2)
+        ]
+
+        self.assertIsNotNone(pools[0])
+        self.assertIs(pools[0], pools[1])
+
+    def test_process_pool_not_forked_beside_other_threads(self):
+        with mock.patch.object(scheduler, "_process_pool", None), \
+                mock.patch.object(scheduler, "_process_pool_refused", False), \
+                mock.patch.object(scheduler.threading, "active_count", return_value=2), \
+                mock.patch.object(scheduler, "ProcessPoolExecutor") as pool_class:
+            result = BuildScheduler(max_workers=1, executor="process").run([
+                BuildTask(id="a", kind="test", run=lambda: offload(os.getpid)),
+            ])
+
+        pool_class.assert_not_called()
+        self.assertEqual(result["a"].value, os.getpid())
+
+    def test_unknown_executor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BuildScheduler(max_workers=1, executor="fiber")
+
     def test_cache_check_skips_run(self):
         did_run = False
 
@@ -162,5 +243,18 @@ class TestBuildScheduler(unittest.TestCase):
         self.assertIn("b", cm.exception.blocked)
 
 
+class TestObjectBuildWorkers(unittest.TestCase):
+    def test_process_executor_defaults_to_cpu_count(self):
+        with mock.patch.dict(os.environ), mock.patch("os.cpu_count", return_value=6):
+            os.environ.pop("PC_OBJECT_BUILD_WORKERS", None)
+            self.assertEqual(_object_build_workers("process"), 6)
+            self.assertEqual(_object_build_workers("thread"), 1)
+
+    def test_environment_overrides_default(self):
+        with mock.patch.dict(os.environ, {"PC_OBJECT_BUILD_WORKERS": "3"}):
+            self.assertEqual(_object_build_workers("process"), 3)
+            self.assertEqual(_object_build_workers("thread"), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
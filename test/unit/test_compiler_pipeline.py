@@ -0,0 +1,140 @@
+"""
+Unit tests for the in-memory optimize/emit pipeline of LLVMCompiler.
+"""
+
+import unittest
+
+from llvmlite import binding, ir
+
+from pythoc.compiler import LLVMCompiler, optimize_and_emit_object, target_machine_options
+from pythoc.config import config
+
+
+def _make_compiler():
+    """Compiler whose module holds ``add3(x) = (x + 1) + 2``."""
+    compiler = LLVMCompiler()
+    i32 = ir.IntType(32)
+    func = ir.Function(compiler.module, ir.FunctionType(i32, [i32]), name="add3")
+    builder = ir.IRBuilder(func.append_basic_block("entry"))
+    slot = builder.alloca(i32)
+    builder.store(builder.add(func.args[0], ir.Constant(i32, 1)), slot)
+    builder.ret(builder.add(builder.load(slot), ir.Constant(i32, 2)))
+    return compiler
+
+
+def _make_loop_compiler():
+    """Compiler whose module holds ``add(a, b, n)``: ``a[i] += b[i]``."""
+    compiler = LLVMCompiler()
+    i32, i64 = ir.IntType(32), ir.IntType(64)
+    ptr = i32.as_pointer()
+    func = ir.Function(
+        compiler.module, ir.FunctionType(ir.VoidType(), [ptr, ptr, i64]), name="add",
+    )
+    a, b, n = func.args
+    a.add_attribute("noalias")
+    b.add_attribute("noalias")
+    entry = func.append_basic_block("entry")
+    loop = func.append_basic_block("loop")
+    done = func.append_basic_block("done")
+
+    builder = ir.IRBuilder(entry)
+    builder.cbranch(builder.icmp_signed(">", n, ir.Constant(i64, 0)), loop, done)
+
+    builder.position_at_end(loop)
+    i = builder.phi(i64)
+    a_i = builder.gep(a, [i])
+    builder.store(builder.add(builder.load(a_i), builder.load(builder.gep(b, [i]))), a_i)
+    next_i = builder.add(i, ir.Constant(i64, 1))
+    i.add_incoming(ir.Constant(i64, 0), entry)
+    i.add_incoming(next_i, loop)
+    builder.cbranch(builder.icmp_signed("<", next_i, n), loop, done)
+
+    builder.position_at_end(done)
+    builder.ret_void()
+    return compiler
+
+
+class TestCompilerPipeline(unittest.TestCase):
+    def test_optimizes_parsed_module_in_place(self):
+        compiler = _make_compiler()
+        llvm_module = compiler.parse_module()
+
+        compiler.optimize_module(2, llvm_module)
+
+        optimized = compiler.get_ir()
+        self.assertIn("define", optimized)
+        self.assertNotIn("alloca", optimized)
+        self.assertEqual(optimized, str(llvm_module))
+        self.assertTrue(compiler.emit_object(llvm_module))
+
+    def test_process_entry_point_matches_in_process_pipeline(self):
+        compiler = _make_compiler()
+        llvm_module = compiler.parse_module()
+        ir_text = str(compiler.module)
+        compiler.optimize_module(2, llvm_module)
+
+        optimized_ir, bitcode, obj_bytes = optimize_and_emit_object(
+            ir_text, 2, want_ir=True, want_bitcode=True)
+
+        self.assertEqual(optimized_ir, compiler.get_ir())
+        self.assertEqual(bitcode, llvm_module.as_bitcode())
+        self.assertEqual(obj_bytes, compiler.emit_object(llvm_module))
+
+    def test_process_entry_point_returns_only_what_is_asked(self):
+        ir_text = str(_make_compiler().module)
+
+        optimized_ir, bitcode, obj_bytes = optimize_and_emit_object(ir_text, 2)
+
+        self.assertIsNone(optimized_ir)
+        self.assertIsNone(bitcode)
+        self.assertTrue(obj_bytes)
+
+    def test_o3_vectorizes_loops(self):
+        compiler = _make_loop_compiler()
+        compiler.optimize_module(3, compiler.parse_module())
+        self.assertIn("x i32>", compiler.get_ir())
+
+    def test_vectorize_off_keeps_scalar_loops(self):
+        compiler = _make_loop_compiler()
+        with config.override(vectorize=False):
+            compiler.optimize_module(3, compiler.parse_module())
+        self.assertNotIn("x i32>", compiler.get_ir())
+
+    def test_adopted_ir_replaces_optimized_module(self):
+        compiler = _make_compiler()
+        compiler.optimize_module(2)
+        self.assertNotIn("alloca", compiler.get_ir())
+
+        compiler.set_optimized_ir("; adopted")
+        self.assertEqual(compiler.get_ir(), "; adopted")
+
+
+
+class TestTargetMachineOptions(unittest.TestCase):
+    def tearDown(self):
+        config.reset()
+
+    def test_default_is_baseline(self):
+        self.assertEqual(target_machine_options(), {"cpu": "", "features": ""})
+
+    def test_native_resolves_to_host(self):
+        with config.override(target_cpu="native"):
+            options = target_machine_options()
+        self.assertEqual(options["cpu"], binding.get_host_cpu_name())
+        self.assertEqual(options["features"], binding.get_host_cpu_features().flatten())
+
+    def test_explicit_features_win_over_native_cpu(self):
+        with config.override(target_cpu="native", target_features="+sse2"):
+            options = target_machine_options()
+        self.assertEqual(options["features"], "+sse2")
+
+    def test_native_object_emission(self):
+        compiler = _make_compiler()
+        llvm_module = compiler.parse_module()
+        with config.override(target_cpu="native"):
+            compiler.optimize_module(3, llvm_module)
+            self.assertTrue(compiler.emit_object(llvm_module))
+
+
+if __name__ == "__main__":
+    unittest.main()
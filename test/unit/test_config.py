@@ -15,7 +15,11 @@ class TestConfigSchema(unittest.TestCase):
         expected = {
             'log_level', 'log_modules', 'raise_on_error',
             'debug_ast', 'debug_ast_format', 'debug_ast_diff',
-            'save_ir', 'save_unopt_ir', 'opt_level', 'debug_info',
+            'save_ir', 'save_unopt_ir', 'opt_level', 'vectorize', 'debug_info',
+            'lto', 'pgo_generate', 'pgo_use', 'function_cache',
+            'binding_snapshots', 'merged_library', 'async_workers',
+            'target_cpu', 'target_features',
+            'build_executor', 'cache_dir', 'cache_max_size',
             'cimport_backend',
             'cimport_target', 'cimport_sysroot', 'libclang_path',
             'cimport_clang_args',
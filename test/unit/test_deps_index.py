@@ -0,0 +1,113 @@
+"""Unit tests for the per-directory dependency index."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pythoc.build.deps import DEPS_VERSION, DependencyTracker, GroupDeps, GroupKey
+from pythoc.build.deps_index import INDEX_FILENAME, DepsIndex
+
+
+class TestDepsIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self._tmpdir.name
+        self.decoded = []
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _index(self):
+        def decode(text):
+            self.decoded.append(text)
+            return json.loads(text)
+        return DepsIndex(self.dir, decode)
+
+    def test_missing_index_is_not_created_by_reads(self):
+        index = self._index()
+        self.assertIsNone(index.get("a.o"))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, INDEX_FILENAME)))
+
+    def test_records_are_decoded_once(self):
+        index = self._index()
+        index.put("a.o", '{"x": 1}')
+        self.assertEqual(index.get("a.o"), {"x": 1})
+        self.assertEqual(index.get("a.o"), {"x": 1})
+        self.assertEqual(self.decoded, ['{"x": 1}'])
+
+    def test_other_writers_are_picked_up(self):
+        reader = self._index()
+        writer = self._index()
+        writer.put("a.o", '{"x": 1}')
+        self.assertEqual(reader.get("a.o"), {"x": 1})
+
+        writer.put("a.o", '{"x": 2}')
+        writer.put("b.o", '{"x": 3}')
+        self.assertEqual(reader.get("a.o"), {"x": 2})
+        self.assertEqual(reader.names(), ["a.o", "b.o"])
+
+        writer.delete("a.o")
+        self.assertIsNone(reader.get("a.o"))
+        self.assertEqual(reader.names(), ["b.o"])
+
+    def test_wiped_directory_drops_cached_records(self):
+        index = self._index()
+        index.put("a.o", '{"x": 1}')
+        shutil.rmtree(self.dir)
+        self.assertIsNone(index.get("a.o"))
+
+        index.put("b.o", '{"x": 2}')
+        self.assertEqual(self._index().names(), ["b.o"])
+
+
+class TestTrackerPersistence(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.obj_file = os.path.join(self._tmpdir.name, "mod.o")
+        self.group_key = (os.path.join(self._tmpdir.name, "mod.py"), None, None, None)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_save_and_load_through_index(self):
+        tracker = DependencyTracker()
+        deps = tracker.get_or_create_group_deps(self.group_key)
+        deps.add_link_library("m")
+        deps.content_key = "abc"
+        tracker.save_deps(self.group_key, self.obj_file)
+
+        loaded = DependencyTracker().load_deps(self.obj_file)
+        self.assertEqual(loaded.group_key, GroupKey(*self.group_key))
+        self.assertEqual(loaded.link_libraries, ["m"])
+        self.assertEqual(loaded.content_key, "abc")
+        self.assertFalse(os.path.exists(self.obj_file.replace(".o", ".deps")))
+
+    def test_legacy_deps_file_is_read_and_replaced(self):
+        legacy = GroupDeps(group_key=GroupKey(*self.group_key), content_key="old")
+        legacy_file = self.obj_file.replace(".o", ".deps")
+        with open(legacy_file, "w") as f:
+            json.dump(legacy.to_dict(), f)
+
+        tracker = DependencyTracker()
+        self.assertEqual(tracker.load_deps(self.obj_file).content_key, "old")
+
+        tracker.write_deps(GroupDeps(group_key=GroupKey(*self.group_key), content_key="new"),
+                           self.obj_file)
+        self.assertFalse(os.path.exists(legacy_file))
+        self.assertEqual(DependencyTracker().load_deps(self.obj_file).content_key, "new")
+
+    def test_discard_and_stale_version(self):
+        tracker = DependencyTracker()
+        tracker.write_deps(GroupDeps(group_key=GroupKey(*self.group_key)), self.obj_file)
+        tracker.discard_deps(self.obj_file)
+        self.assertIsNone(DependencyTracker().load_deps(self.obj_file))
+
+        stale = GroupDeps(version=DEPS_VERSION - 1, group_key=GroupKey(*self.group_key))
+        tracker.write_deps(stale, self.obj_file)
+        self.assertIsNone(DependencyTracker().load_deps(self.obj_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Unit tests for per-function reuse of optimized IR within a group."""
+
+import ctypes
+import os
+import tempfile
+import unittest
+
+from llvmlite import binding, ir
+
+from pythoc.build.fncache import (
+    compute_function_keys,
+    link_reused_functions,
+    plan_function_reuse,
+    store_function_cache,
+)
+from pythoc.compiler import LLVMCompiler
+from pythoc.config import config
+
+
+def _make_module(h_addend=10, g_factor=3):
+    """``f`` and ``h`` call ``g``; ``k`` bumps an internal counter."""
+    module = ir.Module(name="group")
+    module.triple = binding.get_default_triple()
+    i64 = ir.IntType(64)
+    fnty = ir.FunctionType(i64, [i64])
+
+    g = ir.Function(module, fnty, name="g")
+    builder = ir.IRBuilder(g.append_basic_block("entry"))
+    builder.ret(builder.mul(g.args[0], ir.Constant(i64, g_factor)))
+
+    for name, addend in (("f", 1), ("h", h_addend)):
+        func = ir.Function(module, fnty, name=name)
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        builder.ret(builder.add(builder.call(g, [func.args[0]]), ir.Constant(i64, addend)))
+
+    counter = ir.GlobalVariable(module, i64, name="counter")
+    counter.linkage = "internal"
+    counter.initializer = ir.Constant(i64, 0)
+    k = ir.Function(module, ir.FunctionType(i64, []), name="k")
+    builder = ir.IRBuilder(k.append_basic_block("entry"))
+    value = builder.add(builder.load(counter), ir.Constant(i64, 1))
+    builder.store(value, counter)
+    builder.ret(value)
+    return module
+
+
+class TestFunctionKeys(unittest.TestCase):
+    def test_callee_change_changes_caller_key(self):
+        before = compute_function_keys(_make_module())
+        after = compute_function_keys(_make_module(g_factor=4))
+        self.assertNotEqual(before["f"], after["f"])
+        self.assertNotEqual(before["h"], after["h"])
+
+    def test_sibling_change_keeps_key(self):
+        before = compute_function_keys(_make_module())
+        after = compute_function_keys(_make_module(h_addend=20))
+        self.assertEqual(before["f"], after["f"])
+        self.assertEqual(before["g"], after["g"])
+        self.assertNotEqual(before["h"], after["h"])
+
+    def test_mutable_internal_global_is_not_keyed(self):
+        self.assertNotIn("k", compute_function_keys(_make_module()))
+
+    def test_codegen_knobs_are_part_of_key(self):
+        config.reset()
+        try:
+            base = compute_function_keys(_make_module())
+            with config.override(opt_level=3):
+                o3 = compute_function_keys(_make_module())
+        finally:
+            config.reset()
+        self.assertNotEqual(base["f"], o3["f"])
+
+
+class TestFunctionReuse(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.obj_file = os.path.join(self._tmpdir.name, "group.o")
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _build(self, module):
+        plan = plan_function_reuse(module, self.obj_file)
+        llvm_module = binding.parse_assembly(plan.ir_text)
+        llvm_module.verify()
+        LLVMCompiler.optimize_llvm_module(llvm_module, 2)
+        if plan.reusable:
+            link_reused_functions(llvm_module, plan.bitcode, plan.reusable)
+        store_function_cache(self.obj_file, plan.keys, llvm_module.as_bitcode())
+        return plan, llvm_module
+
+    def _call(self, llvm_module, name, *args):
+        target = binding.Target.from_default_triple().create_target_machine()
+        engine = binding.create_mcjit_compiler(llvm_module, target)
+        engine.finalize_object()
+        argtypes = [ctypes.c_int64] * len(args)
+        func = ctypes.CFUNCTYPE(ctypes.c_int64, *argtypes)(engine.get_function_address(name))
+        return func(*args)
+
+    def test_cold_cache_reuses_nothing(self):
+        plan, _ = self._build(_make_module())
+        self.assertEqual(plan.reusable, set())
+        self.assertEqual(plan.ir_text, str(_make_module()))
+
+    def test_unchanged_functions_are_reused(self):
+        self._build(_make_module())
+        plan, llvm_module = self._build(_make_module(h_addend=20))
+        self.assertEqual(plan.reusable, {"f", "g"})
+        self.assertIn('declare i64 @"f"', plan.ir_text)
+        self.assertIn('define available_externally i64 @"g"', plan.ir_text)
+        self.assertEqual(self._call(llvm_module, "h", 5), 35)
+
+        _plan, llvm_module = self._build(_make_module(h_addend=20))
+        self.assertEqual(self._call(llvm_module, "f", 5), 16)
+
+    def test_callee_change_recompiles_callers(self):
+        self._build(_make_module())
+        plan, llvm_module = self._build(_make_module(g_factor=4))
+        self.assertEqual(plan.reusable, set())
+        self.assertEqual(self._call(llvm_module, "f", 5), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Unit tests for the frozen bundle manifest encoding."""
+
+import ctypes
+import unittest
+
+from pythoc.build.freeze import FreezeError, encode_ctype
+from pythoc.build.frozen_runtime import decode_ctype
+
+
+class Inner(ctypes.Structure):
+    _fields_ = [("a", ctypes.c_int32), ("b", ctypes.c_uint8 * 3)]
+
+
+class Outer(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = [("inner", Inner), ("p", ctypes.c_void_p), ("d", ctypes.c_double)]
+
+
+class Bits(ctypes.Structure):
+    _fields_ = [("flag", ctypes.c_uint32, 1)]
+
+
+class TestCtypesDescriptors(unittest.TestCase):
+    def _round_trip(self, ctype):
+        decoded = decode_ctype(encode_ctype(ctype))
+        self.assertEqual(ctypes.sizeof(decoded), ctypes.sizeof(ctype))
+        return decoded
+
+    def test_simple_types(self):
+        self.assertIsNone(encode_ctype(None))
+        self.assertIs(self._round_trip(ctypes.c_int64), ctypes.c_int64)
+        self.assertIs(self._round_trip(ctypes.c_bool), ctypes.c_bool)
+        self.assertIs(self._round_trip(ctypes.c_void_p), ctypes.c_void_p)
+
+    def test_compound_types(self):
+        self._round_trip(ctypes.c_float * 4)
+        self._round_trip(ctypes.POINTER(ctypes.c_int16))
+        self._round_trip(ctypes.CFUNCTYPE(ctypes.c_int32, ctypes.c_double))
+        outer = self._round_trip(Outer)
+        self.assertEqual([name for name, _ in outer._fields_], ["inner", "p", "d"])
+        self.assertEqual(outer.d.offset, Outer.d.offset)
+
+    def test_same_struct_decodes_to_one_class(self):
+        desc = encode_ctype(Inner)
+        self.assertIs(decode_ctype(desc), decode_ctype(encode_ctype(Inner)))
+
+    def test_bit_fields_are_rejected(self):
+        with self.assertRaises(FreezeError):
+            encode_ctype(Bits)
+
+
+if __name__ == "__main__":
+    unittest.main()
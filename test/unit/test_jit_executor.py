@@ -0,0 +1,48 @@
+"""
+Unit tests for JIT executor engine lifetime.
+"""
+
+import gc
+import unittest
+
+from pythoc.jit_executor import JITExecutor
+
+
+class FakeEngine:
+    """Stands in for an MCJIT engine; only records close()."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestJITExecutorClear(unittest.TestCase):
+    def test_retired_engine_freed_once_callables_are_gone(self):
+        executor = JITExecutor()
+        engine = executor._engine = FakeEngine()
+
+        def native_func():
+            pass
+
+        executor._bound.add(native_func)
+        executor.clear()
+        self.assertFalse(engine.closed)
+        self.assertEqual(len(executor._retired_engines), 1)
+
+        del native_func
+        gc.collect()
+        executor.clear()
+        self.assertTrue(engine.closed)
+        self.assertEqual(executor._retired_engines, [])
+
+    def test_unused_engine_freed_on_clear(self):
+        executor = JITExecutor()
+        engine = executor._engine = FakeEngine()
+        executor.clear()
+        self.assertTrue(engine.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,13 @@
 Unit tests for libc bindings
 """
 
+import importlib
+import os
+import subprocess
+import sys
 import unittest
+
+import pythoc.libc as libc
 from pythoc.libc import printf, malloc, free, memcpy, strlen
 
 
@@ -43,5 +49,46 @@ class TestLibcString(unittest.TestCase):
         self.assertTrue(callable(strlen))
 
 
+
+class TestLibcLazyLoading(unittest.TestCase):
+    """Test that header modules are loaded on demand"""
+
+    def test_import_pythoc_does_not_load_libc(self):
+        """Test `import pythoc` leaves libc and meta unloaded"""
+        code = (
+            "import sys, pythoc\n"
+            "print(sorted(m for m in ('pythoc.libc', 'pythoc.meta')"
+            " if m in sys.modules))\n"
+            "pythoc.libc.printf\n"
+            "print('pythoc.libc.stdio' in sys.modules, 'pythoc.libc.math' in sys.modules)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONPATH=root)
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                text=True, env=env, cwd=root)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split("\n")[:2], ["[]", "True False"])
+
+    def test_exports_match_header_star_imports(self):
+        """Test every listed name resolves to its header's definition"""
+        for header, names in libc._EXPORTS.items():
+            module = importlib.import_module('pythoc.libc.' + header)
+            for name in names:
+                self.assertIs(getattr(libc, name), getattr(module, name), name)
+
+    def test_function_names_shadow_header_modules(self):
+        """Test time/signal/setjmp stay functions after their headers load"""
+        importlib.import_module('pythoc.libc.time')
+        self.assertTrue(getattr(libc.time, '_is_extern', False))
+        self.assertTrue(getattr(libc.signal, '_is_extern', False))
+
+    def test_unlisted_helpers_are_reachable(self):
+        """Test names exported by a header but not listed still resolve"""
+        from pythoc.libc.string import strdup
+        self.assertIs(libc.strdup, strdup)
+        with self.assertRaises(AttributeError):
+            libc.no_such_function
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,130 @@
+"""Unit tests for cross-group link-time optimization."""
+
+import os
+import tempfile
+import unittest
+
+from llvmlite import binding, ir
+
+from pythoc.build.lto import (
+    bitcode_file_for,
+    internalize,
+    link_bitcode_module,
+    lto_link_objects,
+)
+from pythoc.compiler import LLVMCompiler
+from pythoc.config import config
+
+
+def _callee_module():
+    """``helper(x) = x * 3``."""
+    module = ir.Module(name="callee")
+    module.triple = binding.get_default_triple()
+    i32 = ir.IntType(32)
+    func = ir.Function(module, ir.FunctionType(i32, [i32]), name="helper")
+    builder = ir.IRBuilder(func.append_basic_block("entry"))
+    builder.ret(builder.mul(func.args[0], ir.Constant(i32, 3)))
+    return module
+
+
+def _caller_module():
+    """``entry(x) = helper(x) + 1`` with ``helper`` defined elsewhere."""
+    module = ir.Module(name="caller")
+    module.triple = binding.get_default_triple()
+    i32 = ir.IntType(32)
+    fnty = ir.FunctionType(i32, [i32])
+    helper = ir.Function(module, fnty, name="helper")
+    func = ir.Function(module, fnty, name="entry")
+    builder = ir.IRBuilder(func.append_basic_block("entry"))
+    builder.ret(builder.add(builder.call(helper, [func.args[0]]), ir.Constant(i32, 1)))
+    return module
+
+
+class TestLinkTimeOptimization(unittest.TestCase):
+    def setUp(self):
+        config.reset()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.callee_obj = self._write_group("callee", _callee_module())
+        self.caller_obj = self._write_group("caller", _caller_module())
+        self.lto_obj = os.path.join(self._tmpdir.name, "out.lto.o")
+
+    def tearDown(self):
+        config.reset()
+        self._tmpdir.cleanup()
+
+    def _write_group(self, name, module, with_bitcode=True):
+        llvm_module = binding.parse_assembly(str(module))
+        obj_file = os.path.join(self._tmpdir.name, name + ".o")
+        with open(obj_file, "wb") as f:
+            f.write(LLVMCompiler.emit_object(llvm_module))
+        if with_bitcode:
+            with open(bitcode_file_for(obj_file), "wb") as f:
+                f.write(llvm_module.as_bitcode())
+        return obj_file
+
+    def test_merges_bitcode_into_one_object(self):
+        objs = lto_link_objects(
+            [self.callee_obj, self.caller_obj], self.lto_obj, preserve_symbols=["entry"],
+        )
+        self.assertEqual(objs, [self.lto_obj])
+        self.assertTrue(os.path.getsize(self.lto_obj) > 0)
+
+    def test_internalized_callee_is_inlined_and_removed(self):
+        llvm_module = link_bitcode_module(
+            [bitcode_file_for(self.callee_obj), bitcode_file_for(self.caller_obj)]
+        )
+        self.assertEqual(internalize(llvm_module, ["entry"]), 1)
+        LLVMCompiler.optimize_whole_program(llvm_module, 2)
+
+        self.assertIsNone(_find_function(llvm_module, "helper"))
+        entry = _find_function(llvm_module, "entry")
+        self.assertNotIn("call", str(entry))
+
+    def test_native_objects_are_kept_and_block_internalization(self):
+        native_obj = self._write_group("native", _callee_module(), with_bitcode=False)
+        os.remove(bitcode_file_for(self.callee_obj))
+
+        objs = lto_link_objects(
+            [self.caller_obj, native_obj], self.lto_obj, preserve_symbols=["entry"],
+        )
+        self.assertEqual(objs, [self.lto_obj, native_obj])
+
+    def test_stale_bitcode_is_ignored(self):
+        past = os.path.getmtime(self.callee_obj) - 100
+        os.utime(bitcode_file_for(self.callee_obj), (past, past))
+
+        objs = lto_link_objects([self.callee_obj, self.caller_obj], self.lto_obj)
+        self.assertEqual(objs, [self.lto_obj, self.callee_obj])
+
+    def test_unchanged_inputs_reuse_lto_object(self):
+        objs = [self.callee_obj, self.caller_obj]
+        lto_link_objects(objs, self.lto_obj, ["entry"])
+        with open(self.lto_obj, "r+b") as f:
+            f.write(b"reused")
+
+        lto_link_objects(objs, self.lto_obj, ["entry"])
+        with open(self.lto_obj, "rb") as f:
+            self.assertTrue(f.read().startswith(b"reused"))
+
+        with config.override(opt_level=3):
+            lto_link_objects(objs, self.lto_obj, ["entry"])
+        with open(self.lto_obj, "rb") as f:
+            self.assertFalse(f.read().startswith(b"reused"))
+
+    def test_without_bitcode_returns_inputs(self):
+        for obj in (self.callee_obj, self.caller_obj):
+            os.remove(bitcode_file_for(obj))
+        objs = lto_link_objects([self.callee_obj, self.caller_obj], self.lto_obj)
+        self.assertEqual(objs, [self.callee_obj, self.caller_obj])
+        self.assertFalse(os.path.exists(self.lto_obj))
+
+
+def _find_function(llvm_module, name):
+    for func in llvm_module.functions:
+        if func.name == name:
+            return func
+    return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,18 @@
 Unit tests for native executor caching behavior.
 """
 
+import ctypes
 import json
 import os
 import tempfile
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from pythoc.native_executor import MultiSOExecutor
+from pythoc import f64, i32
+from pythoc.build.deps import DEPS_VERSION
+from pythoc.native_executor import _MERGED_LIBRARY_GRACE_SECONDS, MultiSOExecutor
 from pythoc.utils.link_utils import get_shared_lib_extension
 
 
@@ -92,6 +96,44 @@ class TestMultiSOExecutor(unittest.TestCase):
         self.assertEqual(result, "fresh_wrapper")
         self.assertNotIn(f"{so_file}:stale_func", executor.function_cache)
 
+    def _native(self, callback_type, func):
+        """A bare ctypes function pointer calling *func*, like a loaded symbol."""
+        callback = callback_type(func)
+        native = ctypes.CFUNCTYPE(None)(ctypes.cast(callback, ctypes.c_void_p).value)
+        native.callback = callback  # Keep the thunk alive.
+        return native
+
+    def test_scalar_signature_binds_fast_path(self):
+        """All-scalar signatures accept ints and scalar pc_literals."""
+        executor = MultiSOExecutor()
+        native = self._native(
+            ctypes.CFUNCTYPE(ctypes.c_int32, ctypes.c_int32, ctypes.c_double),
+            lambda a, b: a + int(b),
+        )
+        add = executor.bind_native_function(
+            native, (ctypes.c_int32, [ctypes.c_int32, ctypes.c_double], i32))
+
+        self.assertEqual(add.__qualname__, "MultiSOExecutor._bind_scalar_call.<locals>.call")
+        result = add(40, 2.0)
+        self.assertEqual(int(result), 42)
+        self.assertIs(result._pc_type, i32)
+        self.assertEqual(int(add(result, f64(1.0))), 43)
+        # ctypes rejects the float for an i32 slot; the generic path reports it.
+        with self.assertRaises(TypeError):
+            add(1.5, 2.0)
+
+    def test_zero_size_parameter_uses_generic_path(self):
+        """Zero-size parameters have no native slot and are dropped."""
+        executor = MultiSOExecutor()
+        native = self._native(ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double),
+                              lambda x: x * 2)
+        twice = executor.bind_native_function(
+            native, (ctypes.c_double, [None, ctypes.c_double], f64))
+
+        self.assertEqual(twice.__qualname__,
+                         "MultiSOExecutor._bind_generic_call.<locals>.wrapper")
+        self.assertEqual(float(twice(object(), 1.5)), 3.0)
+
     def test_darwin_explicit_link_libraries_include_dependencies(self):
         """Darwin links dependent DSOs directly to avoid system symbol clashes."""
         executor = MultiSOExecutor()
@@ -203,7 +245,7 @@ class TestMultiSOExecutor(unittest.TestCase):
             )
 
             deps_data = {
-                "version": 11,
+                "version": DEPS_VERSION,
                 "source_mtime": 0.0,
                 "link_objects": [],
                 "link_libraries": [],
@@ -238,7 +280,7 @@ class TestMultiSOExecutor(unittest.TestCase):
             embed_so = os.path.join(tmpdir, "embed.dll")
 
             deps_data = {
-                "version": 11,
+                "version": DEPS_VERSION,
                 "source_mtime": 0.0,
                 "link_objects": [],
                 "link_libraries": [],
@@ -264,6 +306,31 @@ class TestMultiSOExecutor(unittest.TestCase):
         self.assertEqual(libs, [])
         self.assertEqual(task_deps, ())
 
+    def test_superseded_merged_libraries_are_removed(self):
+        from pythoc.utils.link_utils import file_lock
+
+        executor = MultiSOExecutor()
+        lib_ext = get_shared_lib_extension()
+        long_ago = time.time() - 2 * _MERGED_LIBRARY_GRACE_SECONDS
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = {}
+            for name in ("old", "recent", "orphan", "busy", "live"):
+                paths[name] = os.path.join(tmpdir, f"merged.{name}{lib_ext}")
+                for path in (paths[name], paths[name] + ".lock"):
+                    open(path, "w").close()
+                if name != "recent":
+                    os.utime(paths[name], (long_ago, long_ago))
+            executor._merged_libs.append(paths["live"])
+            os.remove(paths["orphan"])  # lock file of a failed link
+
+            with file_lock(paths["busy"] + ".lock"):
+                executor._evict_superseded_merged_libraries(tmpdir)
+
+            kept = sorted(os.path.basename(paths[name]) + ext
+                          for name in ("recent", "busy", "live") for ext in ("", ".lock"))
+            kept += [os.path.basename(paths[name]) + ".lock" for name in ("old", "orphan")]
+            self.assertEqual(sorted(os.listdir(tmpdir)), sorted(kept))
+
 
 if __name__ == "__main__":
     unittest.main()
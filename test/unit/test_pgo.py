@@ -0,0 +1,213 @@
+"""Unit tests for the profile-guided optimization workflow."""
+
+import ctypes
+import json
+import os
+import tempfile
+import unittest
+
+from llvmlite import binding, ir
+
+from pythoc.build.cache import codegen_knobs
+from pythoc.build.pgo import (
+    apply_profile,
+    function_checksum,
+    inline_threshold_for,
+    instrument_module,
+    load_profile,
+    merge_profiles,
+)
+from pythoc.config import config
+
+
+def _make_module():
+    """``count(n)``: loop with a skewed ``i % 100 == 0`` branch, plus ``idle``."""
+    module = ir.Module(name="pgo")
+    module.triple = binding.get_default_triple()
+    i64 = ir.IntType(64)
+
+    func = ir.Function(module, ir.FunctionType(i64, [i64]), name="count")
+    entry = func.append_basic_block("entry")
+    loop = func.append_basic_block("loop")
+    rare = func.append_basic_block("rare")
+    latch = func.append_basic_block("latch")
+    done = func.append_basic_block("done")
+
+    builder = ir.IRBuilder(entry)
+    builder.branch(loop)
+    builder.position_at_end(loop)
+    i = builder.phi(i64)
+    i.add_incoming(ir.Constant(i64, 0), entry)
+    is_rare = builder.icmp_signed("==", builder.srem(i, ir.Constant(i64, 100)),
+                                  ir.Constant(i64, 0))
+    builder.cbranch(is_rare, rare, latch)
+    builder.position_at_end(rare)
+    builder.branch(latch)
+    builder.position_at_end(latch)
+    next_i = builder.add(i, ir.Constant(i64, 1))
+    i.add_incoming(next_i, latch)
+    builder.cbranch(builder.icmp_signed("<", next_i, func.args[0]), loop, done)
+    builder.position_at_end(done)
+    builder.ret(next_i)
+
+    idle = ir.Function(module, ir.FunctionType(i64, []), name="idle")
+    ir.IRBuilder(idle.append_basic_block("entry")).ret(ir.Constant(i64, 0))
+    return module
+
+
+def _run_instrumented(module, table_name, n):
+    """JIT *module*, call ``count(n)`` and return the counter table."""
+    llvm_module = binding.parse_assembly(str(module))
+    target = binding.Target.from_default_triple().create_target_machine()
+    engine = binding.create_mcjit_compiler(llvm_module, target)
+    engine.finalize_object()
+    count = ctypes.CFUNCTYPE(ctypes.c_int64, ctypes.c_int64)(
+        engine.get_function_address("count"))
+    count(n)
+    size = module.globals[table_name].type.pointee.count
+    table = (ctypes.c_uint64 * size).from_address(
+        engine.get_global_value_address(table_name))
+    return list(table)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_counts_entries_and_branch_outcomes(self):
+        module = _make_module()
+        manifest = instrument_module(module, "__pc_prof_test")
+
+        info = manifest["functions"]["count"]
+        self.assertEqual(info["branches"], 2)
+        self.assertEqual(manifest["functions"]["idle"]["offset"], 5)
+
+        counters = _run_instrumented(module, "__pc_prof_test", 1000)
+        base = info["offset"]
+        self.assertEqual(counters[base], 1)
+        self.assertEqual(counters[base + 1:base + 3], [10, 990])
+        self.assertEqual(counters[base + 3:base + 5], [999, 1])
+        self.assertEqual(counters[5], 0)
+
+    def test_instrumenting_twice_is_a_noop(self):
+        module = _make_module()
+        manifest = instrument_module(module, "__pc_prof_test")
+        ir_text = str(module)
+        self.assertEqual(instrument_module(module, "__pc_prof_test"), manifest)
+        self.assertEqual(str(module), ir_text)
+
+    def test_functions_added_later_get_counters(self):
+        module = _make_module()
+        instrument_module(module, "__pc_prof_test")
+        i64 = ir.IntType(64)
+        late = ir.Function(module, ir.FunctionType(i64, []), name="late")
+        ir.IRBuilder(late.append_basic_block("entry")).ret(ir.Constant(i64, 1))
+
+        manifest = instrument_module(module, "__pc_prof_test")
+
+        self.assertEqual(manifest["size"], 7)
+        self.assertEqual(manifest["functions"]["late"]["offset"], 6)
+        self.assertEqual(manifest["functions"]["idle"]["offset"], 5)
+        counters = _run_instrumented(module, "__pc_prof_test", 1000)
+        self.assertEqual(len(counters), 7)
+        self.assertEqual(counters[:5], [1, 10, 990, 999, 1])
+
+    def test_checksum_ignores_instrumentation(self):
+        plain = _make_module()
+        instrumented = _make_module()
+        instrument_module(instrumented, "__pc_prof_test")
+        self.assertEqual(
+            function_checksum(plain.get_global("count")),
+            function_checksum(instrumented.get_global("count")),
+        )
+
+
+class TestProfileUse(unittest.TestCase):
+    def _profile(self, module, entry=1, branches=([10, 990], [999, 1])):
+        return {
+            "version": 1,
+            "max_entry": entry,
+            "functions": {
+                "count": {
+                    "checksum": function_checksum(module.get_global("count")),
+                    "entry": entry,
+                    "branches": [list(b) for b in branches],
+                },
+                "idle": {
+                    "checksum": function_checksum(module.get_global("idle")),
+                    "entry": 0,
+                    "branches": [],
+                },
+            },
+        }
+
+    def test_annotates_weights_and_entry_counts(self):
+        module = _make_module()
+        summary = apply_profile(module, self._profile(module))
+        self.assertEqual(summary, {"annotated": 2, "hot": 1, "cold": 1})
+
+        text = str(module)
+        self.assertIn('!"branch_weights", i32 10, i32 990', text)
+        self.assertIn('!"function_entry_count", i64 1', text)
+        self.assertIn("cold", str(module.get_global("idle").attributes))
+        self.assertIn("inlinehint", str(module.get_global("count").attributes))
+        binding.parse_assembly(text).verify()
+
+    def test_changed_function_is_not_annotated(self):
+        module = _make_module()
+        profile = self._profile(module)
+        profile["functions"]["count"]["checksum"] = "stale"
+        summary = apply_profile(module, profile)
+        self.assertEqual(summary["annotated"], 1)
+        self.assertNotIn("branch_weights", str(module))
+
+    def test_large_counts_fit_branch_weights(self):
+        module = _make_module()
+        apply_profile(module, self._profile(module, branches=([1 << 40, 1], [1, 1])))
+        self.assertIn('!"branch_weights", i32 4294967295, i32 1', str(module))
+
+    def test_inline_threshold_follows_hotness(self):
+        self.assertEqual(inline_threshold_for({"annotated": 2, "hot": 1, "cold": 1}, 2), 450)
+        self.assertEqual(inline_threshold_for({"annotated": 1, "hot": 0, "cold": 1}, 3), 166)
+        self.assertEqual(inline_threshold_for({"annotated": 1, "hot": 0, "cold": 0}, 2), 225)
+
+    def test_merge_sums_matching_records(self):
+        record = {"checksum": "a", "entry": 1, "branches": [[1, 2]]}
+        merged = merge_profiles(
+            {"functions": {"f": record}},
+            {"functions": {"f": record, "g": dict(record, checksum="b")}},
+        )
+        self.assertEqual(merged["functions"]["f"]["entry"], 2)
+        self.assertEqual(merged["functions"]["f"]["branches"], [[2, 4]])
+        self.assertEqual(merged["functions"]["g"]["checksum"], "b")
+
+
+class TestProfileCacheKey(unittest.TestCase):
+    def setUp(self):
+        config.reset()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmpdir.name, "prof.json")
+
+    def tearDown(self):
+        config.reset()
+        self._tmpdir.cleanup()
+
+    def _write(self, entry):
+        with open(self.path, "w") as f:
+            json.dump({"version": 1, "functions": {
+                "f": {"checksum": "a", "entry": entry, "branches": []}}}, f)
+
+    def test_profile_content_is_part_of_the_key(self):
+        self._write(1)
+        with config.override(pgo_use=self.path):
+            first = dict(codegen_knobs())
+            self._write(22)
+            second = dict(codegen_knobs())
+        self.assertNotEqual(first["pgo_use"], second["pgo_use"])
+        self.assertEqual(load_profile(self.path)["max_entry"], 22)
+
+    def test_instrumented_builds_have_their_own_key(self):
+        plain = dict(codegen_knobs())
+        with config.override(pgo_generate=self.path):
+            self.assertNotEqual(dict(codegen_knobs()), plain)
+
+
+if __name__ == "__main__":
+    unittest.main()
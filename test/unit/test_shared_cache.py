@@ -0,0 +1,116 @@
+"""Unit tests for the shared content-addressed object cache."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from pythoc.build.cache import BuildCache
+from pythoc.build.deps import GroupDeps, GroupKey
+from pythoc.build.shared_cache import SharedObjectCache, get_shared_object_cache
+from pythoc.config import config
+
+
+class TestSharedObjectCache(unittest.TestCase):
+    def setUp(self):
+        config.reset()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = self._tmpdir.name
+        self.cache = SharedObjectCache(os.path.join(root, "cache"))
+        self.source = os.path.join(root, "mod.py")
+        self.embed = os.path.join(root, "types.py")
+        self._write(self.source, "def f(x):\n    return x + 1\n")
+        self._write(self.embed, "X = 1\n")
+        self.group_key = (self.source, None, None, None)
+        self.obj_file = os.path.join(root, "mod.o")
+        self._write(self.obj_file, "object-bytes")
+
+    def tearDown(self):
+        config.reset()
+        self._tmpdir.cleanup()
+
+    def _write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def _deps(self):
+        deps = GroupDeps(group_key=GroupKey(*self.group_key))
+        deps.add_group_dependency(GroupKey(self.embed, None, None, None), "source_embed")
+        deps.link_objects = [self.obj_file]
+        deps.content_key = BuildCache.compute_content_key(
+            self.group_key, self.source, deps.get_source_embed_files(),
+        )
+        return deps
+
+    def test_disabled_without_cache_dir(self):
+        self.assertIsNone(get_shared_object_cache())
+        with config.override(cache_dir=self._tmpdir.name):
+            self.assertIsNotNone(get_shared_object_cache())
+
+    def test_publish_then_lookup(self):
+        deps = self._deps()
+        self.assertTrue(self.cache.publish(self.group_key, self.source, self.obj_file, deps))
+
+        hit = self.cache.lookup(self.group_key, self.source)
+        self.assertIsNotNone(hit)
+        obj_path, restored = hit
+        with open(obj_path) as f:
+            self.assertEqual(f.read(), "object-bytes")
+        self.assertEqual(restored.content_key, deps.content_key)
+        self.assertEqual(restored.get_source_embed_files(), [self.embed])
+        self.assertEqual(restored.link_objects, [self.obj_file])
+
+    def test_embed_change_misses(self):
+        self.cache.publish(self.group_key, self.source, self.obj_file, self._deps())
+        self._write(self.embed, "X = 2\n")
+        self.assertIsNone(self.cache.lookup(self.group_key, self.source))
+
+    def test_source_change_misses(self):
+        self.cache.publish(self.group_key, self.source, self.obj_file, self._deps())
+        self._write(self.source, "def f(x):\n    return x + 2\n")
+        self.assertIsNone(self.cache.lookup(self.group_key, self.source))
+
+    def test_evict_removes_least_recently_used(self):
+        other_source = os.path.join(self._tmpdir.name, "other.py")
+        self._write(other_source, "def g():\n    pass\n")
+        other_key = (other_source, None, None, None)
+        other_deps = GroupDeps(group_key=GroupKey(*other_key))
+        other_deps.content_key = BuildCache.compute_content_key(other_key, other_source)
+
+        self.cache.publish(self.group_key, self.source, self.obj_file, self._deps())
+        self.cache.publish(other_key, other_source, self.obj_file, other_deps)
+
+        # Age every entry, then touch the first one through a lookup.
+        past = time.time() - 100
+        for dirpath, _dirnames, filenames in os.walk(self.cache.objects_dir):
+            for name in filenames:
+                os.utime(os.path.join(dirpath, name), (past, past))
+        obj_path, _deps = self.cache.lookup(self.group_key, self.source)
+        recent_size = (
+            os.path.getsize(obj_path)
+            + os.path.getsize(obj_path[:-len('.o')] + '.deps')
+        )
+
+        self.assertEqual(self.cache.evict(recent_size), 1)
+        self.assertIsNotNone(self.cache.lookup(self.group_key, self.source))
+        self.assertIsNone(self.cache.lookup(other_key, other_source))
+        self.assertEqual(self.cache.evict(recent_size), 0)
+
+    def test_evict_scans_only_past_tracked_size(self):
+        self.cache.publish(self.group_key, self.source, self.obj_file, self._deps())
+        self.assertEqual(self.cache.evict(1 << 30), 0)  # first scan records the size
+        size = self.cache._read_usage()
+        self.assertGreater(size, 0)
+
+        with mock.patch("pythoc.build.shared_cache.os.walk") as walk:
+            self.assertEqual(self.cache.evict(size), 0)
+        walk.assert_not_called()
+
+        self.assertEqual(self.cache.evict(size - 1), 1)
+        self.assertEqual(self.cache._read_usage(), 0)
+        self.assertIsNone(self.cache.lookup(self.group_key, self.source))
+
+
+if __name__ == "__main__":
+    unittest.main()